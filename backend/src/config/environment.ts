@@ -1,4 +1,5 @@
 import dotenv from 'dotenv';
+import path from 'path';
 import { EnvironmentConfig } from '../types/index.js';
 
 // Load environment variables
@@ -27,6 +28,17 @@ export const config: EnvironmentConfig = {
   VAPID_PUBLIC_KEY: process.env.VAPID_PUBLIC_KEY,
   VAPID_PRIVATE_KEY: process.env.VAPID_PRIVATE_KEY,
   VAPID_SUBJECT: process.env.VAPID_SUBJECT,
+  LOAD_INDEX_ENABLED: process.env.LOAD_INDEX_ENABLED?.toLowerCase() === 'true',
+  LOAD_CHANGE_STREAM_ENABLED: process.env.LOAD_CHANGE_STREAM_ENABLED?.toLowerCase() === 'true',
+  PARTY_SUMMARY_READS_ENABLED: process.env.PARTY_SUMMARY_READS_ENABLED?.toLowerCase() === 'true',
+  TEXT_SEARCH_INDEX_ENABLED: process.env.TEXT_SEARCH_INDEX_ENABLED?.toLowerCase() === 'true',
+  SEARCH_RESULT_CACHE_ENABLED: process.env.SEARCH_RESULT_CACHE_ENABLED?.toLowerCase() === 'true',
+  DAILY_STATS_READS_ENABLED: process.env.DAILY_STATS_READS_ENABLED?.toLowerCase() === 'true',
+  DASHBOARD_CACHE_ENABLED: process.env.DASHBOARD_CACHE_ENABLED?.toLowerCase() === 'true',
+  ALERT_MATCH_INDEX_ENABLED: process.env.ALERT_MATCH_INDEX_ENABLED?.toLowerCase() === 'true',
+  ALERT_DISPATCH_CONCURRENCY: Math.max(parseInt(process.env.ALERT_DISPATCH_CONCURRENCY || '', 10) || 4, 1),
+  GAZETTEER_PATH: process.env.GAZETTEER_PATH || path.resolve(process.cwd(), 'data/gazetteer.bin'),
+  EXPORT_DIR: process.env.EXPORT_DIR || path.resolve(process.cwd(), 'exports'),
 };
 
 // Validate required environment variables
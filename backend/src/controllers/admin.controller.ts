@@ -1,15 +1,24 @@
 import { Response } from 'express';
+import { once } from 'events';
+import { PassThrough } from 'stream';
+import { pipeline } from 'stream/promises';
 import mongoose from 'mongoose';
 import bcryptjs from 'bcryptjs';
 import { seedLoads } from '../scripts/seedLoads.js';
 import { AuthRequest } from '../types/index.js';
 import { logger } from '../utils/logger.js';
 import { User } from '../models/User.model.js';
-import { Load } from '../models/Load.model.js';
-import { Shipment } from '../models/Shipment.model.js';
-import { Message } from '../models/Message.model.js';
 import { AuditLog } from '../models/AuditLog.model.js';
-import { Document } from '../models/Document.model.js';
+import { loadIndexService } from '../services/loadIndex.service.js';
+import { geocodingService } from '../services/geocoding.service.js';
+import { partySummaryService } from '../services/partySummary.service.js';
+import { searchResultCacheService } from '../services/searchResultCache.service.js';
+import { dashboardCacheService } from '../services/dashboardCache.service.js';
+import { systemStatsService } from '../services/systemStats.service.js';
+import { EXPORT_CONTENT_TYPES, ExportCollection, exportService, isExportCollection } from '../services/export.service.js';
+import { EXPORT_JOB_FORMATS, exportJobService, exportJobView } from '../services/exportJob.service.js';
+import type { ExportJobFormat, IExportJob } from '../models/ExportJob.model.js';
+import { SYSTEM_STATS } from '../utils/constants.js';
 
 type PaginationResult<T> = {
   data: T[];
@@ -172,6 +181,10 @@ class AdminController {
 
       await this.logAction(req, 'UPDATE_USER', 'Updated user account', { targetCollection: 'users', targetUserId: id, changes: changeMetadata });
 
+      if (['company', 'email', 'accountType'].some(field => field in payload)) {
+        partySummaryService.scheduleSync(id);
+      }
+
       res.json({ success: true, data: updatedUser });
     } catch (error: any) {
       logger.error('Admin updateUser failed', { error: error.message });
@@ -206,298 +219,196 @@ class AdminController {
   }
 
   /**
-   * GET /api/admin/export/users
+   * GET /api/admin/export/users?format=json|csv|ndjson|arrow&gzip=1&from=&to=&status=
    */
   async exportAllData(req: AuthRequest, res: Response): Promise<void> {
+    await this.streamExport(req, res, 'users', 'EXPORT_USERS', 'Exported all users');
+  }
+
+  /**
+   * GET /api/admin/export/loads (same query parameters as users)
+   */
+  async exportLoads(req: AuthRequest, res: Response): Promise<void> {
+    await this.streamExport(req, res, 'loads', 'EXPORT_LOADS', 'Exported loads report');
+  }
+
+  /**
+   * GET /api/admin/export/shipments (same query parameters as users)
+   */
+  async exportShipments(req: AuthRequest, res: Response): Promise<void> {
+    await this.streamExport(req, res, 'shipments', 'EXPORT_SHIPMENTS', 'Exported shipments report');
+  }
+
+  /**
+   * GET /api/admin/export/messages (same query parameters as users; metadata only)
+   */
+  async exportMessages(req: AuthRequest, res: Response): Promise<void> {
+    await this.streamExport(req, res, 'messages', 'EXPORT_MESSAGES', 'Exported messages report');
+  }
+
+  /**
+   * POST /api/admin/export-jobs
+   * Body: { collection, format: csv|ndjson, from?, to?, status? }; output is always gzipped
+   */
+  async createExportJob(req: AuthRequest, res: Response): Promise<void> {
     try {
-      const format = typeof req.query.format === 'string' ? req.query.format.toLowerCase() : 'json';
-      const users = await User.find({}).lean();
-      const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
-
-      await this.logAction(req, 'EXPORT_USERS', 'Exported all users', { targetCollection: 'users', format, count: users.length });
-
-      if (format === 'csv') {
-        const fields = Object.keys(users[0] || {});
-        const csvRows = [fields.join(',')];
-        for (const user of users) {
-          const row = fields.map(field => {
-            const value = (user as Record<string, unknown>)[field];
-            if (value === undefined || value === null) return '';
-            if (typeof value === 'object') {
-              return JSON.stringify(value).replace(/"/g, '""');
-            }
-            return String(value).replace(/"/g, '""');
-          });
-          csvRows.push(row.map(col => (col.includes(',') ? `"${col}"` : col)).join(','));
-        }
+      const collection = String(req.body?.collection ?? '');
+      if (!isExportCollection(collection)) {
+        res.status(400).json({ success: false, error: 'collection must be one of users, loads, shipments, messages' });
+        return;
+      }
 
-        res.setHeader('Content-Type', 'text/csv');
-        res.setHeader('Content-Disposition', `attachment; filename="users-${timestamp}.csv"`);
-        res.status(200).send(csvRows.join('\n'));
+      const options = exportService.parseOptions(collection, { format: 'csv', ...req.body });
+      if ('error' in options) {
+        res.status(400).json({ success: false, error: options.error });
+        return;
+      }
+      if (!EXPORT_JOB_FORMATS.includes(options.format as ExportJobFormat)) {
+        res.status(400).json({ success: false, error: `Export jobs support ${EXPORT_JOB_FORMATS.join(', ')}` });
         return;
       }
 
-      res.setHeader('Content-Type', 'application/json');
-      res.setHeader('Content-Disposition', `attachment; filename="users-${timestamp}.json"`);
-      res.status(200).send(JSON.stringify({ exportDate: new Date().toISOString(), totalUsers: users.length, users }));
+      const job = await exportJobService.submit(collection, options.format as ExportJobFormat, options.filters, req.user!.userId);
+
+      void this.logAction(req, 'CREATE_EXPORT_JOB', `Queued ${collection} export`, {
+        targetCollection: collection,
+        exportJobId: job.id,
+        format: job.format,
+        filters: job.filters,
+      });
+
+      res.status(202).json({ success: true, data: job });
     } catch (error: any) {
-      logger.error('Admin exportAllData failed', { error: error.message });
-      res.status(500).json({ success: false, error: 'Failed to export users' });
+      logger.error('Admin createExportJob failed', { error: error.message });
+      res.status(500).json({ success: false, error: 'Failed to create export job' });
     }
   }
 
-  async exportLoads(req: AuthRequest, res: Response): Promise<void> {
+  /**
+   * GET /api/admin/export-jobs?limit=20
+   */
+  async getExportJobs(req: AuthRequest, res: Response): Promise<void> {
     try {
-      const format = typeof req.query.format === 'string' ? req.query.format.toLowerCase() : 'json';
-      const loads = await Load.find({}).lean();
-      const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
-
-      const exportRecords = loads.map((load) => ({
-        title: load.title,
-        status: load.status,
-        equipmentType: load.equipmentType,
-        weight: load.weight,
-        rate: load.rate,
-        rateType: load.rateType,
-        originCity: load.origin?.city,
-        originState: load.origin?.state,
-        originZip: load.origin?.zip,
-        destinationCity: load.destination?.city,
-        destinationState: load.destination?.state,
-        destinationZip: load.destination?.zip,
-        pickupDate: load.pickupDate ? new Date(load.pickupDate).toISOString() : '',
-        deliveryDate: load.deliveryDate ? new Date(load.deliveryDate).toISOString() : '',
-        bookedAt: load.bookedAt ? new Date(load.bookedAt).toISOString() : '',
-        billingStatus: load.billingStatus,
-        createdAt: load.createdAt ? new Date(load.createdAt).toISOString() : '',
-        updatedAt: load.updatedAt ? new Date(load.updatedAt).toISOString() : '',
-      }));
-
-      await this.logAction(req, 'EXPORT_LOADS', 'Exported loads report', {
-        targetCollection: 'loads',
-        format,
-        count: exportRecords.length,
-      });
+      const limit = Math.min(Math.max(parseInt(String(req.query.limit ?? ''), 10) || 20, 1), 100);
+      res.json({ success: true, data: await exportJobService.list(limit) });
+    } catch (error: any) {
+      logger.error('Admin getExportJobs failed', { error: error.message });
+      res.status(500).json({ success: false, error: 'Failed to fetch export jobs' });
+    }
+  }
 
-      if (format === 'csv') {
-        const fields = Object.keys(exportRecords[0] || {});
-        const csvRows = [fields.join(',')];
-        for (const record of exportRecords) {
-          const row = fields.map((field) => {
-            const value = (record as Record<string, unknown>)[field];
-            if (value === undefined || value === null) return '';
-            return String(value).replace(/"/g, '""');
-          });
-          csvRows.push(row.map((column) => (column.includes(',') ? `"${column}"` : column)).join(','));
-        }
-        res.setHeader('Content-Type', 'text/csv');
-        res.setHeader('Content-Disposition', `attachment; filename="loads-${timestamp}.csv"`);
-        res.status(200).send(csvRows.join('\n'));
+  /**
+   * GET /api/admin/export-jobs/:id
+   * Progress is also pushed to the requesting admin as `export_job_progress`
+   */
+  async getExportJob(req: AuthRequest, res: Response): Promise<void> {
+    try {
+      const job = await this.findExportJob(req, res);
+      if (!job) return;
+      res.json({ success: true, data: exportJobView(job) });
+    } catch (error: any) {
+      logger.error('Admin getExportJob failed', { error: error.message });
+      res.status(500).json({ success: false, error: 'Failed to fetch export job' });
+    }
+  }
+
+  /**
+   * POST /api/admin/export-jobs/:id/resume
+   * Requeue a failed job from its last completed chunk
+   */
+  async resumeExportJob(req: AuthRequest, res: Response): Promise<void> {
+    try {
+      const job = await this.findExportJob(req, res);
+      if (!job) return;
+      if (job.status !== 'failed') {
+        res.status(409).json({ success: false, error: `Export job is ${job.status}` });
+        return;
+      }
+
+      const resumed = await exportJobService.resume(job.id);
+      if (!resumed) {
+        res.status(409).json({ success: false, error: 'Export job is no longer failed' });
         return;
       }
 
-      res.setHeader('Content-Type', 'application/json');
-      res.setHeader('Content-Disposition', `attachment; filename="loads-${timestamp}.json"`);
-      res.status(200).send(JSON.stringify({ exportDate: new Date().toISOString(), totalLoads: exportRecords.length, loads: exportRecords }));
+      void this.logAction(req, 'RESUME_EXPORT_JOB', 'Resumed export job', {
+        targetCollection: job.collectionName,
+        exportJobId: job.id,
+        chunksCompleted: resumed.chunksCompleted,
+      });
+
+      res.json({ success: true, data: resumed });
     } catch (error: any) {
-      logger.error('Admin exportLoads failed', { error: error.message });
-      res.status(500).json({ success: false, error: 'Failed to export loads' });
+      logger.error('Admin resumeExportJob failed', { error: error.message });
+      res.status(500).json({ success: false, error: 'Failed to resume export job' });
     }
   }
 
-  async exportShipments(req: AuthRequest, res: Response): Promise<void> {
+  /**
+   * DELETE /api/admin/export-jobs/:id
+   */
+  async deleteExportJob(req: AuthRequest, res: Response): Promise<void> {
     try {
-      const format = typeof req.query.format === 'string' ? req.query.format.toLowerCase() : 'json';
-      const shipments = await Shipment.find({}).lean();
-      const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
-
-      const exportRecords = shipments.map((shipment) => ({
-        shipmentId: shipment.shipmentId,
-        title: shipment.title,
-        status: shipment.status,
-        description: shipment.description || '',
-        pickupCity: shipment.pickup?.city,
-        pickupState: shipment.pickup?.state,
-        pickupZip: shipment.pickup?.zip,
-        deliveryCity: shipment.delivery?.city,
-        deliveryState: shipment.delivery?.state,
-        deliveryZip: shipment.delivery?.zip,
-        createdAt: shipment.createdAt ? new Date(shipment.createdAt).toISOString() : '',
-        updatedAt: shipment.updatedAt ? new Date(shipment.updatedAt).toISOString() : '',
-      }));
-
-      await this.logAction(req, 'EXPORT_SHIPMENTS', 'Exported shipments report', {
-        targetCollection: 'shipments',
-        format,
-        count: exportRecords.length,
-      });
+      const job = await this.findExportJob(req, res);
+      if (!job) return;
 
-      if (format === 'csv') {
-        const fields = Object.keys(exportRecords[0] || {});
-        const csvRows = [fields.join(',')];
-        for (const record of exportRecords) {
-          const row = fields.map((field) => {
-            const value = (record as Record<string, unknown>)[field];
-            if (value === undefined || value === null) return '';
-            return String(value).replace(/"/g, '""');
-          });
-          csvRows.push(row.map((column) => (column.includes(',') ? `"${column}"` : column)).join(','));
-        }
-        res.setHeader('Content-Type', 'text/csv');
-        res.setHeader('Content-Disposition', `attachment; filename="shipments-${timestamp}.csv"`);
-        res.status(200).send(csvRows.join('\n'));
+      await exportJobService.remove(job.id);
+      void this.logAction(req, 'DELETE_EXPORT_JOB', 'Deleted export job', { targetCollection: job.collectionName, exportJobId: job.id });
+
+      res.json({ success: true, message: 'Export job deleted' });
+    } catch (error: any) {
+      logger.error('Admin deleteExportJob failed', { error: error.message });
+      res.status(500).json({ success: false, error: 'Failed to delete export job' });
+    }
+  }
+
+  /**
+   * GET /api/admin/export-jobs/:id/download
+   * Serves the gzip file; Range requests are supported, so interrupted downloads can continue
+   */
+  async downloadExportJob(req: AuthRequest, res: Response): Promise<void> {
+    try {
+      const job = await this.findExportJob(req, res);
+      if (!job) return;
+      if (job.status !== 'completed') {
+        res.status(409).json({ success: false, error: `Export job is ${job.status}` });
         return;
       }
 
-      res.setHeader('Content-Type', 'application/json');
-      res.setHeader('Content-Disposition', `attachment; filename="shipments-${timestamp}.json"`);
-      res.status(200).send(
-        JSON.stringify({
-          exportDate: new Date().toISOString(),
-          totalShipments: exportRecords.length,
-          shipments: exportRecords,
-        }),
-      );
+      // Audit the first request only, not every resumed range
+      if (!req.headers.range) {
+        void this.logAction(req, 'DOWNLOAD_EXPORT_JOB', 'Downloaded export job file', {
+          targetCollection: job.collectionName,
+          exportJobId: job.id,
+          fileSize: job.fileSize,
+        });
+      }
+
+      res.download(exportJobService.filePath(job), exportJobService.fileName(job), (error) => {
+        if (!error) return;
+        logger.error('Admin downloadExportJob failed', { jobId: job.id, error: error.message });
+        if (!res.headersSent) {
+          res.status(404).json({ success: false, error: 'Export file not found' });
+        }
+      });
     } catch (error: any) {
-      logger.error('Admin exportShipments failed', { error: error.message });
-      res.status(500).json({ success: false, error: 'Failed to export shipments' });
+      logger.error('Admin downloadExportJob failed', { error: error.message });
+      res.status(500).json({ success: false, error: 'Failed to download export job' });
     }
   }
 
   /**
    * GET /api/admin/system-stats
+   * Latest background snapshot (see systemStats.service)
    */
   async getSystemStats(req: AuthRequest, res: Response): Promise<void> {
     try {
-      const [
-        totalUsers,
-        activeUsers,
-        adminUsers,
-        carrierCount,
-        brokerCount,
-        shipperCount,
-        totalLoads,
-        openLoads,
-        bookedLoads,
-        inTransitLoads,
-        deliveredLoads,
-        readyForBillingLoads,
-        totalShipments,
-        openShipments,
-        totalMessages,
-        totalDocuments,
-        verifiedDocuments,
-        laneAggregation,
-        bookingSpeedAggregation,
-      ] = await Promise.all([
-        User.countDocuments({}),
-        User.countDocuments({ isActive: true }),
-        User.countDocuments({ role: 'admin' }),
-        User.countDocuments({ accountType: 'carrier' }),
-        User.countDocuments({ accountType: 'broker' }),
-        User.countDocuments({ accountType: 'shipper' }),
-        Load.countDocuments({}),
-        Load.countDocuments({ status: 'available' }),
-        Load.countDocuments({ status: 'booked' }),
-        Load.countDocuments({ status: 'in_transit' }),
-        Load.countDocuments({ status: 'delivered' }),
-        Load.countDocuments({ billingStatus: { $in: ['ready', 'invoiced'] } }),
-        Shipment.countDocuments({}),
-        Shipment.countDocuments({ status: 'open' }),
-        Message.countDocuments({}),
-        Document.countDocuments({}),
-        Document.countDocuments({ isVerified: true }),
-        Load.aggregate([
-          {
-            $match: {
-              status: { $in: ['available', 'booked', 'in_transit'] },
-            },
-          },
-          {
-            $group: {
-              _id: {
-                origin: '$origin.state',
-                destination: '$destination.state',
-              },
-            },
-          },
-          {
-            $count: 'count',
-          },
-        ]),
-        Load.aggregate([
-          {
-            $match: {
-              bookedAt: { $ne: null },
-              createdAt: { $ne: null },
-            },
-          },
-          {
-            $project: {
-              durationHours: {
-                $divide: [
-                  { $subtract: ['$bookedAt', '$createdAt'] },
-                  1000 * 60 * 60,
-                ],
-              },
-            },
-          },
-          {
-            $group: {
-              _id: null,
-              averageHours: { $avg: '$durationHours' },
-            },
-          },
-        ]),
-      ]);
-
-      const activeLaneCount = laneAggregation[0]?.count ?? 0;
-      const averageHoursToBook = bookingSpeedAggregation[0]?.averageHours ?? 0;
-      const conversionRate = totalLoads > 0 ? Number(((bookedLoads / totalLoads) * 100).toFixed(1)) : 0;
-      const documentVerificationRate =
-        totalDocuments > 0 ? Number(((verifiedDocuments / totalDocuments) * 100).toFixed(1)) : 0;
-
-      const stats = {
-        users: {
-          total: totalUsers,
-          active: activeUsers,
-          admin: adminUsers,
-          carriers: carrierCount,
-          brokers: brokerCount,
-          shippers: shipperCount,
-        },
-        loads: {
-          total: totalLoads,
-          open: openLoads,
-          booked: bookedLoads,
-          inTransit: inTransitLoads,
-          delivered: deliveredLoads,
-          readyForBilling: readyForBillingLoads,
-        },
-        shipments: {
-          total: totalShipments,
-          open: openShipments,
-        },
-        messages: {
-          total: totalMessages,
-        },
-        documents: {
-          total: totalDocuments,
-          verified: verifiedDocuments,
-          pending: Math.max(totalDocuments - verifiedDocuments, 0),
-          verificationRate: documentVerificationRate,
-        },
-        analytics: {
-          conversionRate,
-          activeLaneCount,
-          averageHoursToBook,
-          readyForBilling: readyForBillingLoads,
-        },
-        generatedAt: new Date().toISOString(),
-      };
+      const { value: stats, state } = await dashboardCacheService.systemStats(() => systemStatsService.latest());
 
-      await this.logAction(req, 'VIEW_SYSTEM_STATS', 'Viewed system statistics', { targetCollection: 'system' });
+      // The audit write does not hold up the response
+      void this.logAction(req, 'VIEW_SYSTEM_STATS', 'Viewed system statistics', { targetCollection: 'system' });
 
+      res.setHeader('X-Cache', state.toUpperCase());
       res.json({ success: true, data: stats });
     } catch (error: any) {
       logger.error('Admin getSystemStats failed', { error: error.message });
@@ -505,6 +416,73 @@ class AdminController {
     }
   }
 
+  /**
+   * GET /api/admin/system-stats/history?hours=24
+   * Snapshots for charting, oldest first
+   */
+  async getSystemStatsHistory(req: AuthRequest, res: Response): Promise<void> {
+    try {
+      const hours = Math.min(Math.max(parseInt(String(req.query.hours ?? ''), 10) || 24, 1), SYSTEM_STATS.RETENTION_DAYS * 24);
+      const to = new Date();
+      const from = new Date(to.getTime() - hours * 60 * 60 * 1000);
+      const snapshots = await systemStatsService.history(from, to);
+      res.json({ success: true, data: { from, to, snapshots } });
+    } catch (error: any) {
+      logger.error('Admin getSystemStatsHistory failed', { error: error.message });
+      res.status(500).json({ success: false, error: 'Failed to fetch system stats history' });
+    }
+  }
+
+  /**
+   * GET /api/admin/load-index/stats
+   */
+  async getLoadIndexStats(_req: AuthRequest, res: Response): Promise<void> {
+    try {
+      res.json({ success: true, data: loadIndexService.getStats() });
+    } catch (error: any) {
+      logger.error('Admin getLoadIndexStats failed', { error: error.message });
+      res.status(500).json({ success: false, error: 'Failed to fetch load index stats' });
+    }
+  }
+
+  /**
+   * GET /api/admin/geocoding/stats
+   */
+  async getGeocodingStats(_req: AuthRequest, res: Response): Promise<void> {
+    try {
+      res.json({ success: true, data: geocodingService.getCacheStats() });
+    } catch (error: any) {
+      logger.error('Admin getGeocodingStats failed', { error: error.message });
+      res.status(500).json({ success: false, error: 'Failed to fetch geocoding stats' });
+    }
+  }
+
+  /**
+   * GET /api/admin/search-cache/stats?limit=50
+   * Result cache totals and per-key hit ratios, busiest keys first
+   */
+  async getSearchCacheStats(req: AuthRequest, res: Response): Promise<void> {
+    try {
+      const limit = Math.min(Math.max(parseInt(String(req.query.limit ?? ''), 10) || 50, 1), 500);
+      res.json({ success: true, data: searchResultCacheService.getStats(limit) });
+    } catch (error: any) {
+      logger.error('Admin getSearchCacheStats failed', { error: error.message });
+      res.status(500).json({ success: false, error: 'Failed to fetch search cache stats' });
+    }
+  }
+
+  /**
+   * GET /api/admin/dashboard-cache/stats
+   */
+  async getDashboardCacheStats(_req: AuthRequest, res: Response): Promise<void> {
+    try {
+      res.json({ success: true, data: dashboardCacheService.getStats() });
+    } catch (error: any) {
+      logger.error('Admin getDashboardCacheStats failed', { error: error.message });
+      res.status(500).json({ success: false, error: 'Failed to fetch dashboard cache stats' });
+    }
+  }
+
   /**
    * GET /api/admin/audit-logs
    */
@@ -626,6 +604,83 @@ class AdminController {
     }
   }
 
+  /**
+   * Stream an export from a MongoDB cursor through the encoder (and gzip) into
+   * the response; pipeline() propagates backpressure and destroys the cursor if
+   * the client goes away. Logged once the stream ends, with the record count.
+   */
+  private async streamExport(
+    req: AuthRequest,
+    res: Response,
+    collection: ExportCollection,
+    action: string,
+    description: string
+  ): Promise<void> {
+    const options = exportService.parseOptions(collection, req.query);
+    if ('error' in options) {
+      res.status(400).json({ success: false, error: options.error });
+      return;
+    }
+
+    const timestamp = new Date().toISOString().replace(/[:.]/g, '-');
+    const filename = `${collection}-${timestamp}.${options.format}${options.gzip ? '.gz' : ''}`;
+    const { stages, encoder } = exportService.pipeline(collection, options);
+
+    // The stages feed an intermediate stream, and res is attached only once the
+    // first bytes arrive (or the export ends empty). A failure before then
+    // (bad query, cursor error) still gets a 500, not a reset connection.
+    const body = new PassThrough();
+    const producing = pipeline([...stages, body]);
+    const started = await Promise.race([
+      once(body, 'readable').then(() => null, (error: Error) => error),
+      producing.then(() => null, (error: Error) => error)
+    ]);
+
+    if (started) {
+      logger.error(`Admin export ${collection} failed`, { error: started.message, exported: encoder.records });
+      res.status(500).json({ success: false, error: `Failed to export ${collection}` });
+      return;
+    }
+
+    res.setHeader('Content-Type', options.gzip ? 'application/gzip' : EXPORT_CONTENT_TYPES[options.format]);
+    res.setHeader('Content-Disposition', `attachment; filename="${filename}"`);
+    // A client that goes away stops the cursor
+    res.on('close', () => {
+      if (!res.writableFinished) body.destroy();
+    });
+    body.pipe(res);
+
+    try {
+      await producing;
+      void this.logAction(req, action, description, {
+        targetCollection: collection,
+        format: options.format,
+        gzip: options.gzip,
+        filters: options.filters,
+        count: encoder.records,
+      });
+    } catch (error: any) {
+      logger.error(`Admin export ${collection} failed`, { error: error.message, exported: encoder.records });
+      // Headers and part of the body are out; cut the response so it is not taken as complete
+      res.destroy();
+    }
+  }
+
+  private async findExportJob(req: AuthRequest, res: Response): Promise<IExportJob | null> {
+    const { id } = req.params;
+    if (!mongoose.Types.ObjectId.isValid(id)) {
+      res.status(400).json({ success: false, error: 'Invalid export job ID' });
+      return null;
+    }
+
+    const job = await exportJobService.get(id);
+    if (!job) {
+      res.status(404).json({ success: false, error: 'Export job not found' });
+      return null;
+    }
+    return job;
+  }
+
   private async logAction(req: AuthRequest, action: string, description: string, metadata: Record<string, unknown> = {}): Promise<void> {
     try {
       if (!req.user?.userId) return;
@@ -3,6 +3,7 @@ import { Load } from '../models/Load.model.js';
 import { Document } from '../models/Document.model.js';
 import { AuthRequest, InvoicePreview } from '../types/index.js';
 import { logger } from '../utils/logger.js';
+import { partySummaryService } from '../services/partySummary.service.js';
 
 const computeLineHaulTotal = (
   rateType: 'per_mile' | 'flat_rate',
@@ -98,13 +99,14 @@ export const listReadyInvoices = async (req: AuthRequest, res: Response): Promis
       query.bookedBy = req.user.userId;
     }
 
-    const loads = await Load.find(query)
-      .select('title pickupDate deliveryDate rate rateType agreedRate billingStatus distance postedBy bookedBy')
-      .sort({ updatedAt: -1 })
-      .populate('postedBy', 'company')
-      .populate('bookedBy', 'company');
+    const loads = await partySummaryService.readLoads(
+      Load.find(query)
+        .select('title pickupDate deliveryDate rate rateType agreedRate billingStatus distance postedBy bookedBy postedBySummary bookedBySummary')
+        .sort({ updatedAt: -1 }),
+      { postedBy: 'company', bookedBy: 'company' }
+    );
 
-    const invoices = loads.map((load) => {
+    const invoices = loads.map((load: any) => {
       // Runtime validation: ensure populated fields exist and have expected structure
       const postedBy: PartyLike = load.postedBy && typeof load.postedBy === 'object' && 'company' in load.postedBy
         ? load.postedBy as PartyLike
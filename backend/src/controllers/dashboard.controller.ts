@@ -1,54 +1,45 @@
 import { Response } from 'express';
+import { Types } from 'mongoose';
 import { Load } from '../models/Load.model.js';
 import { Shipment, ShipmentRequest } from '../models/Shipment.model.js';
 import { AuthRequest } from '../types/index.js';
 import { logger } from '../utils/logger.js';
-import { analyticsService } from '../services/analytics.service.js';
+import { StageTimer } from '../utils/stageTimer.js';
+import { validateTimeZone } from '../utils/validators.js';
+import { analyticsService, DEFAULT_TIME_ZONE } from '../services/analytics.service.js';
+import { dashboardCacheService } from '../services/dashboardCache.service.js';
+import { partySummaryService } from '../services/partySummary.service.js';
 
+// Time series buckets follow the caller's calendar days (?tz=America/Chicago)
+const timeZoneOf = (req: AuthRequest): string =>
+  typeof req.query.tz === 'string' && req.query.tz ? req.query.tz : DEFAULT_TIME_ZONE;
+
+const RECENT_LIMIT = 5;
+
+// Counts of documents whose `field` is one of `values`, for $group stages
+const countWhere = (field: string, values: string[]) => ({ $sum: { $cond: [{ $in: [`$${field}`, values] }, 1, 0] } });
+const sumWhere = (field: string, values: string[], sumField: string) => ({
+  $sum: { $cond: [{ $in: [`$${field}`, values] }, { $ifNull: [`$${sumField}`, 0] }, 0] }
+});
+
+/**
+ * Each dashboard is assembled from one $facet aggregation per collection
+ * (totals and recent documents in a single round trip) plus the analytics,
+ * all issued concurrently, and served through the dashboard cache when enabled.
+ */
 export class DashboardController {
   async getCarrierStats(req: AuthRequest, res: Response): Promise<void> {
     try {
-      const carrierId = req.user?.userId;
-
-      // Get booked loads
-      const bookedLoads = await Load.find({ bookedBy: carrierId, status: { $ne: 'cancelled' } })
-        .populate('postedBy', 'company email')
-        .sort({ createdAt: -1 });
-
-      // Calculate stats
-      const totalBooked = bookedLoads.length;
-      const totalEarnings = bookedLoads.reduce((sum, load) => sum + (load.rate || 0), 0);
-      const totalMiles = bookedLoads.reduce((sum, load) => sum + (load.distance || 0), 0);
-      const activeLoads = bookedLoads.filter(load => ['booked', 'in_transit'].includes(load.status)).length;
-
-      // Get analytics
-      const revenueTimeSeries = await analyticsService.getCarrierRevenueTimeSeries(carrierId || '', 30);
-      const loadCountTimeSeries = await analyticsService.getCarrierLoadCountTimeSeries(carrierId || '', 30);
-      const revenueAnalytics = await analyticsService.getCarrierRevenueAnalytics(carrierId || '', 30);
-      const loadAnalytics = await analyticsService.getCarrierLoadAnalytics(carrierId || '', 30);
-      const topEquipment = await analyticsService.getTopEquipmentTypes(carrierId || '', 'carrier', 5);
-
-      res.json({
-        success: true,
-        stats: {
-          totalBooked,
-          totalEarnings,
-          totalMiles,
-          activeLoads,
-          averageRate: totalBooked > 0 ? Math.round(totalEarnings / totalBooked) : 0,
-          rating: '5.0' // Placeholder
-        },
-        analytics: {
-          revenue: revenueAnalytics,
-          loads: loadAnalytics
-        },
-        timeSeries: {
-          revenue: revenueTimeSeries,
-          loads: loadCountTimeSeries
-        },
-        topEquipment,
-        recentLoads: bookedLoads.slice(0, 5)
-      });
+      const carrierId = req.user?.userId || '';
+      const timeZone = timeZoneOf(req);
+      const timer = new StageTimer();
+
+      const { value, state } = await dashboardCacheService.dashboard('carrier', carrierId, timeZone, () =>
+        this.buildCarrierStats(carrierId, timeZone, timer)
+      );
+
+      res.setHeader('X-Cache', state.toUpperCase());
+      res.json(timer.attach(req, res, value));
     } catch (error: any) {
       logger.error('Get carrier stats failed', {
         error: error?.message,
@@ -62,49 +53,16 @@ export class DashboardController {
 
   async getBrokerStats(req: AuthRequest, res: Response): Promise<void> {
     try {
-      const brokerId = req.user?.userId;
-
-      // Get posted loads
-      const postedLoads = await Load.find({ postedBy: brokerId })
-        .populate('bookedBy', 'company email')
-        .sort({ createdAt: -1 });
-
-      // Get shipment requests
-      const shipmentRequests = await ShipmentRequest.find({ brokerId })
-        .populate('shipmentId', 'title pickup delivery')
-        .populate('shipperId', 'company email')
-        .sort({ requestedAt: -1 });
-
-      // Calculate stats
-      const totalPosted = postedLoads.length;
-      const activeLoads = postedLoads.filter(load => load.status === 'available').length;
-      const bookedLoadsArray = postedLoads.filter(load => load.status === 'booked');
-      const bookedLoads = bookedLoadsArray.length;
-      const potentialRevenue = bookedLoadsArray.reduce((sum: number, load: any) => sum + (load.rate || 0), 0);
-      const totalRequests = shipmentRequests.length;
-      const pendingRequests = shipmentRequests.filter(req => req.status === 'pending').length;
-
-      // Get analytics
-      const loadsTimeSeries = await analyticsService.getBrokerLoadsTimeSeries(brokerId || '', 30);
-      const topEquipment = await analyticsService.getTopEquipmentTypes(brokerId || '', 'broker', 5);
-
-      res.json({
-        success: true,
-        stats: {
-          totalPosted,
-          activeLoads,
-          carrierRequests: bookedLoads,
-          potentialRevenue,
-          shipmentRequests: totalRequests,
-          pendingRequests
-        },
-        timeSeries: {
-          loads: loadsTimeSeries
-        },
-        topEquipment,
-        recentLoads: postedLoads.slice(0, 5),
-        recentShipmentRequests: shipmentRequests.slice(0, 5)
-      });
+      const brokerId = req.user?.userId || '';
+      const timeZone = timeZoneOf(req);
+      const timer = new StageTimer();
+
+      const { value, state } = await dashboardCacheService.dashboard('broker', brokerId, timeZone, () =>
+        this.buildBrokerStats(brokerId, timeZone, timer)
+      );
+
+      res.setHeader('X-Cache', state.toUpperCase());
+      res.json(timer.attach(req, res, value));
     } catch (error: any) {
       logger.error('Get broker stats failed', {
         error: error?.message,
@@ -118,51 +76,16 @@ export class DashboardController {
 
   async getShipperStats(req: AuthRequest, res: Response): Promise<void> {
     try {
-      const shipperId = req.user?.userId;
-
-      // Get shipments
-      const shipments = await Shipment.find({ postedBy: shipperId })
-        .sort({ createdAt: -1 });
-
-      // Get shipment requests
-      const shipmentRequests = await ShipmentRequest.find({ shipperId })
-        .populate('brokerId', 'company email usdotNumber mcNumber')
-        .populate('shipmentId', 'title pickup delivery')
-        .sort({ requestedAt: -1 });
-
-      // Get loads linked to shipments
-      const shipmentIds = shipments.map(s => s._id);
-      const loads = await Load.find({ shipment: { $in: shipmentIds } })
-        .populate('bookedBy', 'company email')
-        .sort({ createdAt: -1 });
-
-      // Calculate stats
-      const totalShipments = shipments.length;
-      const activeShipments = shipments.filter(s => s.status === 'open').length;
-      const totalProposals = shipmentRequests.length;
-      const totalSpend = loads.reduce((sum, load) => sum + (load.rate || 0), 0);
-      const pendingRequests = shipmentRequests.filter(req => req.status === 'pending').length;
-      const approvedRequests = shipmentRequests.filter(req => req.status === 'approved').length;
-
-      // Get analytics
-      const shipmentsTimeSeries = await analyticsService.getShipperShipmentsTimeSeries(shipperId || '', 30);
-
-      res.json({
-        success: true,
-        stats: {
-          totalShipments,
-          activeShipments,
-          totalProposals,
-          totalSpend,
-          pendingRequests,
-          approvedRequests
-        },
-        timeSeries: {
-          shipments: shipmentsTimeSeries
-        },
-        recentShipments: shipments.slice(0, 5),
-        recentRequests: shipmentRequests.slice(0, 5)
-      });
+      const shipperId = req.user?.userId || '';
+      const timeZone = timeZoneOf(req);
+      const timer = new StageTimer();
+
+      const { value, state } = await dashboardCacheService.dashboard('shipper', shipperId, timeZone, () =>
+        this.buildShipperStats(shipperId, timeZone, timer)
+      );
+
+      res.setHeader('X-Cache', state.toUpperCase());
+      res.json(timer.attach(req, res, value));
     } catch (error: any) {
       logger.error('Get shipper stats failed', {
         error: error?.message,
@@ -178,6 +101,11 @@ export class DashboardController {
     try {
       const accountType = req.user?.accountType;
 
+      if (!validateTimeZone(timeZoneOf(req))) {
+        res.status(400).json({ error: 'Invalid time zone' });
+        return;
+      }
+
       switch (accountType) {
         case 'carrier':
           await this.getCarrierStats(req, res);
@@ -201,6 +129,195 @@ export class DashboardController {
       res.status(500).json({ error: 'Failed to fetch stats' });
     }
   }
+
+  private async buildCarrierStats(carrierId: string, timeZone: string, timer: StageTimer) {
+    const [[loadFacets], analytics] = await Promise.all([
+      timer.time('loads', () => Load.aggregate([
+        { $match: { bookedBy: new Types.ObjectId(carrierId), status: { $ne: 'cancelled' } } },
+        {
+          $facet: {
+            totals: [
+              {
+                $group: {
+                  _id: null,
+                  totalBooked: { $sum: 1 },
+                  totalEarnings: { $sum: { $ifNull: ['$rate', 0] } },
+                  totalMiles: { $sum: { $ifNull: ['$distance', 0] } },
+                  activeLoads: countWhere('status', ['booked', 'in_transit'])
+                }
+              }
+            ],
+            recentLoads: [{ $sort: { createdAt: -1 } }, { $limit: RECENT_LIMIT }]
+          }
+        }
+      ])),
+      timer.time('analytics', () => analyticsService.getCarrierDashboardAnalytics(carrierId, 30, timeZone))
+    ]);
+
+    const recentLoads = await timer.time('parties', () =>
+      partySummaryService.hydrateLoads(loadFacets.recentLoads, { postedBy: 'company email' })
+    );
+    const { totalBooked = 0, totalEarnings = 0, totalMiles = 0, activeLoads = 0 } = loadFacets.totals[0] ?? {};
+
+    return {
+      success: true,
+      stats: {
+        totalBooked,
+        totalEarnings,
+        totalMiles,
+        activeLoads,
+        averageRate: totalBooked > 0 ? Math.round(totalEarnings / totalBooked) : 0,
+        rating: '5.0' // Placeholder
+      },
+      analytics: {
+        revenue: analytics.revenueAnalytics,
+        loads: analytics.loadAnalytics
+      },
+      timeSeries: {
+        revenue: analytics.revenueTimeSeries,
+        loads: analytics.loadCountTimeSeries
+      },
+      topEquipment: analytics.topEquipment,
+      recentLoads
+    };
+  }
+
+  private async buildBrokerStats(brokerId: string, timeZone: string, timer: StageTimer) {
+    const [[loadFacets], [requestFacets], loadsTimeSeries, topEquipment] = await Promise.all([
+      timer.time('loads', () => Load.aggregate([
+        { $match: { postedBy: new Types.ObjectId(brokerId) } },
+        {
+          $facet: {
+            totals: [
+              {
+                $group: {
+                  _id: null,
+                  totalPosted: { $sum: 1 },
+                  activeLoads: countWhere('status', ['available']),
+                  bookedLoads: countWhere('status', ['booked']),
+                  potentialRevenue: sumWhere('status', ['booked'], 'rate')
+                }
+              }
+            ],
+            recentLoads: [{ $sort: { createdAt: -1 } }, { $limit: RECENT_LIMIT }]
+          }
+        }
+      ])),
+      timer.time('shipmentRequests', () => ShipmentRequest.aggregate([
+        { $match: { brokerId: new Types.ObjectId(brokerId) } },
+        {
+          $facet: {
+            totals: [{ $group: { _id: null, totalRequests: { $sum: 1 }, pendingRequests: countWhere('status', ['pending']) } }],
+            recentRequests: [{ $sort: { requestedAt: -1 } }, { $limit: RECENT_LIMIT }]
+          }
+        }
+      ])),
+      timer.time('loadsTimeSeries', () => analyticsService.getBrokerLoadsTimeSeries(brokerId, 30, timeZone)),
+      timer.time('topEquipment', () => analyticsService.getTopEquipmentTypes(brokerId, 'broker', 5))
+    ]);
+
+    const [recentLoads, recentShipmentRequests] = await timer.time('parties', () => Promise.all([
+      partySummaryService.hydrateLoads(loadFacets.recentLoads, { bookedBy: 'company email' }),
+      ShipmentRequest.populate(requestFacets.recentRequests, [
+        { path: 'shipmentId', select: 'title pickup delivery' },
+        { path: 'shipperId', select: 'company email' }
+      ])
+    ]));
+    const { totalPosted = 0, activeLoads = 0, bookedLoads = 0, potentialRevenue = 0 } = loadFacets.totals[0] ?? {};
+    const { totalRequests = 0, pendingRequests = 0 } = requestFacets.totals[0] ?? {};
+
+    return {
+      success: true,
+      stats: {
+        totalPosted,
+        activeLoads,
+        carrierRequests: bookedLoads,
+        potentialRevenue,
+        shipmentRequests: totalRequests,
+        pendingRequests
+      },
+      timeSeries: {
+        loads: loadsTimeSeries
+      },
+      topEquipment,
+      recentLoads,
+      recentShipmentRequests
+    };
+  }
+
+  private async buildShipperStats(shipperId: string, timeZone: string, timer: StageTimer) {
+    const [[shipmentFacets], [requestFacets], shipmentsTimeSeries] = await Promise.all([
+      timer.time('shipments', () => Shipment.aggregate([
+        { $match: { postedBy: new Types.ObjectId(shipperId) } },
+        {
+          $facet: {
+            totals: [{ $group: { _id: null, totalShipments: { $sum: 1 }, activeShipments: countWhere('status', ['open']) } }],
+            recentShipments: [{ $sort: { createdAt: -1 } }, { $limit: RECENT_LIMIT }],
+            // Spend on loads linked to these shipments, joined server-side on the { shipment } index
+            spend: [
+              {
+                $lookup: {
+                  from: Load.collection.collectionName,
+                  localField: '_id',
+                  foreignField: 'shipment',
+                  pipeline: [{ $project: { _id: 0, rate: 1 } }],
+                  as: 'loads'
+                }
+              },
+              { $unwind: '$loads' },
+              { $group: { _id: null, totalSpend: { $sum: { $ifNull: ['$loads.rate', 0] } } } }
+            ]
+          }
+        }
+      ])),
+      timer.time('shipmentRequests', () => ShipmentRequest.aggregate([
+        { $match: { shipperId: new Types.ObjectId(shipperId) } },
+        {
+          $facet: {
+            totals: [
+              {
+                $group: {
+                  _id: null,
+                  totalProposals: { $sum: 1 },
+                  pendingRequests: countWhere('status', ['pending']),
+                  approvedRequests: countWhere('status', ['approved'])
+                }
+              }
+            ],
+            recentRequests: [{ $sort: { requestedAt: -1 } }, { $limit: RECENT_LIMIT }]
+          }
+        }
+      ])),
+      timer.time('shipmentsTimeSeries', () => analyticsService.getShipperShipmentsTimeSeries(shipperId, 30, timeZone))
+    ]);
+
+    const recentRequests = await timer.time('parties', () =>
+      ShipmentRequest.populate(requestFacets.recentRequests, [
+        { path: 'brokerId', select: 'company email usdotNumber mcNumber' },
+        { path: 'shipmentId', select: 'title pickup delivery' }
+      ])
+    );
+    const { totalShipments = 0, activeShipments = 0 } = shipmentFacets.totals[0] ?? {};
+    const { totalSpend = 0 } = shipmentFacets.spend[0] ?? {};
+    const { totalProposals = 0, pendingRequests = 0, approvedRequests = 0 } = requestFacets.totals[0] ?? {};
+
+    return {
+      success: true,
+      stats: {
+        totalShipments,
+        activeShipments,
+        totalProposals,
+        totalSpend,
+        pendingRequests,
+        approvedRequests
+      },
+      timeSeries: {
+        shipments: shipmentsTimeSeries
+      },
+      recentShipments: shipmentFacets.recentShipments,
+      recentRequests
+    };
+  }
 }
 
 export const dashboardController = new DashboardController();
@@ -0,0 +1,43 @@
+import { Response } from 'express';
+import { AuthRequest } from '../types/index.js';
+import { laneRateService } from '../services/laneRate.service.js';
+import { logger } from '../utils/logger.js';
+import { validateState } from '../utils/validators.js';
+
+const stateParam = (value: unknown): string | undefined => {
+  if (typeof value !== 'string') return undefined;
+  const state = value.trim().toUpperCase();
+  return validateState(state, 'US') || validateState(state, 'CA') ? state : undefined;
+};
+
+export class LaneRateController {
+  /**
+   * Market rate-per-mile quote for a lane
+   * GET /api/lane-rates/quote?origin=TX&destination=CA&equipment=Dry%20Van
+   */
+  async getQuote(req: AuthRequest, res: Response): Promise<void> {
+    try {
+      const origin = stateParam(req.query.origin);
+      const destination = stateParam(req.query.destination);
+      const equipment = typeof req.query.equipment === 'string' ? req.query.equipment.trim() : undefined;
+
+      if (!origin || !destination) {
+        res.status(400).json({ error: 'Valid origin and destination states are required' });
+        return;
+      }
+
+      const quote = await laneRateService.getQuote(origin, destination, equipment);
+      if (!quote) {
+        res.status(404).json({ error: 'No recent bookings on this lane' });
+        return;
+      }
+
+      res.json({ success: true, data: quote });
+    } catch (error: any) {
+      logger.error('Get lane rate quote failed', { error: error.message });
+      res.status(500).json({ error: 'Failed to fetch lane rate quote' });
+    }
+  }
+}
+
+export const laneRateController = new LaneRateController();
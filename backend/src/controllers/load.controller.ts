@@ -4,53 +4,26 @@ import { User } from '../models/User.model.js';
 import { Shipment } from '../models/Shipment.model.js';
 import { AuthRequest } from '../types/index.js';
 import { LoadQueryFilter } from '../types/query.types.js';
-import { PAGINATION } from '../utils/constants.js';
+import { GEOCODE_REQUEST_TIMEOUT_MS, PAGINATION } from '../utils/constants.js';
+import { buildKeysetFilter, decodeCursor, encodeCursor, KEYSET_SORT, parseCountMode, parseLimit } from '../utils/pagination.js';
 import { validateState, validatePostalCode } from '../utils/validators.js';
 import { logger } from '../utils/logger.js';
+import { calculateDistanceMiles } from '../utils/geo.js';
 import { websocketService } from '../services/websocket.service.js';
 import { geocodingService } from '../services/geocoding.service.js';
-
-const EARTH_RADIUS_MILES = 3958.8;
-
-const toRadians = (degrees: number): number => (degrees * Math.PI) / 180;
-
-const calculateDistanceMiles = (
-  origin?: { lat?: number; lng?: number },
-  destination?: { lat?: number; lng?: number }
-): number | null => {
-  if (
-    !origin ||
-    !destination ||
-    typeof origin.lat !== 'number' ||
-    typeof origin.lng !== 'number' ||
-    typeof destination.lat !== 'number' ||
-    typeof destination.lng !== 'number'
-  ) {
-    return null;
-  }
-
-  const dLat = toRadians(destination.lat - origin.lat);
-  const dLon = toRadians(destination.lng - origin.lng);
-  const lat1 = toRadians(origin.lat);
-  const lat2 = toRadians(destination.lat);
-
-  const a =
-    Math.sin(dLat / 2) * Math.sin(dLat / 2) +
-    Math.sin(dLon / 2) * Math.sin(dLon / 2) * Math.cos(lat1) * Math.cos(lat2);
-  const c = 2 * Math.atan2(Math.sqrt(a), Math.sqrt(1 - a));
-  const miles = EARTH_RADIUS_MILES * c;
-
-  if (!Number.isFinite(miles) || miles <= 0) {
-    return null;
-  }
-
-  return Math.round(miles);
-};
+import { loadCountService } from '../services/loadCount.service.js';
+import { loadEvents } from '../services/loadEvents.service.js';
+import { loadIndexService } from '../services/loadIndex.service.js';
+import { loadImportService, MAX_IMPORT_ROWS } from '../services/loadImport.service.js';
+import { partySummaryService, PARTY_SUMMARY_FIELDS, toPartySummary } from '../services/partySummary.service.js';
+import { searchResultCacheService } from '../services/searchResultCache.service.js';
+import { dailyStatsService } from '../services/dailyStats.service.js';
+import { detectImportFormat, LoadImportInput, parseLoadImport, ParsedImportRow } from '../utils/loadImport.js';
 
 export class LoadController {
   async getLoads(req: AuthRequest, res: Response): Promise<void> {
     try {
-      const { page = PAGINATION.DEFAULT_PAGE, limit = PAGINATION.DEFAULT_LIMIT, status = 'available' } = req.query;
+      const { page = PAGINATION.DEFAULT_PAGE, limit = PAGINATION.DEFAULT_LIMIT, status = 'available', cursor } = req.query;
       const skip = (Number(page) - 1) * Number(limit);
 
       const query: LoadQueryFilter = { status: String(status) };
@@ -63,13 +36,53 @@ export class LoadController {
         }
       }
 
-      const loads = await Load.find(query)
-        .populate('postedBy', 'company email accountType')
-        .sort({ createdAt: -1 })
-        .skip(skip)
-        .limit(parseInt(limit as string));
+      // Cursor mode: ?cursor= (empty string for the first page) switches to keyset pagination
+      if (typeof cursor === 'string') {
+        await this.getLoadsByCursor(req, res, query, cursor);
+        return;
+      }
+
+      if (query.status === 'available') {
+        const indexed = loadIndexService.query(
+          { isInterstate: query.isInterstate },
+          { skip, limit: parseInt(limit as string) }
+        );
+        if (indexed) {
+          res.json({
+            success: true,
+            loads: indexed.loads,
+            pagination: {
+              page: parseInt(page as string),
+              limit: parseInt(limit as string),
+              total: indexed.total,
+              pages: Math.ceil(indexed.total / parseInt(limit as string))
+            }
+          });
+          return;
+        }
+      }
+
+      const countMode = parseCountMode(req.query.count, 'exact');
+      const cacheTicket = searchResultCacheService.ticket(
+        { status: [query.status], isInterstate: query.isInterstate },
+        { skip, limit: parseInt(limit as string), count: countMode }
+      );
+      const cached = cacheTicket ? await searchResultCacheService.read(cacheTicket, { postedBy: PARTY_SUMMARY_FIELDS }) : null;
+
+      const [loads, total] = cached ? [cached.loads, cached.total] as const : await Promise.all([
+        partySummaryService.readLoads(
+          Load.find(query)
+            .sort({ createdAt: -1 })
+            .skip(skip)
+            .limit(parseInt(limit as string)),
+          { postedBy: PARTY_SUMMARY_FIELDS }
+        ),
+        loadCountService.count({ ...query }, countMode)
+      ]);
 
-      const total = await Load.countDocuments(query);
+      if (cacheTicket && !cached) {
+        searchResultCacheService.store(cacheTicket, { ids: loads.map((load: any) => String(load._id)), total });
+      }
 
       res.json({
         success: true,
@@ -78,7 +91,7 @@ export class LoadController {
           page: parseInt(page as string),
           limit: parseInt(limit as string),
           total,
-          pages: Math.ceil(total / parseInt(limit as string))
+          pages: total !== undefined ? Math.ceil(total / parseInt(limit as string)) : undefined
         }
       });
     } catch (error: any) {
@@ -87,6 +100,92 @@ export class LoadController {
     }
   }
 
+  /**
+   * Keyset pagination over { createdAt: -1, _id: -1 }.
+   * Total count is skipped by default; pass ?count=cached|estimated|exact to include it.
+   */
+  private async getLoadsByCursor(req: AuthRequest, res: Response, query: LoadQueryFilter, cursor: string): Promise<void> {
+    const limit = parseLimit(req.query.limit);
+    const countMode = parseCountMode(req.query.count, 'none');
+
+    const position = cursor ? decodeCursor(cursor) : null;
+    if (cursor && !position) {
+      res.status(400).json({ error: 'Invalid cursor' });
+      return;
+    }
+
+    if (query.status === 'available') {
+      const indexed = loadIndexService.query({ isInterstate: query.isInterstate }, { limit, cursor: position });
+      if (indexed) {
+        res.json({
+          success: true,
+          loads: indexed.loads,
+          pagination: {
+            limit,
+            hasMore: !!indexed.nextCursor,
+            nextCursor: indexed.nextCursor ?? null,
+            total: countMode === 'none' ? undefined : indexed.total
+          }
+        });
+        return;
+      }
+    }
+
+    const cacheTicket = searchResultCacheService.ticket(
+      { status: [query.status], isInterstate: query.isInterstate },
+      { limit, cursor, count: countMode }
+    );
+    const cached = cacheTicket ? await searchResultCacheService.read(cacheTicket, { postedBy: PARTY_SUMMARY_FIELDS }) : null;
+    if (cached) {
+      res.json({
+        success: true,
+        loads: cached.loads,
+        pagination: {
+          limit,
+          hasMore: !!cached.nextCursor,
+          nextCursor: cached.nextCursor ?? null,
+          total: cached.total
+        }
+      });
+      return;
+    }
+
+    const filter: Record<string, unknown> = { ...query };
+    if (position) {
+      Object.assign(filter, buildKeysetFilter(position));
+    }
+
+    const [rows, total] = await Promise.all([
+      partySummaryService.readLoads(
+        Load.find(filter)
+          .sort(KEYSET_SORT)
+          .limit(limit + 1),
+        { postedBy: PARTY_SUMMARY_FIELDS }
+      ),
+      loadCountService.count({ ...query }, countMode)
+    ]);
+
+    const hasMore = rows.length > limit;
+    const loads = hasMore ? rows.slice(0, limit) : rows;
+    const last = loads[loads.length - 1];
+    const nextCursor = hasMore && last ? encodeCursor(last) : null;
+
+    if (cacheTicket) {
+      searchResultCacheService.store(cacheTicket, { ids: loads.map(load => String(load._id)), total, nextCursor });
+    }
+
+    res.json({
+      success: true,
+      loads,
+      pagination: {
+        limit,
+        hasMore,
+        nextCursor,
+        total
+      }
+    });
+  }
+
   async postLoad(req: AuthRequest, res: Response): Promise<void> {
     try {
       if (req.user?.accountType !== 'broker' && req.user?.role !== 'admin') {
@@ -146,9 +245,12 @@ export class LoadController {
         unlinked = false;
       }
 
-      // Geocode addresses to get coordinates
-      const originCoords = await geocodingService.geocodeAddress(origin);
-      const destCoords = await geocodingService.geocodeAddress(destination);
+      // Geocode both addresses in parallel within a fixed budget; a slow geocoder
+      // leaves coordinates unset rather than stalling the post
+      const [originCoords, destCoords] = await Promise.all([
+        geocodingService.geocodeWithin(origin, GEOCODE_REQUEST_TIMEOUT_MS),
+        geocodingService.geocodeWithin(destination, GEOCODE_REQUEST_TIMEOUT_MS)
+      ]);
 
       const originCoordinates = originCoords
         ? { lat: originCoords.latitude, lng: originCoords.longitude }
@@ -180,6 +282,7 @@ export class LoadController {
         isInterstate,
         shipment: shipmentRef,
         postedBy: req.user.userId,
+        postedBySummary: toPartySummary(broker),
         billingStatus: 'not_ready',
         distance: computedDistance ?? undefined
       };
@@ -187,6 +290,9 @@ export class LoadController {
       const load = new Load(loadData);
       await load.save();
 
+      loadEvents.publishCreated(load.toObject());
+      void dailyStatsService.recordLoadsCreated([load]);
+
       // Broadcast new load via WebSocket
       websocketService.notifyNewLoad(load);
 
@@ -201,6 +307,51 @@ export class LoadController {
     }
   }
 
+  /**
+   * POST /api/loads/import
+   * Bulk import from an uploaded CSV/NDJSON file (field "file") or a JSON body { loads: [...] }
+   */
+  async importLoads(req: AuthRequest, res: Response): Promise<void> {
+    try {
+      if (req.user?.accountType !== 'broker' && req.user?.role !== 'admin') {
+        res.status(403).json({ error: 'Only brokers can post loads' });
+        return;
+      }
+
+      let rows: ParsedImportRow[];
+      if (req.file) {
+        const content = req.file.buffer.toString('utf8');
+        const format = detectImportFormat(content, req.file.originalname, req.file.mimetype);
+        rows = parseLoadImport(content, format);
+      } else if (Array.isArray(req.body?.loads)) {
+        rows = req.body.loads.map((input: LoadImportInput, i: number) => ({ row: i + 1, input }));
+      } else {
+        res.status(400).json({ error: 'Upload a CSV/NDJSON file or send { loads: [...] }' });
+        return;
+      }
+
+      if (rows.length === 0) {
+        res.status(400).json({ error: 'No loads found in import' });
+        return;
+      }
+      if (rows.length > MAX_IMPORT_ROWS) {
+        res.status(400).json({ error: `At most ${MAX_IMPORT_ROWS} loads can be imported at once` });
+        return;
+      }
+
+      const summary = await loadImportService.importLoads(rows, req.user.userId);
+
+      res.status(summary.failed === 0 ? 201 : 207).json({
+        success: summary.created > 0,
+        message: `Imported ${summary.created} of ${summary.received} loads`,
+        ...summary
+      });
+    } catch (error: any) {
+      logger.error('Bulk load import failed', { error: error.message });
+      res.status(500).json({ error: 'Failed to import loads' });
+    }
+  }
+
   async bookLoad(req: AuthRequest, res: Response): Promise<void> {
     try {
       if (req.user?.accountType !== 'carrier' && req.user?.role !== 'admin') {
@@ -235,6 +386,7 @@ export class LoadController {
         bookedAt: new Date(),
         agreedRate: finalAgreedRate,
         billingStatus: 'ready',
+        bookedBySummary: toPartySummary(carrier),
       };
 
       if (typeof bookingNotes === 'string' && bookingNotes.trim().length > 0) {
@@ -255,6 +407,9 @@ export class LoadController {
         return;
       }
 
+      loadEvents.publishUpdated(load.toObject(), 'available');
+      void dailyStatsService.recordLoadStatusChange(load, 'available');
+
       // Broadcast load booking via WebSocket
       websocketService.notifyLoadUpdate(load._id.toString(), {
         status: load.status,
@@ -1,8 +1,18 @@
 import { Response } from 'express';
 import { AuthRequest } from '../types/index.js';
 import { geocodingService } from '../services/geocoding.service.js';
+import { distanceRow, nearestInRow, packPoints, PackedPoints } from '../utils/distanceMatrix.js';
 import { logger } from '../utils/logger.js';
 
+const MAX_MATRIX_POINTS = 5000;
+// Matrices needing more origin/destination distances are always streamed as
+// NDJSON rows (k does not reduce the work, only the output)
+const MAX_INLINE_MATRIX_PAIRS = 250000;
+// Distances computed between event-loop yields while streaming
+const STREAM_PAIRS_PER_TICK = 250000;
+
+const roundMiles = (miles: number): number => Math.round(miles * 10) / 10;
+
 export class LocationController {
   /**
    * Geocode address to coordinates
@@ -100,6 +110,116 @@ export class LocationController {
       res.status(500).json({ error: 'Failed to calculate distance' });
     }
   }
+
+  /**
+   * Distances between every origin and destination
+   * POST /api/locations/distance-matrix
+   * Body: { origins: [{ lat, lng }], destinations: [{ lat, lng }], k?, stream? }
+   * With k, each row holds only the k nearest destinations ({ index, distance }).
+   * Matrices with more than 250k origin × destination pairs (or stream: true) are
+   * returned as NDJSON, one row per line. Requires auth; rate limited per user.
+   */
+  async distanceMatrix(req: AuthRequest, res: Response): Promise<void> {
+    try {
+      const { origins, destinations } = req.body;
+      const k = req.body.k !== undefined ? parseInt(req.body.k, 10) : undefined;
+
+      if (!Array.isArray(origins) || !Array.isArray(destinations) || origins.length === 0 || destinations.length === 0) {
+        res.status(400).json({ error: 'Non-empty origins and destinations arrays are required' });
+        return;
+      }
+      if (origins.length > MAX_MATRIX_POINTS || destinations.length > MAX_MATRIX_POINTS) {
+        res.status(400).json({ error: `At most ${MAX_MATRIX_POINTS} origins and destinations are allowed` });
+        return;
+      }
+      if (k !== undefined && (Number.isNaN(k) || k <= 0)) {
+        res.status(400).json({ error: 'k must be a positive integer' });
+        return;
+      }
+
+      const packedOrigins = packPoints(origins);
+      if ('invalidIndex' in packedOrigins) {
+        res.status(400).json({ error: `Invalid lat/lng for origin ${packedOrigins.invalidIndex}` });
+        return;
+      }
+      const packedDestinations = packPoints(destinations);
+      if ('invalidIndex' in packedDestinations) {
+        res.status(400).json({ error: `Invalid lat/lng for destination ${packedDestinations.invalidIndex}` });
+        return;
+      }
+
+      if (req.body.stream === true || origins.length * destinations.length > MAX_INLINE_MATRIX_PAIRS) {
+        await this.streamDistanceMatrix(res, packedOrigins, packedDestinations, k);
+        return;
+      }
+
+      const buffer = new Float64Array(packedDestinations.count);
+      const rows: unknown[] = [];
+      for (let i = 0; i < packedOrigins.count; i++) {
+        distanceRow(packedOrigins, i, packedDestinations, buffer);
+        rows.push(k !== undefined
+          ? nearestInRow(buffer, k).map(entry => ({ index: entry.index, distance: roundMiles(entry.distance) }))
+          : Array.from(buffer, roundMiles));
+      }
+
+      res.json({
+        success: true,
+        data: { unit: 'miles', rows }
+      });
+    } catch (error: any) {
+      logger.error('Distance matrix failed', { error: error.message });
+      if (res.headersSent) {
+        res.destroy();
+        return;
+      }
+      res.status(500).json({ error: 'Failed to calculate distance matrix' });
+    }
+  }
+
+  /**
+   * Write one NDJSON line per origin row, honouring backpressure and client disconnects
+   */
+  private async streamDistanceMatrix(
+    res: Response,
+    origins: PackedPoints,
+    destinations: PackedPoints,
+    k?: number
+  ): Promise<void> {
+    // 'close' before end() means the client went away
+    let aborted = false;
+    res.on('close', () => {
+      aborted = true;
+    });
+
+    res.setHeader('Content-Type', 'application/x-ndjson');
+    res.setHeader('Cache-Control', 'no-store');
+
+    const buffer = new Float64Array(destinations.count);
+    const rowsPerTick = Math.max(Math.floor(STREAM_PAIRS_PER_TICK / destinations.count), 1);
+    for (let i = 0; i < origins.count && !aborted; i++) {
+      distanceRow(origins, i, destinations, buffer);
+      const line = k !== undefined
+        ? { row: i, nearest: nearestInRow(buffer, k).map(entry => ({ index: entry.index, distance: roundMiles(entry.distance) })) }
+        : { row: i, distances: Array.from(buffer, roundMiles) };
+
+      if (!res.write(`${JSON.stringify(line)}\n`)) {
+        await new Promise<void>((resolve) => {
+          const done = () => {
+            res.off('drain', done);
+            res.off('close', done);
+            resolve();
+          };
+          res.on('drain', done);
+          res.on('close', done);
+        });
+      } else if ((i + 1) % rowsPerTick === 0) {
+        // Let other requests run during long matrices
+        await new Promise<void>((resolve) => setImmediate(resolve));
+      }
+    }
+
+    res.end();
+  }
 }
 
 export const locationController = new LocationController();
@@ -1,5 +1,6 @@
 import { Response } from 'express';
 import { SavedSearch } from '../models/SavedSearch.model.js';
+import { searchMatchService } from '../services/searchMatch.service.js';
 import { AuthRequest } from '../types/index.js';
 import { logger } from '../utils/logger.js';
 
@@ -45,6 +46,7 @@ export class SavedSearchController {
       });
 
       await search.save();
+      searchMatchService.upsert(search);
 
       res.status(201).json({
         success: true,
@@ -67,7 +69,12 @@ export class SavedSearchController {
 
       const updates: Record<string, unknown> = {};
       if (name !== undefined) updates.name = name;
-      if (filters !== undefined) updates.filters = filters;
+      if (filters !== undefined) {
+        updates.filters = filters;
+        // Pending matches and the watermark were made against the old filters
+        updates.pendingLoads = [];
+        updates.$unset = { pendingSince: 1, lastSeenLoadAt: 1, lastSeenLoadId: 1 };
+      }
       if (alertEnabled !== undefined) updates.alertEnabled = alertEnabled;
       if (frequency !== undefined) updates.frequency = frequency;
 
@@ -81,6 +88,7 @@ export class SavedSearchController {
         res.status(404).json({ error: 'Saved search not found' });
         return;
       }
+      searchMatchService.upsert(search);
 
       res.json({
         success: true,
@@ -111,6 +119,7 @@ export class SavedSearchController {
         res.status(404).json({ error: 'Saved search not found' });
         return;
       }
+      searchMatchService.upsert(search);
 
       res.json({
         success: true,
@@ -138,6 +147,7 @@ export class SavedSearchController {
         res.status(404).json({ error: 'Saved search not found' });
         return;
       }
+      searchMatchService.remove(search.id);
 
       res.json({
         success: true,
@@ -1,8 +1,18 @@
 import { Response } from 'express';
-import { searchService, SearchFilters } from '../services/search.service.js';
+import { searchService, SearchFilters, InvalidCursorError, NearbySearchOptions } from '../services/search.service.js';
+import { parseCountMode } from '../utils/pagination.js';
+import { isValidLatLng } from '../utils/geo.js';
 import { AuthRequest } from '../types/index.js';
 import { logger } from '../utils/logger.js';
 
+const MAX_RADIUS_MILES = 500;
+
+// The fallback applies only to a missing parameter; anything sent is parsed and validated
+const parseRadius = (value: unknown, fallback: number): number =>
+  value === undefined || value === '' ? fallback : parseFloat(String(value));
+
+const isValidRadius = (miles: number): boolean => miles > 0 && miles <= MAX_RADIUS_MILES;
+
 export class SearchController {
   /**
    * POST /api/search/loads
@@ -29,7 +39,95 @@ export class SearchController {
         bookedBy: req.body.bookedBy || req.query.bookedBy
       };
 
-      const result = await searchService.searchLoads(filters, page, limit);
+      const rawCursor = req.body.cursor ?? req.query.cursor;
+      const cursor = typeof rawCursor === 'string' ? rawCursor : undefined;
+      const count = parseCountMode(req.body.count ?? req.query.count, cursor !== undefined ? 'none' : 'exact');
+
+      const result = await searchService.searchLoads(filters, page, limit, { cursor, count });
+
+      res.json({
+        success: true,
+        data: {
+          loads: result.loads,
+          pagination: cursor !== undefined
+            ? {
+                limit,
+                hasMore: !!result.nextCursor,
+                nextCursor: result.nextCursor ?? null,
+                total: result.total
+              }
+            : {
+                page,
+                limit,
+                total: result.total,
+                pages: result.total !== undefined ? Math.ceil(result.total / limit) : undefined
+              },
+          suggestions: result.suggestions
+        }
+      });
+    } catch (error: any) {
+      if (error instanceof InvalidCursorError) {
+        res.status(400).json({ error: 'Invalid cursor' });
+        return;
+      }
+      logger.error('Search loads failed', { error: error.message });
+      res.status(500).json({ error: 'Failed to search loads' });
+    }
+  }
+
+  /**
+   * GET|POST /api/search/nearby
+   * Available loads with origin within `radius` miles of lat/lng (deadhead search),
+   * optionally constrained to a destination radius via destLat/destLng/destRadius
+   */
+  async searchNearby(req: AuthRequest, res: Response): Promise<void> {
+    try {
+      const input = { ...req.query, ...req.body };
+      const lat = parseFloat(input.lat);
+      const lng = parseFloat(input.lng);
+      const radiusMiles = parseRadius(input.radius, 100);
+      const page = parseInt(input.page) || 1;
+      const limit = Math.min(parseInt(input.limit) || 20, 100);
+
+      if (!isValidLatLng(lat, lng)) {
+        res.status(400).json({ error: 'Valid lat and lng are required' });
+        return;
+      }
+      if (!isValidRadius(radiusMiles)) {
+        res.status(400).json({ error: `radius must be between 0 and ${MAX_RADIUS_MILES} miles` });
+        return;
+      }
+
+      let destination: NearbySearchOptions['destination'];
+      if (input.destLat !== undefined || input.destLng !== undefined) {
+        const destLat = parseFloat(input.destLat);
+        const destLng = parseFloat(input.destLng);
+        const destRadius = parseRadius(input.destRadius, radiusMiles);
+        if (!isValidLatLng(destLat, destLng)) {
+          res.status(400).json({ error: 'Valid destLat and destLng are required' });
+          return;
+        }
+        if (!isValidRadius(destRadius)) {
+          res.status(400).json({ error: `destRadius must be between 0 and ${MAX_RADIUS_MILES} miles` });
+          return;
+        }
+        destination = { lat: destLat, lng: destLng, radiusMiles: destRadius };
+      }
+
+      const result = await searchService.searchLoadsNearby(
+        { lat, lng, radiusMiles, destination },
+        {
+          equipment: input.equipment,
+          minRate: input.minRate ? parseFloat(input.minRate) : undefined,
+          maxRate: input.maxRate ? parseFloat(input.maxRate) : undefined,
+          minWeight: input.minWeight ? parseFloat(input.minWeight) : undefined,
+          maxWeight: input.maxWeight ? parseFloat(input.maxWeight) : undefined,
+          pickupDateFrom: input.pickupDateFrom ? new Date(input.pickupDateFrom) : undefined,
+          pickupDateTo: input.pickupDateTo ? new Date(input.pickupDateTo) : undefined
+        },
+        page,
+        limit
+      );
 
       res.json({
         success: true,
@@ -40,13 +138,12 @@ export class SearchController {
             limit,
             total: result.total,
             pages: Math.ceil(result.total / limit)
-          },
-          suggestions: result.suggestions
+          }
         }
       });
     } catch (error: any) {
-      logger.error('Search loads failed', { error: error.message });
-      res.status(500).json({ error: 'Failed to search loads' });
+      logger.error('Nearby search failed', { error: error.message });
+      res.status(500).json({ error: 'Failed to search nearby loads' });
     }
   }
 
@@ -4,6 +4,7 @@ import { AuthRequest } from '../types/index.js';
 import { body, validationResult } from 'express-validator';
 import bcryptjs from 'bcryptjs';
 import { logger } from '../utils/logger.js';
+import { partySummaryService } from '../services/partySummary.service.js';
 
 export const getSettings = async (req: AuthRequest, res: Response): Promise<void> => {
   try {
@@ -64,6 +65,11 @@ export const updateProfile = async (req: AuthRequest, res: Response): Promise<vo
       return;
     }
 
+    // Refresh the party summaries denormalized onto this user's loads
+    if (email || company) {
+      partySummaryService.scheduleSync(String(updatedUser._id));
+    }
+
     res.json({
       success: true,
       message: 'Profile updated successfully',
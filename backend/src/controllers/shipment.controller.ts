@@ -5,6 +5,8 @@ import { ShipmentQueryFilter } from '../types/query.types.js';
 import { PAGINATION } from '../utils/constants.js';
 import { validateState, validatePostalCode } from '../utils/validators.js';
 import { logger } from '../utils/logger.js';
+import { dailyStatsService } from '../services/dailyStats.service.js';
+import { dashboardCacheService } from '../services/dashboardCache.service.js';
 
 export class ShipmentController {
   async getShipments(req: AuthRequest, res: Response): Promise<void> {
@@ -97,6 +99,8 @@ export class ShipmentController {
       });
 
       await shipment.save();
+      void dailyStatsService.recordShipmentCreated(shipment);
+      dashboardCacheService.invalidateUsers(shipment.postedBy);
       await shipment.populate('postedBy', 'company email accountType');
 
       logger.info('Shipment created successfully', { shipmentId, userId: req.user?.userId });
@@ -183,10 +187,13 @@ export class ShipmentController {
         }
         shipment.delivery = delivery;
       }
+      const previousStatus = shipment.status;
       if (status) shipment.status = status;
 
       shipment.updatedAt = new Date();
       await shipment.save();
+      void dailyStatsService.recordShipmentStatusChange(shipment, previousStatus);
+      dashboardCacheService.invalidateUsers(shipment.postedBy);
       await shipment.populate('postedBy', 'company email accountType');
 
       logger.info('Shipment updated successfully', { shipmentId: shipment.shipmentId, userId: req.user?.userId });
@@ -220,9 +227,12 @@ export class ShipmentController {
       }
 
       // Delete associated shipment requests
+      const requestBrokerIds = await ShipmentRequest.distinct('brokerId', { shipmentId: id });
       await ShipmentRequest.deleteMany({ shipmentId: id });
 
       await Shipment.deleteOne({ _id: id });
+      void dailyStatsService.recordShipmentDeleted(shipment);
+      dashboardCacheService.invalidateUsers(shipment.postedBy, ...requestBrokerIds);
 
       logger.info('Shipment deleted successfully', { shipmentId: shipment.shipmentId, userId: req.user?.userId });
 
@@ -316,6 +326,7 @@ export class ShipmentController {
       });
 
       await request.save();
+      dashboardCacheService.invalidateUsers(request.brokerId, request.shipperId);
       await request.populate([
         { path: 'shipmentId', select: 'title pickup delivery status shipmentId' },
         { path: 'brokerId', select: 'company email accountType usdotNumber mcNumber' },
@@ -365,6 +376,7 @@ export class ShipmentController {
       }
 
       await request.save();
+      dashboardCacheService.invalidateUsers(request.brokerId, request.shipperId);
       await request.populate([
         { path: 'shipmentId', select: 'title pickup delivery status shipmentId' },
         { path: 'brokerId', select: 'company email accountType usdotNumber mcNumber' },
@@ -1,5 +1,6 @@
 import rateLimit from 'express-rate-limit';
 import { RATE_LIMIT } from '../utils/constants.js';
+import { AuthRequest } from '../types/index.js';
 
 export const apiLimiter = rateLimit({
   windowMs: RATE_LIMIT.WINDOW_MS,
@@ -12,6 +13,15 @@ export const apiLimiter = rateLimit({
   legacyHeaders: false,
 });
 
-
-
-
+// Distance matrices are CPU-bound; limited per authenticated user
+export const distanceMatrixLimiter = rateLimit({
+  windowMs: RATE_LIMIT.DISTANCE_MATRIX_WINDOW_MS,
+  max: RATE_LIMIT.DISTANCE_MATRIX_MAX_REQUESTS,
+  keyGenerator: (req) => (req as AuthRequest).user?.userId ?? req.ip ?? 'anonymous',
+  message: {
+    error: 'Too many distance matrix requests, please try again later.',
+    retryAfter: '1 minute'
+  },
+  standardHeaders: true,
+  legacyHeaders: false,
+});
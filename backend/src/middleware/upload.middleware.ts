@@ -77,6 +77,26 @@ export const uploadAvatar = multer({
   }
 });
 
+// Bulk load imports are parsed in memory and never written to disk
+const loadImportFileFilter = (_req: Request, file: Express.Multer.File, cb: multer.FileFilterCallback) => {
+  const allowedMimes = ['text/csv', 'application/csv', 'application/vnd.ms-excel', 'application/x-ndjson', 'application/json', 'text/plain', 'application/octet-stream'];
+  const allowedExtensions = ['.csv', '.ndjson', '.jsonl'];
+
+  if (allowedMimes.includes(file.mimetype) || allowedExtensions.includes(path.extname(file.originalname).toLowerCase())) {
+    cb(null, true);
+  } else {
+    cb(new Error('Invalid file type. Only CSV and NDJSON files are allowed.'));
+  }
+};
+
+export const uploadLoadImport = multer({
+  storage: multer.memoryStorage(),
+  fileFilter: loadImportFileFilter,
+  limits: {
+    fileSize: 20 * 1024 * 1024 // 20MB
+  }
+});
+
 // Helper function to get full file URL
 export const getFileUrl = (filename: string, type: 'document' | 'avatar'): string => {
   const baseUrl = process.env.API_URL || 'http://localhost:4000';
@@ -0,0 +1,95 @@
+import mongoose, { Document, Schema, Types } from 'mongoose';
+import { ALERTS } from '../utils/constants.js';
+
+// One alert a page of the run is about to send
+export interface PlannedAlert {
+  searchId: Types.ObjectId;
+  searchName: string;
+  userId: Types.ObjectId;
+  // Loads in the email, newest first
+  loadIds: Types.ObjectId[];
+  // Pending-bucket entries to remove once handled (match index path)
+  drainLoadIds: Types.ObjectId[];
+  // Newest load in the alert; becomes the search's watermark once handled (query path)
+  seenThrough?: {
+    createdAt: Date;
+    loadId: Types.ObjectId;
+  };
+}
+
+export interface IAlertRun extends Document {
+  status: 'running' | 'completed';
+  // Instance holding the run; a stale heartbeat lets another instance resume it
+  owner: string;
+  heartbeatAt: Date;
+  // Checkpoint: every search up to this _id has been handled
+  lastSearchId?: Types.ObjectId;
+  // The page being sent; replayed after a crash with the same provider idempotency keys
+  inFlight?: {
+    upTo: Types.ObjectId;
+    alerts: PlannedAlert[];
+    // Search ids in each provider batch, in key order
+    batches: Types.ObjectId[][];
+    // Searches read for the page, counted once it is checkpointed
+    scanned: number;
+  };
+  scanned: number;
+  sent: number;
+  failed: number;
+  startedAt: Date;
+  completedAt?: Date;
+}
+
+/**
+ * Progress of one AlertCronService run, checkpointed page by page so a crash
+ * never skips alerts; a replayed batch is only sent again if its content
+ * changed in between. At most one run is in progress.
+ */
+const alertRunSchema = new Schema<IAlertRun>(
+  {
+    status: { type: String, enum: ['running', 'completed'], default: 'running' },
+    owner: { type: String, required: true },
+    heartbeatAt: { type: Date, default: Date.now },
+    lastSearchId: Schema.Types.ObjectId,
+    inFlight: {
+      type: new Schema(
+        {
+          upTo: { type: Schema.Types.ObjectId, required: true },
+          alerts: [
+            new Schema(
+              {
+                searchId: { type: Schema.Types.ObjectId, required: true },
+                searchName: { type: String, default: '' },
+                userId: { type: Schema.Types.ObjectId, required: true },
+                loadIds: [Schema.Types.ObjectId],
+                drainLoadIds: [Schema.Types.ObjectId],
+                seenThrough: {
+                  type: new Schema({ createdAt: Date, loadId: Schema.Types.ObjectId }, { _id: false }),
+                  default: undefined
+                }
+              },
+              { _id: false }
+            )
+          ],
+          batches: [[Schema.Types.ObjectId]],
+          scanned: { type: Number, default: 0 }
+        },
+        { _id: false }
+      ),
+      default: undefined
+    },
+    scanned: { type: Number, default: 0 },
+    sent: { type: Number, default: 0 },
+    failed: { type: Number, default: 0 },
+    startedAt: { type: Date, default: Date.now },
+    completedAt: Date
+  },
+  {
+    versionKey: false
+  }
+);
+
+alertRunSchema.index({ status: 1 }, { unique: true, partialFilterExpression: { status: 'running' } });
+alertRunSchema.index({ completedAt: 1 }, { expireAfterSeconds: ALERTS.RUN_RETENTION_DAYS * 24 * 60 * 60 });
+
+export const AlertRun = mongoose.model<IAlertRun>('AlertRun', alertRunSchema);
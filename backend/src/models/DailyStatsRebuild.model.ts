@@ -0,0 +1,35 @@
+import mongoose, { Document, Schema } from 'mongoose';
+import { DAILY_STATS } from '../utils/constants.js';
+
+export interface IDailyStatsRebuild extends Document {
+  // UTC day of the nightly run; one document (and one rebuilding instance) per night
+  night: Date;
+  owner: string;
+  startedAt: Date;
+  completedAt?: Date;
+  removed?: number;
+  recomputed?: number;
+}
+
+/**
+ * Lease for dailyStats.service's nightly rebuild: the instance that inserts the
+ * night's document runs it, the others skip. A run that dies is not resumed;
+ * the next night's rebuild covers the same window.
+ */
+const dailyStatsRebuildSchema = new Schema<IDailyStatsRebuild>(
+  {
+    night: { type: Date, required: true },
+    owner: { type: String, required: true },
+    startedAt: { type: Date, default: Date.now },
+    completedAt: Date,
+    removed: Number,
+    recomputed: Number
+  },
+  {
+    versionKey: false
+  }
+);
+
+dailyStatsRebuildSchema.index({ night: 1 }, { unique: true, expireAfterSeconds: DAILY_STATS.RUN_RETENTION_DAYS * 24 * 60 * 60 });
+
+export const DailyStatsRebuild = mongoose.model<IDailyStatsRebuild>('DailyStatsRebuild', dailyStatsRebuildSchema);
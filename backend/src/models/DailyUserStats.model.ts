@@ -0,0 +1,52 @@
+import mongoose, { Document, Schema, Types } from 'mongoose';
+
+export type DailyStatsRole = 'carrier' | 'broker' | 'shipper';
+
+export interface IDailyUserStats extends Document {
+  userId: Types.ObjectId;
+  role: DailyStatsRole;
+  day: Date;
+  count: number;
+  statusCounts: Record<string, number>;
+  revenue: number;
+  miles: number;
+  equipment: Record<string, number>;
+  rebuiltAt?: Date;
+  touchedAt?: Date;
+}
+
+/**
+ * Per-user, per-UTC-day rollup of the loads a carrier booked, the loads a broker
+ * posted or the shipments a shipper posted, keyed by the document's createdAt day.
+ * Kept current by dailyStats.service and repaired by its nightly rebuild.
+ */
+const dailyUserStatsSchema = new Schema<IDailyUserStats>(
+  {
+    userId: { type: Schema.Types.ObjectId, ref: 'User', required: true },
+    role: { type: String, enum: ['carrier', 'broker', 'shipper'], required: true },
+    // UTC midnight of the day
+    day: { type: Date, required: true },
+    count: { type: Number, default: 0 },
+    // Documents per current status (loads: available/booked/...; shipments: open/closed)
+    statusCounts: { type: Schema.Types.Mixed, default: {} },
+    // Sum of rate over booked, in-transit and delivered loads
+    revenue: { type: Number, default: 0 },
+    // Sum of distance over non-cancelled loads
+    miles: { type: Number, default: 0 },
+    // Non-cancelled loads per equipment type
+    equipment: { type: Schema.Types.Mixed, default: {} },
+    // Start of the rebuild that last wrote the day
+    rebuiltAt: Date,
+    // Last incremental delta; a rebuild keeps days touched after it started
+    touchedAt: Date
+  },
+  {
+    minimize: false
+  }
+);
+
+// One document per user, role and day; also the $merge key of the rebuild
+dailyUserStatsSchema.index({ userId: 1, role: 1, day: 1 }, { unique: true });
+dailyUserStatsSchema.index({ day: 1 });
+
+export const DailyUserStats = mongoose.model<IDailyUserStats>('DailyUserStats', dailyUserStatsSchema);
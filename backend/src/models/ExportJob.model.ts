@@ -0,0 +1,80 @@
+import mongoose, { Document, Schema, Types } from 'mongoose';
+import type { ExportCollection } from '../services/export.service.js';
+
+export type ExportJobFormat = 'csv' | 'ndjson';
+export type ExportJobStatus = 'queued' | 'running' | 'completed' | 'failed';
+
+export interface IExportJob extends Document {
+  collectionName: ExportCollection;
+  format: ExportJobFormat;
+  filters: {
+    from?: Date;
+    to?: Date;
+    status?: string[];
+  };
+  status: ExportJobStatus;
+  requestedBy: Types.ObjectId;
+  // countDocuments at submission; the collection may change while the job runs
+  total: number;
+  processed: number;
+  // Parts are written in _id order; a resumed job continues after lastId
+  chunksCompleted: number;
+  lastId?: Types.ObjectId;
+  // CSV columns, fixed by the first part so later parts line up
+  fields: string[];
+  attempts: number;
+  error?: string;
+  // Worker holding the job and its last progress; stale heartbeats are reclaimed
+  lockedBy?: string;
+  heartbeatAt?: Date;
+  runAfter: Date;
+  fileSize?: number;
+  startedAt?: Date;
+  completedAt?: Date;
+  expiresAt?: Date;
+  createdAt: Date;
+  updatedAt: Date;
+}
+
+/**
+ * Background admin export, processed by exportJob.service in _id-range chunks
+ * written as gzip parts and concatenated into one file when done.
+ */
+const exportJobSchema = new Schema<IExportJob>(
+  {
+    collectionName: { type: String, enum: ['users', 'loads', 'shipments', 'messages'], required: true },
+    format: { type: String, enum: ['csv', 'ndjson'], required: true },
+    filters: {
+      from: Date,
+      to: Date,
+      status: { type: [String], default: undefined }
+    },
+    status: { type: String, enum: ['queued', 'running', 'completed', 'failed'], default: 'queued' },
+    requestedBy: { type: Schema.Types.ObjectId, ref: 'User', required: true },
+    total: { type: Number, default: 0 },
+    processed: { type: Number, default: 0 },
+    chunksCompleted: { type: Number, default: 0 },
+    lastId: Schema.Types.ObjectId,
+    fields: { type: [String], default: [] },
+    attempts: { type: Number, default: 0 },
+    error: String,
+    lockedBy: String,
+    heartbeatAt: Date,
+    runAfter: { type: Date, default: Date.now },
+    fileSize: Number,
+    startedAt: Date,
+    completedAt: Date,
+    expiresAt: Date
+  },
+  {
+    timestamps: true
+  }
+);
+
+// Worker claims: oldest runnable job first
+exportJobSchema.index({ status: 1, runAfter: 1, createdAt: 1 });
+exportJobSchema.index({ createdAt: -1 });
+// Cleanup removes the file with the document, so this is not a TTL index
+exportJobSchema.index({ expiresAt: 1 }, { sparse: true });
+
+export const ExportJob = mongoose.model<IExportJob>('ExportJob', exportJobSchema);
@@ -0,0 +1,41 @@
+import mongoose, { Document, Schema } from 'mongoose';
+
+export interface IGeocodeCache extends Document {
+  key: string;
+  found: boolean;
+  latitude?: number;
+  longitude?: number;
+  expiresAt: Date;
+  createdAt: Date;
+  updatedAt: Date;
+}
+
+const geocodeCacheSchema = new Schema<IGeocodeCache>(
+  {
+    // Normalized "city|state|zip|country" address key
+    key: {
+      type: String,
+      required: true,
+      unique: true
+    },
+    // false for cached misses (address not found by the provider)
+    found: {
+      type: Boolean,
+      required: true
+    },
+    latitude: Number,
+    longitude: Number,
+    expiresAt: {
+      type: Date,
+      required: true
+    }
+  },
+  {
+    timestamps: true
+  }
+);
+
+// MongoDB removes entries once expiresAt has passed
+geocodeCacheSchema.index({ expiresAt: 1 }, { expireAfterSeconds: 0 });
+
+export const GeocodeCache = mongoose.model<IGeocodeCache>('GeocodeCache', geocodeCacheSchema);
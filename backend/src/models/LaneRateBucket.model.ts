@@ -0,0 +1,57 @@
+import mongoose, { Document, Schema } from 'mongoose';
+import type { SerializedDigest } from '../utils/tdigest.js';
+
+// Bucket rows with this equipment value cover every equipment type on the lane
+export const ALL_EQUIPMENT = '*';
+
+export interface ILaneRateBucket extends Document {
+  origin: string;
+  destination: string;
+  equipment: string;
+  // Monday 00:00 UTC of the booking week
+  weekStart: Date;
+  count: number;
+  // Sum of rate per mile, for the mean
+  sum: number;
+  digest: SerializedDigest;
+  // Optimistic concurrency counter for digest merges
+  version: number;
+  rebuiltAt?: Date;
+  updatedAt: Date;
+}
+
+/**
+ * Rate-per-mile t-digest of the loads booked on one lane (origin state →
+ * destination state, per equipment type and for all equipment) in one week.
+ * Written by laneRate.service as loads are booked and by its backfill.
+ */
+const laneRateBucketSchema = new Schema<ILaneRateBucket>(
+  {
+    origin: { type: String, required: true },
+    destination: { type: String, required: true },
+    equipment: { type: String, required: true },
+    weekStart: { type: Date, required: true },
+    count: { type: Number, default: 0 },
+    sum: { type: Number, default: 0 },
+    digest: {
+      means: { type: [Number], default: [] },
+      weights: { type: [Number], default: [] },
+      min: { type: Number, default: 0 },
+      max: { type: Number, default: 0 }
+    },
+    version: { type: Number, default: 0 },
+    rebuiltAt: Date,
+    updatedAt: { type: Date, default: Date.now }
+  },
+  {
+    versionKey: false
+  }
+);
+
+// One bucket per lane and week; the prefix also orders the quote refresh scan by lane
+laneRateBucketSchema.index({ origin: 1, destination: 1, equipment: 1, weekStart: 1 }, { unique: true });
+laneRateBucketSchema.index({ weekStart: 1 });
+// Polled by every instance for buckets changed since its last look
+laneRateBucketSchema.index({ updatedAt: 1 });
+
+export const LaneRateBucket = mongoose.model<ILaneRateBucket>('LaneRateBucket', laneRateBucketSchema);
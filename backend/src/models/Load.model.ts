@@ -1,5 +1,19 @@
 import mongoose, { Schema, Model } from 'mongoose';
 import { ILoad } from '../types/index.js';
+import { toGeoPoint } from '../utils/geo.js';
+
+// GeoJSON point ([lng, lat]) mirrored from the lat/lng coordinates for 2dsphere queries
+const pointSchema = new Schema({
+  type: { type: String, enum: ['Point'], required: true },
+  coordinates: { type: [Number], required: true }
+}, { _id: false });
+
+// Denormalized snapshot of the posting/booking user, kept in sync by partySummary.service
+const partySummarySchema = new Schema({
+  company: { type: String },
+  email: { type: String },
+  accountType: { type: String }
+}, { _id: false });
 
 const loadSchema = new Schema<ILoad>({
   title: { type: String, required: true },
@@ -24,6 +38,8 @@ const loadSchema = new Schema<ILoad>({
       lng: { type: Number }
     }
   },
+  originPoint: { type: pointSchema, default: undefined },
+  destinationPoint: { type: pointSchema, default: undefined },
   pickupDate: { type: Date, required: true },
   deliveryDate: { type: Date, required: true },
   equipmentType: { type: String, required: true },
@@ -42,6 +58,8 @@ const loadSchema = new Schema<ILoad>({
   // Relationships
   postedBy: { type: Schema.Types.ObjectId, ref: 'User', required: true },
   bookedBy: { type: Schema.Types.ObjectId, ref: 'User' },
+  postedBySummary: { type: partySummarySchema, default: undefined },
+  bookedBySummary: { type: partySummarySchema, default: undefined },
   shipment: { type: Schema.Types.ObjectId, ref: 'Shipment' },
   agreedRate: { type: Number },
   bookedAt: { type: Date },
@@ -63,15 +81,48 @@ loadSchema.index({ bookedBy: 1, status: 1 }); // For carrier's booked loads
 loadSchema.index({ 'origin.state': 1, 'destination.state': 1 }); // For route filtering
 loadSchema.index({ equipmentType: 1, status: 1 }); // For equipment type filtering
 loadSchema.index({ createdAt: -1 }); // For recent loads
+loadSchema.index({ status: 1, createdAt: -1, _id: -1 }); // For keyset (cursor) pagination of the load board
+loadSchema.index({ status: 1, equipmentType: 1, createdAt: -1, _id: -1 }); // For saved-search alerts: loads past a search's watermark, newest first
+loadSchema.index({ bookedBy: 1, createdAt: 1, status: 1, rate: 1 }); // Covers carrier revenue/load time series
+loadSchema.index({ postedBy: 1, createdAt: 1 }); // Covers broker posted-loads time series
+loadSchema.index({ shipment: 1 }); // For the shipper dashboard spend $lookup
+
+// Geospatial indexes for radius (deadhead) queries
+loadSchema.index({ originPoint: '2dsphere', status: 1 });
+loadSchema.index({ destinationPoint: '2dsphere' });
 
-// Geospatial indexes for map queries
-loadSchema.index({ 'origin.coordinates.lat': 1, 'origin.coordinates.lng': 1 }); // 2dsphere not supported, use 2d compound
-loadSchema.index({ 'destination.coordinates.lat': 1, 'destination.coordinates.lng': 1 });
+// Keep GeoJSON points in sync with lat/lng coordinates (runs for save and insertMany)
+loadSchema.pre('validate', function (next) {
+  this.originPoint = toGeoPoint(this.origin?.coordinates);
+  this.destinationPoint = toGeoPoint(this.destination?.coordinates);
+  next();
+});
 
-// Full-text search index for search optimization
-loadSchema.index({ title: 'text', description: 'text' }, { weights: { title: 10, description: 5 } });
-loadSchema.index({ 'origin.city': 'text', 'origin.state': 'text' });
-loadSchema.index({ 'destination.city': 'text', 'destination.state': 'text' });
+// Full-text search: MongoDB allows a single text index per collection, so every
+// searchable field lives in one weighted index (weights mirror loadTextSearch.service.ts)
+loadSchema.index(
+  {
+    title: 'text',
+    description: 'text',
+    'origin.city': 'text',
+    'origin.state': 'text',
+    'destination.city': 'text',
+    'destination.state': 'text',
+    equipmentType: 'text'
+  },
+  {
+    name: 'load_text_search',
+    weights: {
+      title: 10,
+      'origin.city': 6,
+      'destination.city': 6,
+      equipmentType: 4,
+      'origin.state': 3,
+      'destination.state': 3,
+      description: 2
+    }
+  }
+);
 
 export const Load: Model<ILoad> = mongoose.model<ILoad>('Load', loadSchema);
 
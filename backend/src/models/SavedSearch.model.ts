@@ -18,6 +18,13 @@ export interface ISavedSearch {
   alertEnabled: boolean;
   frequency: 'instant' | 'daily' | 'weekly';
   lastAlertSent?: Date;
+  // Loads matched at post time (newest ALERTS.MAX_LOADS_PER_ALERT), drained by the alert schedulers
+  pendingLoads: mongoose.Types.ObjectId[];
+  // Set while pendingLoads is non-empty
+  pendingSince?: Date;
+  // Newest load already considered for alerts (query path); later runs only read loads created after it
+  lastSeenLoadAt?: Date;
+  lastSeenLoadId?: mongoose.Types.ObjectId;
   createdAt: Date;
 }
 
@@ -39,12 +46,17 @@ const savedSearchSchema = new Schema<ISavedSearch>({
   alertEnabled: { type: Boolean, default: true },
   frequency: { type: String, enum: ['instant', 'daily', 'weekly'], default: 'instant' },
   lastAlertSent: { type: Date },
+  pendingLoads: [{ type: Schema.Types.ObjectId, ref: 'Load' }],
+  pendingSince: { type: Date },
+  lastSeenLoadAt: { type: Date },
+  lastSeenLoadId: { type: Schema.Types.ObjectId },
   createdAt: { type: Date, default: Date.now }
 });
 
 // Indexes
 savedSearchSchema.index({ userId: 1, createdAt: -1 });
 savedSearchSchema.index({ alertEnabled: 1, frequency: 1, lastAlertSent: 1 });
+savedSearchSchema.index({ pendingSince: 1 }, { sparse: true }); // Searches with pending matches
 
 export const SavedSearch: Model<ISavedSearch> = mongoose.model<ISavedSearch>('SavedSearch', savedSearchSchema);
 
@@ -25,6 +25,7 @@ const shipmentSchema = new Schema<IShipment>({
 shipmentSchema.index({ postedBy: 1, status: 1 }); // For shipper's shipments
 shipmentSchema.index({ status: 1, createdAt: -1 }); // For filtering shipments
 shipmentSchema.index({ createdAt: -1 }); // For recent shipments
+shipmentSchema.index({ postedBy: 1, createdAt: 1 }); // Covers shipper shipments time series
 
 const shipmentRequestSchema = new Schema<IShipmentRequest>({
   shipmentId: { type: Schema.Types.ObjectId, ref: 'Shipment', required: true },
@@ -0,0 +1,72 @@
+import mongoose, { Document, Schema } from 'mongoose';
+import { SYSTEM_STATS } from '../utils/constants.js';
+
+export interface SystemStats {
+  users: {
+    total: number;
+    active: number;
+    admin: number;
+    carriers: number;
+    brokers: number;
+    shippers: number;
+  };
+  loads: {
+    total: number;
+    open: number;
+    booked: number;
+    inTransit: number;
+    delivered: number;
+    readyForBilling: number;
+  };
+  shipments: {
+    total: number;
+    open: number;
+  };
+  messages: {
+    total: number;
+  };
+  documents: {
+    total: number;
+    verified: number;
+    pending: number;
+    verificationRate: number;
+  };
+  analytics: {
+    conversionRate: number;
+    activeLaneCount: number;
+    averageHoursToBook: number;
+    readyForBilling: number;
+  };
+}
+
+export interface ISystemStatsSnapshot extends SystemStats, Document {
+  // Start of the snapshot interval; one document per interval across instances
+  takenAt: Date;
+  durationMs: number;
+}
+
+const counts = (fields: string[]) => Object.fromEntries(fields.map(field => [field, { type: Number, default: 0 }]));
+
+/**
+ * Admin console statistics computed in the background by systemStats.service,
+ * kept for SYSTEM_STATS.RETENTION_DAYS so the console can chart history.
+ */
+const systemStatsSnapshotSchema = new Schema<ISystemStatsSnapshot>(
+  {
+    takenAt: { type: Date, required: true },
+    users: counts(['total', 'active', 'admin', 'carriers', 'brokers', 'shippers']),
+    loads: counts(['total', 'open', 'booked', 'inTransit', 'delivered', 'readyForBilling']),
+    shipments: counts(['total', 'open']),
+    messages: counts(['total']),
+    documents: counts(['total', 'verified', 'pending', 'verificationRate']),
+    analytics: counts(['conversionRate', 'activeLaneCount', 'averageHoursToBook', 'readyForBilling']),
+    durationMs: { type: Number, default: 0 }
+  },
+  {
+    versionKey: false
+  }
+);
+
+systemStatsSnapshotSchema.index({ takenAt: 1 }, { unique: true, expireAfterSeconds: SYSTEM_STATS.RETENTION_DAYS * 24 * 60 * 60 });
+
+export const SystemStatsSnapshot = mongoose.model<ISystemStatsSnapshot>('SystemStatsSnapshot', systemStatsSnapshotSchema);
@@ -17,7 +17,19 @@ router.delete('/users/:id', adminController.deleteUser.bind(adminController));
 router.get('/export/users', adminController.exportAllData.bind(adminController));
 router.get('/export/loads', adminController.exportLoads.bind(adminController));
 router.get('/export/shipments', adminController.exportShipments.bind(adminController));
+router.get('/export/messages', adminController.exportMessages.bind(adminController));
+router.post('/export-jobs', adminController.createExportJob.bind(adminController));
+router.get('/export-jobs', adminController.getExportJobs.bind(adminController));
+router.get('/export-jobs/:id', adminController.getExportJob.bind(adminController));
+router.post('/export-jobs/:id/resume', adminController.resumeExportJob.bind(adminController));
+router.get('/export-jobs/:id/download', adminController.downloadExportJob.bind(adminController));
+router.delete('/export-jobs/:id', adminController.deleteExportJob.bind(adminController));
 router.get('/system-stats', adminController.getSystemStats.bind(adminController));
+router.get('/system-stats/history', adminController.getSystemStatsHistory.bind(adminController));
+router.get('/load-index/stats', adminController.getLoadIndexStats.bind(adminController));
+router.get('/geocoding/stats', adminController.getGeocodingStats.bind(adminController));
+router.get('/search-cache/stats', adminController.getSearchCacheStats.bind(adminController));
+router.get('/dashboard-cache/stats', adminController.getDashboardCacheStats.bind(adminController));
 router.get('/audit-logs', adminController.getAuditLogs.bind(adminController));
 router.delete('/audit-logs/purge/:days', adminController.purgeAuditLogs.bind(adminController));
 
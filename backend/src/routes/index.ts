@@ -17,6 +17,7 @@ import sessionRoutes from './session.routes.js';
 import adminRoutes from './admin.routes.js';
 import friendRoutes from './friend.routes.js';
 import billingRoutes from './billing.routes.js';
+import laneRateRoutes from './laneRate.routes.js';
 
 const router = Router();
 
@@ -43,6 +44,7 @@ router.use('/messages', messageRoutes);
 router.use('/support', supportRoutes);
 router.use('/documents', documentRoutes);
 router.use('/billing', billingRoutes);
+router.use('/lane-rates', laneRateRoutes);
 router.use('/push', pushRoutes);
 router.use('/locations', locationRoutes);
 router.use('/searches', savedSearchRoutes);
@@ -0,0 +1,16 @@
+import { Router } from 'express';
+import { laneRateController } from '../controllers/laneRate.controller.js';
+import { authenticateToken } from '../middleware/auth.middleware.js';
+
+const router = Router();
+
+router.use(authenticateToken);
+
+/**
+ * @route   GET /api/lane-rates/quote
+ * @desc    Rate-per-mile p25/p50/p75 and weekly volume for a lane (optional equipment)
+ * @access  Private
+ */
+router.get('/quote', laneRateController.getQuote.bind(laneRateController));
+
+export default router;
@@ -3,6 +3,7 @@ import { loadController } from '../controllers/load.controller.js';
 import { authenticateToken } from '../middleware/auth.middleware.js';
 import { requireBrokerOrCarrier, requireBroker, requireCarrier } from '../middleware/authorization.middleware.js';
 import { asyncHandler } from '../middleware/error.middleware.js';
+import { uploadLoadImport } from '../middleware/upload.middleware.js';
 
 const router = Router();
 
@@ -15,6 +16,9 @@ router.get('/', requireBrokerOrCarrier, asyncHandler(loadController.getLoads.bin
 // POST /api/loads - Post new load (brokers only)
 router.post('/', requireBroker, asyncHandler(loadController.postLoad.bind(loadController)));
 
+// POST /api/loads/import - Bulk import loads from a CSV/NDJSON upload or JSON array (brokers only)
+router.post('/import', requireBroker, uploadLoadImport.single('file'), asyncHandler(loadController.importLoads.bind(loadController)));
+
 // POST /api/loads/:id/book - Book a load (carriers only)
 router.post('/:id/book', requireCarrier, asyncHandler(loadController.bookLoad.bind(loadController)));
 
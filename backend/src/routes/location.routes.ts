@@ -1,5 +1,7 @@
 import { Router } from 'express';
 import { locationController } from '../controllers/location.controller.js';
+import { authenticateToken } from '../middleware/auth.middleware.js';
+import { distanceMatrixLimiter } from '../middleware/rateLimit.middleware.js';
 
 const router = Router();
 
@@ -24,5 +26,12 @@ router.get('/reverse', locationController.reverseGeocode.bind(locationController
  */
 router.post('/distance', locationController.calculateDistance.bind(locationController));
 
+/**
+ * @route   POST /api/locations/distance-matrix
+ * @desc    Distances from many origins to many destinations (optional top-k, NDJSON streaming)
+ * @access  Private (rate limited per user)
+ */
+router.post('/distance-matrix', authenticateToken, distanceMatrixLimiter, locationController.distanceMatrix.bind(locationController));
+
 export default router;
 
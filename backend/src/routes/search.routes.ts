@@ -14,6 +14,10 @@ router.post('/loads', asyncHandler(searchController.searchLoads.bind(searchContr
 // GET /api/search/loads - Also support GET for backward compatibility
 router.get('/loads', asyncHandler(searchController.searchLoads.bind(searchController)));
 
+// GET|POST /api/search/nearby - Radius (deadhead) search around a point
+router.get('/nearby', asyncHandler(searchController.searchNearby.bind(searchController)));
+router.post('/nearby', asyncHandler(searchController.searchNearby.bind(searchController)));
+
 // GET /api/search/autocomplete - Autocomplete suggestions
 router.get('/autocomplete', asyncHandler(searchController.autocomplete.bind(searchController)));
 
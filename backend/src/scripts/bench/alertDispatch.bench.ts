@@ -0,0 +1,117 @@
+import { Types } from 'mongoose';
+import { SavedSearch } from '../../models/SavedSearch.model.js';
+import { User } from '../../models/User.model.js';
+import { AlertRun } from '../../models/AlertRun.model.js';
+import { AlertBatchSender, alertCronService } from '../../services/alertCron.service.js';
+import { EmailMessage } from '../../services/email.service.js';
+import { cities, equipmentTypes } from '../seedLoads.js';
+import { logger } from '../../utils/logger.js';
+import { connectBenchDatabase, disconnectBenchDatabase, getBenchSize, seedBenchLoads } from './benchUtils.js';
+
+/**
+ * Saved-search alert dispatch: one full alert run over BENCH_ALERT_SEARCHES
+ * due searches (default 100000) at each concurrency in BENCH_CONCURRENCY
+ * (default "1,8,32"). Emails go to a stub provider that waits
+ * BENCH_EMAIL_LATENCY_MS (default 150) per batch call, so no mail is sent.
+ * Usage: npm run bench:alert-dispatch  (BENCH_LOADS=50000 by default)
+ */
+
+const INSERT_BATCH_SIZE = 10000;
+const USERS = 1000;
+
+function buildSearch(i: number, users: Types.ObjectId[]): Record<string, unknown> {
+  const origin = cities[(i * 7) % cities.length];
+  const destination = cities[(i * 13 + 5) % cities.length];
+  return {
+    userId: users[i % users.length],
+    name: `Bench search ${i}`,
+    filters: {
+      equipment: i % 3 === 0 ? [] : [equipmentTypes[i % equipmentTypes.length]],
+      priceMin: i % 4 === 0 ? 1000 + (i % 2000) : undefined,
+      originState: i % 2 === 0 ? origin.state : undefined,
+      destinationState: i % 5 === 0 ? destination.state : undefined
+    },
+    alertEnabled: true,
+    frequency: i % 10 === 0 ? 'weekly' : i % 3 === 0 ? 'daily' : 'instant',
+    pendingLoads: [],
+    createdAt: new Date()
+  };
+}
+
+/**
+ * Seed searches (and their users) up to `count`, reusing an existing corpus of that size
+ */
+async function seedSearches(count: number): Promise<void> {
+  if (await SavedSearch.estimatedDocumentCount() === count) {
+    logger.info('Reusing seeded benchmark searches', { count });
+    return;
+  }
+
+  await Promise.all([SavedSearch.deleteMany({}), User.deleteMany({})]);
+  const users = Array.from({ length: USERS }, () => new Types.ObjectId());
+  await User.collection.insertMany(users.map((_id, i) => ({ _id, email: `bench-${i}@example.com`, company: `Bench Carrier ${i}` })));
+
+  for (let start = 0; start < count; start += INSERT_BATCH_SIZE) {
+    const end = Math.min(start + INSERT_BATCH_SIZE, count);
+    const batch = [];
+    for (let i = start; i < end; i++) {
+      batch.push(buildSearch(i, users));
+    }
+    await SavedSearch.collection.insertMany(batch, { ordered: false });
+  }
+  await SavedSearch.createIndexes();
+  logger.info('Seeded benchmark searches', { count });
+}
+
+const sleep = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+async function run(): Promise<void> {
+  const searches = parseInt(process.env.BENCH_ALERT_SEARCHES || '', 10) || 100000;
+  const latencyMs = parseInt(process.env.BENCH_EMAIL_LATENCY_MS || '', 10) || 150;
+  const concurrencies = (process.env.BENCH_CONCURRENCY || '1,8,32')
+    .split(',')
+    .map(value => parseInt(value, 10))
+    .filter(value => value > 0);
+
+  await connectBenchDatabase();
+  await seedBenchLoads(getBenchSize(50000));
+  await seedSearches(searches);
+  await AlertRun.createIndexes();
+
+  let emails = 0;
+  const sender: AlertBatchSender = async (messages: EmailMessage[]) => {
+    await sleep(latencyMs);
+    emails += messages.length;
+    return true;
+  };
+
+  const results = [];
+  for (const concurrency of concurrencies) {
+    // Every search due again with no watermark, no run to resume
+    await SavedSearch.updateMany({}, { $unset: { lastAlertSent: 1, lastSeenLoadAt: 1, lastSeenLoadId: 1 } });
+    await AlertRun.deleteMany({});
+    emails = 0;
+
+    const summary = await alertCronService.run({ concurrency, sender });
+    results.push({
+      concurrency,
+      scanned: summary.scanned,
+      sent: summary.sent,
+      emails,
+      providerCalls: summary.providerCalls,
+      durationMs: summary.durationMs,
+      searchesPerSec: Math.round(summary.scanned / (summary.durationMs / 1000))
+    });
+  }
+
+  console.log(`\nAlert dispatch (${searches} searches, ${latencyMs}ms per provider call)`);
+  console.table(results);
+
+  await disconnectBenchDatabase();
+}
+
+run().catch(async (error) => {
+  console.error('Alert dispatch benchmark failed', error);
+  await disconnectBenchDatabase();
+  process.exit(1);
+});
@@ -0,0 +1,118 @@
+import { Types } from 'mongoose';
+import { Load } from '../../models/Load.model.js';
+import { analyticsService } from '../../services/analytics.service.js';
+import { buildBenchLoad, connectBenchDatabase, disconnectBenchDatabase, getBenchSize, measure, printResults } from './benchUtils.js';
+
+/**
+ * Carrier dashboard time series: the previous find() + JS bucketing vs the
+ * $match/$group($dateTrunc) pipeline. Seeds one carrier with BENCH_LOADS booked
+ * loads over 30 days and removes them afterwards.
+ * Usage: npm run bench:analytics  (BENCH_LOADS=50000 by default)
+ */
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const RUNS = 10;
+const DAYS = 30;
+const CARRIER_ID = new Types.ObjectId('00000000000000000000be01');
+
+async function seedCarrierLoads(count: number): Promise<void> {
+  await Load.deleteMany({ bookedBy: CARRIER_ID });
+  const brokers = Array.from({ length: 20 }, () => new Types.ObjectId());
+  const now = Date.now();
+
+  for (let start = 0; start < count; start += 10000) {
+    const batch = [];
+    for (let i = start; i < Math.min(start + 10000, count); i++) {
+      const createdAt = new Date(now - ((i * 7919) % (DAYS * DAY_MS / 1000)) * 1000);
+      batch.push({
+        ...buildBenchLoad(i, brokers, now),
+        status: i % 4 === 0 ? 'delivered' : 'booked',
+        bookedBy: CARRIER_ID,
+        createdAt,
+        updatedAt: createdAt
+      });
+    }
+    await Load.collection.insertMany(batch, { ordered: false });
+  }
+  await Load.createIndexes();
+}
+
+// Previous implementation, kept here as the baseline
+async function legacyRevenueTimeSeries(carrierId: string, days: number) {
+  const startDate = new Date();
+  startDate.setDate(startDate.getDate() - days);
+
+  const loads = await Load.find({
+    bookedBy: carrierId,
+    status: { $nin: ['available', 'cancelled'] },
+    createdAt: { $gte: startDate }
+  }).sort({ createdAt: 1 });
+
+  const dataMap = new Map<string, number>();
+  loads.forEach(load => {
+    const date = new Date(load.createdAt).toISOString().split('T')[0];
+    dataMap.set(date, (dataMap.get(date) || 0) + (load.rate || 0));
+  });
+
+  const result = [];
+  const today = new Date();
+  for (let i = days - 1; i >= 0; i--) {
+    const date = new Date(today);
+    date.setDate(date.getDate() - i);
+    const dateStr = date.toISOString().split('T')[0];
+    result.push({ date: dateStr, value: dataMap.get(dateStr) || 0, count: 0 });
+  }
+  return { result, documents: loads.length };
+}
+
+async function heapDeltaMb(fn: () => Promise<unknown>): Promise<number> {
+  (global as any).gc?.();
+  const before = process.memoryUsage().heapUsed;
+  await fn();
+  const after = process.memoryUsage().heapUsed;
+  return Math.round(((after - before) / 1024 / 1024) * 10) / 10;
+}
+
+async function run(): Promise<void> {
+  const size = getBenchSize(50_000);
+  const carrierId = CARRIER_ID.toString();
+  await connectBenchDatabase();
+  await seedCarrierLoads(size);
+
+  const legacy = await legacyRevenueTimeSeries(carrierId, DAYS);
+  const pipeline = await analyticsService.getCarrierRevenueTimeSeries(carrierId, DAYS);
+  const legacyTotal = legacy.result.reduce((sum, point) => sum + point.value, 0);
+  const pipelineTotal = pipeline.reduce((sum, point) => sum + point.value, 0);
+
+  const results = [
+    await measure('legacy find + JS buckets', RUNS, () => legacyRevenueTimeSeries(carrierId, DAYS)),
+    await measure('$group by $dateTrunc (UTC)', RUNS, () => analyticsService.getCarrierRevenueTimeSeries(carrierId, DAYS)),
+    await measure('$group by $dateTrunc (America/Chicago)', RUNS, () => analyticsService.getCarrierRevenueTimeSeries(carrierId, DAYS, 'America/Chicago'))
+  ];
+  printResults(`Carrier revenue time series, ${size.toLocaleString()} booked loads`, results);
+
+  console.log('\nData moved and heap growth per call (run with --expose-gc for stable numbers)');
+  console.table([
+    {
+      variant: 'legacy',
+      rowsReturned: legacy.documents,
+      heapDeltaMb: await heapDeltaMb(() => legacyRevenueTimeSeries(carrierId, DAYS)),
+      revenueTotal: legacyTotal
+    },
+    {
+      variant: 'pipeline',
+      rowsReturned: pipeline.filter(point => (point.count ?? 0) > 0).length,
+      heapDeltaMb: await heapDeltaMb(() => analyticsService.getCarrierRevenueTimeSeries(carrierId, DAYS)),
+      revenueTotal: pipelineTotal
+    }
+  ]);
+
+  await Load.deleteMany({ bookedBy: CARRIER_ID });
+  await disconnectBenchDatabase();
+}
+
+run().catch(async (error) => {
+  console.error('Analytics time series benchmark failed', error);
+  await disconnectBenchDatabase();
+  process.exit(1);
+});
@@ -0,0 +1,43 @@
+import { searchService } from '../../services/search.service.js';
+import { autocompleteService } from '../../services/autocomplete.service.js';
+import { connectBenchDatabase, disconnectBenchDatabase, getBenchSize, measure, printResults, seedBenchLoads, BenchResult } from './benchUtils.js';
+
+/**
+ * Regex aggregation vs in-memory prefix index for city/state autocomplete.
+ * Usage: npm run bench:autocomplete  (BENCH_LOADS=200000 by default)
+ */
+
+const PREFIXES = ['Da', 'San', 'Chi', 'New Y', 'Hou', 'Po', 'Mi', 'Col'];
+const RUNS = 20;
+
+async function run(): Promise<void> {
+  const size = getBenchSize(200_000);
+  await connectBenchDatabase();
+  await seedBenchLoads(size);
+
+  const results: BenchResult[] = [];
+
+  // The search service falls back to the regex aggregation until the index is built
+  for (const prefix of PREFIXES) {
+    results.push(await measure(`regex aggregation "${prefix}"`, RUNS, () =>
+      searchService.autocompleteCityState(prefix, 'origin', 10)
+    ));
+  }
+
+  await autocompleteService.start();
+
+  for (const prefix of PREFIXES) {
+    results.push(await measure(`prefix index "${prefix}"`, RUNS * 50, () =>
+      autocompleteService.complete(prefix, 'origin', 10)
+    ));
+  }
+
+  printResults(`City/state autocomplete, ${size.toLocaleString()} loads`, results);
+  await disconnectBenchDatabase();
+}
+
+run().catch(async (error) => {
+  console.error('Autocomplete benchmark failed', error);
+  await disconnectBenchDatabase();
+  process.exit(1);
+});
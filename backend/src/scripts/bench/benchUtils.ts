@@ -0,0 +1,172 @@
+import mongoose, { Types } from 'mongoose';
+import { performance } from 'perf_hooks';
+import { config } from '../../config/environment.js';
+import { Load } from '../../models/Load.model.js';
+import { cities, equipmentTypes } from '../seedLoads.js';
+import { logger } from '../../utils/logger.js';
+import { toGeoPoint } from '../../utils/geo.js';
+
+/**
+ * Shared helpers for the benchmark scripts in this folder.
+ * Benchmarks run against a dedicated database (BENCH_DB_NAME, default
+ * "cargolume_bench") so they never touch application data.
+ */
+
+export interface BenchResult {
+  label: string;
+  runs: number;
+  meanMs: number;
+  p50Ms: number;
+  p95Ms: number;
+  minMs: number;
+}
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const INSERT_BATCH_SIZE = 10000;
+
+export async function connectBenchDatabase(): Promise<void> {
+  const uri = (process.env.BENCH_MONGODB_URI || config.MONGODB_URI || 'mongodb://127.0.0.1:27017').trim();
+  const dbName = process.env.BENCH_DB_NAME || 'cargolume_bench';
+  await mongoose.connect(uri, { dbName });
+  logger.info('Connected to benchmark database', { dbName });
+}
+
+export async function disconnectBenchDatabase(): Promise<void> {
+  await mongoose.disconnect();
+}
+
+export function getBenchSize(defaultSize: number): number {
+  const size = parseInt(process.env.BENCH_LOADS || '', 10);
+  return Number.isNaN(size) || size <= 0 ? defaultSize : size;
+}
+
+function pick<T>(array: readonly T[], i: number): T {
+  return array[i % array.length];
+}
+
+/**
+ * Build one synthetic load document. Deterministic per index so repeated
+ * seeds produce the same corpus.
+ */
+export function buildBenchLoad(i: number, brokers: Types.ObjectId[], now: number = Date.now()): Record<string, unknown> {
+  const origin = pick(cities, i * 7);
+  const destination = pick(cities, i * 13 + 5);
+  const equipment = pick(equipmentTypes, i * 3);
+  const distance = 200 + ((i * 37) % 2000);
+  const createdAt = new Date(now - ((i * 7919) % (90 * DAY_MS / 1000)) * 1000);
+  const pickupDate = new Date(createdAt.getTime() + (1 + (i % 7)) * DAY_MS);
+  const statusRoll = i % 10;
+  const status = statusRoll < 7 ? 'available' : statusRoll < 8 ? 'booked' : statusRoll < 9 ? 'delivered' : 'cancelled';
+  const rate = Math.round(distance * (2 + (i % 25) / 10));
+  const booked = status === 'booked' || status === 'delivered';
+
+  return {
+    title: `${equipment} Load: ${origin.city}, ${origin.state} → ${destination.city}, ${destination.state}`,
+    description: 'Benchmark load',
+    origin: {
+      city: origin.city,
+      state: origin.state,
+      zip: origin.zip,
+      country: 'US',
+      coordinates: { lat: origin.lat, lng: origin.lng }
+    },
+    destination: {
+      city: destination.city,
+      state: destination.state,
+      zip: destination.zip,
+      country: 'US',
+      coordinates: { lat: destination.lat, lng: destination.lng }
+    },
+    // Raw collection inserts skip the model's validate hook, so derive points here
+    originPoint: toGeoPoint(origin),
+    destinationPoint: toGeoPoint(destination),
+    pickupDate,
+    deliveryDate: new Date(pickupDate.getTime() + 2 * DAY_MS),
+    equipmentType: equipment,
+    weight: 15000 + ((i * 101) % 30000),
+    rate,
+    rateType: 'flat_rate',
+    distance,
+    status,
+    shipmentId: '',
+    unlinked: true,
+    isInterstate: origin.state !== destination.state,
+    postedBy: pick(brokers, i),
+    bookedBy: booked ? pick(brokers, i + 1) : undefined,
+    agreedRate: booked ? rate : undefined,
+    bookedAt: booked ? new Date(createdAt.getTime() + ((i % 48) + 1) * 60 * 60 * 1000) : undefined,
+    billingStatus: booked ? 'ready' : 'not_ready',
+    createdAt,
+    updatedAt: createdAt
+  };
+}
+
+/**
+ * Seed the bench loads collection up to `count` documents. Reuses an existing
+ * corpus of the right size so repeated runs skip the insert phase.
+ */
+export async function seedBenchLoads(count: number): Promise<void> {
+  const existing = await Load.estimatedDocumentCount();
+  if (existing === count) {
+    logger.info('Reusing seeded benchmark loads', { count });
+  } else {
+    await Load.deleteMany({});
+    const brokers = Array.from({ length: 50 }, () => new Types.ObjectId());
+    const now = Date.now();
+
+    for (let start = 0; start < count; start += INSERT_BATCH_SIZE) {
+      const end = Math.min(start + INSERT_BATCH_SIZE, count);
+      const batch = [];
+      for (let i = start; i < end; i++) {
+        batch.push(buildBenchLoad(i, brokers, now));
+      }
+      await Load.collection.insertMany(batch, { ordered: false });
+      if ((end / INSERT_BATCH_SIZE) % 10 === 0 || end === count) {
+        logger.info('Seeded benchmark loads', { inserted: end, total: count });
+      }
+    }
+  }
+
+  try {
+    await Load.createIndexes();
+  } catch (error: any) {
+    logger.warn('Some load indexes could not be created', { error: error.message });
+  }
+}
+
+function percentile(sorted: number[], p: number): number {
+  if (sorted.length === 0) return 0;
+  const index = Math.min(sorted.length - 1, Math.ceil((p / 100) * sorted.length) - 1);
+  return sorted[Math.max(0, index)];
+}
+
+/**
+ * Time an async operation: one warm-up call, then `runs` measured calls
+ */
+export async function measure(label: string, runs: number, fn: () => Promise<unknown> | unknown): Promise<BenchResult> {
+  await fn();
+
+  const samples: number[] = [];
+  for (let i = 0; i < runs; i++) {
+    const start = performance.now();
+    await fn();
+    samples.push(performance.now() - start);
+  }
+
+  samples.sort((a, b) => a - b);
+  const round = (value: number) => Math.round(value * 1000) / 1000;
+
+  return {
+    label,
+    runs,
+    meanMs: round(samples.reduce((sum, value) => sum + value, 0) / samples.length),
+    p50Ms: round(percentile(samples, 50)),
+    p95Ms: round(percentile(samples, 95)),
+    minMs: round(samples[0])
+  };
+}
+
+export function printResults(title: string, results: BenchResult[]): void {
+  console.log(`\n${title}`);
+  console.table(results);
+}
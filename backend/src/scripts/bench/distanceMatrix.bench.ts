@@ -0,0 +1,62 @@
+import { haversineMiles } from '../../utils/geo.js';
+import { distanceRow, nearestInRow, packPoints, PackedPoints } from '../../utils/distanceMatrix.js';
+import { measure, printResults, BenchResult } from './benchUtils.js';
+
+/**
+ * Distance matrix kernels: per-pair haversine over objects vs the packed
+ * typed-array kernel, with and without top-k selection. No database needed.
+ * Usage: npm run bench:distance-matrix  (BENCH_MATRIX_SIZE=1000 by default)
+ */
+
+const RUNS = 10;
+const TOP_K = 10;
+
+function randomPoints(count: number, seed: number): Array<{ lat: number; lng: number }> {
+  // Deterministic LCG so runs are comparable; continental US bounding box
+  let state = seed;
+  const next = () => (state = (state * 16807) % 2147483647) / 2147483647;
+  return Array.from({ length: count }, () => ({ lat: 25 + next() * 24, lng: -124 + next() * 57 }));
+}
+
+async function run(): Promise<void> {
+  const size = parseInt(process.env.BENCH_MATRIX_SIZE || '', 10) || 1000;
+  const trucks = randomPoints(size, 7);
+  const pickups = randomPoints(size, 13);
+  const origins = packPoints(trucks) as PackedPoints;
+  const destinations = packPoints(pickups) as PackedPoints;
+  const results: BenchResult[] = [];
+
+  results.push(await measure(`per-pair haversine ${size}x${size}`, RUNS, () => {
+    const rows: number[][] = [];
+    for (const truck of trucks) {
+      rows.push(pickups.map(pickup => haversineMiles(truck.lat, truck.lng, pickup.lat, pickup.lng)));
+    }
+    return rows;
+  }));
+
+  results.push(await measure(`typed-array kernel ${size}x${size}`, RUNS, () => {
+    const buffer = new Float64Array(size);
+    let checksum = 0;
+    for (let i = 0; i < size; i++) {
+      distanceRow(origins, i, destinations, buffer);
+      checksum += buffer[0];
+    }
+    return checksum;
+  }));
+
+  results.push(await measure(`typed-array kernel + top-${TOP_K} ${size}x${size}`, RUNS, () => {
+    const buffer = new Float64Array(size);
+    const rows = [];
+    for (let i = 0; i < size; i++) {
+      rows.push(nearestInRow(distanceRow(origins, i, destinations, buffer), TOP_K));
+    }
+    return rows;
+  }));
+
+  printResults(`Distance matrix, ${size.toLocaleString()} x ${size.toLocaleString()}`, results);
+}
+
+run().catch((error) => {
+  console.error('Distance matrix benchmark failed', error);
+  process.exit(1);
+});
@@ -0,0 +1,72 @@
+import { Types } from 'mongoose';
+import { performance } from 'perf_hooks';
+import { Load } from '../../models/Load.model.js';
+import { loadImportService } from '../../services/loadImport.service.js';
+import { parseLoadImport } from '../../utils/loadImport.js';
+import { cities, equipmentTypes } from '../seedLoads.js';
+import { connectBenchDatabase, disconnectBenchDatabase, getBenchSize } from './benchUtils.js';
+
+/**
+ * Bulk import throughput: parse a generated CSV and import it end to end.
+ * Rows carry coordinates so the run does not depend on a geocoder; set
+ * BENCH_IMPORT_GEOCODE=true to drop them and exercise the geocoding path.
+ * Usage: npm run bench:load-import  (BENCH_LOADS=5000 by default)
+ */
+
+function buildCsv(count: number, withCoordinates: boolean): string {
+  const header = [
+    'originCity', 'originState', 'originZip', 'originLat', 'originLng',
+    'destinationCity', 'destinationState', 'destinationZip', 'destinationLat', 'destinationLng',
+    'pickupDate', 'deliveryDate', 'equipmentType', 'weight', 'rate', 'rateType'
+  ];
+  const lines = [header.join(',')];
+  const day = 24 * 60 * 60 * 1000;
+
+  for (let i = 0; i < count; i++) {
+    const origin = cities[i % cities.length];
+    const destination = cities[(i * 7 + 3) % cities.length];
+    const pickup = new Date(Date.now() + ((i % 14) + 1) * day);
+    lines.push([
+      origin.city, origin.state, origin.zip, withCoordinates ? origin.lat : '', withCoordinates ? origin.lng : '',
+      destination.city, destination.state, destination.zip, withCoordinates ? destination.lat : '', withCoordinates ? destination.lng : '',
+      pickup.toISOString(), new Date(pickup.getTime() + 2 * day).toISOString(),
+      equipmentTypes[i % equipmentTypes.length], 20000 + (i % 20000), 1500 + (i % 3000), 'flat_rate'
+    ].join(','));
+  }
+
+  return lines.join('\n');
+}
+
+async function run(): Promise<void> {
+  const size = getBenchSize(5000);
+  const brokerId = new Types.ObjectId().toString();
+  await connectBenchDatabase();
+
+  const csv = buildCsv(size, process.env.BENCH_IMPORT_GEOCODE !== 'true');
+
+  const start = performance.now();
+  const rows = parseLoadImport(csv, 'csv');
+  const parsedAt = performance.now();
+  const summary = await loadImportService.importLoads(rows, brokerId);
+  const end = performance.now();
+
+  console.log('\nBulk load import');
+  console.table([{
+    rows: size,
+    created: summary.created,
+    failed: summary.failed,
+    parseMs: Math.round(parsedAt - start),
+    importMs: Math.round(end - parsedAt),
+    loadsPerSec: Math.round(summary.created / ((end - start) / 1000))
+  }]);
+
+  // Leave the shared bench corpus as it was
+  await Load.deleteMany({ postedBy: brokerId });
+  await disconnectBenchDatabase();
+}
+
+run().catch(async (error) => {
+  console.error('Load import benchmark failed', error);
+  await disconnectBenchDatabase();
+  process.exit(1);
+});
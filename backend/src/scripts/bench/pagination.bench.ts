@@ -0,0 +1,57 @@
+import { Load } from '../../models/Load.model.js';
+import { buildKeysetFilter, decodeCursor, encodeCursor, KEYSET_SORT } from '../../utils/pagination.js';
+import { loadCountService } from '../../services/loadCount.service.js';
+import { connectBenchDatabase, disconnectBenchDatabase, getBenchSize, measure, printResults, seedBenchLoads, BenchResult } from './benchUtils.js';
+
+/**
+ * Offset vs keyset pagination on the load board query.
+ * Usage: npm run bench:pagination  (BENCH_LOADS=1000000 by default)
+ */
+
+const PAGE_SIZE = 20;
+const RUNS = 20;
+
+async function offsetPage(filter: Record<string, unknown>, page: number): Promise<void> {
+  await Promise.all([
+    Load.find(filter).sort({ createdAt: -1 }).skip((page - 1) * PAGE_SIZE).limit(PAGE_SIZE).lean(),
+    Load.countDocuments(filter)
+  ]);
+}
+
+async function cursorPage(filter: Record<string, unknown>, cursor: string): Promise<void> {
+  const pageFilter = { ...filter };
+  const position = cursor ? decodeCursor(cursor) : null;
+  if (position) Object.assign(pageFilter, buildKeysetFilter(position));
+  await Load.find(pageFilter).sort(KEYSET_SORT).limit(PAGE_SIZE + 1).lean();
+}
+
+async function run(): Promise<void> {
+  const size = getBenchSize(1_000_000);
+  await connectBenchDatabase();
+  await seedBenchLoads(size);
+
+  const filter = { status: 'available' };
+
+  // Cursor for the start of page 500, computed once outside the timed section
+  const boundary = await Load.findOne(filter).sort(KEYSET_SORT).skip(499 * PAGE_SIZE - 1).select('createdAt').lean();
+  const page500Cursor = boundary ? encodeCursor(boundary) : '';
+
+  const results: BenchResult[] = [
+    await measure('offset page 1 (+countDocuments)', RUNS, () => offsetPage(filter, 1)),
+    await measure('offset page 500 (+countDocuments)', RUNS, () => offsetPage(filter, 500)),
+    await measure('cursor page 1 (no count)', RUNS, () => cursorPage(filter, '')),
+    await measure('cursor page 500 (no count)', RUNS, () => cursorPage(filter, page500Cursor)),
+    await measure('cursor page 500 (+cached count)', RUNS, () =>
+      Promise.all([cursorPage(filter, page500Cursor), loadCountService.count(filter, 'cached')])
+    )
+  ];
+
+  printResults(`Load board pagination, ${size.toLocaleString()} loads, page size ${PAGE_SIZE}`, results);
+  await disconnectBenchDatabase();
+}
+
+run().catch(async (error) => {
+  console.error('Pagination benchmark failed', error);
+  await disconnectBenchDatabase();
+  process.exit(1);
+});
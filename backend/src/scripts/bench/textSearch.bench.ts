@@ -0,0 +1,87 @@
+import { Load } from '../../models/Load.model.js';
+import { LOAD_TEXT_WEIGHTS, LoadTextField, loadTextFields, LoadTextSource } from '../../services/loadTextSearch.service.js';
+import { TextIndex, tokenize } from '../../utils/textIndex.js';
+import { connectBenchDatabase, disconnectBenchDatabase, getBenchSize, measure, printResults, seedBenchLoads, BenchResult } from './benchUtils.js';
+
+/**
+ * Free-text load search: MongoDB weighted text index vs the in-process BM25 index.
+ * Relevance is precision@10 against an "all query terms present" ground truth.
+ * Usage: npm run bench:text-search  (BENCH_LOADS=100000 by default)
+ */
+
+const QUERIES = ['dallas chicago', 'reefer houston', 'flatbed tx', 'seattle portland dry van', 'miami', 'atlanta ga step deck'];
+const RUNS = 20;
+const TOP = 10;
+
+async function ensureTextIndex(): Promise<void> {
+  // Older bench databases may still carry the legacy per-field text indexes
+  for (const index of await Load.collection.indexes()) {
+    if (Object.values(index.key).includes('text') && index.name && index.name !== 'load_text_search') {
+      await Load.collection.dropIndex(index.name);
+    }
+  }
+  await Load.createIndexes();
+}
+
+function isRelevant(query: string, fields: Record<LoadTextField, string | undefined>): boolean {
+  const tokens = new Set(tokenize(Object.values(fields).filter(Boolean).join(' ')));
+  return tokenize(query).every(term => tokens.has(term));
+}
+
+async function run(): Promise<void> {
+  const size = getBenchSize(100_000);
+  await connectBenchDatabase();
+  await seedBenchLoads(size);
+  await ensureTextIndex();
+
+  const fieldsById = new Map<string, Record<LoadTextField, string | undefined>>();
+  const index = new TextIndex<LoadTextField>(LOAD_TEXT_WEIGHTS);
+  const buildStart = Date.now();
+  const cursor = Load.find({ status: { $ne: 'cancelled' } })
+    .select('title description origin.city origin.state destination.city destination.state equipmentType')
+    .lean()
+    .cursor();
+  for await (const load of cursor) {
+    const fields = loadTextFields(load as LoadTextSource);
+    fieldsById.set(String(load._id), fields);
+    index.add(String(load._id), fields);
+  }
+  console.log(`In-process index built: ${index.size.toLocaleString()} loads in ${Date.now() - buildStart}ms`);
+
+  const latency: BenchResult[] = [];
+  const relevance: Array<{ query: string; mongoP10: number; bm25P10: number }> = [];
+
+  for (const query of QUERIES) {
+    const mongoSearch = () => Load.find(
+      { status: { $ne: 'cancelled' }, $text: { $search: query } },
+      { score: { $meta: 'textScore' } }
+    )
+      .sort({ score: { $meta: 'textScore' }, createdAt: -1 })
+      .limit(TOP)
+      .lean();
+
+    latency.push(await measure(`mongo $text "${query}"`, RUNS, mongoSearch));
+    latency.push(await measure(`bm25 index "${query}"`, RUNS, () => index.search(query, TOP)));
+
+    const mongoTop = await mongoSearch();
+    const bm25Top = index.search(query, TOP);
+    const precision = (relevant: number, returned: number) => (returned === 0 ? 0 : Math.round((relevant / returned) * 100) / 100);
+
+    relevance.push({
+      query,
+      mongoP10: precision(mongoTop.filter(load => isRelevant(query, loadTextFields(load as LoadTextSource))).length, mongoTop.length),
+      bm25P10: precision(bm25Top.filter(hit => isRelevant(query, fieldsById.get(hit.id) as Record<LoadTextField, string | undefined>)).length, bm25Top.length)
+    });
+  }
+
+  printResults(`Text search latency, ${size.toLocaleString()} loads`, latency);
+  console.log('\nRelevance (precision@10)');
+  console.table(relevance);
+  await disconnectBenchDatabase();
+}
+
+run().catch(async (error) => {
+  console.error('Text search benchmark failed', error);
+  await disconnectBenchDatabase();
+  process.exit(1);
+});
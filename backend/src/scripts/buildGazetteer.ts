@@ -0,0 +1,70 @@
+import fs from 'fs';
+import path from 'path';
+import { encodeGazetteer, GazetteerRecord } from '../utils/gazetteer.js';
+import { logger } from '../utils/logger.js';
+
+/**
+ * Build the offline postal-code gazetteer used by the geocoding service.
+ *
+ * Inputs are GeoNames postal-code dumps (tab-separated, e.g. US.txt and CA.txt
+ * from download.geonames.org/export/zip) or CSV files with the columns
+ * code,country,city,region,lat,lng. Canadian entries are keyed by FSA.
+ *
+ * Usage: npm run gazetteer:build -- <input...> [--out data/gazetteer.bin]
+ */
+
+function parseLine(line: string): GazetteerRecord | null {
+  if (line.includes('\t')) {
+    // GeoNames: country, postal code, place name, admin name1, admin code1, ..., latitude (9), longitude (10)
+    const columns = line.split('\t');
+    const country = columns[0]?.toUpperCase();
+    if (country !== 'US' && country !== 'CA') return null;
+    return {
+      code: columns[1],
+      country,
+      city: columns[2],
+      region: columns[4],
+      lat: parseFloat(columns[9]),
+      lng: parseFloat(columns[10])
+    };
+  }
+
+  const [code, country, city, region, lat, lng] = line.split(',').map(value => value.trim());
+  const normalizedCountry = country?.toUpperCase();
+  if (normalizedCountry !== 'US' && normalizedCountry !== 'CA') return null;
+  return { code, country: normalizedCountry, city, region, lat: parseFloat(lat), lng: parseFloat(lng) };
+}
+
+function build(): void {
+  const args = process.argv.slice(2);
+  const outIndex = args.indexOf('--out');
+  const output = path.resolve(outIndex >= 0 ? args[outIndex + 1] : 'data/gazetteer.bin');
+  const inputs = args.filter((_, i) => i !== outIndex && i !== outIndex + 1);
+
+  if (inputs.length === 0) {
+    logger.error('Usage: npm run gazetteer:build -- <input...> [--out data/gazetteer.bin]');
+    process.exit(1);
+  }
+
+  const records: GazetteerRecord[] = [];
+  for (const input of inputs) {
+    const lines = fs.readFileSync(input, 'utf8').split(/\r?\n/);
+    let parsed = 0;
+    for (const line of lines) {
+      if (!line.trim()) continue;
+      const record = parseLine(line);
+      if (record) {
+        records.push(record);
+        parsed++;
+      }
+    }
+    logger.info('Parsed gazetteer input', { input, records: parsed });
+  }
+
+  const data = encodeGazetteer(records);
+  fs.mkdirSync(path.dirname(output), { recursive: true });
+  fs.writeFileSync(output, data);
+  logger.info('Gazetteer written', { output, bytes: data.length });
+}
+
+build();
@@ -0,0 +1,34 @@
+import mongoose from 'mongoose';
+import { config } from '../../config/environment.js';
+import { DailyUserStats } from '../../models/DailyUserStats.model.js';
+import { dailyStatsService } from '../../services/dailyStats.service.js';
+import { DAILY_STATS } from '../../utils/constants.js';
+import { logger } from '../../utils/logger.js';
+
+/**
+ * Build DailyUserStats rollups from existing loads and shipments.
+ * Safe to re-run: the window is recomputed and replaced.
+ * Run before setting DAILY_STATS_READS_ENABLED=true.
+ * Usage: npm run migrate:daily-stats [-- <days>]  (default: the nightly window)
+ */
+
+async function migrate(): Promise<void> {
+  const days = parseInt(process.argv[2] || '', 10) || DAILY_STATS.REBUILD_DAYS;
+
+  await mongoose.connect(config.MONGODB_URI);
+  logger.info('Connected to MongoDB for daily stats backfill', { days });
+
+  // $merge needs the unique { userId, role, day } index to exist
+  await DailyUserStats.createIndexes();
+  await dailyStatsService.rebuild(days);
+
+  await mongoose.disconnect();
+}
+
+migrate()
+  .then(() => process.exit(0))
+  .catch(async (error) => {
+    logger.error('Daily stats backfill failed', { error: error.message });
+    await mongoose.disconnect();
+    process.exit(1);
+  });
@@ -0,0 +1,34 @@
+import mongoose from 'mongoose';
+import { config } from '../../config/environment.js';
+import { LaneRateBucket } from '../../models/LaneRateBucket.model.js';
+import { laneRateService } from '../../services/laneRate.service.js';
+import { logger } from '../../utils/logger.js';
+
+/**
+ * Build lane rate buckets (weekly rate-per-mile t-digests) from booked loads.
+ * Safe to re-run, and to run while loads are being booked: rebuilt weeks are
+ * replaced, and buckets a booking merges into meanwhile are recomputed.
+ * Usage: npm run migrate:lane-rates [-- <weeks>]  (default: all history)
+ */
+
+async function migrate(): Promise<void> {
+  const weeks = parseInt(process.argv[2] || '', 10);
+  const since = weeks > 0 ? new Date(Date.now() - weeks * 7 * 24 * 60 * 60 * 1000) : undefined;
+
+  await mongoose.connect(config.MONGODB_URI);
+  logger.info('Connected to MongoDB for lane rate backfill', { since });
+
+  await LaneRateBucket.createIndexes();
+  const result = await laneRateService.rebuild(since);
+  logger.info('Lane rate backfill complete', result);
+
+  await mongoose.disconnect();
+}
+
+migrate()
+  .then(() => process.exit(0))
+  .catch(async (error) => {
+    logger.error('Lane rate backfill failed', { error: error.message });
+    await mongoose.disconnect();
+    process.exit(1);
+  });
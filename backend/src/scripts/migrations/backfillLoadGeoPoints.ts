@@ -0,0 +1,83 @@
+import mongoose from 'mongoose';
+import { config } from '../../config/environment.js';
+import { Load } from '../../models/Load.model.js';
+import { logger } from '../../utils/logger.js';
+import { toGeoPoint } from '../../utils/geo.js';
+
+/**
+ * Backfill GeoJSON originPoint/destinationPoint on existing loads, drop the
+ * legacy lat/lng compound indexes and build the 2dsphere indexes.
+ * Safe to re-run: only loads missing a point are touched.
+ * Usage: npm run migrate:geo
+ */
+
+const BATCH_SIZE = 1000;
+const LEGACY_INDEXES = [
+  'origin.coordinates.lat_1_origin.coordinates.lng_1',
+  'destination.coordinates.lat_1_destination.coordinates.lng_1'
+];
+
+async function backfillPoints(): Promise<number> {
+  const cursor = Load.find(
+    { $or: [{ originPoint: { $exists: false } }, { destinationPoint: { $exists: false } }] },
+    { 'origin.coordinates': 1, 'destination.coordinates': 1 }
+  )
+    .lean()
+    .cursor();
+
+  let operations: any[] = [];
+  let updated = 0;
+
+  const flush = async () => {
+    if (operations.length === 0) return;
+    await Load.bulkWrite(operations, { ordered: false });
+    updated += operations.length;
+    operations = [];
+    logger.info('Geo backfill progress', { updated });
+  };
+
+  for await (const load of cursor) {
+    const $set: Record<string, unknown> = {};
+    const originPoint = toGeoPoint(load.origin?.coordinates);
+    const destinationPoint = toGeoPoint(load.destination?.coordinates);
+    if (originPoint) $set.originPoint = originPoint;
+    if (destinationPoint) $set.destinationPoint = destinationPoint;
+    if (Object.keys($set).length === 0) continue;
+
+    operations.push({ updateOne: { filter: { _id: load._id }, update: { $set } } });
+    if (operations.length >= BATCH_SIZE) await flush();
+  }
+  await flush();
+
+  return updated;
+}
+
+async function migrate(): Promise<void> {
+  await mongoose.connect(config.MONGODB_URI);
+  logger.info('Connected to MongoDB for geo backfill');
+
+  const updated = await backfillPoints();
+  logger.info('Geo points backfilled', { updated });
+
+  const existing = await Load.collection.indexes();
+  for (const name of LEGACY_INDEXES) {
+    if (existing.some(index => index.name === name)) {
+      await Load.collection.dropIndex(name);
+      logger.info('Dropped legacy coordinate index', { name });
+    }
+  }
+
+  // 2dsphere indexes can only be built once every point is valid GeoJSON
+  await Load.createIndexes();
+  logger.info('Load indexes synced');
+
+  await mongoose.disconnect();
+}
+
+migrate()
+  .then(() => process.exit(0))
+  .catch(async (error) => {
+    logger.error('Geo backfill failed', { error: error.message });
+    await mongoose.disconnect();
+    process.exit(1);
+  });
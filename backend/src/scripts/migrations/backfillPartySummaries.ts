@@ -0,0 +1,49 @@
+import mongoose from 'mongoose';
+import { config } from '../../config/environment.js';
+import { Load } from '../../models/Load.model.js';
+import { partySummaryService } from '../../services/partySummary.service.js';
+import { mapWithConcurrency } from '../../utils/concurrency.js';
+import { logger } from '../../utils/logger.js';
+
+/**
+ * Backfill postedBySummary/bookedBySummary on existing loads, one user at a time.
+ * Safe to re-run: summaries are rewritten from the current user documents.
+ * Run before setting PARTY_SUMMARY_READS_ENABLED=true.
+ * Usage: npm run migrate:party-summaries
+ */
+
+const USER_CONCURRENCY = 4;
+
+async function migrate(): Promise<void> {
+  await mongoose.connect(config.MONGODB_URI);
+  logger.info('Connected to MongoDB for party summary backfill');
+
+  const [brokers, carriers] = await Promise.all([
+    Load.distinct('postedBy'),
+    Load.distinct('bookedBy', { bookedBy: { $ne: null } })
+  ]);
+  const userIds = Array.from(new Set([...brokers, ...carriers].map(String)));
+  logger.info('Backfilling party summaries', { users: userIds.length });
+
+  let posted = 0;
+  let booked = 0;
+  let done = 0;
+  await mapWithConcurrency(userIds, USER_CONCURRENCY, async (userId) => {
+    const result = await partySummaryService.syncUser(userId);
+    posted += result.posted;
+    booked += result.booked;
+    done++;
+    if (done % 100 === 0) logger.info('Party summary backfill progress', { users: done, posted, booked });
+  });
+
+  logger.info('Party summaries backfilled', { users: userIds.length, posted, booked });
+  await mongoose.disconnect();
+}
+
+migrate()
+  .then(() => process.exit(0))
+  .catch(async (error) => {
+    logger.error('Party summary backfill failed', { error: error.message });
+    await mongoose.disconnect();
+    process.exit(1);
+  });
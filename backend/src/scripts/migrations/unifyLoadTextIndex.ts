@@ -0,0 +1,39 @@
+import mongoose from 'mongoose';
+import { config } from '../../config/environment.js';
+import { Load } from '../../models/Load.model.js';
+import { logger } from '../../utils/logger.js';
+
+/**
+ * Replace legacy load text indexes with the single weighted load_text_search index.
+ * MongoDB allows one text index per collection, so older ones must be dropped first.
+ * Usage: npm run migrate:text-index
+ */
+
+const TEXT_INDEX_NAME = 'load_text_search';
+
+async function migrate(): Promise<void> {
+  await mongoose.connect(config.MONGODB_URI);
+  logger.info('Connected to MongoDB for text index migration');
+
+  const indexes = await Load.collection.indexes();
+  for (const index of indexes) {
+    const isText = Object.values(index.key).includes('text');
+    if (isText && index.name && index.name !== TEXT_INDEX_NAME) {
+      await Load.collection.dropIndex(index.name);
+      logger.info('Dropped legacy text index', { name: index.name });
+    }
+  }
+
+  await Load.createIndexes();
+  logger.info('Load indexes synced');
+
+  await mongoose.disconnect();
+}
+
+migrate()
+  .then(() => process.exit(0))
+  .catch(async (error) => {
+    logger.error('Text index migration failed', { error: error.message });
+    await mongoose.disconnect();
+    process.exit(1);
+  });
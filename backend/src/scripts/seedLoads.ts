@@ -3,6 +3,8 @@ import { config } from '../config/environment.js';
 import { Load } from '../models/Load.model.js';
 import { User } from '../models/User.model.js';
 import { logger } from '../utils/logger.js';
+import { loadEvents } from '../services/loadEvents.service.js';
+import { toPartySummary } from '../services/partySummary.service.js';
 
 // Realistic load data generator with coordinates
 const cities = [
@@ -132,7 +134,8 @@ async function seedLoads() {
       const equipment = getRandomElement(equipmentTypes);
       const rateType = getRandomElement(rateTypes);
       const description = getRandomElement(loadDescriptions);
-      const postedBy = getRandomElement(allBrokers)._id;
+      const broker = getRandomElement(allBrokers);
+      const postedBy = broker._id;
       
       // Generate realistic rate based on equipment and distance
       let baseRate = 0;
@@ -179,7 +182,8 @@ async function seedLoads() {
         deliveryDate: new Date(pickupDate.getTime() + (distance / 50) * 24 * 60 * 60 * 1000),
         distance,
         status: Math.random() > 0.1 ? 'available' : 'booked',
-        postedBy
+        postedBy,
+        postedBySummary: toPartySummary(broker)
       };
 
       loads.push(load);
@@ -194,6 +198,7 @@ async function seedLoads() {
     }
 
     logger.info(`Successfully seeded ${loads.length} realistic loads!`);
+    loadEvents.publishReset();
     
     // Only close connection and exit if called directly (not imported)
     if (import.meta.url === `file://${process.argv[1]}` || require.main === module) {
@@ -222,5 +227,5 @@ if (import.meta.url === `file://${process.argv[1]}`) {
   seedLoads();
 }
 
-export { seedLoads };
+export { seedLoads, cities, equipmentTypes };
 
@@ -8,6 +8,19 @@ import { connectToDatabase } from './config/database.js';
 import { authService } from './services/auth.service.js';
 import { websocketService } from './services/websocket.service.js';
 import { alertCronService } from './services/alertCron.service.js';
+import { loadEvents } from './services/loadEvents.service.js';
+import { loadIndexService } from './services/loadIndex.service.js';
+import { facetCounterService } from './services/facetCounter.service.js';
+import { autocompleteService } from './services/autocomplete.service.js';
+import { loadTextSearchService } from './services/loadTextSearch.service.js';
+import { searchResultCacheService } from './services/searchResultCache.service.js';
+import { geocodingService } from './services/geocoding.service.js';
+import { dailyStatsService } from './services/dailyStats.service.js';
+import { dashboardCacheService } from './services/dashboardCache.service.js';
+import { systemStatsService } from './services/systemStats.service.js';
+import { laneRateService } from './services/laneRate.service.js';
+import { exportJobService } from './services/exportJob.service.js';
+import { searchMatchService } from './services/searchMatch.service.js';
 import { logger } from './utils/logger.js';
 import { apiLimiter } from './middleware/rateLimit.middleware.js';
 import { errorHandler } from './middleware/error.middleware.js';
@@ -176,6 +189,47 @@ async function startServer() {
     
     // Start alert cron job
     alertCronService.start();
+
+    // Match new loads against saved searches as they are posted (opt-in)
+    await searchMatchService.start();
+
+    // Mirror load writes from other instances (replica set only)
+    if (config.LOAD_CHANGE_STREAM_ENABLED) {
+      loadEvents.startChangeStream();
+    }
+
+    // Build in-memory available-load index (opt-in)
+    await loadIndexService.start();
+
+    // Seed search facet counters in the background; suggestions query MongoDB until ready
+    void facetCounterService.start();
+
+    // Build city/state autocomplete indexes in the background; completions query MongoDB until ready
+    void autocompleteService.start();
+
+    // Build in-memory free-text index (opt-in)
+    await loadTextSearchService.start();
+
+    // Cache load list/search result pages (opt-in)
+    searchResultCacheService.start();
+
+    // Nightly repair of the dashboard rollups
+    dailyStatsService.start();
+
+    // Serve dashboards and system stats stale-while-revalidate (opt-in)
+    dashboardCacheService.start();
+
+    // Snapshot admin system stats in the background; the first snapshot computes the hourly figures if they are not ready
+    void systemStatsService.start();
+
+    // Lane market-rate quotes, updated as loads are booked
+    laneRateService.start();
+
+    // Background admin export jobs (resumes any interrupted ones)
+    exportJobService.start();
+
+    // Preload geocodes for common lanes in the background
+    void geocodingService.warmUp();
     
     // Ensure default admin user
     await authService.ensureDefaultAdminUser();
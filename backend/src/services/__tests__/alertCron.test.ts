@@ -0,0 +1,309 @@
+import { Types } from 'mongoose';
+import { alertCronService } from '../alertCron.service.js';
+import type { AlertBatchSender } from '../alertCron.service.js';
+import type { EmailMessage } from '../email.service.js';
+import { ALERTS } from '../../utils/constants.js';
+
+// In-memory stand-ins for the collections the alert run reads and writes
+const mockDb = {
+  searches: [] as any[],
+  loads: [] as any[],
+  users: [] as any[],
+  runs: [] as any[]
+};
+
+const mockCompare = (a: any, b: any): number => {
+  const key = (value: any) => (value instanceof Date ? value.getTime() : value instanceof Types.ObjectId ? value.toString() : value);
+  const [x, y] = [key(a), key(b)];
+  return x < y ? -1 : x > y ? 1 : 0;
+};
+
+function mockMatches(doc: any, filter: Record<string, any>): boolean {
+  return Object.entries(filter).every(([path, condition]) => {
+    if (path === '$or') return condition.some((branch: any) => mockMatches(doc, branch));
+    const value = path.split('.').reduce((current, key) => current?.[key], doc);
+    if (condition === null) return value === null || value === undefined;
+    if (typeof condition !== 'object' || condition instanceof Date || condition instanceof Types.ObjectId) {
+      return value !== undefined && mockCompare(value, condition) === 0;
+    }
+    return Object.entries(condition).every(([op, operand]: [string, any]) => {
+      const present = value !== undefined && value !== null;
+      switch (op) {
+        case '$gt': return present && mockCompare(value, operand) > 0;
+        case '$gte': return present && mockCompare(value, operand) >= 0;
+        case '$lt': return present && mockCompare(value, operand) < 0;
+        case '$lte': return present && mockCompare(value, operand) <= 0;
+        case '$in': return operand.some((item: any) => mockCompare(value, item) === 0);
+        case '$exists': return present === operand;
+        default: throw new Error(`Unsupported operator ${op}`);
+      }
+    });
+  });
+}
+
+// Copies keep ObjectIds and Dates, like documents read back from MongoDB
+function mockClone<T>(value: T): T {
+  if (Array.isArray(value)) return value.map(mockClone) as T;
+  if (value instanceof Date) return new Date(value) as T;
+  if (value instanceof Types.ObjectId || value === null || typeof value !== 'object') return value;
+  return Object.fromEntries(Object.entries(value).map(([key, item]) => [key, mockClone(item)])) as T;
+}
+
+function mockApply(doc: any, update: any): void {
+  Object.assign(doc, mockClone(update.$set ?? {}));
+  Object.keys(update.$unset ?? {}).forEach(key => delete doc[key]);
+  Object.entries(update.$inc ?? {}).forEach(([key, by]) => {
+    doc[key] = (doc[key] ?? 0) + (by as number);
+  });
+}
+
+function mockFind(collection: () => any[], filter: Record<string, any>) {
+  let docs = collection().filter(doc => mockMatches(doc, filter));
+  const query = {
+    sort: (spec: Record<string, 1 | -1>) => {
+      docs = [...docs].sort((a, b) => {
+        for (const [key, direction] of Object.entries(spec)) {
+          const order = mockCompare(a[key], b[key]) * direction;
+          if (order !== 0) return order;
+        }
+        return 0;
+      });
+      return query;
+    },
+    limit: (count: number) => {
+      docs = docs.slice(0, count);
+      return query;
+    },
+    select: () => query,
+    lean: () => Promise.resolve(docs.map(mockClone))
+  };
+  return query;
+}
+
+const mockNewId = () => new Types.ObjectId();
+
+const mockRunDoc = (run: any) => ({ ...mockClone(run), id: run._id.toString() });
+
+jest.mock('../../models/SavedSearch.model.js', () => ({
+  SavedSearch: {
+    find: (filter: any) => mockFind(() => mockDb.searches, filter),
+    bulkWrite: async (ops: any[]) => {
+      for (const { updateOne } of ops) {
+        mockDb.searches.filter(doc => mockMatches(doc, updateOne.filter)).forEach(doc => mockApply(doc, updateOne.update));
+      }
+    }
+  }
+}));
+
+jest.mock('../../models/Load.model.js', () => ({
+  Load: { find: (filter: any) => mockFind(() => mockDb.loads, filter) }
+}));
+
+jest.mock('../../models/User.model.js', () => ({
+  User: { find: (filter: any) => mockFind(() => mockDb.users, filter) }
+}));
+
+jest.mock('../../models/AlertRun.model.js', () => ({
+  AlertRun: {
+    findOneAndUpdate: async (filter: any, update: any) => {
+      const run = mockDb.runs.find(doc => mockMatches(doc, filter));
+      if (!run) return null;
+      mockApply(run, update);
+      return mockRunDoc(run);
+    },
+    create: async (fields: any) => {
+      if (mockDb.runs.some(doc => doc.status === 'running')) {
+        throw Object.assign(new Error('duplicate key'), { code: 11000 });
+      }
+      const run = { _id: mockNewId(), status: 'running', heartbeatAt: new Date(), scanned: 0, sent: 0, failed: 0, ...fields };
+      mockDb.runs.push(run);
+      return mockRunDoc(run);
+    },
+    updateOne: async (filter: any, update: any) => {
+      const run = mockDb.runs.find(doc => mockMatches(doc, filter));
+      if (run) mockApply(run, update);
+      return { matchedCount: run ? 1 : 0 };
+    }
+  }
+}));
+
+jest.mock('../searchMatch.service.js', () => ({
+  searchMatchService: { isEnabled: () => false }
+}));
+
+jest.mock('../email.service.js', () => ({
+  emailService: { sendBatch: async () => true }
+}));
+
+jest.mock('../../config/environment.js', () => ({
+  config: { ALERT_DISPATCH_CONCURRENCY: 1 }
+}));
+
+jest.mock('../../utils/logger.js', () => ({
+  logger: { info: () => undefined, warn: () => undefined, error: () => undefined, debug: () => undefined }
+}));
+
+/**
+ * Email provider that honours idempotency keys: a repeated key with the same
+ * payload is acknowledged without delivering again.
+ */
+class Provider {
+  delivered: string[] = [];
+  calls: string[] = [];
+  conflicts: string[] = [];
+  private payloads = new Map<string, string>();
+
+  send(messages: EmailMessage[], idempotencyKey: string): boolean {
+    this.calls.push(idempotencyKey);
+    const payload = JSON.stringify(messages);
+    const previous = this.payloads.get(idempotencyKey);
+    if (previous !== undefined) {
+      if (previous !== payload) this.conflicts.push(idempotencyKey);
+      return previous === payload;
+    }
+    this.payloads.set(idempotencyKey, payload);
+    this.delivered.push(...messages.map(message => message.to));
+    return true;
+  }
+
+  sender(): AlertBatchSender {
+    return async (messages, idempotencyKey) => this.send(messages, idempotencyKey);
+  }
+}
+
+function seed(count: number): void {
+  const user = (i: number) => ({ _id: new Types.ObjectId(), email: `carrier-${i}@example.com`, company: `Carrier ${i}` });
+  mockDb.users = Array.from({ length: count }, (_, i) => user(i));
+  mockDb.searches = mockDb.users.map((owner, i) => ({
+    _id: new Types.ObjectId(),
+    userId: owner._id,
+    name: `Search ${i}`,
+    filters: {},
+    alertEnabled: true,
+    frequency: 'instant',
+    pendingLoads: []
+  }));
+  mockDb.loads = [{
+    _id: new Types.ObjectId(),
+    title: 'Dry van Dallas to Chicago',
+    origin: { city: 'Dallas', state: 'TX' },
+    destination: { city: 'Chicago', state: 'IL' },
+    equipmentType: 'Dry Van',
+    rate: 2500,
+    status: 'available',
+    createdAt: new Date()
+  }];
+}
+
+const expireHeartbeat = (): void => {
+  mockDb.runs.forEach(run => {
+    run.heartbeatAt = new Date(Date.now() - ALERTS.RUN_STALE_MS - 1000);
+  });
+};
+
+const alerted = (): boolean[] => mockDb.searches.map(search => search.lastAlertSent !== undefined);
+
+describe('AlertCronService.run', () => {
+  beforeEach(() => {
+    mockDb.runs = [];
+  });
+
+  it('resumes a run that died mid-page without resending or skipping alerts', async () => {
+    const searches = ALERTS.DISPATCH_PAGE_SIZE + ALERTS.EMAIL_BATCH_SIZE + 20;
+    seed(searches);
+    const provider = new Provider();
+
+    // The provider accepts the second batch of the second page, then the process dies
+    let crashAt = Math.ceil(ALERTS.DISPATCH_PAGE_SIZE / ALERTS.EMAIL_BATCH_SIZE) + 2;
+    const crashing: AlertBatchSender = async (messages, idempotencyKey) => {
+      provider.send(messages, idempotencyKey);
+      if (--crashAt === 0) throw new Error('process killed');
+      return true;
+    };
+    await expect(alertCronService.run({ sender: crashing })).rejects.toThrow('process killed');
+
+    const [crashed] = mockDb.runs;
+    expect(crashed.status).toBe('running');
+    expect(crashed.lastSearchId.toString()).toBe(mockDb.searches[ALERTS.DISPATCH_PAGE_SIZE - 1]._id.toString());
+    expect(crashed.inFlight.upTo.toString()).toBe(mockDb.searches[searches - 1]._id.toString());
+    expect(crashed.inFlight.batches).toHaveLength(2);
+    expect(provider.delivered).toHaveLength(searches);
+    // The in-flight page was delivered but never checkpointed
+    expect(alerted().filter(Boolean)).toHaveLength(ALERTS.DISPATCH_PAGE_SIZE);
+    const inFlightKeys = provider.calls.slice(-2);
+
+    // A live heartbeat keeps other runs out; a stale one lets the next run take over
+    const blocked = await alertCronService.run({ sender: provider.sender() });
+    expect(blocked.runId).toBeNull();
+
+    expireHeartbeat();
+    const callsBefore = provider.calls.length;
+    const summary = await alertCronService.run({ sender: provider.sender() });
+
+    expect(summary.runId).toBe(crashed._id.toString());
+    expect(summary.resumed).toBe(true);
+    expect(summary.sent).toBe(searches - ALERTS.DISPATCH_PAGE_SIZE);
+    expect(summary.failed).toBe(0);
+    // The replay reused the recorded keys with the same payloads
+    expect(provider.calls.slice(callsBefore)).toEqual(inFlightKeys);
+    expect(provider.conflicts).toEqual([]);
+
+    expect(new Set(provider.delivered).size).toBe(searches);
+    expect(provider.delivered).toHaveLength(searches);
+    expect(alerted().every(Boolean)).toBe(true);
+
+    const [resumed] = mockDb.runs;
+    expect(resumed.status).toBe('completed');
+    expect(resumed.inFlight).toBeUndefined();
+    expect(resumed.lastSearchId.toString()).toBe(mockDb.searches[searches - 1]._id.toString());
+    expect(resumed.scanned).toBe(searches);
+  });
+
+  it('leaves alerts from a failed batch due for the next run', async () => {
+    const searches = ALERTS.EMAIL_BATCH_SIZE + 10;
+    seed(searches);
+    const provider = new Provider();
+
+    const failingSecondBatch: AlertBatchSender = async (messages, idempotencyKey) =>
+      idempotencyKey.endsWith('-1') ? false : provider.send(messages, idempotencyKey);
+    const first = await alertCronService.run({ sender: failingSecondBatch });
+
+    expect(first.sent).toBe(ALERTS.EMAIL_BATCH_SIZE);
+    expect(first.failed).toBe(10);
+    expect(alerted().slice(0, ALERTS.EMAIL_BATCH_SIZE).every(Boolean)).toBe(true);
+    expect(alerted().slice(ALERTS.EMAIL_BATCH_SIZE).some(Boolean)).toBe(false);
+
+    const second = await alertCronService.run({ sender: provider.sender() });
+
+    expect(second.resumed).toBe(false);
+    expect(second.sent).toBe(10);
+    expect(new Set(provider.delivered).size).toBe(searches);
+    expect(provider.delivered).toHaveLength(searches);
+  });
+
+  it('fails a replayed batch whose recipients changed instead of reusing its key', async () => {
+    const searches = ALERTS.EMAIL_BATCH_SIZE + 10;
+    seed(searches);
+    const provider = new Provider();
+
+    // Killed after recording the page, before the provider saw anything
+    const killed: AlertBatchSender = async () => {
+      throw new Error('process killed');
+    };
+    await expect(alertCronService.run({ sender: killed })).rejects.toThrow('process killed');
+
+    // A recipient in the first batch lost their email address meanwhile
+    delete mockDb.users[3].email;
+    expireHeartbeat();
+    const summary = await alertCronService.run({ sender: provider.sender() });
+
+    expect(provider.calls).toHaveLength(1);
+    expect(provider.calls[0].endsWith('-1')).toBe(true);
+    expect(summary.sent).toBe(10);
+    // Like a first send, the search without an email is handled rather than retried
+    expect(summary.failed).toBe(ALERTS.EMAIL_BATCH_SIZE - 1);
+    expect(alerted().slice(0, ALERTS.EMAIL_BATCH_SIZE).filter(Boolean)).toHaveLength(1);
+    expect(alerted()[3]).toBe(true);
+    expect(alerted().slice(ALERTS.EMAIL_BATCH_SIZE).every(Boolean)).toBe(true);
+  });
+});
@@ -1,14 +1,60 @@
 import { CronJob } from 'cron';
+import { hostname } from 'os';
 import { SavedSearch, ISavedSearch } from '../models/SavedSearch.model.js';
 import { Load } from '../models/Load.model.js';
+import { User } from '../models/User.model.js';
+import { AlertRun, IAlertRun, PlannedAlert } from '../models/AlertRun.model.js';
 import { ILoad } from '../types/index.js';
 import { LoadQueryFilter } from '../types/query.types.js';
-import { emailService } from './email.service.js';
+import { config } from '../config/environment.js';
+import { EmailMessage, emailService } from './email.service.js';
+import { searchMatchService } from './searchMatch.service.js';
+import { ALERTS } from '../utils/constants.js';
+import { mapWithConcurrency } from '../utils/concurrency.js';
 import { logger } from '../utils/logger.js';
 import { Types } from 'mongoose';
 
+/**
+ * Sends one provider batch; resolves false when the batch was not sent
+ */
+export type AlertBatchSender = (messages: EmailMessage[], idempotencyKey: string) => Promise<boolean>;
+
+export interface AlertRunOptions {
+  // Matching queries and provider calls in flight at once (default ALERT_DISPATCH_CONCURRENCY)
+  concurrency?: number;
+  // Defaults to emailService.sendBatch
+  sender?: AlertBatchSender;
+}
+
+export interface AlertRunSummary {
+  // null when another instance's run is in progress
+  runId: string | null;
+  resumed: boolean;
+  scanned: number;
+  sent: number;
+  failed: number;
+  providerCalls: number;
+  durationMs: number;
+}
+
+type AlertSearch = Pick<ISavedSearch, 'userId' | 'name' | 'filters' | 'frequency' | 'lastAlertSent' | 'pendingLoads' | 'lastSeenLoadAt' | 'lastSeenLoadId'> & { _id: Types.ObjectId };
+type AlertLoad = Pick<ILoad, 'title' | 'origin' | 'destination' | 'equipmentType' | 'rate' | 'createdAt'> & { _id: Types.ObjectId };
+
+interface RunContext {
+  run: IAlertRun;
+  sender: AlertBatchSender;
+  concurrency: number;
+  summary: AlertRunSummary;
+}
+
+const HOUR_MS = 60 * 60 * 1000;
+const FREQUENCY_HOURS: Record<ISavedSearch['frequency'], number> = { instant: 1, daily: 24, weekly: 168 };
+const SEARCH_FIELDS = 'userId name filters frequency lastAlertSent pendingLoads lastSeenLoadAt lastSeenLoadId';
+const ALERT_LOAD_FIELDS = 'title origin destination equipmentType rate createdAt';
+
 class AlertCronService {
   private cronJob: CronJob | null = null;
+  private readonly owner = `${hostname()}:${process.pid}`;
 
   /**
    * Start alert cron job
@@ -18,7 +64,7 @@ class AlertCronService {
     this.cronJob = new CronJob('0 * * * *', async () => {
       await this.processAlerts();
     });
-    
+
     this.cronJob.start();
     logger.info('Alert cron job started - running every hour');
   }
@@ -40,59 +86,317 @@ class AlertCronService {
   private async processAlerts(): Promise<void> {
     try {
       logger.info('Running alert processing job');
+      const summary = await this.run();
+      logger.info('Alert processing completed', summary);
+    } catch (error: any) {
+      logger.error('Error processing alerts', { error: error.message });
+    }
+  }
+
+  /**
+   * One alert run. Due searches are read in _id order, a page at a time:
+   * matches are found with bounded concurrency, emails go out in provider
+   * batches, and the page's lastAlertSent updates are one bulkWrite. The page
+   * is recorded on the AlertRun before sending and the checkpoint advanced
+   * after, so a run that dies is resumed by the next one: the in-flight page
+   * is replayed with the same idempotency keys (the provider drops repeats)
+   * and the run continues after the checkpoint.
+   */
+  async run(options: AlertRunOptions = {}): Promise<AlertRunSummary> {
+    const startedAt = Date.now();
+    const summary: AlertRunSummary = { runId: null, resumed: false, scanned: 0, sent: 0, failed: 0, providerCalls: 0, durationMs: 0 };
+
+    const claimed = await this.claimRun();
+    if (!claimed) {
+      logger.info('Alert run already in progress on another instance');
+      return summary;
+    }
+
+    const context: RunContext = {
+      run: claimed.run,
+      sender: options.sender ?? ((messages, idempotencyKey) => emailService.sendBatch(messages, idempotencyKey)),
+      concurrency: Math.max(options.concurrency ?? config.ALERT_DISPATCH_CONCURRENCY, 1),
+      summary: { ...summary, runId: claimed.run.id, resumed: claimed.resumed }
+    };
+    const { run } = context;
+
+    let owned = true;
+    if (run.inFlight) {
+      logger.info('Replaying alert page from interrupted run', { runId: run.id, alerts: run.inFlight.alerts.length });
+      owned = await this.dispatchPage(context, run.inFlight.upTo, run.inFlight.alerts, run.inFlight.scanned ?? 0, new Map(), run.inFlight.batches);
+    }
 
-      // Get all active saved searches
-      const searches = await SavedSearch.find({ alertEnabled: true }).populate('userId', 'email company');
-
-      for (const search of searches) {
-        // Determine if alert should be sent based on frequency
-        const shouldSend = this.shouldSendAlert(search);
-        if (!shouldSend) continue;
-
-        // Find matching loads
-        const matchingLoads = await this.findMatchingLoads(search);
-        
-        if (matchingLoads.length > 0) {
-          await this.sendAlert(search, matchingLoads);
-          
-          // Update last alert sent time
-          search.lastAlertSent = new Date();
-          await search.save();
-        }
+    // Continue past the replayed page; its failed alerts wait for the next run
+    const now = new Date();
+    let after = run.inFlight?.upTo ?? run.lastSearchId;
+    while (owned) {
+      const filter: Record<string, unknown> = { ...this.dueFilter(now), ...(after ? { _id: { $gt: after } } : {}) };
+      if (searchMatchService.isEnabled()) {
+        filter.pendingSince = { $exists: true };
       }
 
-      logger.info('Alert processing completed');
+      const page = await SavedSearch.find(filter)
+        .sort({ _id: 1 })
+        .limit(ALERTS.DISPATCH_PAGE_SIZE)
+        .select(SEARCH_FIELDS)
+        .lean<AlertSearch[]>();
+      if (page.length === 0) break;
+
+      const { plans, loads } = searchMatchService.isEnabled()
+        ? await this.planFromPending(page)
+        : await this.planFromQueries(page, context.concurrency);
+
+      after = page[page.length - 1]._id;
+      owned = await this.dispatchPage(context, after, plans, page.length, loads);
+    }
+
+    if (owned) {
+      await AlertRun.updateOne({ _id: run._id, owner: this.owner }, { $set: { status: 'completed', completedAt: new Date() } });
+    } else {
+      logger.warn('Alert run taken over by another instance', { runId: run.id });
+    }
+
+    context.summary.durationMs = Date.now() - startedAt;
+    return context.summary;
+  }
+
+  /**
+   * Resume a run whose owner stopped checkpointing, or start a new one.
+   * Returns null while another instance's run is live.
+   */
+  private async claimRun(): Promise<{ run: IAlertRun; resumed: boolean } | null> {
+    const now = new Date();
+    const stale = await AlertRun.findOneAndUpdate(
+      { status: 'running', heartbeatAt: { $lt: new Date(now.getTime() - ALERTS.RUN_STALE_MS) } },
+      { $set: { owner: this.owner, heartbeatAt: now } },
+      { new: true }
+    );
+    if (stale) {
+      return { run: stale, resumed: true };
+    }
+
+    try {
+      return { run: await AlertRun.create({ owner: this.owner }), resumed: false };
     } catch (error: any) {
-      logger.error('Error processing alerts', { error: error.message });
+      if (error.code === 11000) return null;
+      throw error;
     }
   }
 
   /**
-   * Check if alert should be sent based on frequency and last sent time
+   * Alert-enabled searches whose frequency interval has passed since their last alert
    */
-  private shouldSendAlert(search: any): boolean {
-    if (!search.lastAlertSent) return true;
+  private dueFilter(now: Date): Record<string, unknown> {
+    return {
+      alertEnabled: true,
+      $or: [
+        { lastAlertSent: null },
+        ...Object.entries(FREQUENCY_HOURS).map(([frequency, hours]) => ({
+          frequency,
+          lastAlertSent: { $lte: new Date(now.getTime() - hours * HOUR_MS + ALERTS.SCHEDULE_SLACK_MS) }
+        }))
+      ]
+    };
+  }
 
-    const now = new Date();
-    const lastSent = new Date(search.lastAlertSent);
-    const hoursSince = (now.getTime() - lastSent.getTime()) / (1000 * 60 * 60);
-
-    switch (search.frequency) {
-      case 'instant':
-        return hoursSince >= 1; // At least 1 hour ago
-      case 'daily':
-        return hoursSince >= 24; // At least 24 hours ago
-      case 'weekly':
-        return hoursSince >= 168; // At least 7 days ago
-      default:
-        return false;
+  /**
+   * Query each search's new matches, `concurrency` searches at a time
+   */
+  private async planFromQueries(page: AlertSearch[], concurrency: number): Promise<{ plans: PlannedAlert[]; loads: Map<string, AlertLoad> }> {
+    const loads = new Map<string, AlertLoad>();
+    const planned = await mapWithConcurrency(page, concurrency, async (search): Promise<PlannedAlert | null> => {
+      const matchingLoads = await this.findMatchingLoads(search);
+      if (matchingLoads.length === 0) return null;
+
+      for (const load of matchingLoads) {
+        loads.set(load._id.toString(), load);
+      }
+      return {
+        searchId: search._id,
+        searchName: search.name,
+        userId: search.userId,
+        loadIds: matchingLoads.map(load => load._id),
+        drainLoadIds: [],
+        // Newest delivered first, so the first load is the new watermark
+        seenThrough: { createdAt: matchingLoads[0].createdAt, loadId: matchingLoads[0]._id }
+      };
+    });
+    return { plans: planned.filter((plan): plan is PlannedAlert => plan !== null), loads };
+  }
+
+  /**
+   * Alerts from the pending buckets filled by searchMatch.service; loads no
+   * longer available are drained without being sent
+   */
+  private async planFromPending(page: AlertSearch[]): Promise<{ plans: PlannedAlert[]; loads: Map<string, AlertLoad> }> {
+    const loadIds = Array.from(new Set(page.flatMap(search => (search.pendingLoads ?? []).map(id => id.toString()))));
+    const available = await Load.find({ _id: { $in: loadIds }, status: 'available' })
+      .select(ALERT_LOAD_FIELDS)
+      .lean<AlertLoad[]>();
+    const loads = new Map(available.map(load => [load._id.toString(), load]));
+
+    const plans = page
+      .filter(search => (search.pendingLoads ?? []).length > 0)
+      .map(search => ({
+        searchId: search._id,
+        searchName: search.name,
+        userId: search.userId,
+        // Newest match first
+        loadIds: search.pendingLoads.filter(id => loads.has(id.toString())).reverse(),
+        drainLoadIds: search.pendingLoads
+      }));
+    return { plans, loads };
+  }
+
+  /**
+   * Render, record, send and checkpoint one page. Returns false if this
+   * instance no longer owns the run. `recordedBatches` is the batch layout of
+   * an interrupted page being replayed.
+   */
+  private async dispatchPage(
+    context: RunContext,
+    upTo: Types.ObjectId,
+    plans: PlannedAlert[],
+    scanned: number,
+    loads: Map<string, AlertLoad>,
+    recordedBatches?: Types.ObjectId[][]
+  ): Promise<boolean> {
+    const { run, summary } = context;
+    const owned = { _id: run._id, owner: this.owner };
+    const messages = await this.renderAlerts(plans, loads);
+    const failed = new Set<PlannedAlert>();
+
+    let batches: Array<Array<{ plan: PlannedAlert; message: EmailMessage }>> = [];
+    if (recordedBatches) {
+      // Replay the exact recorded batches so each idempotency key carries the
+      // same recipients. A batch that can no longer be rebuilt (an email or
+      // load removed since) would reuse its key with a different payload, so
+      // it is failed and retried by the next run instead.
+      const bySearch = new Map(messages.map(entry => [entry.plan.searchId.toString(), entry]));
+      batches = recordedBatches.map(searchIds => {
+        const batch = searchIds.map(id => bySearch.get(id.toString()));
+        searchIds.forEach(id => bySearch.delete(id.toString()));
+        if (batch.every(Boolean)) return batch as Array<{ plan: PlannedAlert; message: EmailMessage }>;
+        batch.forEach(entry => entry && failed.add(entry.plan));
+        return [];
+      });
+      // Alerts that were not sendable when the page was recorded
+      bySearch.forEach(entry => failed.add(entry.plan));
+    } else {
+      for (let i = 0; i < messages.length; i += ALERTS.EMAIL_BATCH_SIZE) {
+        batches.push(messages.slice(i, i + ALERTS.EMAIL_BATCH_SIZE));
+      }
+
+      // Recorded before sending, so a crash replays exactly these batches
+      if (plans.length > 0) {
+        const inFlight = { upTo, alerts: plans, batches: batches.map(batch => batch.map(entry => entry.plan.searchId)), scanned };
+        const recorded = await AlertRun.updateOne(owned, { $set: { inFlight, heartbeatAt: new Date() } });
+        if (recorded.matchedCount === 0) return false;
+      }
+    }
+
+    // Keys depend only on the recorded page and batch layout, so a replay reuses them
+    const results = await mapWithConcurrency(batches, context.concurrency, (batch, index) =>
+      batch.length > 0
+        ? context.sender(batch.map(entry => entry.message), `alerts-${run.id}-${upTo.toString()}-${index}`)
+        : Promise.resolve(true)
+    );
+    summary.providerCalls += batches.filter(batch => batch.length > 0).length;
+
+    let sent = 0;
+    batches.forEach((batch, index) => {
+      if (results[index]) {
+        sent += batch.length;
+      } else {
+        batch.forEach(entry => failed.add(entry.plan));
+      }
+    });
+
+    // Failed alerts keep their lastAlertSent and pending loads, so the next run retries them
+    const sentAt = new Date();
+    const updates = plans
+      .filter(plan => !failed.has(plan))
+      .map(plan => {
+        const alertSentAt = plan.loadIds.length > 0 ? sentAt : undefined;
+        const watermark = plan.seenThrough
+          ? { lastSeenLoadAt: plan.seenThrough.createdAt, lastSeenLoadId: plan.seenThrough.loadId }
+          : {};
+        return {
+          updateOne: {
+            filter: { _id: plan.searchId },
+            update: plan.drainLoadIds.length > 0
+              ? searchMatchService.drainUpdate(plan.drainLoadIds, alertSentAt)
+              : { $set: { lastAlertSent: sentAt, ...watermark } }
+          }
+        };
+      });
+    if (updates.length > 0) {
+      await SavedSearch.bulkWrite(updates as any[], { ordered: false });
     }
+
+    const failedCount = failed.size;
+    const checkpoint = await AlertRun.updateOne(owned, {
+      $set: { lastSearchId: upTo, heartbeatAt: new Date() },
+      $unset: { inFlight: 1 },
+      $inc: { scanned, sent, failed: failedCount }
+    });
+
+    summary.scanned += scanned;
+    summary.sent += sent;
+    summary.failed += failedCount;
+    logger.debug('Alert page dispatched', { runId: run.id, scanned, alerts: plans.length, sent, failed: failedCount });
+
+    return checkpoint.matchedCount > 0;
   }
 
   /**
-   * Find loads matching saved search criteria
+   * Email per alert with loads. Users (and, on replay, loads) are read once per page.
    */
-  private async findMatchingLoads(search: { filters: { equipment?: string[]; priceMin?: number; priceMax?: number; originState?: string; destinationState?: string; dateRange?: { from: Date; to: Date } } }): Promise<Array<ILoad & { _id: Types.ObjectId }>> {
+  private async renderAlerts(plans: PlannedAlert[], loads: Map<string, AlertLoad>): Promise<Array<{ plan: PlannedAlert; message: EmailMessage }>> {
+    const withLoads = plans.filter(plan => plan.loadIds.length > 0);
+    if (withLoads.length === 0) return [];
+
+    const missing = Array.from(new Set(withLoads.flatMap(plan => plan.loadIds.map(id => id.toString())))).filter(id => !loads.has(id));
+    if (missing.length > 0) {
+      const fetched = await Load.find({ _id: { $in: missing } }).select(ALERT_LOAD_FIELDS).lean<AlertLoad[]>();
+      fetched.forEach(load => loads.set(load._id.toString(), load));
+    }
+
+    const userIds = Array.from(new Set(withLoads.map(plan => plan.userId.toString())));
+    const users = await User.find({ _id: { $in: userIds } }).select('email company').lean<Array<{ _id: Types.ObjectId; email?: string; company?: string }>>();
+    const usersById = new Map(users.map(user => [user._id.toString(), user]));
+
+    const messages: Array<{ plan: PlannedAlert; message: EmailMessage }> = [];
+    for (const plan of withLoads) {
+      const user = usersById.get(plan.userId.toString());
+      if (!user?.email) {
+        logger.warn('No email found for saved search', { searchId: plan.searchId });
+        continue;
+      }
+      const matchingLoads = plan.loadIds
+        .map(id => loads.get(id.toString()))
+        .filter((load): load is AlertLoad => Boolean(load));
+      if (matchingLoads.length > 0) {
+        messages.push({ plan, message: this.renderAlert(plan.searchName, user, matchingLoads) });
+      }
+    }
+    return messages;
+  }
+
+  /**
+   * Find loads matching saved search criteria that were created after the
+   * search's watermark, returned newest first for the email. They are read
+   * oldest first, so when more than MAX_LOADS_PER_ALERT matched since the last
+   * alert, the watermark advances only past the delivered loads and the rest
+   * go out in later alerts. Without a watermark (a new search, or one whose
+   * filters changed) the newest matches are sent and the watermark starts
+   * there; older loads are not backfilled.
+   */
+  private async findMatchingLoads(search: {
+    filters: { equipment?: string[]; priceMin?: number; priceMax?: number; originState?: string; destinationState?: string; dateRange?: { from: Date; to: Date } };
+    lastSeenLoadAt?: Date;
+    lastSeenLoadId?: Types.ObjectId;
+  }): Promise<AlertLoad[]> {
     const query: LoadQueryFilter & Record<string, unknown> = { status: 'available' };
 
     // Equipment type filter
@@ -123,33 +427,35 @@ class AlertCronService {
       };
     }
 
-    // Get loads matching criteria
+    // Only loads after the watermark; (createdAt, _id) breaks createdAt ties
+    if (search.lastSeenLoadAt && search.lastSeenLoadId) {
+      query.$or = [
+        { createdAt: { $gt: search.lastSeenLoadAt } },
+        { createdAt: search.lastSeenLoadAt, _id: { $gt: search.lastSeenLoadId } }
+      ];
+    }
+
+    // Get loads matching criteria (only the fields the email shows); served by
+    // the { status, equipmentType, createdAt, _id } and { status, createdAt, _id } indexes
+    const backlog = Boolean(search.lastSeenLoadAt && search.lastSeenLoadId);
+    const direction = backlog ? 1 : -1;
     const loads = await Load.find(query)
-      .populate('postedBy', 'company email')
-      .limit(50); // Max 50 loads per alert
+      .select(ALERT_LOAD_FIELDS)
+      .sort({ createdAt: direction, _id: direction })
+      .limit(ALERTS.MAX_LOADS_PER_ALERT)
+      .lean<AlertLoad[]>();
 
-    return loads.map(load => load.toObject() as unknown as ILoad & { _id: Types.ObjectId });
+    return backlog ? loads.reverse() : loads;
   }
 
   /**
-   * Send alert email to user
+   * Alert email for one saved search
    */
-  private async sendAlert(
-    search: ISavedSearch & { userId: { email?: string; company?: string } | Types.ObjectId; _id: Types.ObjectId; name: string },
-    matchingLoads: Array<ILoad & { _id: Types.ObjectId }>
-  ): Promise<void> {
-    try {
-      const userId = search.userId as { email?: string; company?: string };
-      const userEmail = userId?.email;
-      const userName = userId?.company || 'Valued User';
-
-      if (!userEmail) {
-        logger.warn('No email found for saved search', { searchId: search._id });
-        return;
-      }
+  private renderAlert(searchName: string, user: { email?: string; company?: string }, matchingLoads: AlertLoad[]): EmailMessage {
+    const userName = user.company || 'Valued User';
 
-      // Generate load list HTML
-      const loadListHtml = matchingLoads.map(load => `
+    // Generate load list HTML
+    const loadListHtml = matchingLoads.map(load => `
         <div style="border: 1px solid #ddd; padding: 15px; margin-bottom: 10px; border-radius: 8px;">
           <h3 style="color: #2563eb; margin: 0 0 10px 0;">${load.title}</h3>
           <p><strong>Origin:</strong> ${load.origin.city}, ${load.origin.state}</p>
@@ -159,14 +465,14 @@ class AlertCronService {
         </div>
       `).join('');
 
-      const htmlContent = `
+    const htmlContent = `
         <div style="font-family: Arial, sans-serif; max-width: 600px; margin: 0 auto;">
           <h2 style="color: #2563eb;">New Loads Matching Your Saved Search</h2>
           <p>Hi ${userName},</p>
-          <p>We found <strong>${matchingLoads.length}</strong> new load${matchingLoads.length > 1 ? 's' : ''} matching your saved search "<strong>${search.name}</strong>":</p>
+          <p>We found <strong>${matchingLoads.length}</strong> new load${matchingLoads.length > 1 ? 's' : ''} matching your saved search "<strong>${searchName}</strong>":</p>
           ${loadListHtml}
           <div style="margin-top: 30px; text-align: center;">
-            <a href="https://www.cargolume.com/loads" 
+            <a href="https://www.cargolume.com/loads"
                style="background: #2563eb; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block;">
               View Load Board
             </a>
@@ -174,26 +480,12 @@ class AlertCronService {
         </div>
       `;
 
-      await emailService.sendEmail({
-        to: userEmail,
-        subject: `New Loads Matching "${search.name}"`,
-        html: htmlContent
-      });
-
-      const userIdForLog = search.userId instanceof Types.ObjectId 
-        ? search.userId.toString() 
-        : (search.userId as { _id?: Types.ObjectId })?._id?.toString() || 'unknown';
-
-      logger.info('Alert sent', { 
-        searchId: search._id, 
-        userId: userIdForLog,
-        loadCount: matchingLoads.length 
-      });
-    } catch (error: any) {
-      logger.error('Failed to send alert', { error: error.message, searchId: search._id });
-    }
+    return {
+      to: user.email!,
+      subject: `New Loads Matching "${searchName}"`,
+      html: htmlContent
+    };
   }
 }
 
 export const alertCronService = new AlertCronService();
-
@@ -1,7 +1,47 @@
+import { Model, Types } from 'mongoose';
 import { Load } from '../models/Load.model.js';
 import { Shipment } from '../models/Shipment.model.js';
+import { config } from '../config/environment.js';
+import { DailyStatsRole } from '../models/DailyUserStats.model.js';
+import { DAILY_STATS } from '../utils/constants.js';
 import { logger } from '../utils/logger.js';
 import type { AccountType } from '../types/index.js';
+import { dailyStatsService, DailyStatsDay, REVENUE_STATUSES } from './dailyStats.service.js';
+
+export const DEFAULT_TIME_ZONE = 'UTC';
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+/**
+ * The last `days` calendar dates (YYYY-MM-DD) in a time zone, oldest first
+ */
+function lastDays(days: number, timeZone: string): string[] {
+  const today = new Intl.DateTimeFormat('en-CA', { timeZone, year: 'numeric', month: '2-digit', day: '2-digit' }).format(new Date());
+  const [year, month, day] = today.split('-').map(Number);
+  const todayUtc = Date.UTC(year, month - 1, day);
+  return Array.from({ length: days }, (_, i) => new Date(todayUtc - (days - 1 - i) * DAY_MS).toISOString().split('T')[0]);
+}
+
+const revenueLoads = (day: DailyStatsDay): number =>
+  REVENUE_STATUSES.reduce((sum, status) => sum + (day.statusCounts[status] || 0), 0);
+
+/**
+ * Split rollups into the current and previous `days`-day period
+ */
+function splitPeriods(rollups: DailyStatsDay[], days: number): { current: DailyStatsDay[]; previous: DailyStatsDay[] } {
+  const dates = lastDays(days * 2, DEFAULT_TIME_ZONE);
+  const start = dates[0];
+  const boundary = dates[days];
+  return {
+    current: rollups.filter(day => day.date >= boundary),
+    previous: rollups.filter(day => day.date >= start && day.date < boundary)
+  };
+}
+
+const trendOf = (change: number): 'up' | 'down' | 'stable' => (change > 5 ? 'up' : change < -5 ? 'down' : 'stable');
+
+const sumOf = (days: DailyStatsDay[], value: (day: DailyStatsDay) => number): number =>
+  days.reduce((sum, day) => sum + value(day), 0);
 
 export interface TimeSeriesData {
   date: string;
@@ -25,45 +65,27 @@ export interface LoadAnalytics {
   change: number;
 }
 
+export interface CarrierDashboardAnalytics {
+  revenueTimeSeries: TimeSeriesData[];
+  loadCountTimeSeries: TimeSeriesData[];
+  revenueAnalytics: RevenueAnalytics;
+  loadAnalytics: LoadAnalytics;
+  topEquipment: Array<{ type: string; count: number }>;
+}
+
+const revenuePoint = (day: DailyStatsDay) => ({ value: day.revenue, count: revenueLoads(day) });
+const countPoint = (day: DailyStatsDay) => ({ value: 0, count: day.count });
+
 class AnalyticsService {
   /**
-   * Get revenue time series for a carrier
+   * Get revenue time series for a carrier (sum of rate and count of booked loads per day)
    */
-  async getCarrierRevenueTimeSeries(carrierId: string, days: number = 30): Promise<TimeSeriesData[]> {
+  async getCarrierRevenueTimeSeries(carrierId: string, days: number = 30, timeZone: string = DEFAULT_TIME_ZONE): Promise<TimeSeriesData[]> {
     try {
-      const startDate = new Date();
-      startDate.setDate(startDate.getDate() - days);
-
-      const loads = await Load.find({
-        bookedBy: carrierId,
-        status: { $nin: ['available', 'cancelled'] },
-        createdAt: { $gte: startDate }
-      }).sort({ createdAt: 1 });
-
-      // Group by date
-      const dataMap = new Map<string, number>();
-
-      loads.forEach(load => {
-        const date = new Date(load.createdAt).toISOString().split('T')[0];
-        const currentValue = dataMap.get(date) || 0;
-        dataMap.set(date, currentValue + (load.rate || 0));
-      });
-
-      // Fill missing dates with 0
-      const result: TimeSeriesData[] = [];
-      const today = new Date();
-      for (let i = days - 1; i >= 0; i--) {
-        const date = new Date(today);
-        date.setDate(date.getDate() - i);
-        const dateStr = date.toISOString().split('T')[0];
-        result.push({
-          date: dateStr,
-          value: dataMap.get(dateStr) || 0,
-          count: 0
-        });
+      if (this.useRollups(timeZone)) {
+        return await this.rollupSeries(carrierId, 'carrier', days, revenuePoint);
       }
-
-      return result;
+      return await this.dailySeries(Load, 'bookedBy', carrierId, days, timeZone, { status: { $nin: ['available', 'cancelled'] } }, 'rate');
     } catch (error: any) {
       logger.error('Get carrier revenue time series failed', { error: error.message });
       return [];
@@ -73,40 +95,12 @@ class AnalyticsService {
   /**
    * Get load count time series for a carrier
    */
-  async getCarrierLoadCountTimeSeries(carrierId: string, days: number = 30): Promise<TimeSeriesData[]> {
+  async getCarrierLoadCountTimeSeries(carrierId: string, days: number = 30, timeZone: string = DEFAULT_TIME_ZONE): Promise<TimeSeriesData[]> {
     try {
-      const startDate = new Date();
-      startDate.setDate(startDate.getDate() - days);
-
-      const loads = await Load.find({
-        bookedBy: carrierId,
-        createdAt: { $gte: startDate }
-      }).sort({ createdAt: 1 });
-
-      // Group by date
-      const dataMap = new Map<string, number>();
-
-      loads.forEach(load => {
-        const date = new Date(load.createdAt).toISOString().split('T')[0];
-        const currentCount = dataMap.get(date) || 0;
-        dataMap.set(date, currentCount + 1);
-      });
-
-      // Fill missing dates with 0
-      const result: TimeSeriesData[] = [];
-      const today = new Date();
-      for (let i = days - 1; i >= 0; i--) {
-        const date = new Date(today);
-        date.setDate(date.getDate() - i);
-        const dateStr = date.toISOString().split('T')[0];
-        result.push({
-          date: dateStr,
-          value: 0,
-          count: dataMap.get(dateStr) || 0
-        });
+      if (this.useRollups(timeZone)) {
+        return await this.rollupSeries(carrierId, 'carrier', days, countPoint);
       }
-
-      return result;
+      return await this.dailySeries(Load, 'bookedBy', carrierId, days, timeZone);
     } catch (error: any) {
       logger.error('Get carrier load count time series failed', { error: error.message });
       return [];
@@ -118,6 +112,10 @@ class AnalyticsService {
    */
   async getCarrierRevenueAnalytics(carrierId: string, days: number = 30): Promise<RevenueAnalytics> {
     try {
+      if (config.DAILY_STATS_READS_ENABLED) {
+        return this.rollupRevenueAnalytics(await dailyStatsService.readDays(carrierId, 'carrier', days * 2), days);
+      }
+
       const startDate = new Date();
       startDate.setDate(startDate.getDate() - days);
 
@@ -138,19 +136,7 @@ class AnalyticsService {
 
       const currentTotal = currentPeriodLoads.reduce((sum, load) => sum + (load.rate || 0), 0);
       const previousTotal = previousPeriodLoads.reduce((sum, load) => sum + (load.rate || 0), 0);
-      const average = currentPeriodLoads.length > 0 ? Math.round(currentTotal / currentPeriodLoads.length) : 0;
-      const change = previousTotal > 0 ? ((currentTotal - previousTotal) / previousTotal) * 100 : 0;
-
-      let trend: 'up' | 'down' | 'stable' = 'stable';
-      if (change > 5) trend = 'up';
-      else if (change < -5) trend = 'down';
-
-      return {
-        total: currentTotal,
-        average,
-        trend,
-        change: Math.round(change * 10) / 10
-      };
+      return this.revenueAnalytics(currentTotal, currentPeriodLoads.length, previousTotal);
     } catch (error: any) {
       logger.error('Get carrier revenue analytics failed', { error: error.message });
       return { total: 0, average: 0, trend: 'stable', change: 0 };
@@ -162,6 +148,10 @@ class AnalyticsService {
    */
   async getCarrierLoadAnalytics(carrierId: string, days: number = 30): Promise<LoadAnalytics> {
     try {
+      if (config.DAILY_STATS_READS_ENABLED) {
+        return this.rollupLoadAnalytics(await dailyStatsService.readDays(carrierId, 'carrier', days * 2), days);
+      }
+
       const startDate = new Date();
       startDate.setDate(startDate.getDate() - days);
 
@@ -178,23 +168,15 @@ class AnalyticsService {
         createdAt: { $gte: previousStartDate, $lt: startDate }
       });
 
-      const active = currentPeriodLoads.filter(load => ['booked', 'in_transit'].includes(load.status)).length;
-      const completed = currentPeriodLoads.filter(load => load.status === 'delivered').length;
-      const cancelled = currentPeriodLoads.filter(load => load.status === 'cancelled').length;
-      const change = previousPeriodLoads.length > 0 ? ((currentPeriodLoads.length - previousPeriodLoads.length) / previousPeriodLoads.length) * 100 : 0;
-
-      let trend: 'up' | 'down' | 'stable' = 'stable';
-      if (change > 5) trend = 'up';
-      else if (change < -5) trend = 'down';
-
-      return {
-        total: currentPeriodLoads.length,
-        active,
-        completed,
-        cancelled,
-        trend,
-        change: Math.round(change * 10) / 10
-      };
+      return this.loadAnalytics(
+        {
+          total: currentPeriodLoads.length,
+          active: currentPeriodLoads.filter(load => ['booked', 'in_transit'].includes(load.status)).length,
+          completed: currentPeriodLoads.filter(load => load.status === 'delivered').length,
+          cancelled: currentPeriodLoads.filter(load => load.status === 'cancelled').length
+        },
+        previousPeriodLoads.length
+      );
     } catch (error: any) {
       logger.error('Get carrier load analytics failed', { error: error.message });
       return { total: 0, active: 0, completed: 0, cancelled: 0, trend: 'stable', change: 0 };
@@ -204,38 +186,12 @@ class AnalyticsService {
   /**
    * Get broker posted loads time series
    */
-  async getBrokerLoadsTimeSeries(brokerId: string, days: number = 30): Promise<TimeSeriesData[]> {
+  async getBrokerLoadsTimeSeries(brokerId: string, days: number = 30, timeZone: string = DEFAULT_TIME_ZONE): Promise<TimeSeriesData[]> {
     try {
-      const startDate = new Date();
-      startDate.setDate(startDate.getDate() - days);
-
-      const loads = await Load.find({
-        postedBy: brokerId,
-        createdAt: { $gte: startDate }
-      }).sort({ createdAt: 1 });
-
-      const dataMap = new Map<string, number>();
-
-      loads.forEach(load => {
-        const date = new Date(load.createdAt).toISOString().split('T')[0];
-        const currentCount = dataMap.get(date) || 0;
-        dataMap.set(date, currentCount + 1);
-      });
-
-      const result: TimeSeriesData[] = [];
-      const today = new Date();
-      for (let i = days - 1; i >= 0; i--) {
-        const date = new Date(today);
-        date.setDate(date.getDate() - i);
-        const dateStr = date.toISOString().split('T')[0];
-        result.push({
-          date: dateStr,
-          value: 0,
-          count: dataMap.get(dateStr) || 0
-        });
+      if (this.useRollups(timeZone)) {
+        return await this.rollupSeries(brokerId, 'broker', days, countPoint);
       }
-
-      return result;
+      return await this.dailySeries(Load, 'postedBy', brokerId, days, timeZone);
     } catch (error: any) {
       logger.error('Get broker loads time series failed', { error: error.message });
       return [];
@@ -245,38 +201,12 @@ class AnalyticsService {
   /**
    * Get shipper shipments time series
    */
-  async getShipperShipmentsTimeSeries(shipperId: string, days: number = 30): Promise<TimeSeriesData[]> {
+  async getShipperShipmentsTimeSeries(shipperId: string, days: number = 30, timeZone: string = DEFAULT_TIME_ZONE): Promise<TimeSeriesData[]> {
     try {
-      const startDate = new Date();
-      startDate.setDate(startDate.getDate() - days);
-
-      const shipments = await Shipment.find({
-        postedBy: shipperId,
-        createdAt: { $gte: startDate }
-      }).sort({ createdAt: 1 });
-
-      const dataMap = new Map<string, number>();
-
-      shipments.forEach(shipment => {
-        const date = new Date(shipment.createdAt).toISOString().split('T')[0];
-        const currentCount = dataMap.get(date) || 0;
-        dataMap.set(date, currentCount + 1);
-      });
-
-      const result: TimeSeriesData[] = [];
-      const today = new Date();
-      for (let i = days - 1; i >= 0; i--) {
-        const date = new Date(today);
-        date.setDate(date.getDate() - i);
-        const dateStr = date.toISOString().split('T')[0];
-        result.push({
-          date: dateStr,
-          value: 0,
-          count: dataMap.get(dateStr) || 0
-        });
+      if (this.useRollups(timeZone)) {
+        return await this.rollupSeries(shipperId, 'shipper', days, countPoint);
       }
-
-      return result;
+      return await this.dailySeries(Shipment, 'postedBy', shipperId, days, timeZone);
     } catch (error: any) {
       logger.error('Get shipper shipments time series failed', { error: error.message });
       return [];
@@ -288,6 +218,11 @@ class AnalyticsService {
    */
   async getTopEquipmentTypes(userId: string, accountType: AccountType, limit: number = 5): Promise<Array<{ type: string; count: number }>> {
     try {
+      // Rollups only cover recent days, so this reads the last EQUIPMENT_WINDOW_DAYS
+      if (config.DAILY_STATS_READS_ENABLED && (accountType === 'carrier' || accountType === 'broker')) {
+        return this.rollupTopEquipment(await dailyStatsService.readDays(userId, accountType, DAILY_STATS.EQUIPMENT_WINDOW_DAYS), limit);
+      }
+
       if (accountType === 'carrier') {
         const loads = await Load.find({
           bookedBy: userId,
@@ -329,6 +264,176 @@ class AnalyticsService {
       return [];
     }
   }
+
+  /**
+   * Everything the carrier dashboard shows. With rollups this is a single read
+   * covering the longest window, sliced in memory; otherwise the individual
+   * queries run concurrently.
+   */
+  async getCarrierDashboardAnalytics(
+    carrierId: string,
+    days: number = 30,
+    timeZone: string = DEFAULT_TIME_ZONE,
+    equipmentLimit: number = 5
+  ): Promise<CarrierDashboardAnalytics> {
+    if (this.useRollups(timeZone)) {
+      try {
+        const rollups = await dailyStatsService.readDays(carrierId, 'carrier', Math.max(days * 2, DAILY_STATS.EQUIPMENT_WINDOW_DAYS));
+        const equipmentStart = lastDays(DAILY_STATS.EQUIPMENT_WINDOW_DAYS, DEFAULT_TIME_ZONE)[0];
+        return {
+          revenueTimeSeries: this.toSeries(rollups, days, revenuePoint),
+          loadCountTimeSeries: this.toSeries(rollups, days, countPoint),
+          revenueAnalytics: this.rollupRevenueAnalytics(rollups, days),
+          loadAnalytics: this.rollupLoadAnalytics(rollups, days),
+          topEquipment: this.rollupTopEquipment(rollups.filter(day => day.date >= equipmentStart), equipmentLimit)
+        };
+      } catch (error: any) {
+        logger.error('Get carrier dashboard analytics failed', { error: error.message });
+      }
+    }
+
+    const [revenueTimeSeries, loadCountTimeSeries, revenueAnalytics, loadAnalytics, topEquipment] = await Promise.all([
+      this.getCarrierRevenueTimeSeries(carrierId, days, timeZone),
+      this.getCarrierLoadCountTimeSeries(carrierId, days, timeZone),
+      this.getCarrierRevenueAnalytics(carrierId, days),
+      this.getCarrierLoadAnalytics(carrierId, days),
+      this.getTopEquipmentTypes(carrierId, 'carrier', equipmentLimit)
+    ]);
+    return { revenueTimeSeries, loadCountTimeSeries, revenueAnalytics, loadAnalytics, topEquipment };
+  }
+
+  private useRollups(timeZone: string): boolean {
+    // Rollups are bucketed by UTC day
+    return config.DAILY_STATS_READS_ENABLED && timeZone === DEFAULT_TIME_ZONE;
+  }
+
+  /**
+   * Daily series from DailyUserStats rollups, empty days as 0
+   */
+  private async rollupSeries(
+    userId: string,
+    role: DailyStatsRole,
+    days: number,
+    point: (day: DailyStatsDay) => { value: number; count: number }
+  ): Promise<TimeSeriesData[]> {
+    return this.toSeries(await dailyStatsService.readDays(userId, role, days), days, point);
+  }
+
+  private toSeries(
+    rollups: DailyStatsDay[],
+    days: number,
+    point: (day: DailyStatsDay) => { value: number; count: number }
+  ): TimeSeriesData[] {
+    const byDate = new Map(rollups.map(day => [day.date, day]));
+    return lastDays(days, DEFAULT_TIME_ZONE).map(date => {
+      const day = byDate.get(date);
+      return { date, ...(day ? point(day) : { value: 0, count: 0 }) };
+    });
+  }
+
+  private rollupRevenueAnalytics(rollups: DailyStatsDay[], days: number): RevenueAnalytics {
+    const { current, previous } = splitPeriods(rollups, days);
+    return this.revenueAnalytics(sumOf(current, day => day.revenue), sumOf(current, revenueLoads), sumOf(previous, day => day.revenue));
+  }
+
+  private rollupLoadAnalytics(rollups: DailyStatsDay[], days: number): LoadAnalytics {
+    const { current, previous } = splitPeriods(rollups, days);
+    const status = (name: string) => sumOf(current, day => day.statusCounts[name] || 0);
+    return this.loadAnalytics(
+      {
+        total: sumOf(current, day => day.count),
+        active: status('booked') + status('in_transit'),
+        completed: status('delivered'),
+        cancelled: status('cancelled')
+      },
+      sumOf(previous, day => day.count)
+    );
+  }
+
+  private rollupTopEquipment(rollups: DailyStatsDay[], limit: number): Array<{ type: string; count: number }> {
+    const equipmentCounts = new Map<string, number>();
+    for (const day of rollups) {
+      for (const [type, count] of Object.entries(day.equipment)) {
+        equipmentCounts.set(type, (equipmentCounts.get(type) || 0) + count);
+      }
+    }
+
+    return Array.from(equipmentCounts.entries())
+      .filter(([, count]) => count > 0)
+      .map(([type, count]) => ({ type, count }))
+      .sort((a, b) => b.count - a.count)
+      .slice(0, limit);
+  }
+
+  private revenueAnalytics(currentTotal: number, currentCount: number, previousTotal: number): RevenueAnalytics {
+    const change = previousTotal > 0 ? ((currentTotal - previousTotal) / previousTotal) * 100 : 0;
+    return {
+      total: currentTotal,
+      average: currentCount > 0 ? Math.round(currentTotal / currentCount) : 0,
+      trend: trendOf(change),
+      change: Math.round(change * 10) / 10
+    };
+  }
+
+  private loadAnalytics(current: Pick<LoadAnalytics, 'total' | 'active' | 'completed' | 'cancelled'>, previousTotal: number): LoadAnalytics {
+    const change = previousTotal > 0 ? ((current.total - previousTotal) / previousTotal) * 100 : 0;
+    return { ...current, trend: trendOf(change), change: Math.round(change * 10) / 10 };
+  }
+
+  /**
+   * Per-day count (and optional sum of `sumField`) of documents created in the
+   * last `days` calendar days of `timeZone`, oldest first with empty days as 0.
+   * Buckets are built in MongoDB with $dateTrunc (5.0+), so only one row per
+   * day leaves the server; the { owner, createdAt, ... } indexes cover the scan.
+   */
+  private async dailySeries(
+    model: Model<any>,
+    ownerField: 'bookedBy' | 'postedBy',
+    ownerId: string,
+    days: number,
+    timeZone: string,
+    filter: Record<string, unknown> = {},
+    sumField?: 'rate'
+  ): Promise<TimeSeriesData[]> {
+    const dates = lastDays(days, timeZone);
+    if (!Types.ObjectId.isValid(ownerId)) {
+      return dates.map(date => ({ date, value: 0, count: 0 }));
+    }
+
+    const $match = {
+      // Aggregation skips schema casting, so the owner id must be an ObjectId
+      [ownerField]: new Types.ObjectId(ownerId),
+      ...filter,
+      // One extra day absorbs DST shifts; buckets outside the series are dropped below
+      createdAt: { $gte: new Date(Date.now() - (days + 1) * DAY_MS) }
+    };
+
+    const buckets: Array<{ date: string; value?: number; count: number }> = await model.aggregate([
+      { $match },
+      {
+        $group: {
+          _id: { $dateTrunc: { date: '$createdAt', unit: 'day', timezone: timeZone } },
+          ...(sumField ? { value: { $sum: { $ifNull: [`$${sumField}`, 0] } } } : {}),
+          count: { $sum: 1 }
+        }
+      },
+      {
+        $project: {
+          _id: 0,
+          date: { $dateToString: { date: '$_id', format: '%Y-%m-%d', timezone: timeZone } },
+          value: 1,
+          count: 1
+        }
+      }
+    ]);
+
+    const byDate = new Map(buckets.map(bucket => [bucket.date, bucket]));
+    return dates.map(date => ({
+      date,
+      value: byDate.get(date)?.value ?? 0,
+      count: byDate.get(date)?.count ?? 0
+    }));
+  }
 }
 
 export const analyticsService = new AnalyticsService();
@@ -0,0 +1,111 @@
+import { Load } from '../models/Load.model.js';
+import { loadEvents, LoadChange, LoadSnapshot } from './loadEvents.service.js';
+import { CompletionIndex } from '../utils/completionIndex.js';
+import { logger } from '../utils/logger.js';
+
+export type CompletionField = 'origin' | 'destination';
+
+const cityStateKey = (location?: { city?: string; state?: string }): string | null =>
+  location?.city && location?.state ? `${location.city}, ${location.state}` : null;
+
+/**
+ * City/state autocomplete served from in-memory prefix indexes of
+ * non-cancelled loads, one per origin and destination.
+ */
+class AutocompleteService {
+  private indexes: Record<CompletionField, CompletionIndex> = {
+    origin: new CompletionIndex(),
+    destination: new CompletionIndex()
+  };
+  private ready = false;
+  private started = false;
+
+  async start(): Promise<void> {
+    if (this.started) return;
+    this.started = true;
+
+    loadEvents.subscribe((change) => this.applyChange(change));
+    await this.rebuild();
+  }
+
+  isReady(): boolean {
+    return this.ready;
+  }
+
+  complete(query: string, field: CompletionField, limit: number = 10): string[] {
+    return this.indexes[field].complete(query, limit);
+  }
+
+  /**
+   * Rebuild both indexes from a grouped aggregation over non-cancelled loads
+   */
+  async rebuild(): Promise<void> {
+    try {
+      const startedAt = Date.now();
+      const [result] = await Load.aggregate([
+        { $match: { status: { $ne: 'cancelled' } } },
+        {
+          $facet: {
+            origin: [{ $group: { _id: { city: '$origin.city', state: '$origin.state' }, count: { $sum: 1 } } }],
+            destination: [{ $group: { _id: { city: '$destination.city', state: '$destination.state' }, count: { $sum: 1 } } }]
+          }
+        }
+      ]);
+
+      const next: Record<CompletionField, CompletionIndex> = {
+        origin: new CompletionIndex(),
+        destination: new CompletionIndex()
+      };
+
+      for (const field of ['origin', 'destination'] as CompletionField[]) {
+        for (const row of (result?.[field] ?? []) as Array<{ _id: { city?: string; state?: string }; count: number }>) {
+          const key = cityStateKey(row._id);
+          if (key) next[field].add(key, row.count);
+        }
+      }
+
+      this.indexes = next;
+      this.ready = true;
+
+      logger.info('Autocomplete index rebuilt', {
+        origins: next.origin.size,
+        destinations: next.destination.size,
+        durationMs: Date.now() - startedAt
+      });
+    } catch (error: any) {
+      logger.error('Autocomplete index rebuild failed', { error: error.message });
+    }
+  }
+
+  private applyChange(change: LoadChange): void {
+    if (!this.ready) return;
+
+    switch (change.type) {
+      case 'created':
+        if (change.load.status !== 'cancelled') this.adjust(change.load, 1);
+        break;
+      case 'updated': {
+        if (!change.previousStatus) break;
+        const wasCounted = change.previousStatus !== 'cancelled';
+        const isCounted = change.load.status !== 'cancelled';
+        if (wasCounted && !isCounted) this.adjust(change.load, -1);
+        else if (!wasCounted && isCounted) this.adjust(change.load, 1);
+        break;
+      }
+      case 'reset':
+        void this.rebuild();
+        break;
+      default:
+        break;
+    }
+  }
+
+  private adjust(load: LoadSnapshot, delta: number): void {
+    const origin = cityStateKey(load.origin);
+    const destination = cityStateKey(load.destination);
+    if (origin) this.indexes.origin.add(origin, delta);
+    if (destination) this.indexes.destination.add(destination, delta);
+  }
+}
+
+export const autocompleteService = new AutocompleteService();
@@ -0,0 +1,455 @@
+import { CronJob } from 'cron';
+import { hostname } from 'os';
+import { Types } from 'mongoose';
+import { Load } from '../models/Load.model.js';
+import { Shipment } from '../models/Shipment.model.js';
+import { DailyUserStats, DailyStatsRole } from '../models/DailyUserStats.model.js';
+import { DailyStatsRebuild } from '../models/DailyStatsRebuild.model.js';
+import { LoadStatus } from '../types/index.js';
+import { DAILY_STATS } from '../utils/constants.js';
+import { logger } from '../utils/logger.js';
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+const LOAD_STATUSES: LoadStatus[] = ['available', 'booked', 'in_transit', 'delivered', 'cancelled'];
+export const REVENUE_STATUSES: LoadStatus[] = ['booked', 'in_transit', 'delivered'];
+
+/** Fields of a load (document, lean object or event snapshot) the rollup reads */
+export interface RollupLoad {
+  status: string;
+  createdAt: Date | string;
+  rate?: number;
+  distance?: number;
+  equipmentType?: string;
+  postedBy?: unknown;
+  bookedBy?: unknown;
+}
+
+export interface RollupShipment {
+  status: string;
+  createdAt: Date | string;
+  postedBy?: unknown;
+}
+
+export interface DailyStatsDay {
+  date: string;
+  count: number;
+  statusCounts: Record<string, number>;
+  revenue: number;
+  miles: number;
+  equipment: Record<string, number>;
+}
+
+interface RollupKey {
+  userId: Types.ObjectId;
+  role: DailyStatsRole;
+  day: Date;
+}
+
+interface PendingUpdate {
+  filter: RollupKey;
+  inc: Record<string, number>;
+}
+
+// Source filter per rollup role; null skips the role
+type RollupMatches = Record<DailyStatsRole, Record<string, unknown> | null>;
+
+const idOf = (value: unknown): string | undefined => {
+  if (!value) return undefined;
+  if (typeof value === 'object' && '_id' in (value as Record<string, unknown>)) {
+    return String((value as { _id: unknown })._id);
+  }
+  return String(value);
+};
+
+const utcDay = (date: Date | string): Date => {
+  const time = new Date(date).getTime();
+  return new Date(time - (((time % DAY_MS) + DAY_MS) % DAY_MS));
+};
+
+// Equipment names become field names, so dots would nest
+const equipmentKey = (type?: string): string => (type || 'Unknown').replace(/\./g, '_');
+
+/**
+ * Maintains the DailyUserStats rollups: write paths record created loads and
+ * shipments and status changes as $inc deltas, and a nightly job on one
+ * instance rebuilds the recent window from the raw collections to repair drift.
+ */
+class DailyStatsService {
+  private cronJob: CronJob | null = null;
+  private rebuilding = false;
+  private readonly owner = `${hostname()}:${process.pid}`;
+
+  /**
+   * Schedule the nightly rebuild (03:30 server time)
+   */
+  start(): void {
+    if (this.cronJob) return;
+
+    this.cronJob = new CronJob('30 3 * * *', async () => {
+      try {
+        await this.runNightly();
+      } catch (error: any) {
+        logger.error('Daily stats rebuild failed', { error: error.message });
+      }
+    });
+    this.cronJob.start();
+    logger.info('Daily stats rebuild scheduled - running nightly');
+  }
+
+  stop(): void {
+    this.cronJob?.stop();
+    this.cronJob = null;
+  }
+
+  /**
+   * Add newly created loads to their broker's (and carrier's, if booked) rollups
+   */
+  async recordLoadsCreated(loads: RollupLoad[]): Promise<void> {
+    const updates = new Map<string, PendingUpdate>();
+    for (const load of loads) {
+      this.addLoad(updates, load, 1);
+    }
+    await this.flush(updates);
+  }
+
+  /**
+   * Move a load's contribution from its previous status to its current one.
+   * A load leaving "available" had no carrier before the change.
+   */
+  async recordLoadStatusChange(load: RollupLoad, previousStatus: string): Promise<void> {
+    if (previousStatus === load.status) return;
+
+    // Copy fields explicitly: spreading a mongoose document does not copy its paths
+    const previous: RollupLoad = {
+      status: previousStatus,
+      createdAt: load.createdAt,
+      rate: load.rate,
+      distance: load.distance,
+      equipmentType: load.equipmentType,
+      postedBy: load.postedBy,
+      bookedBy: previousStatus === 'available' ? undefined : load.bookedBy
+    };
+
+    const updates = new Map<string, PendingUpdate>();
+    this.addLoad(updates, previous, -1);
+    this.addLoad(updates, load, 1);
+    await this.flush(updates);
+  }
+
+  async recordShipmentCreated(shipment: RollupShipment): Promise<void> {
+    const updates = new Map<string, PendingUpdate>();
+    this.addShipment(updates, shipment, 1);
+    await this.flush(updates);
+  }
+
+  async recordShipmentDeleted(shipment: RollupShipment): Promise<void> {
+    const updates = new Map<string, PendingUpdate>();
+    this.addShipment(updates, shipment, -1);
+    await this.flush(updates);
+  }
+
+  async recordShipmentStatusChange(shipment: RollupShipment, previousStatus: string): Promise<void> {
+    if (previousStatus === shipment.status) return;
+
+    const updates = new Map<string, PendingUpdate>();
+    this.addShipment(updates, { status: previousStatus, createdAt: shipment.createdAt, postedBy: shipment.postedBy }, -1);
+    this.addShipment(updates, shipment, 1);
+    await this.flush(updates);
+  }
+
+  /**
+   * Rollups for the last `days` UTC days (today included), oldest first; days
+   * without activity are omitted
+   */
+  async readDays(userId: string, role: DailyStatsRole, days: number): Promise<DailyStatsDay[]> {
+    if (!Types.ObjectId.isValid(userId)) return [];
+
+    const from = new Date(utcDay(new Date()).getTime() - (days - 1) * DAY_MS);
+    const docs = await DailyUserStats.find({ userId: new Types.ObjectId(userId), role, day: { $gte: from } })
+      .select('day count statusCounts revenue miles equipment')
+      .sort({ day: 1 })
+      .lean();
+
+    return docs.map(doc => ({
+      date: doc.day.toISOString().split('T')[0],
+      count: doc.count || 0,
+      statusCounts: doc.statusCounts || {},
+      revenue: doc.revenue || 0,
+      miles: doc.miles || 0,
+      equipment: doc.equipment || {}
+    }));
+  }
+
+  /**
+   * Recompute the last `days` UTC days from loads and shipments with $merge,
+   * then drop rollup days that no longer have any source documents. A day
+   * that takes a delta while the rebuild reads it keeps its live document and
+   * is recomputed on its own afterwards, so concurrent deltas are never lost.
+   */
+  async rebuild(days: number = DAILY_STATS.REBUILD_DAYS): Promise<{ removed: number; recomputed: number }> {
+    if (this.rebuilding) return { removed: 0, recomputed: 0 };
+    this.rebuilding = true;
+
+    try {
+      const runStart = new Date();
+      const from = new Date(utcDay(runStart).getTime() - (days - 1) * DAY_MS);
+      const window = { createdAt: { $gte: from } };
+
+      await this.aggregateRollups({
+        carrier: { bookedBy: { $ne: null }, ...window },
+        broker: { postedBy: { $ne: null }, ...window },
+        shipper: window
+      }, runStart);
+
+      // Days the merge did not replace either lost their source documents or took a delta during the run
+      const leftover = { day: { $gte: from }, rebuiltAt: { $ne: runStart } };
+      const stale = await DailyUserStats.deleteMany({
+        ...leftover,
+        $or: [{ touchedAt: { $lt: runStart } }, { touchedAt: { $exists: false } }]
+      });
+      const touched = await DailyUserStats.find({ ...leftover, touchedAt: { $gte: runStart } })
+        .select('userId role day')
+        .lean<RollupKey[]>();
+      const recomputed = await this.recompute(touched);
+
+      logger.info('Daily stats rebuilt', { days, removed: stale.deletedCount, recomputed, durationMs: Date.now() - runStart.getTime() });
+      return { removed: stale.deletedCount, recomputed };
+    } finally {
+      this.rebuilding = false;
+    }
+  }
+
+  /**
+   * The nightly rebuild, run by the instance that claims the night's lease
+   */
+  private async runNightly(): Promise<void> {
+    const night = utcDay(new Date());
+    try {
+      const claimed = await DailyStatsRebuild.updateOne(
+        { night },
+        { $setOnInsert: { owner: this.owner, startedAt: new Date() } },
+        { upsert: true }
+      );
+      if (claimed.upsertedCount === 0) {
+        logger.info('Daily stats rebuild already claimed by another instance');
+        return;
+      }
+    } catch (error: any) {
+      // Another instance inserted the night's lease first
+      if (error.code === 11000) return;
+      throw error;
+    }
+
+    const result = await this.rebuild();
+    await DailyStatsRebuild.updateOne({ night, owner: this.owner }, { $set: { completedAt: new Date(), ...result } });
+  }
+
+  /**
+   * Recompute single rollup days the guarded merge skipped. A day that keeps
+   * changing is left as is; the next night's rebuild picks it up.
+   */
+  private async recompute(keys: RollupKey[]): Promise<number> {
+    let pending = keys;
+    for (let attempt = 0; attempt < DAILY_STATS.REBUILD_RETRIES && pending.length > 0; attempt++) {
+      const attemptStart = new Date();
+      const sources = (role: DailyStatsRole, field: 'bookedBy' | 'postedBy') => {
+        const days = pending
+          .filter(key => key.role === role)
+          .map(key => ({ [field]: key.userId, createdAt: { $gte: key.day, $lt: new Date(key.day.getTime() + DAY_MS) } }));
+        return days.length > 0 ? { $or: days } : null;
+      };
+
+      await this.aggregateRollups({
+        carrier: sources('carrier', 'bookedBy'),
+        broker: sources('broker', 'postedBy'),
+        shipper: sources('shipper', 'postedBy')
+      }, attemptStart);
+
+      pending = await DailyUserStats.find({
+        $or: pending.map(({ userId, role, day }) => ({ userId, role, day })),
+        rebuiltAt: { $ne: attemptStart }
+      })
+        .select('userId role day')
+        .lean<RollupKey[]>();
+    }
+
+    if (pending.length > 0) {
+      logger.warn('Daily stats days still changing after rebuild', { days: pending.length });
+    }
+    return keys.length - pending.length;
+  }
+
+  private async aggregateRollups(matches: RollupMatches, rebuiltAt: Date): Promise<void> {
+    if (matches.carrier) await Load.aggregate(this.loadRollupPipeline('bookedBy', 'carrier', matches.carrier, rebuiltAt));
+    if (matches.broker) await Load.aggregate(this.loadRollupPipeline('postedBy', 'broker', matches.broker, rebuiltAt));
+    if (matches.shipper) await Shipment.aggregate(this.shipmentRollupPipeline(matches.shipper, rebuiltAt));
+  }
+
+  private addLoad(updates: Map<string, PendingUpdate>, load: RollupLoad, sign: 1 | -1): void {
+    const inc: Record<string, number> = {
+      count: sign,
+      [`statusCounts.${load.status}`]: sign
+    };
+    if ((REVENUE_STATUSES as string[]).includes(load.status)) {
+      inc.revenue = sign * (load.rate || 0);
+    }
+    if (load.status !== 'cancelled') {
+      inc.miles = sign * (load.distance || 0);
+      inc[`equipment.${equipmentKey(load.equipmentType)}`] = sign;
+    }
+
+    const day = utcDay(load.createdAt);
+    this.addDelta(updates, idOf(load.postedBy), 'broker', day, inc);
+    this.addDelta(updates, idOf(load.bookedBy), 'carrier', day, inc);
+  }
+
+  private addShipment(updates: Map<string, PendingUpdate>, shipment: RollupShipment, sign: 1 | -1): void {
+    this.addDelta(updates, idOf(shipment.postedBy), 'shipper', utcDay(shipment.createdAt), {
+      count: sign,
+      [`statusCounts.${shipment.status}`]: sign
+    });
+  }
+
+  private addDelta(updates: Map<string, PendingUpdate>, userId: string | undefined, role: DailyStatsRole, day: Date, inc: Record<string, number>): void {
+    if (!userId || !Types.ObjectId.isValid(userId)) return;
+
+    const key = `${userId}|${role}|${day.getTime()}`;
+    let update = updates.get(key);
+    if (!update) {
+      update = { filter: { userId: new Types.ObjectId(userId), role, day }, inc: {} };
+      updates.set(key, update);
+    }
+    for (const [field, value] of Object.entries(inc)) {
+      update.inc[field] = (update.inc[field] || 0) + value;
+    }
+  }
+
+  private async flush(updates: Map<string, PendingUpdate>): Promise<void> {
+    const operations = Array.from(updates.values())
+      .map(update => ({
+        filter: update.filter,
+        inc: Object.fromEntries(Object.entries(update.inc).filter(([, value]) => value !== 0))
+      }))
+      .filter(update => Object.keys(update.inc).length > 0)
+      .map(update => ({
+        updateOne: {
+          filter: update.filter,
+          // touchedAt tells a running rebuild the day changed after it started reading
+          update: { $inc: update.inc, $set: { touchedAt: new Date() } },
+          upsert: true
+        }
+      }));
+    if (operations.length === 0) return;
+
+    try {
+      await DailyUserStats.bulkWrite(operations, { ordered: false });
+    } catch (error: any) {
+      // The nightly rebuild repairs any missed delta
+      logger.error('Daily stats update failed', { error: error.message });
+    }
+  }
+
+  private loadRollupPipeline(field: 'bookedBy' | 'postedBy', role: DailyStatsRole, match: Record<string, unknown>, rebuiltAt: Date): any[] {
+    const statusSums = Object.fromEntries(
+      LOAD_STATUSES.map(status => [status, { $sum: { $cond: [{ $eq: ['$status', status] }, 1, 0] } }])
+    );
+    const statusTotals = Object.fromEntries(LOAD_STATUSES.map(status => [status, { $sum: `$${status}` }]));
+
+    return [
+      { $match: match },
+      {
+        $group: {
+          _id: {
+            userId: `$${field}`,
+            day: { $dateTrunc: { date: '$createdAt', unit: 'day' } },
+            equipment: { $replaceAll: { input: { $ifNull: ['$equipmentType', 'Unknown'] }, find: '.', replacement: '_' } }
+          },
+          count: { $sum: 1 },
+          ...statusSums,
+          revenue: { $sum: { $cond: [{ $in: ['$status', REVENUE_STATUSES] }, { $ifNull: ['$rate', 0] }, 0] } },
+          miles: { $sum: { $cond: [{ $ne: ['$status', 'cancelled'] }, { $ifNull: ['$distance', 0] }, 0] } },
+          active: { $sum: { $cond: [{ $ne: ['$status', 'cancelled'] }, 1, 0] } }
+        }
+      },
+      {
+        $group: {
+          _id: { userId: '$_id.userId', day: '$_id.day' },
+          count: { $sum: '$count' },
+          ...statusTotals,
+          revenue: { $sum: '$revenue' },
+          miles: { $sum: '$miles' },
+          equipment: { $push: { k: '$_id.equipment', v: '$active' } }
+        }
+      },
+      {
+        $project: {
+          _id: 0,
+          userId: '$_id.userId',
+          role: { $literal: role },
+          day: '$_id.day',
+          count: 1,
+          statusCounts: Object.fromEntries(LOAD_STATUSES.map(status => [status, `$${status}`])),
+          revenue: 1,
+          miles: 1,
+          equipment: { $arrayToObject: { $filter: { input: '$equipment', cond: { $gt: ['$$this.v', 0] } } } },
+          rebuiltAt: { $literal: rebuiltAt }
+        }
+      },
+      this.mergeStage()
+    ];
+  }
+
+  private shipmentRollupPipeline(match: Record<string, unknown>, rebuiltAt: Date): any[] {
+    return [
+      { $match: match },
+      {
+        $group: {
+          _id: { userId: '$postedBy', day: { $dateTrunc: { date: '$createdAt', unit: 'day' } } },
+          count: { $sum: 1 },
+          open: { $sum: { $cond: [{ $eq: ['$status', 'open'] }, 1, 0] } },
+          closed: { $sum: { $cond: [{ $eq: ['$status', 'closed'] }, 1, 0] } }
+        }
+      },
+      {
+        $project: {
+          _id: 0,
+          userId: '$_id.userId',
+          role: { $literal: 'shipper' },
+          day: '$_id.day',
+          count: 1,
+          statusCounts: { open: '$open', closed: '$closed' },
+          revenue: { $literal: 0 },
+          miles: { $literal: 0 },
+          equipment: { $literal: {} },
+          rebuiltAt: { $literal: rebuiltAt }
+        }
+      },
+      this.mergeStage()
+    ];
+  }
+
+  /**
+   * Replace matched days, except one that took a delta after the pipeline's
+   * rebuiltAt: the rebuilt figures may already include that change, so the
+   * live document is kept and the day recomputed
+   */
+  private mergeStage() {
+    return {
+      $merge: {
+        into: DailyUserStats.collection.collectionName,
+        on: ['userId', 'role', 'day'],
+        whenMatched: [
+          {
+            $replaceWith: {
+              $cond: [{ $gte: ['$touchedAt', '$$new.rebuiltAt'] }, '$$ROOT', { $mergeObjects: ['$$new', { _id: '$_id' }] }]
+            }
+          }
+        ],
+        whenNotMatched: 'insert'
+      }
+    };
+  }
+}
+
+export const dailyStatsService = new DailyStatsService();
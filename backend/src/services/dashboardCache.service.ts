@@ -0,0 +1,121 @@
+import { Shipment } from '../models/Shipment.model.js';
+import { config } from '../config/environment.js';
+import type { AccountType } from '../types/index.js';
+import { DASHBOARD_CACHE } from '../utils/constants.js';
+import { logger } from '../utils/logger.js';
+import { SwrCache, SwrCacheStats, SwrState } from '../utils/swrCache.js';
+import { loadEvents, LoadChange } from './loadEvents.service.js';
+
+export interface DashboardCacheStats extends SwrCacheStats {
+  enabled: boolean;
+}
+
+const SYSTEM_TAG = 'system';
+const userTag = (userId: string): string => `user:${userId}`;
+
+const idOf = (value: unknown): string | undefined => {
+  if (!value) return undefined;
+  if (typeof value === 'object' && '_id' in (value as Record<string, unknown>)) {
+    return String((value as { _id: unknown })._id);
+  }
+  return String(value);
+};
+
+/**
+ * Stale-while-revalidate cache for per-user dashboards and the admin system
+ * stats. Writes drop the dashboards of the users they touch, so people see
+ * their own changes at once; system stats are only marked stale, since they
+ * aggregate over everyone and are refreshed in the background anyway.
+ */
+class DashboardCacheService {
+  private cache = new SwrCache<object>('dashboard', {
+    maxBytes: DASHBOARD_CACHE.MAX_BYTES,
+    freshMs: DASHBOARD_CACHE.FRESH_MS,
+    maxAgeMs: DASHBOARD_CACHE.MAX_AGE_MS
+  });
+  private started = false;
+
+  /**
+   * Subscribe to load writes (including other instances' when change streams are on)
+   */
+  start(): void {
+    if (!config.DASHBOARD_CACHE_ENABLED || this.started) return;
+    this.started = true;
+    loadEvents.subscribe((change) => this.applyChange(change));
+    logger.info('Dashboard cache enabled', { maxBytes: DASHBOARD_CACHE.MAX_BYTES, maxAgeMs: DASHBOARD_CACHE.MAX_AGE_MS });
+  }
+
+  /**
+   * A user's dashboard for one role and time zone; `build` runs on a miss or in
+   * the background once the cached copy is stale
+   */
+  async dashboard<T extends object>(
+    role: AccountType,
+    userId: string,
+    timeZone: string,
+    build: () => Promise<T>
+  ): Promise<{ value: T; state: SwrState }> {
+    if (!config.DASHBOARD_CACHE_ENABLED) {
+      return { value: await build(), state: 'miss' };
+    }
+    return this.cache.get(`${role}:${userId}:${timeZone}`, build, [userTag(userId)]) as Promise<{ value: T; state: SwrState }>;
+  }
+
+  async systemStats<T extends object>(build: () => Promise<T>): Promise<{ value: T; state: SwrState }> {
+    if (!config.DASHBOARD_CACHE_ENABLED) {
+      return { value: await build(), state: 'miss' };
+    }
+    return this.cache.get('system-stats', build, [SYSTEM_TAG]) as Promise<{ value: T; state: SwrState }>;
+  }
+
+  /**
+   * Drop the cached dashboards of every user a write touched and age the system stats
+   */
+  invalidateUsers(...userIds: unknown[]): void {
+    if (!config.DASHBOARD_CACHE_ENABLED) return;
+
+    for (const userId of userIds) {
+      const id = idOf(userId);
+      if (id) {
+        this.cache.invalidateTag(userTag(id));
+      }
+    }
+    this.cache.invalidateTag(SYSTEM_TAG, { soft: true });
+  }
+
+  getStats(): DashboardCacheStats {
+    return { enabled: config.DASHBOARD_CACHE_ENABLED, ...this.cache.getStats() };
+  }
+
+  private applyChange(change: LoadChange): void {
+    switch (change.type) {
+      case 'reset':
+      case 'deleted':
+        // The owners of a deleted load are unknown, and a reset touches everyone
+        this.cache.clear();
+        return;
+      case 'created':
+      case 'updated': {
+        const { load } = change;
+        this.invalidateUsers(load.postedBy, load.bookedBy);
+        if (load.shipment) {
+          // The shipper's spend includes loads linked to their shipments
+          void this.invalidateShipmentOwner(idOf(load.shipment));
+        }
+        return;
+      }
+    }
+  }
+
+  private async invalidateShipmentOwner(shipmentId?: string): Promise<void> {
+    if (!shipmentId) return;
+    try {
+      const shipment = await Shipment.findById(shipmentId).select('postedBy').lean();
+      this.invalidateUsers(shipment?.postedBy);
+    } catch (error: any) {
+      logger.error('Dashboard cache shipment lookup failed', { shipmentId, error: error.message });
+    }
+  }
+}
+
+export const dashboardCacheService = new DashboardCacheService();
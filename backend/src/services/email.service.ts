@@ -2,6 +2,12 @@ import { Resend } from 'resend';
 import { config } from '../config/environment.js';
 import { logger } from '../utils/logger.js';
 
+export interface EmailMessage {
+  to: string;
+  subject: string;
+  html: string;
+}
+
 class EmailService {
   private client: Resend | null = null;
   private sender: string | null = null;
@@ -95,7 +101,7 @@ class EmailService {
     });
   }
 
-  async sendEmail(message: { to: string; subject: string; html: string }): Promise<boolean> {
+  async sendEmail(message: EmailMessage): Promise<boolean> {
     if (!this.client || !this.sender) {
       logger.warn('Resend client not available - email not sent');
       return false;
@@ -129,6 +135,44 @@ class EmailService {
     }
   }
 
+  /**
+   * Send up to 100 emails in one provider call (all or none). A repeated
+   * idempotency key with the same payload within 24h is not sent again. A key
+   * reused with a different payload is rejected and counts as not sent: the
+   * caller cannot tell which of the recipients the original request covered.
+   */
+  async sendBatch(messages: EmailMessage[], idempotencyKey?: string): Promise<boolean> {
+    if (messages.length === 0) return true;
+    if (!this.client || !this.sender) {
+      logger.warn('Resend client not available - email batch not sent', { count: messages.length });
+      return false;
+    }
+
+    try {
+      const { data: responseData, error } = await this.client.batch.send(
+        messages.map(message => ({ from: this.sender!, to: message.to, subject: message.subject, html: message.html })),
+        idempotencyKey ? { idempotencyKey } : undefined
+      );
+
+      if (error) {
+        throw new Error(error.message ?? 'Unknown Resend error');
+      }
+
+      logger.info('Email batch sent successfully via Resend', {
+        count: messages.length,
+        ids: responseData?.data?.length ?? 0
+      });
+      return true;
+    } catch (error: any) {
+      logger.error('Resend batch sending failed', {
+        count: messages.length,
+        idempotencyKey,
+        error: error?.message || error
+      });
+      return false;
+    }
+  }
+
   isConfigured(): boolean {
     return this.client !== null && !!this.sender;
   }
@@ -0,0 +1,425 @@
+import { Model, Types } from 'mongoose';
+import { Duplex, Readable, Transform, TransformCallback } from 'stream';
+import { createGzip } from 'zlib';
+import { RecordBatchFileWriter } from 'apache-arrow';
+import { Load } from '../models/Load.model.js';
+import { Message } from '../models/Message.model.js';
+import { Shipment } from '../models/Shipment.model.js';
+import { User } from '../models/User.model.js';
+import { ArrowBatchEncoder, ArrowColumn } from '../utils/arrowBatches.js';
+
+export type ExportCollection = 'users' | 'loads' | 'shipments' | 'messages';
+// 'arrow' is the Arrow IPC file format (Feather v2), for collections with typed columns
+export type ExportFormat = 'csv' | 'ndjson' | 'json' | 'arrow';
+
+export const EXPORT_FORMATS: ExportFormat[] = ['csv', 'ndjson', 'json', 'arrow'];
+
+export interface ExportFilters {
+  /** Inclusive lower bound on createdAt */
+  from?: Date;
+  /** Exclusive upper bound on createdAt */
+  to?: Date;
+  status?: string[];
+}
+
+export interface ExportOptions {
+  format: ExportFormat;
+  gzip: boolean;
+  filters: ExportFilters;
+}
+
+export type ExportRecord = Record<string, unknown>;
+
+export interface ExportEncoderOptions {
+  // CSV columns; taken from the first record when omitted
+  fields?: string[];
+  // Write the CSV header row (off for the continuation parts of an export job)
+  header?: boolean;
+}
+
+interface ExportDefinition {
+  model: Model<any>;
+  // Key of the record array (and `total<Key>` count) in the JSON envelope
+  jsonKey: string;
+  totalKey: string;
+  // Field the `status` filter applies to and its accepted values
+  statusField: string;
+  statuses: string[];
+  // Mongo filter for one status value, when it is not a plain field match
+  statusFilter?: (status: string) => Record<string, unknown>;
+  select?: string;
+  toRecord: (doc: any) => ExportRecord;
+  // Typed columns for the arrow format, and the fields they read
+  columns?: ArrowColumn[];
+  columnSelect?: string;
+}
+
+const CURSOR_BATCH_SIZE = 1000;
+const RECORD_BATCH_ROWS = 10000;
+
+const LOAD_STATUSES = ['available', 'booked', 'in_transit', 'delivered', 'cancelled'];
+const SHIPMENT_STATUSES = ['open', 'closed'];
+
+const isoDate = (value: unknown): string => (value ? new Date(value as string | Date).toISOString() : '');
+
+const EXPORTS: Record<ExportCollection, ExportDefinition> = {
+  users: {
+    model: User,
+    jsonKey: 'users',
+    totalKey: 'totalUsers',
+    statusField: 'isActive',
+    statuses: ['active', 'inactive'],
+    statusFilter: status => (status === 'active' ? { isActive: { $ne: false } } : { isActive: false }),
+    // Credentials never leave the database
+    select: '-password -emailVerificationToken -emailVerificationCodeHash',
+    toRecord: user => user
+  },
+  loads: {
+    model: Load,
+    jsonKey: 'loads',
+    totalKey: 'totalLoads',
+    statusField: 'status',
+    statuses: LOAD_STATUSES,
+    select: 'title status equipmentType weight rate rateType origin destination pickupDate deliveryDate bookedAt billingStatus createdAt updatedAt',
+    toRecord: load => ({
+      title: load.title,
+      status: load.status,
+      equipmentType: load.equipmentType,
+      weight: load.weight,
+      rate: load.rate,
+      rateType: load.rateType,
+      originCity: load.origin?.city,
+      originState: load.origin?.state,
+      originZip: load.origin?.zip,
+      destinationCity: load.destination?.city,
+      destinationState: load.destination?.state,
+      destinationZip: load.destination?.zip,
+      pickupDate: isoDate(load.pickupDate),
+      deliveryDate: isoDate(load.deliveryDate),
+      bookedAt: isoDate(load.bookedAt),
+      billingStatus: load.billingStatus,
+      createdAt: isoDate(load.createdAt),
+      updatedAt: isoDate(load.updatedAt)
+    }),
+    columns: [
+      { name: 'id', type: 'utf8', value: load => load._id },
+      { name: 'title', type: 'utf8', value: load => load.title },
+      { name: 'status', type: 'dictionary', dictionary: LOAD_STATUSES, value: load => load.status },
+      { name: 'equipmentType', type: 'utf8', value: load => load.equipmentType },
+      { name: 'weight', type: 'float64', value: load => load.weight },
+      { name: 'rate', type: 'float64', value: load => load.rate },
+      { name: 'rateType', type: 'dictionary', dictionary: ['per_mile', 'flat_rate'], value: load => load.rateType },
+      { name: 'agreedRate', type: 'float64', value: load => load.agreedRate },
+      { name: 'distance', type: 'float64', value: load => load.distance },
+      { name: 'originCity', type: 'utf8', value: load => load.origin?.city },
+      { name: 'originState', type: 'utf8', value: load => load.origin?.state },
+      { name: 'originZip', type: 'utf8', value: load => load.origin?.zip },
+      { name: 'destinationCity', type: 'utf8', value: load => load.destination?.city },
+      { name: 'destinationState', type: 'utf8', value: load => load.destination?.state },
+      { name: 'destinationZip', type: 'utf8', value: load => load.destination?.zip },
+      { name: 'pickupDate', type: 'timestamp', value: load => load.pickupDate },
+      { name: 'deliveryDate', type: 'timestamp', value: load => load.deliveryDate },
+      { name: 'bookedAt', type: 'timestamp', value: load => load.bookedAt },
+      { name: 'billingStatus', type: 'dictionary', dictionary: ['not_ready', 'ready', 'invoiced', 'paid'], value: load => load.billingStatus },
+      { name: 'postedBy', type: 'utf8', value: load => load.postedBy },
+      { name: 'bookedBy', type: 'utf8', value: load => load.bookedBy },
+      { name: 'shipment', type: 'utf8', value: load => load.shipment },
+      { name: 'createdAt', type: 'timestamp', value: load => load.createdAt },
+      { name: 'updatedAt', type: 'timestamp', value: load => load.updatedAt }
+    ],
+    columnSelect: 'title status equipmentType weight rate rateType agreedRate distance origin destination pickupDate deliveryDate bookedAt billingStatus postedBy bookedBy shipment createdAt updatedAt'
+  },
+  shipments: {
+    model: Shipment,
+    jsonKey: 'shipments',
+    totalKey: 'totalShipments',
+    statusField: 'status',
+    statuses: SHIPMENT_STATUSES,
+    select: 'shipmentId title status description pickup delivery createdAt updatedAt',
+    toRecord: shipment => ({
+      shipmentId: shipment.shipmentId,
+      title: shipment.title,
+      status: shipment.status,
+      description: shipment.description || '',
+      pickupCity: shipment.pickup?.city,
+      pickupState: shipment.pickup?.state,
+      pickupZip: shipment.pickup?.zip,
+      deliveryCity: shipment.delivery?.city,
+      deliveryState: shipment.delivery?.state,
+      deliveryZip: shipment.delivery?.zip,
+      createdAt: isoDate(shipment.createdAt),
+      updatedAt: isoDate(shipment.updatedAt)
+    }),
+    columns: [
+      { name: 'id', type: 'utf8', value: shipment => shipment._id },
+      { name: 'shipmentId', type: 'utf8', value: shipment => shipment.shipmentId },
+      { name: 'title', type: 'utf8', value: shipment => shipment.title },
+      { name: 'status', type: 'dictionary', dictionary: SHIPMENT_STATUSES, value: shipment => shipment.status },
+      { name: 'pickupCity', type: 'utf8', value: shipment => shipment.pickup?.city },
+      { name: 'pickupState', type: 'utf8', value: shipment => shipment.pickup?.state },
+      { name: 'pickupZip', type: 'utf8', value: shipment => shipment.pickup?.zip },
+      { name: 'deliveryCity', type: 'utf8', value: shipment => shipment.delivery?.city },
+      { name: 'deliveryState', type: 'utf8', value: shipment => shipment.delivery?.state },
+      { name: 'deliveryZip', type: 'utf8', value: shipment => shipment.delivery?.zip },
+      { name: 'postedBy', type: 'utf8', value: shipment => shipment.postedBy },
+      { name: 'createdAt', type: 'timestamp', value: shipment => shipment.createdAt },
+      { name: 'updatedAt', type: 'timestamp', value: shipment => shipment.updatedAt }
+    ],
+    columnSelect: 'shipmentId title status pickup delivery postedBy createdAt updatedAt'
+  },
+  // Message metadata only; subjects and bodies are private to the participants
+  messages: {
+    model: Message,
+    jsonKey: 'messages',
+    totalKey: 'totalMessages',
+    statusField: 'isRead',
+    statuses: ['read', 'unread'],
+    statusFilter: status => ({ isRead: status === 'read' }),
+    select: 'sender receiver load isRead isEdited editedAt attachments createdAt',
+    toRecord: message => ({
+      id: String(message._id),
+      sender: String(message.sender),
+      receiver: String(message.receiver),
+      load: message.load ? String(message.load) : '',
+      isRead: Boolean(message.isRead),
+      isEdited: Boolean(message.isEdited),
+      attachmentCount: message.attachments?.length ?? 0,
+      createdAt: isoDate(message.createdAt),
+      editedAt: isoDate(message.editedAt)
+    }),
+    columns: [
+      { name: 'id', type: 'utf8', value: message => message._id },
+      { name: 'sender', type: 'utf8', value: message => message.sender },
+      { name: 'receiver', type: 'utf8', value: message => message.receiver },
+      { name: 'load', type: 'utf8', value: message => message.load },
+      { name: 'isRead', type: 'bool', value: message => message.isRead },
+      { name: 'isEdited', type: 'bool', value: message => message.isEdited },
+      { name: 'attachmentCount', type: 'int32', value: message => message.attachments?.length ?? 0 },
+      { name: 'createdAt', type: 'timestamp', value: message => message.createdAt },
+      { name: 'editedAt', type: 'timestamp', value: message => message.editedAt }
+    ],
+    columnSelect: 'sender receiver load isRead isEdited editedAt attachments createdAt'
+  }
+};
+
+const csvCell = (value: unknown): string => {
+  if (value === undefined || value === null) return '';
+  const text =
+    value instanceof Date ? value.toISOString()
+      : value instanceof Types.ObjectId ? value.toHexString()
+        : typeof value === 'object' ? JSON.stringify(value)
+          : String(value);
+  return /[",\r\n]/.test(text) ? `"${text.replace(/"/g, '""')}"` : text;
+};
+
+/**
+ * Object-mode records in, encoded text out. CSV columns come from the first
+ * record unless given; the JSON envelope is written incrementally with the
+ * total at the end.
+ */
+export class ExportEncoder extends Transform {
+  private fields: string[] | null;
+  private readonly header: boolean;
+  private count = 0;
+
+  constructor(
+    private readonly format: ExportFormat,
+    private readonly definition: Pick<ExportDefinition, 'jsonKey' | 'totalKey'>,
+    options: ExportEncoderOptions = {}
+  ) {
+    super({ writableObjectMode: true });
+    this.fields = options.fields ?? null;
+    this.header = options.header ?? true;
+  }
+
+  get records(): number {
+    return this.count;
+  }
+
+  // CSV columns in use; null until the first record when not given
+  get columns(): string[] | null {
+    return this.fields;
+  }
+
+  _transform(record: ExportRecord, _encoding: BufferEncoding, callback: TransformCallback): void {
+    let chunk: string;
+    switch (this.format) {
+      case 'csv':
+        if (!this.fields) {
+          this.fields = Object.keys(record);
+        }
+        chunk = this.count === 0 && this.header ? `${this.fields.join(',')}\n` : '';
+        chunk += `${this.fields.map(field => csvCell(record[field])).join(',')}\n`;
+        break;
+      case 'ndjson':
+        chunk = `${JSON.stringify(record)}\n`;
+        break;
+      case 'json':
+      default:
+        chunk = `${this.count === 0 ? `{"exportDate":${JSON.stringify(new Date().toISOString())},"${this.definition.jsonKey}":[` : ','}${JSON.stringify(record)}`;
+        break;
+    }
+    this.count++;
+    callback(null, chunk);
+  }
+
+  _flush(callback: TransformCallback): void {
+    if (this.format === 'json') {
+      const head = this.count === 0 ? `{"exportDate":${JSON.stringify(new Date().toISOString())},"${this.definition.jsonKey}":[` : '';
+      callback(null, `${head}],"${this.definition.totalKey}":${this.count}}`);
+      return;
+    }
+    callback();
+  }
+}
+
+export const EXPORT_CONTENT_TYPES: Record<ExportFormat, string> = {
+  csv: 'text/csv',
+  ndjson: 'application/x-ndjson',
+  json: 'application/json',
+  arrow: 'application/vnd.apache.arrow.file'
+};
+
+const COLUMNAR_COLLECTIONS = (Object.keys(EXPORTS) as ExportCollection[]).filter(collection => EXPORTS[collection].columns);
+
+export function isExportCollection(value: string): value is ExportCollection {
+  return value in EXPORTS;
+}
+
+/**
+ * Admin exports streamed from a MongoDB cursor, so memory stays flat whatever
+ * the collection size
+ */
+class ExportService {
+  /**
+   * Parse ?format=&gzip=&from=&to=&status= for a collection; returns an error message for bad input
+   */
+  parseOptions(collection: ExportCollection, query: Record<string, unknown>): ExportOptions | { error: string } {
+    const format = (typeof query.format === 'string' ? query.format.toLowerCase() : 'json') as ExportFormat;
+    if (!EXPORT_FORMATS.includes(format)) {
+      return { error: `format must be one of ${EXPORT_FORMATS.join(', ')}` };
+    }
+
+    if (format === 'arrow' && !EXPORTS[collection].columns) {
+      return { error: `arrow format is available for ${COLUMNAR_COLLECTIONS.join(', ')}` };
+    }
+
+    const gzip = ['1', 'true', 'yes'].includes(String(query.gzip ?? '').toLowerCase());
+    const filters: ExportFilters = {};
+
+    for (const bound of ['from', 'to'] as const) {
+      if (typeof query[bound] === 'string' && query[bound]) {
+        const date = new Date(query[bound] as string);
+        if (Number.isNaN(date.getTime())) {
+          return { error: `${bound} must be a date` };
+        }
+        filters[bound] = date;
+      }
+    }
+
+    if (query.status !== undefined) {
+      const statuses = ([] as unknown[]).concat(query.status).flatMap(value => String(value).split(',')).map(value => value.trim()).filter(Boolean);
+      const allowed = EXPORTS[collection].statuses;
+      const invalid = statuses.filter(status => !allowed.includes(status));
+      if (invalid.length > 0) {
+        return { error: `status must be one of ${allowed.join(', ')}` };
+      }
+      filters.status = statuses;
+    }
+
+    return { format, gzip, filters };
+  }
+
+  /**
+   * Mongo filter for an export; `extra` is merged in (e.g. an _id range)
+   */
+  filter(collection: ExportCollection, filters: ExportFilters, extra: Record<string, unknown> = {}): Record<string, unknown> {
+    const definition = EXPORTS[collection];
+    const filter: Record<string, unknown> = { ...extra };
+
+    if (filters.from || filters.to) {
+      filter.createdAt = {
+        ...(filters.from ? { $gte: filters.from } : {}),
+        ...(filters.to ? { $lt: filters.to } : {})
+      };
+    }
+    if (filters.status?.length) {
+      if (definition.statusFilter) {
+        filter.$or = filters.status.map(definition.statusFilter);
+      } else {
+        filter[definition.statusField] = { $in: filters.status };
+      }
+    }
+    return filter;
+  }
+
+  /**
+   * Lean cursor over the export's documents in _id order, mapped to records.
+   * Backpressure reaches MongoDB: the cursor fetches the next batch only when read.
+   */
+  records(collection: ExportCollection, filters: ExportFilters, extra: Record<string, unknown> = {}): Readable {
+    const definition = EXPORTS[collection];
+    return this.cursor(collection, filters, extra, definition.select)
+      .map((doc: any) => definition.toRecord(doc)) as unknown as Readable;
+  }
+
+  encoder(collection: ExportCollection, format: ExportFormat, options: ExportEncoderOptions = {}): ExportEncoder {
+    return new ExportEncoder(format, EXPORTS[collection], options);
+  }
+
+  count(collection: ExportCollection, filters: ExportFilters): Promise<number> {
+    return EXPORTS[collection].model.countDocuments(this.filter(collection, filters));
+  }
+
+  /**
+   * _id of the last document in the next chunk of up to `size` documents after
+   * `after` (from the start when null); null once no documents remain
+   */
+  async chunkEnd(collection: ExportCollection, filters: ExportFilters, after: Types.ObjectId | null, size: number): Promise<Types.ObjectId | null> {
+    const { model } = EXPORTS[collection];
+    const filter = this.filter(collection, filters, after ? { _id: { $gt: after } } : {});
+    const [end] = await model.find(filter).sort({ _id: 1 }).skip(size - 1).limit(1).select('_id').lean<Array<{ _id: Types.ObjectId }>>();
+    if (end) return end._id;
+
+    // Fewer than `size` left: the chunk runs to the last one
+    const [last] = await model.find(filter).sort({ _id: -1 }).limit(1).select('_id').lean<Array<{ _id: Types.ObjectId }>>();
+    return last?._id ?? null;
+  }
+
+  /**
+   * Record stream → encoder (→ gzip) stages, to hand to stream.pipeline. The
+   * arrow format streams documents into record batches and an IPC file writer.
+   */
+  pipeline(collection: ExportCollection, options: ExportOptions): { stages: Array<Readable | Transform | Duplex>; encoder: { readonly records: number } } {
+    const definition = EXPORTS[collection];
+    let stages: Array<Readable | Transform | Duplex>;
+    let encoder: { readonly records: number };
+
+    if (options.format === 'arrow' && definition.columns) {
+      const batches = new ArrowBatchEncoder(definition.columns, RECORD_BATCH_ROWS);
+      // Never read whole documents: fall back to the text formats' projection
+      stages = [this.cursor(collection, options.filters, {}, definition.columnSelect ?? definition.select), batches, RecordBatchFileWriter.throughNode()];
+      encoder = batches;
+    } else {
+      const text = this.encoder(collection, options.format);
+      stages = [this.records(collection, options.filters), text];
+      encoder = text;
+    }
+
+    if (options.gzip) {
+      stages.push(createGzip());
+    }
+    return { stages, encoder };
+  }
+
+  private cursor(collection: ExportCollection, filters: ExportFilters, extra: Record<string, unknown>, select?: string) {
+    const query = EXPORTS[collection].model.find(this.filter(collection, filters, extra)).sort({ _id: 1 }).lean();
+    if (select) {
+      query.select(select);
+    }
+    return query.cursor({ batchSize: CURSOR_BATCH_SIZE });
+  }
+}
+
+export const exportService = new ExportService();
+
@@ -0,0 +1,352 @@
+import { CronJob } from 'cron';
+import { createReadStream, createWriteStream } from 'fs';
+import { mkdir, rename, rm, stat } from 'fs/promises';
+import { hostname } from 'os';
+import path from 'path';
+import { pipeline } from 'stream/promises';
+import { createGzip, gzipSync } from 'zlib';
+import { config } from '../config/environment.js';
+import { ExportJob, ExportJobFormat, ExportJobStatus, IExportJob } from '../models/ExportJob.model.js';
+import { EXPORT_JOBS } from '../utils/constants.js';
+import { logger } from '../utils/logger.js';
+import { ExportCollection, ExportFilters, exportService } from './export.service.js';
+import { websocketService } from './websocket.service.js';
+
+export const EXPORT_JOB_FORMATS: ExportJobFormat[] = ['csv', 'ndjson'];
+
+export interface ExportJobView {
+  id: string;
+  collection: ExportCollection;
+  format: ExportJobFormat;
+  filters: ExportFilters;
+  status: ExportJobStatus;
+  total: number;
+  processed: number;
+  // 0-100; the total is counted at submission, so this is an estimate on a live collection
+  progress: number;
+  chunksCompleted: number;
+  attempts: number;
+  error?: string;
+  fileName?: string;
+  fileSize?: number;
+  createdAt: Date;
+  startedAt?: Date;
+  completedAt?: Date;
+  expiresAt?: Date;
+}
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+
+const partName = (index: number): string => `part-${String(index).padStart(6, '0')}.gz`;
+
+/**
+ * Background admin exports. A worker claims queued jobs from MongoDB and writes
+ * each _id-range chunk as a gzip part (written to a temp name, then renamed)
+ * before recording the chunk on the job, so a failed or interrupted job resumes
+ * after its last completed chunk. Gzip members concatenate into a valid gzip
+ * stream, so the finished file is the parts joined in order. Progress goes to
+ * the requesting admin over the websocket after every chunk.
+ */
+class ExportJobService {
+  private readonly workerId = `${hostname()}:${process.pid}`;
+  private pollJob: CronJob | null = null;
+  private cleanupJob: CronJob | null = null;
+  private polling: Promise<void> | null = null;
+
+  start(): void {
+    if (this.pollJob) return;
+
+    this.pollJob = new CronJob(EXPORT_JOBS.POLL_CRON, async () => {
+      await this.poll();
+    });
+    this.cleanupJob = new CronJob(EXPORT_JOBS.CLEANUP_CRON, async () => {
+      try {
+        await this.cleanup();
+      } catch (error: any) {
+        logger.error('Export job cleanup failed', { error: error.message });
+      }
+    });
+    this.pollJob.start();
+    this.cleanupJob.start();
+
+    void this.poll();
+  }
+
+  stop(): void {
+    this.pollJob?.stop();
+    this.cleanupJob?.stop();
+    this.pollJob = null;
+    this.cleanupJob = null;
+  }
+
+  async submit(collection: ExportCollection, format: ExportJobFormat, filters: ExportFilters, requestedBy: string): Promise<ExportJobView> {
+    const total = await exportService.count(collection, filters);
+    const job = await ExportJob.create({ collectionName: collection, format, filters, requestedBy, total });
+    logger.info('Export job queued', { jobId: job.id, collection, format, total });
+
+    void this.poll();
+    return exportJobView(job);
+  }
+
+  async get(id: string): Promise<IExportJob | null> {
+    return ExportJob.findById(id);
+  }
+
+  async list(limit: number): Promise<ExportJobView[]> {
+    const jobs = await ExportJob.find().sort({ createdAt: -1 }).limit(limit);
+    return jobs.map(exportJobView);
+  }
+
+  /**
+   * Requeue a failed job; it continues after its last completed chunk
+   */
+  async resume(id: string): Promise<ExportJobView | null> {
+    const job = await ExportJob.findOneAndUpdate(
+      { _id: id, status: 'failed' },
+      { $set: { status: 'queued', attempts: 0, runAfter: new Date() }, $unset: { error: 1, expiresAt: 1 } },
+      { new: true }
+    );
+    if (!job) return null;
+
+    void this.poll();
+    return exportJobView(job);
+  }
+
+  /**
+   * Delete a job and its files. A worker running it stops at its next chunk.
+   */
+  async remove(id: string): Promise<boolean> {
+    const job = await ExportJob.findByIdAndDelete(id);
+    if (!job) return false;
+    await this.removeFiles(job);
+    return true;
+  }
+
+  filePath(job: IExportJob): string {
+    return path.join(config.EXPORT_DIR, `${job.id}.${job.format}.gz`);
+  }
+
+  fileName(job: IExportJob): string {
+    return `${job.collectionName}-${job.createdAt.toISOString().replace(/[:.]/g, '-')}.${job.format}.gz`;
+  }
+
+  /**
+   * Run claimable jobs one at a time until none are left. Concurrent calls share one run.
+   */
+  poll(): Promise<void> {
+    if (!this.polling) {
+      this.polling = this.drain().finally(() => {
+        this.polling = null;
+      });
+    }
+    return this.polling;
+  }
+
+  /**
+   * Remove finished and failed jobs past their retention, with their files
+   */
+  async cleanup(): Promise<number> {
+    const expired = await ExportJob.find({ expiresAt: { $lte: new Date() } });
+    for (const job of expired) {
+      await this.removeFiles(job);
+      await job.deleteOne();
+    }
+    if (expired.length > 0) {
+      logger.info('Expired export jobs removed', { count: expired.length });
+    }
+    return expired.length;
+  }
+
+  private async drain(): Promise<void> {
+    try {
+      let job = await this.claim();
+      while (job) {
+        await this.run(job);
+        job = await this.claim();
+      }
+    } catch (error: any) {
+      logger.error('Export job poll failed', { error: error.message });
+    }
+  }
+
+  private claim(): Promise<IExportJob | null> {
+    const now = new Date();
+    return ExportJob.findOneAndUpdate(
+      {
+        $or: [
+          { status: 'queued', runAfter: { $lte: now } },
+          { status: 'running', heartbeatAt: { $lt: new Date(now.getTime() - EXPORT_JOBS.STALE_MS) } }
+        ]
+      },
+      { $set: { status: 'running', lockedBy: this.workerId, heartbeatAt: now }, $inc: { attempts: 1 } },
+      { sort: { createdAt: 1 }, new: true }
+    );
+  }
+
+  private async run(job: IExportJob): Promise<void> {
+    const startedAt = Date.now();
+    if (!job.startedAt) {
+      job.startedAt = new Date(startedAt);
+      await ExportJob.updateOne({ _id: job._id, lockedBy: this.workerId }, { $set: { startedAt: job.startedAt } });
+    }
+    logger.info('Export job started', { jobId: job.id, resumeFromChunk: job.chunksCompleted, attempt: job.attempts });
+    this.notify(job);
+
+    try {
+      const current = await this.writeParts(job);
+      if (!current) {
+        logger.info('Export job stopped (removed or reclaimed)', { jobId: job.id });
+        return;
+      }
+      await this.finish(current);
+      logger.info('Export job completed', { jobId: job.id, records: current.processed, durationMs: Date.now() - startedAt });
+    } catch (error: any) {
+      await this.fail(job, error);
+    }
+  }
+
+  /**
+   * Write the remaining chunks; returns the job after the last one, or null if
+   * this worker lost it (deleted, or reclaimed after a stale heartbeat)
+   */
+  private async writeParts(job: IExportJob): Promise<IExportJob | null> {
+    const collection = job.collectionName;
+    const filters = toFilters(job);
+    const dir = this.partsDir(job);
+    await mkdir(dir, { recursive: true });
+
+    let current = job;
+    for (;;) {
+      const after = current.lastId ?? null;
+      const end = await exportService.chunkEnd(collection, filters, after, EXPORT_JOBS.CHUNK_SIZE);
+      if (!end) return current;
+
+      const fields = current.fields.length > 0 ? current.fields : undefined;
+      const encoder = exportService.encoder(collection, current.format, { fields, header: !fields });
+      const range = after ? { $gt: after, $lte: end } : { $lte: end };
+      const part = path.join(dir, partName(current.chunksCompleted));
+
+      await pipeline(
+        exportService.records(collection, filters, { _id: range }),
+        encoder,
+        createGzip(),
+        createWriteStream(`${part}.tmp`)
+      );
+      await rename(`${part}.tmp`, part);
+
+      const next = await ExportJob.findOneAndUpdate(
+        { _id: current._id, lockedBy: this.workerId, status: 'running' },
+        {
+          $set: { lastId: end, fields: encoder.columns ?? [], heartbeatAt: new Date() },
+          $inc: { chunksCompleted: 1, processed: encoder.records }
+        },
+        { new: true }
+      );
+      if (!next) return null;
+
+      current = next;
+      this.notify(current);
+    }
+  }
+
+  private async finish(job: IExportJob): Promise<void> {
+    const dir = this.partsDir(job);
+    const file = this.filePath(job);
+    const parts = Array.from({ length: job.chunksCompleted }, (_, i) => path.join(dir, partName(i)));
+
+    // An export with no documents is still a valid (empty) gzip file
+    await pipeline(
+      async function* () {
+        if (parts.length === 0) {
+          yield gzipSync(Buffer.alloc(0));
+        }
+        for (const part of parts) {
+          yield* createReadStream(part);
+        }
+      },
+      createWriteStream(`${file}.tmp`)
+    );
+    await rename(`${file}.tmp`, file);
+    const { size } = await stat(file);
+
+    const now = new Date();
+    const done = await ExportJob.findOneAndUpdate(
+      { _id: job._id, lockedBy: this.workerId, status: 'running' },
+      {
+        $set: { status: 'completed', fileSize: size, completedAt: now, expiresAt: new Date(now.getTime() + EXPORT_JOBS.RETENTION_DAYS * DAY_MS) },
+        $unset: { lockedBy: 1, heartbeatAt: 1, error: 1 }
+      },
+      { new: true }
+    );
+    if (!done) {
+      await rm(file, { force: true });
+      return;
+    }
+    await rm(dir, { recursive: true, force: true });
+    this.notify(done);
+  }
+
+  private async fail(job: IExportJob, error: any): Promise<void> {
+    const retry = job.attempts < EXPORT_JOBS.MAX_ATTEMPTS;
+    logger.error('Export job failed', { jobId: job.id, attempt: job.attempts, retry, error: error.message });
+
+    const now = Date.now();
+    const failed = await ExportJob.findOneAndUpdate(
+      { _id: job._id, lockedBy: this.workerId, status: 'running' },
+      retry
+        ? { $set: { status: 'queued', error: error.message, runAfter: new Date(now + job.attempts * EXPORT_JOBS.RETRY_DELAY_MS) }, $unset: { lockedBy: 1, heartbeatAt: 1 } }
+        : { $set: { status: 'failed', error: error.message, expiresAt: new Date(now + EXPORT_JOBS.RETENTION_DAYS * DAY_MS) }, $unset: { lockedBy: 1, heartbeatAt: 1 } },
+      { new: true }
+    );
+    if (failed) this.notify(failed);
+  }
+
+  private async removeFiles(job: IExportJob): Promise<void> {
+    await rm(this.partsDir(job), { recursive: true, force: true });
+    await rm(this.filePath(job), { force: true });
+  }
+
+  private partsDir(job: IExportJob): string {
+    return path.join(config.EXPORT_DIR, String(job._id));
+  }
+
+  private notify(job: IExportJob): void {
+    websocketService.emitToUser(job.requestedBy.toString(), 'export_job_progress', exportJobView(job));
+  }
+}
+
+function toFilters(job: IExportJob): ExportFilters {
+  const { from, to, status } = job.filters ?? {};
+  return {
+    ...(from ? { from } : {}),
+    ...(to ? { to } : {}),
+    ...(status?.length ? { status: [...status] } : {})
+  };
+}
+
+export function exportJobView(job: IExportJob): ExportJobView {
+  const progress = job.status === 'completed' ? 100
+    : job.total > 0 ? Math.min(Math.floor((job.processed / job.total) * 100), 99)
+      : 0;
+  return {
+    id: job.id,
+    collection: job.collectionName,
+    format: job.format,
+    filters: toFilters(job),
+    status: job.status,
+    total: job.total,
+    processed: job.processed,
+    progress,
+    chunksCompleted: job.chunksCompleted,
+    attempts: job.attempts,
+    error: job.error,
+    fileName: job.status === 'completed' ? exportJobService.fileName(job) : undefined,
+    fileSize: job.fileSize,
+    createdAt: job.createdAt,
+    startedAt: job.startedAt,
+    completedAt: job.completedAt,
+    expiresAt: job.expiresAt
+  };
+}
+
+export const exportJobService = new ExportJobService();
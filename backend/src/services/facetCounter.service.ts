@@ -0,0 +1,167 @@
+import { CronJob } from 'cron';
+import { Load } from '../models/Load.model.js';
+import { loadEvents, LoadChange, LoadSnapshot } from './loadEvents.service.js';
+import { logger } from '../utils/logger.js';
+
+export type FacetName = 'origin' | 'destination' | 'equipment';
+
+export interface FacetCount {
+  value: string;
+  count: number;
+}
+
+type FacetMaps = Record<FacetName, Map<string, number>>;
+
+const FACETS: FacetName[] = ['origin', 'destination', 'equipment'];
+
+function emptyMaps(): FacetMaps {
+  return { origin: new Map(), destination: new Map(), equipment: new Map() };
+}
+
+function facetValues(load: Pick<LoadSnapshot, 'origin' | 'destination' | 'equipmentType'>): Record<FacetName, string | undefined> {
+  return {
+    origin: load.origin?.state,
+    destination: load.destination?.state,
+    equipment: load.equipmentType
+  };
+}
+
+/**
+ * Incrementally maintained counts of non-cancelled loads per origin state,
+ * destination state and equipment type. Updated from load change events;
+ * a periodic reconcile recomputes them from MongoDB to repair drift.
+ */
+class FacetCounterService {
+  private counts: FacetMaps = emptyMaps();
+  private sorted: Partial<Record<FacetName, FacetCount[]>> = {};
+  private ready = false;
+  private cronJob: CronJob | null = null;
+  private unsubscribe: (() => void) | null = null;
+
+  /**
+   * Subscribe to load events, seed counters and schedule reconciliation
+   */
+  async start(): Promise<void> {
+    if (this.cronJob) return;
+
+    this.unsubscribe = loadEvents.subscribe((change) => this.applyChange(change));
+
+    // Reconcile every 10 minutes
+    this.cronJob = new CronJob('*/10 * * * *', async () => {
+      await this.reconcile();
+    });
+    this.cronJob.start();
+
+    await this.reconcile();
+  }
+
+  stop(): void {
+    this.cronJob?.stop();
+    this.cronJob = null;
+    this.unsubscribe?.();
+    this.unsubscribe = null;
+  }
+
+  isReady(): boolean {
+    return this.ready;
+  }
+
+  /**
+   * Top values for a facet, highest count first
+   */
+  top(facet: FacetName, limit: number): FacetCount[] {
+    let sorted = this.sorted[facet];
+    if (!sorted) {
+      sorted = Array.from(this.counts[facet].entries())
+        .filter(([, count]) => count > 0)
+        .map(([value, count]) => ({ value, count }))
+        .sort((a, b) => b.count - a.count);
+      this.sorted[facet] = sorted;
+    }
+    return sorted.slice(0, limit);
+  }
+
+  /**
+   * Recompute all counters from MongoDB in one aggregation
+   */
+  async reconcile(): Promise<void> {
+    try {
+      const [result] = await Load.aggregate([
+        { $match: { status: { $ne: 'cancelled' } } },
+        {
+          $facet: {
+            origin: [{ $group: { _id: '$origin.state', count: { $sum: 1 } } }],
+            destination: [{ $group: { _id: '$destination.state', count: { $sum: 1 } } }],
+            equipment: [{ $group: { _id: '$equipmentType', count: { $sum: 1 } } }]
+          }
+        }
+      ]);
+
+      const next = emptyMaps();
+      let drift = 0;
+
+      for (const facet of FACETS) {
+        for (const row of (result?.[facet] ?? []) as Array<{ _id: string | null; count: number }>) {
+          if (!row._id) continue;
+          next[facet].set(row._id, row.count);
+        }
+        if (this.ready) {
+          const keys = new Set([...next[facet].keys(), ...this.counts[facet].keys()]);
+          for (const key of keys) {
+            drift += Math.abs((next[facet].get(key) ?? 0) - (this.counts[facet].get(key) ?? 0));
+          }
+        }
+      }
+
+      this.counts = next;
+      this.sorted = {};
+      this.ready = true;
+
+      if (drift > 0) {
+        logger.warn('Facet counters drift repaired', { drift });
+      } else {
+        logger.debug('Facet counters reconciled');
+      }
+    } catch (error: any) {
+      logger.error('Facet counter reconcile failed', { error: error.message });
+    }
+  }
+
+  private applyChange(change: LoadChange): void {
+    if (!this.ready) return;
+
+    switch (change.type) {
+      case 'created':
+        if (change.load.status !== 'cancelled') this.adjust(change.load, 1);
+        break;
+      case 'updated': {
+        // Without the previous status (e.g. change streams) the periodic reconcile repairs counts
+        if (!change.previousStatus) break;
+        const wasCounted = change.previousStatus !== 'cancelled';
+        const isCounted = change.load.status !== 'cancelled';
+        if (wasCounted && !isCounted) this.adjust(change.load, -1);
+        else if (!wasCounted && isCounted) this.adjust(change.load, 1);
+        break;
+      }
+      case 'reset':
+        void this.reconcile();
+        break;
+      default:
+        break;
+    }
+  }
+
+  private adjust(load: LoadSnapshot, delta: number): void {
+    const values = facetValues(load);
+    for (const facet of FACETS) {
+      const value = values[facet];
+      if (!value) continue;
+      const next = (this.counts[facet].get(value) ?? 0) + delta;
+      if (next > 0) this.counts[facet].set(value, next);
+      else this.counts[facet].delete(value);
+      delete this.sorted[facet];
+    }
+  }
+}
+
+export const facetCounterService = new FacetCounterService();
@@ -1,4 +1,11 @@
 import NodeGeocoder from 'node-geocoder';
+import { config } from '../config/environment.js';
+import { Load } from '../models/Load.model.js';
+import { GeocodeCache } from '../models/GeocodeCache.model.js';
+import { GEOCODE_CACHE } from '../utils/constants.js';
+import { Gazetteer } from '../utils/gazetteer.js';
+import { isValidLatLng } from '../utils/geo.js';
+import { LruCache } from '../utils/lruCache.js';
 import { logger } from '../utils/logger.js';
 
 interface GeoPoint {
@@ -13,8 +20,63 @@ interface Address {
   country?: string;
 }
 
+interface GeocodeCacheStats {
+  gazetteerHits: number;
+  memoryHits: number;
+  persistentHits: number;
+  negativeHits: number;
+  misses: number;
+  coalesced: number;
+  timeouts: number;
+  providerErrors: number;
+  warmed: number;
+}
+
+// Reverse lookups farther than this from any centroid fall back to the provider
+const GAZETTEER_REVERSE_MAX_MILES = 50;
+
+// Warm-up looks at lanes posted in the last 90 days
+const WARM_UP_WINDOW_MS = 90 * 24 * 60 * 60 * 1000;
+
+const normalizePart = (value?: string): string =>
+  (value ?? '').trim().toLowerCase().replace(/\s+/g, ' ');
+
+/**
+ * Cache key for an address; US/USA/blank countries share one key
+ */
+export function normalizeAddressKey(address: Address): string {
+  const country = normalizePart(address.country);
+  return [
+    normalizePart(address.city),
+    normalizePart(address.state),
+    normalizePart(address.zip).replace(/\s/g, ''),
+    !country || country === 'usa' || country === 'united states' ? 'us' : country
+  ].join('|');
+}
+
+const isCanada = (country?: string): boolean => {
+  const value = normalizePart(country);
+  return value === 'ca' || value === 'can' || value === 'canada';
+};
+
 class GeocodingService {
   private geocoder: NodeGeocoder.Geocoder | null = null;
+  private gazetteer: Gazetteer | null = null;
+  // Concurrent lookups of the same address share one promise
+  private inFlight: Map<string, Promise<GeoPoint | null>> = new Map();
+  // null values are cached misses
+  private memory = new LruCache<string, GeoPoint | null>(GEOCODE_CACHE.MAX_MEMORY_ENTRIES, GEOCODE_CACHE.TTL_MS);
+  private stats: GeocodeCacheStats = {
+    gazetteerHits: 0,
+    memoryHits: 0,
+    persistentHits: 0,
+    negativeHits: 0,
+    misses: 0,
+    coalesced: 0,
+    timeouts: 0,
+    providerErrors: 0,
+    warmed: 0
+  };
 
   constructor() {
     try {
@@ -27,15 +89,205 @@ class GeocodingService {
     } catch (error: any) {
       logger.error('Failed to initialize geocoding service', { error: error.message });
     }
+
+    try {
+      this.gazetteer = Gazetteer.load(config.GAZETTEER_PATH);
+      if (this.gazetteer) {
+        logger.info('Offline gazetteer loaded', { entries: this.gazetteer.size });
+      } else {
+        logger.info('Offline gazetteer not found, using network geocoder only', { path: config.GAZETTEER_PATH });
+      }
+    } catch (error: any) {
+      logger.error('Failed to load offline gazetteer', { error: error.message, path: config.GAZETTEER_PATH });
+    }
   }
 
   /**
-   * Geocode address to coordinates
+   * Geocode address to coordinates.
+   * Resolves the ZIP/FSA from the offline gazetteer when possible, otherwise checks
+   * the in-memory LRU, then the MongoDB cache, then the provider; misses are cached
+   * for a shorter TTL so bad addresses are not retried on every call. Concurrent
+   * uncached lookups of the same address share a single promise.
    */
   async geocodeAddress(address: Address): Promise<GeoPoint | null> {
+    const place = this.gazetteer?.lookup(address.zip, isCanada(address.country) ? 'CA' : 'US');
+    if (place) {
+      this.stats.gazetteerHits++;
+      return { latitude: place.lat, longitude: place.lng };
+    }
+
+    const key = normalizeAddressKey(address);
+
+    const cached = this.memory.get(key);
+    if (cached !== undefined) {
+      this.stats.memoryHits++;
+      if (cached === null) this.stats.negativeHits++;
+      return cached;
+    }
+
+    const pending = this.inFlight.get(key);
+    if (pending) {
+      this.stats.coalesced++;
+      return pending;
+    }
+
+    const promise = this.resolveUncached(key, address).finally(() => {
+      this.inFlight.delete(key);
+    });
+    this.inFlight.set(key, promise);
+    return promise;
+  }
+
+  /**
+   * geocodeAddress bounded by a timeout; resolves null if the budget runs out.
+   * The underlying lookup keeps running and still populates the cache.
+   */
+  async geocodeWithin(address: Address, timeoutMs: number): Promise<GeoPoint | null> {
+    let timer: NodeJS.Timeout | undefined;
+    const timeout = new Promise<null>((resolve) => {
+      timer = setTimeout(() => {
+        this.stats.timeouts++;
+        logger.warn('Geocoding timed out', { address, timeoutMs });
+        resolve(null);
+      }, timeoutMs);
+    });
+
+    try {
+      return await Promise.race([this.geocodeAddress(address), timeout]);
+    } finally {
+      clearTimeout(timer);
+    }
+  }
+
+  private async resolveUncached(key: string, address: Address): Promise<GeoPoint | null> {
+    const persisted = await this.readPersisted(key);
+    if (persisted !== undefined) {
+      this.stats.persistentHits++;
+      if (persisted.point === null) this.stats.negativeHits++;
+      this.memory.set(key, persisted.point, Math.max(persisted.expiresAt.getTime() - Date.now(), 0));
+      return persisted.point;
+    }
+
+    this.stats.misses++;
+    const point = await this.lookup(address);
+    if (point !== undefined) {
+      await this.remember(key, point);
+    }
+    return point ?? null;
+  }
+
+  /**
+   * Cache hit/miss counters and current memory tier size
+   */
+  getCacheStats(): GeocodeCacheStats & { memoryEntries: number; gazetteerEntries: number; hitRatio: number } {
+    const hits = this.stats.gazetteerHits + this.stats.memoryHits + this.stats.persistentHits;
+    const total = hits + this.stats.misses;
+    return {
+      ...this.stats,
+      memoryEntries: this.memory.size,
+      gazetteerEntries: this.gazetteer?.size ?? 0,
+      hitRatio: total > 0 ? Math.round((hits / total) * 1000) / 1000 : 0
+    };
+  }
+
+  /**
+   * Preload the most common origin/destination locations into memory.
+   * Uses the persistent cache where present and otherwise the coordinates
+   * already stored on loads, so warm-up never calls the provider.
+   */
+  async warmUp(limit: number = GEOCODE_CACHE.WARM_UP_LOCATIONS): Promise<void> {
+    try {
+      const startedAt = Date.now();
+      const groupByLocation = (field: 'origin' | 'destination') => [
+        {
+          $group: {
+            _id: {
+              city: `$${field}.city`,
+              state: `$${field}.state`,
+              zip: `$${field}.zip`,
+              country: `$${field}.country`
+            },
+            count: { $sum: 1 },
+            lat: { $first: `$${field}.coordinates.lat` },
+            lng: { $first: `$${field}.coordinates.lng` }
+          }
+        },
+        { $sort: { count: -1 } },
+        { $limit: limit }
+      ];
+
+      const since = new Date(Date.now() - WARM_UP_WINDOW_MS);
+      const [result] = await Load.aggregate([
+        { $match: { createdAt: { $gte: since } } },
+        { $facet: { origin: groupByLocation('origin'), destination: groupByLocation('destination') } }
+      ]);
+
+      const locations = new Map<string, GeoPoint | null>();
+      for (const row of [...(result?.origin ?? []), ...(result?.destination ?? [])] as Array<{ _id: Address; lat?: number; lng?: number }>) {
+        if (!row._id?.city || !row._id?.state) continue;
+        const point = isValidLatLng(row.lat, row.lng) && (row.lat !== 0 || row.lng !== 0)
+          ? { latitude: row.lat as number, longitude: row.lng as number }
+          : null;
+        locations.set(normalizeAddressKey(row._id), point);
+      }
+
+      const keys = Array.from(locations.keys()).slice(0, limit);
+      const persisted = await GeocodeCache.find({ key: { $in: keys }, expiresAt: { $gt: new Date() } }).lean();
+      const persistedKeys = new Set<string>();
+
+      for (const doc of persisted) {
+        persistedKeys.add(doc.key);
+        this.memory.set(
+          doc.key,
+          doc.found ? { latitude: doc.latitude as number, longitude: doc.longitude as number } : null,
+          Math.max(doc.expiresAt.getTime() - Date.now(), 0)
+        );
+      }
+
+      // Seed both tiers from load coordinates for locations not cached yet
+      const seeded: string[] = [];
+      for (const key of keys) {
+        const point = locations.get(key);
+        if (persistedKeys.has(key) || !point) continue;
+        this.memory.set(key, point);
+        seeded.push(key);
+      }
+      if (seeded.length > 0) {
+        const expiresAt = new Date(Date.now() + GEOCODE_CACHE.TTL_MS);
+        await GeocodeCache.bulkWrite(
+          seeded.map(key => {
+            const point = locations.get(key) as GeoPoint;
+            return {
+              updateOne: {
+                filter: { key },
+                update: { $setOnInsert: { key, found: true, latitude: point.latitude, longitude: point.longitude, expiresAt } },
+                upsert: true
+              }
+            };
+          }),
+          { ordered: false }
+        );
+      }
+
+      this.stats.warmed = persisted.length + seeded.length;
+      logger.info('Geocoding cache warmed', {
+        fromCache: persisted.length,
+        fromLoads: seeded.length,
+        durationMs: Date.now() - startedAt
+      });
+    } catch (error: any) {
+      logger.error('Geocoding cache warm-up failed', { error: error.message });
+    }
+  }
+
+  /**
+   * Query the provider. Returns null when the address is not found and
+   * undefined on provider errors (which are not cached).
+   */
+  private async lookup(address: Address): Promise<GeoPoint | null | undefined> {
     if (!this.geocoder) {
       logger.warn('Geocoding service not initialized');
-      return null;
+      return undefined;
     }
 
     try {
@@ -52,8 +304,42 @@ class GeocodingService {
       logger.warn('No geocoding results found', { query });
       return null;
     } catch (error: any) {
+      this.stats.providerErrors++;
       logger.error('Geocoding failed', { error: error.message, address });
-      return null;
+      return undefined;
+    }
+  }
+
+  private async readPersisted(key: string): Promise<{ point: GeoPoint | null; expiresAt: Date } | undefined> {
+    try {
+      // The TTL monitor runs periodically, so filter out expired entries explicitly
+      const doc = await GeocodeCache.findOne({ key, expiresAt: { $gt: new Date() } }).lean();
+      if (!doc) return undefined;
+      return {
+        point: doc.found ? { latitude: doc.latitude as number, longitude: doc.longitude as number } : null,
+        expiresAt: doc.expiresAt
+      };
+    } catch (error: any) {
+      logger.warn('Geocoding cache read failed', { error: error.message });
+      return undefined;
+    }
+  }
+
+  private async remember(key: string, point: GeoPoint | null): Promise<void> {
+    const ttlMs = point ? GEOCODE_CACHE.TTL_MS : GEOCODE_CACHE.NEGATIVE_TTL_MS;
+    this.memory.set(key, point, ttlMs);
+
+    try {
+      const expiresAt = new Date(Date.now() + ttlMs);
+      await GeocodeCache.updateOne(
+        { key },
+        point
+          ? { $set: { found: true, latitude: point.latitude, longitude: point.longitude, expiresAt } }
+          : { $set: { found: false, expiresAt }, $unset: { latitude: 1, longitude: 1 } },
+        { upsert: true }
+      );
+    } catch (error: any) {
+      logger.warn('Geocoding cache write failed', { error: error.message });
     }
   }
 
@@ -61,6 +347,12 @@ class GeocodingService {
    * Reverse geocode coordinates to address
    */
   async reverseGeocode(latitude: number, longitude: number): Promise<Address | null> {
+    const place = this.gazetteer?.nearest(latitude, longitude, GAZETTEER_REVERSE_MAX_MILES);
+    if (place) {
+      this.stats.gazetteerHits++;
+      return { city: place.city, state: place.region, zip: place.code, country: place.country };
+    }
+
     if (!this.geocoder) {
       logger.warn('Geocoding service not initialized');
       return null;
@@ -0,0 +1,558 @@
+import { CronJob } from 'cron';
+import { Load } from '../models/Load.model.js';
+import { ALL_EQUIPMENT, ILaneRateBucket, LaneRateBucket } from '../models/LaneRateBucket.model.js';
+import { LANE_RATES } from '../utils/constants.js';
+import { logger } from '../utils/logger.js';
+import { TDigest } from '../utils/tdigest.js';
+import { loadEvents, LoadChange, LoadSnapshot } from './loadEvents.service.js';
+
+export interface Lane {
+  origin: string;
+  destination: string;
+  equipment: string;
+}
+
+export interface LaneWeek {
+  weekStart: string;
+  loads: number;
+  p50: number | null;
+}
+
+export interface LaneQuote extends Lane {
+  loads: number;
+  ratePerMile: {
+    p25: number;
+    p50: number;
+    p75: number;
+    mean: number;
+  };
+  weekly: LaneWeek[];
+  trend: {
+    volumeChange: number;
+    rateChange: number;
+    direction: 'up' | 'down' | 'stable';
+  };
+  updatedAt: string;
+}
+
+interface PendingBucket extends Lane {
+  weekStart: Date;
+  digest: TDigest;
+  count: number;
+  sum: number;
+}
+
+type BucketRow = Pick<ILaneRateBucket, 'origin' | 'destination' | 'equipment' | 'weekStart' | 'count' | 'sum' | 'digest'>;
+type ChangedBucket = Pick<ILaneRateBucket, 'origin' | 'destination' | 'equipment' | 'updatedAt'>;
+
+const DAY_MS = 24 * 60 * 60 * 1000;
+const WEEK_MS = 7 * DAY_MS;
+const BACKFILL_BATCH = 500;
+const BOOKED_STATUSES = ['booked', 'in_transit', 'delivered'];
+
+const laneKey = (lane: Lane): string => `${lane.origin}|${lane.destination}|${lane.equipment}`;
+
+/**
+ * Monday 00:00 UTC of the week containing `date` (same as $dateTrunc unit 'week', startOfWeek 'monday')
+ */
+export function weekStartOf(date: Date): Date {
+  const day = Date.UTC(date.getUTCFullYear(), date.getUTCMonth(), date.getUTCDate());
+  return new Date(day - ((new Date(day).getUTCDay() + 6) % 7) * DAY_MS);
+}
+
+/**
+ * Rate per mile a booked load paid: the agreed rate (or posted rate) as-is for
+ * per-mile loads, divided by distance for flat-rate loads. Undefined when unknown or implausible.
+ */
+export function ratePerMileOf(load: Pick<LoadSnapshot, 'rate' | 'agreedRate' | 'rateType' | 'distance'>): number | undefined {
+  const rate = load.agreedRate ?? load.rate;
+  const perMile = load.rateType === 'flat_rate' ? (load.distance && load.distance > 0 ? rate / load.distance : undefined) : rate;
+  return perMile !== undefined && perMile > 0 && perMile <= LANE_RATES.MAX_RATE_PER_MILE ? perMile : undefined;
+}
+
+type BucketKey = Pick<ILaneRateBucket, 'origin' | 'destination' | 'equipment' | 'weekStart'>;
+
+const bucketKey = (bucket: BucketKey): string => `${laneKey(bucket)}|${new Date(bucket.weekStart).getTime()}`;
+
+/**
+ * Booked loads grouped into lane/week buckets with their rates per mile.
+ * `equipment` is '$equipmentType' for per-equipment buckets or the ALL_EQUIPMENT
+ * literal; `bucket` narrows the result to that one bucket.
+ */
+function bucketPipeline(equipment: unknown, match: Record<string, unknown>, bucket?: BucketKey): any[] {
+  const weekStart = bucket ? new Date(bucket.weekStart) : undefined;
+  return [
+    { $match: { status: { $in: BOOKED_STATUSES }, ...match } },
+    {
+      $project: {
+        origin: '$origin.state',
+        destination: '$destination.state',
+        equipment: { $ifNull: [equipment, 'Unknown'] },
+        bookedAt: { $ifNull: ['$bookedAt', '$createdAt'] },
+        ratePerMile: {
+          $let: {
+            vars: { paid: { $ifNull: ['$agreedRate', '$rate'] } },
+            in: {
+              $cond: [
+                { $eq: ['$rateType', 'flat_rate'] },
+                { $cond: [{ $gt: ['$distance', 0] }, { $divide: ['$$paid', '$distance'] }, null] },
+                '$$paid'
+              ]
+            }
+          }
+        }
+      }
+    },
+    {
+      $match: {
+        ratePerMile: { $gt: 0, $lte: LANE_RATES.MAX_RATE_PER_MILE },
+        ...(bucket && weekStart
+          ? {
+            origin: bucket.origin,
+            destination: bucket.destination,
+            equipment: bucket.equipment,
+            bookedAt: { $gte: weekStart, $lt: new Date(weekStart.getTime() + WEEK_MS) }
+          }
+          : { origin: { $type: 'string' }, destination: { $type: 'string' } })
+      }
+    },
+    {
+      $group: {
+        _id: {
+          origin: '$origin',
+          destination: '$destination',
+          equipment: '$equipment',
+          weekStart: { $dateTrunc: { date: '$bookedAt', unit: 'week', startOfWeek: 'monday' } }
+        },
+        rates: { $push: '$ratePerMile' },
+        sum: { $sum: '$ratePerMile' }
+      }
+    }
+  ];
+}
+
+/**
+ * Write replacing a bucket with a rebuilt group: guarded by the version read
+ * before aggregating, or insert-only when the bucket did not exist
+ */
+function rebuildOp(row: { _id: BucketKey; rates: number[]; sum: number }, version: number | undefined, runStart: Date): any {
+  const digest = new TDigest(LANE_RATES.COMPRESSION);
+  for (const rate of row.rates) digest.add(rate);
+  const fields = { count: row.rates.length, sum: row.sum, digest: digest.toJSON(), rebuiltAt: runStart, updatedAt: runStart };
+
+  return version === undefined
+    ? { updateOne: { filter: row._id, update: { $setOnInsert: { ...fields, version: 1 } }, upsert: true } }
+    : { updateOne: { filter: { ...row._id, version }, update: { $set: fields, $inc: { version: 1 } } } };
+}
+
+const change = (current: number, previous: number): number =>
+  previous > 0 ? Math.round(((current - previous) / previous) * 1000) / 10 : 0;
+
+const round2 = (value: number): number => Math.round(value * 100) / 100;
+
+/**
+ * Lane market rates. Every booked load adds its rate per mile to a t-digest
+ * for its lane and week (per equipment type and across all equipment); the
+ * weekly digests live in LaneRateBucket and merge into quotes over the last
+ * WINDOW_WEEKS. Quotes are precomputed in memory, so a lookup is a Map get.
+ * Each instance polls for buckets changed since its last look (bookings
+ * recorded elsewhere) and rebuilds every quote daily as the window slides.
+ */
+class LaneRateService {
+  private quotes: Map<string, LaneQuote> = new Map();
+  private ready = false;
+  private pending: Map<string, PendingBucket> = new Map();
+  private draining = false;
+  private cronJob: CronJob | null = null;
+  private pollJob: CronJob | null = null;
+  private polling = false;
+  // Newest bucket updatedAt this instance has refreshed quotes for
+  private changesSeenAt: Date | null = null;
+  private unsubscribe: (() => void) | null = null;
+
+  start(): void {
+    if (this.cronJob) return;
+
+    this.unsubscribe = loadEvents.subscribe((change) => this.applyChange(change));
+    this.cronJob = new CronJob(LANE_RATES.REFRESH_CRON, async () => {
+      await this.refreshQuotes();
+    });
+    this.cronJob.start();
+    this.pollJob = new CronJob(LANE_RATES.POLL_CRON, async () => {
+      await this.refreshChangedLanes();
+    });
+    this.pollJob.start();
+
+    void this.refreshQuotes();
+  }
+
+  stop(): void {
+    this.cronJob?.stop();
+    this.pollJob?.stop();
+    this.cronJob = null;
+    this.pollJob = null;
+    this.unsubscribe?.();
+    this.unsubscribe = null;
+  }
+
+  /**
+   * Quote for a lane; `equipment` omitted means all equipment. Null when the
+   * lane has no bookings in the window. Until the first refresh completes the
+   * lane is read from MongoDB.
+   */
+  async getQuote(origin: string, destination: string, equipment?: string): Promise<LaneQuote | null> {
+    const lane: Lane = { origin, destination, equipment: equipment || ALL_EQUIPMENT };
+    const quote = this.quotes.get(laneKey(lane));
+    if (quote || this.ready) {
+      return quote ?? null;
+    }
+    return this.refreshLane(lane);
+  }
+
+  /**
+   * Add one booked load's rate per mile to its lane/week buckets
+   */
+  record(load: LoadSnapshot): void {
+    const ratePerMile = ratePerMileOf(load);
+    const origin = load.origin?.state;
+    const destination = load.destination?.state;
+    if (ratePerMile === undefined || !origin || !destination) return;
+
+    const weekStart = weekStartOf(load.bookedAt ? new Date(load.bookedAt) : new Date());
+    for (const equipment of [load.equipmentType || 'Unknown', ALL_EQUIPMENT]) {
+      const key = `${laneKey({ origin, destination, equipment })}|${weekStart.getTime()}`;
+      let bucket = this.pending.get(key);
+      if (!bucket) {
+        bucket = { origin, destination, equipment, weekStart, digest: new TDigest(LANE_RATES.COMPRESSION), count: 0, sum: 0 };
+        this.pending.set(key, bucket);
+      }
+      bucket.digest.add(ratePerMile);
+      bucket.count++;
+      bucket.sum += ratePerMile;
+    }
+
+    if (!this.draining) {
+      this.draining = true;
+      void this.drain();
+    }
+  }
+
+  /**
+   * Recompute every quote from the buckets in the window, one lane at a time
+   */
+  async refreshQuotes(): Promise<void> {
+    const startedAt = Date.now();
+    try {
+      // Changes from here on are picked up by the next poll
+      const changesSeenAt = new Date(startedAt);
+      const quotes = new Map<string, LaneQuote>();
+      const cursor = LaneRateBucket.find({ weekStart: { $gte: this.windowStart() } })
+        .sort({ origin: 1, destination: 1, equipment: 1, weekStart: 1 })
+        .select('origin destination equipment weekStart count sum digest')
+        .lean<BucketRow[]>()
+        .cursor();
+
+      let lane: Lane | null = null;
+      let rows: BucketRow[] = [];
+      const flush = () => {
+        if (lane && rows.length > 0) {
+          const quote = this.buildQuote(lane, rows);
+          if (quote) quotes.set(laneKey(lane), quote);
+        }
+      };
+
+      for await (const row of cursor) {
+        if (!lane || laneKey(lane) !== laneKey(row)) {
+          flush();
+          lane = { origin: row.origin, destination: row.destination, equipment: row.equipment };
+          rows = [];
+        }
+        rows.push(row);
+      }
+      flush();
+
+      this.quotes = quotes;
+      this.ready = true;
+      if (!this.changesSeenAt || this.changesSeenAt < changesSeenAt) {
+        this.changesSeenAt = changesSeenAt;
+      }
+      logger.info('Lane rate quotes refreshed', { lanes: quotes.size, durationMs: Date.now() - startedAt });
+    } catch (error: any) {
+      logger.error('Lane rate quote refresh failed', { error: error.message });
+    }
+  }
+
+  /**
+   * Refresh the quotes of lanes whose buckets changed since the last poll
+   */
+  async refreshChangedLanes(): Promise<void> {
+    if (!this.ready || !this.changesSeenAt || this.polling) return;
+    this.polling = true;
+    try {
+      const since = new Date(this.changesSeenAt.getTime() - LANE_RATES.POLL_OVERLAP_MS);
+      const changed = await LaneRateBucket.find({ updatedAt: { $gt: since } })
+        .select('origin destination equipment updatedAt')
+        .lean<ChangedBucket[]>();
+
+      const lanes = new Map<string, Lane>();
+      let latest = this.changesSeenAt;
+      for (const bucket of changed) {
+        lanes.set(laneKey(bucket), { origin: bucket.origin, destination: bucket.destination, equipment: bucket.equipment });
+        if (bucket.updatedAt > latest) latest = bucket.updatedAt;
+      }
+      for (const lane of lanes.values()) {
+        await this.refreshLane(lane);
+      }
+      this.changesSeenAt = latest;
+
+      if (lanes.size > 0) {
+        logger.debug('Lane rate quotes refreshed for changed lanes', { lanes: lanes.size });
+      }
+    } catch (error: any) {
+      logger.error('Lane rate change poll failed', { error: error.message });
+    } finally {
+      this.polling = false;
+    }
+  }
+
+  /**
+   * Rebuild buckets from booked loads (all history, or weeks from `since`),
+   * replacing their digests. Writes are guarded by the bucket versions read
+   * before aggregating, so a bucket merged into by a booking meanwhile is not
+   * overwritten but recomputed on its own afterwards. Throws on failure.
+   */
+  async rebuild(since?: Date): Promise<{ buckets: number; recomputed: number; removed: number }> {
+    const runStart = new Date();
+    const fromWeek = since ? weekStartOf(since) : undefined;
+    const range = fromWeek ? { weekStart: { $gte: fromWeek } } : {};
+    let buckets = 0;
+
+    const versions = new Map<string, number>();
+    const existing = LaneRateBucket.find(range).select('origin destination equipment weekStart version').lean().cursor();
+    for await (const bucket of existing) {
+      versions.set(bucketKey(bucket), bucket.version);
+    }
+
+    // Loads booked before bookedAt existed fall back to createdAt, as in bucketPipeline's $project
+    const match = fromWeek ? { $or: [{ bookedAt: { $gte: fromWeek } }, { bookedAt: null, createdAt: { $gte: fromWeek } }] } : {};
+    for (const equipment of ['$equipmentType', { $literal: ALL_EQUIPMENT }]) {
+      const cursor = Load.aggregate(bucketPipeline(equipment, match)).allowDiskUse(true).cursor();
+
+      let ops: any[] = [];
+      for await (const row of cursor) {
+        ops.push(rebuildOp(row, versions.get(bucketKey(row._id)), runStart));
+        if (ops.length >= BACKFILL_BATCH) {
+          await this.writeRebuilt(ops);
+          buckets += ops.length;
+          ops = [];
+        }
+      }
+      if (ops.length > 0) {
+        await this.writeRebuilt(ops);
+        buckets += ops.length;
+      }
+    }
+
+    // Buckets the run did not write either changed since the version read (a
+    // booking was merged in and the guarded write skipped) or no longer have
+    // any booked load mapping to them
+    const unwritten = await LaneRateBucket.find({ ...range, rebuiltAt: { $ne: runStart } })
+      .select('origin destination equipment weekStart version')
+      .lean();
+    const stale: any[] = [];
+    let recomputed = 0;
+    for (const bucket of unwritten) {
+      if (versions.get(bucketKey(bucket)) === bucket.version) {
+        stale.push({ deleteOne: { filter: { _id: bucket._id, version: bucket.version } } });
+      } else {
+        await this.rebuildBucket(bucket, runStart);
+        recomputed++;
+      }
+    }
+    const removed = stale.length > 0 ? (await LaneRateBucket.bulkWrite(stale, { ordered: false })).deletedCount : 0;
+
+    await this.refreshQuotes();
+    return { buckets, recomputed, removed };
+  }
+
+  private applyChange(change: LoadChange): void {
+    // Only the instance that booked the load knows the previous status, so each booking is recorded once
+    if (change.type === 'updated' && change.previousStatus === 'available' && change.load.status === 'booked') {
+      this.record(change.load);
+    }
+  }
+
+  private async drain(): Promise<void> {
+    try {
+      while (this.pending.size > 0) {
+        const [key, bucket] = this.pending.entries().next().value as [string, PendingBucket];
+        this.pending.delete(key);
+        try {
+          await this.flushBucket(bucket);
+          await this.refreshLane(bucket);
+        } catch (error: any) {
+          logger.error('Lane rate bucket update failed', { lane: laneKey(bucket), error: error.message });
+        }
+      }
+    } finally {
+      this.draining = false;
+    }
+  }
+
+  /**
+   * Merge a pending digest into its stored bucket. Read-merge-write guarded by
+   * the bucket version, so concurrent writers (other instances) retry instead of
+   * overwriting each other's samples.
+   */
+  private async flushBucket(bucket: PendingBucket): Promise<void> {
+    const filter = { origin: bucket.origin, destination: bucket.destination, equipment: bucket.equipment, weekStart: bucket.weekStart };
+
+    for (let attempt = 0; attempt < LANE_RATES.FLUSH_RETRIES; attempt++) {
+      const stored = await LaneRateBucket.findOne(filter).select('digest version').lean();
+      const digest = TDigest.fromJSON(stored?.digest, LANE_RATES.COMPRESSION);
+      digest.merge(bucket.digest);
+
+      try {
+        if (stored) {
+          // Version-guarded, so a concurrent merge makes this a no-op and we re-read
+          const result = await LaneRateBucket.updateOne(
+            { _id: stored._id, version: stored.version },
+            {
+              $set: { digest: digest.toJSON(), updatedAt: new Date() },
+              $inc: { count: bucket.count, sum: bucket.sum, version: 1 }
+            }
+          );
+          if (result.modifiedCount > 0) return;
+        } else {
+          // Insert-only: if another writer created the bucket since the read,
+          // this matches it without changing anything and we merge on retry
+          const result = await LaneRateBucket.updateOne(
+            filter,
+            { $setOnInsert: { digest: digest.toJSON(), count: bucket.count, sum: bucket.sum, version: 1, updatedAt: new Date() } },
+            { upsert: true }
+          );
+          if (result.upsertedCount > 0) return;
+        }
+      } catch (error: any) {
+        // Another writer created the bucket first
+        if (error.code !== 11000) throw error;
+      }
+    }
+    throw new Error('Lane rate bucket kept changing; giving up');
+  }
+
+  /**
+   * Apply a batch of guarded rebuild writes. Skipped writes (version moved on)
+   * and insert races (duplicate key) are left for the conflict pass.
+   */
+  private async writeRebuilt(ops: any[]): Promise<void> {
+    try {
+      await LaneRateBucket.bulkWrite(ops, { ordered: false });
+    } catch (error: any) {
+      const errors: Array<{ code?: number }> = error.writeErrors ?? [];
+      if (errors.length === 0 || errors.some(writeError => writeError.code !== 11000)) throw error;
+    }
+  }
+
+  /**
+   * Recompute one bucket from its booked loads, guarded by its version like flushBucket
+   */
+  private async rebuildBucket(bucket: BucketKey, runStart: Date): Promise<void> {
+    const filter = { origin: bucket.origin, destination: bucket.destination, equipment: bucket.equipment, weekStart: bucket.weekStart };
+    const equipment = bucket.equipment === ALL_EQUIPMENT ? { $literal: ALL_EQUIPMENT } : '$equipmentType';
+    const match = { 'origin.state': bucket.origin, 'destination.state': bucket.destination };
+
+    for (let attempt = 0; attempt < LANE_RATES.FLUSH_RETRIES; attempt++) {
+      const stored = await LaneRateBucket.findOne(filter).select('version').lean();
+      const [row] = await Load.aggregate(bucketPipeline(equipment, match, filter));
+
+      try {
+        if (!row) {
+          if (!stored) return;
+          const result = await LaneRateBucket.deleteOne({ _id: stored._id, version: stored.version });
+          if (result.deletedCount > 0) return;
+        } else {
+          const result = await LaneRateBucket.bulkWrite([rebuildOp(row, stored?.version, runStart)]);
+          if (result.modifiedCount + result.upsertedCount > 0) return;
+        }
+      } catch (error: any) {
+        if (error.code !== 11000) throw error;
+      }
+    }
+    throw new Error('Lane rate bucket kept changing during rebuild; giving up');
+  }
+
+  private async refreshLane(lane: Lane): Promise<LaneQuote | null> {
+    const rows = await LaneRateBucket.find({
+      origin: lane.origin,
+      destination: lane.destination,
+      equipment: lane.equipment,
+      weekStart: { $gte: this.windowStart() }
+    })
+      .sort({ weekStart: 1 })
+      .select('origin destination equipment weekStart count sum digest')
+      .lean<BucketRow[]>();
+
+    const key = laneKey(lane);
+    const quote = this.buildQuote(lane, rows);
+    if (quote) this.quotes.set(key, quote);
+    else this.quotes.delete(key);
+    return quote;
+  }
+
+  private windowStart(): Date {
+    return new Date(weekStartOf(new Date()).getTime() - (LANE_RATES.WINDOW_WEEKS - 1) * WEEK_MS);
+  }
+
+  /**
+   * Merge a lane's weekly buckets (oldest first) into a quote
+   */
+  private buildQuote(lane: Lane, rows: BucketRow[]): LaneQuote | null {
+    const windowStart = this.windowStart().getTime();
+    const byWeek = new Map(rows.map(row => [new Date(row.weekStart).getTime(), row]));
+    const window = TDigest.fromJSON(null, LANE_RATES.COMPRESSION);
+    const recent = TDigest.fromJSON(null, LANE_RATES.COMPRESSION);
+    const previous = TDigest.fromJSON(null, LANE_RATES.COMPRESSION);
+    const weekly: LaneWeek[] = [];
+    let loads = 0;
+    let sum = 0;
+
+    for (let i = 0; i < LANE_RATES.WINDOW_WEEKS; i++) {
+      const weekStart = windowStart + i * WEEK_MS;
+      const row = byWeek.get(weekStart);
+      const digest = TDigest.fromJSON(row?.digest, LANE_RATES.COMPRESSION);
+      weekly.push({ weekStart: new Date(weekStart).toISOString().split('T')[0], loads: row?.count ?? 0, p50: row ? round2(digest.quantile(0.5)) : null });
+      if (!row) continue;
+
+      loads += row.count;
+      sum += row.sum;
+      window.merge(digest);
+      const weeksAgo = LANE_RATES.WINDOW_WEEKS - 1 - i;
+      if (weeksAgo < LANE_RATES.TREND_WEEKS) recent.merge(digest);
+      else if (weeksAgo < LANE_RATES.TREND_WEEKS * 2) previous.merge(digest);
+    }
+
+    if (loads === 0) return null;
+
+    const rateChange = recent.count > 0 && previous.count > 0 ? change(recent.quantile(0.5), previous.quantile(0.5)) : 0;
+    return {
+      ...lane,
+      loads,
+      ratePerMile: {
+        p25: round2(window.quantile(0.25)),
+        p50: round2(window.quantile(0.5)),
+        p75: round2(window.quantile(0.75)),
+        mean: round2(sum / loads)
+      },
+      weekly,
+      trend: {
+        volumeChange: change(recent.count, previous.count),
+        rateChange,
+        direction: rateChange > 5 ? 'up' : rateChange < -5 ? 'down' : 'stable'
+      },
+      updatedAt: new Date().toISOString()
+    };
+  }
+}
+
+export const laneRateService = new LaneRateService();
@@ -0,0 +1,81 @@
+import { Load } from '../models/Load.model.js';
+import { CountMode } from '../utils/pagination.js';
+import { logger } from '../utils/logger.js';
+
+interface CachedCount {
+  value: number;
+  expiresAt: number;
+}
+
+const COUNT_TTL_MS = 30 * 1000;
+const MAX_CACHED_COUNTS = 500;
+
+class LoadCountService {
+  private cache: Map<string, CachedCount> = new Map();
+  private pending: Map<string, Promise<number>> = new Map();
+
+  /**
+   * Count loads matching a filter according to the requested mode.
+   * Returns undefined when the caller asked for no count.
+   */
+  async count(filter: Record<string, unknown>, mode: CountMode): Promise<number | undefined> {
+    switch (mode) {
+      case 'none':
+        return undefined;
+      case 'exact':
+        return Load.countDocuments(filter);
+      case 'estimated':
+        // Collection metadata is only usable for unfiltered counts
+        if (Object.keys(filter).length === 0) {
+          return Load.estimatedDocumentCount();
+        }
+        return this.cachedCount(filter);
+      case 'cached':
+      default:
+        return this.cachedCount(filter);
+    }
+  }
+
+  /**
+   * Drop all cached counts (e.g. after bulk writes)
+   */
+  invalidate(): void {
+    this.cache.clear();
+  }
+
+  private async cachedCount(filter: Record<string, unknown>): Promise<number> {
+    const key = JSON.stringify(filter);
+    const now = Date.now();
+    const cached = this.cache.get(key);
+
+    if (cached && cached.expiresAt > now) {
+      return cached.value;
+    }
+
+    // Share one in-flight countDocuments between concurrent requests
+    const inFlight = this.pending.get(key);
+    if (inFlight) return inFlight;
+
+    const promise = Load.countDocuments(filter)
+      .then((value) => {
+        if (this.cache.size >= MAX_CACHED_COUNTS) {
+          const oldestKey = this.cache.keys().next().value;
+          if (oldestKey !== undefined) this.cache.delete(oldestKey);
+        }
+        this.cache.set(key, { value, expiresAt: Date.now() + COUNT_TTL_MS });
+        return value;
+      })
+      .catch((error: any) => {
+        logger.error('Cached load count failed', { error: error.message });
+        throw error;
+      })
+      .finally(() => {
+        this.pending.delete(key);
+      });
+
+    this.pending.set(key, promise);
+    return promise;
+  }
+}
+
+export const loadCountService = new LoadCountService();
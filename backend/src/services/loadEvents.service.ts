@@ -0,0 +1,298 @@
+import { Load } from '../models/Load.model.js';
+import { ILoad, IPartySummary, LoadStatus } from '../types/index.js';
+import { logger } from '../utils/logger.js';
+
+/**
+ * Load snapshot passed to listeners. postedBy/bookedBy may be populated.
+ */
+export type LoadSnapshot = Omit<ILoad, 'postedBy' | 'bookedBy'> & {
+  postedBy: unknown;
+  bookedBy?: unknown;
+};
+
+export type LoadChange =
+  | { type: 'created'; load: LoadSnapshot }
+  | { type: 'updated'; load: LoadSnapshot; previousStatus?: LoadStatus }
+  | { type: 'deleted'; loadId: string }
+  // A user's profile changed; loads they posted now carry this postedBySummary
+  | { type: 'party'; userId: string; summary: IPartySummary }
+  | { type: 'reset' };
+
+export type LoadChangeListener = (change: LoadChange) => void | Promise<void>;
+
+// How long a locally published write waits for its own change-stream echo
+const ECHO_TTL_MS = 60 * 1000;
+const RESTART_DELAY_MS = 1000;
+const MAX_RESTART_DELAY_MS = 60 * 1000;
+// Resume token no longer in the oplog
+const CHANGE_STREAM_HISTORY_LOST = 286;
+
+// Fields written by partySummaryService's fan-out (plus the timestamp it bumps).
+// Updates touching nothing else are dropped, except postedBySummary changes,
+// which are turned into one 'party' event per user.
+const SUMMARY_ONLY_FIELDS = ['postedBySummary', 'bookedBySummary', 'updatedAt'];
+const IGNORED_UPDATE_FIELDS = ['bookedBySummary', 'updatedAt'];
+
+const CHANGE_STREAM_PIPELINE = [
+  {
+    $match: {
+      $expr: {
+        $or: [
+          { $ne: ['$operationType', 'update'] },
+          { $gt: [{ $size: { $ifNull: ['$updateDescription.removedFields', []] } }, 0] },
+          {
+            $gt: [
+              {
+                $size: {
+                  $filter: {
+                    input: { $objectToArray: { $ifNull: ['$updateDescription.updatedFields', {}] } },
+                    cond: { $not: [{ $in: [{ $arrayElemAt: [{ $split: ['$$this.k', '.'] }, 0] }, IGNORED_UPDATE_FIELDS] }] }
+                  }
+                }
+              },
+              0
+            ]
+          }
+        ]
+      }
+    }
+  }
+];
+
+function isSummaryOnlyUpdate(event: any): boolean {
+  if ((event.updateDescription?.removedFields ?? []).length > 0) return false;
+  const fields = Object.keys(event.updateDescription?.updatedFields ?? {});
+  return fields.length > 0 && fields.every(field => SUMMARY_ONLY_FIELDS.includes(field.split('.')[0]));
+}
+
+/**
+ * In-process hub for load write events.
+ * Controllers publish after a successful write; in-memory read models
+ * (indexes, counters, caches) subscribe to stay current.
+ */
+class LoadEventsService {
+  private listeners: Set<LoadChangeListener> = new Set();
+  private changeStream: ReturnType<typeof Load.watch> | null = null;
+  private changeStreamEnabled = false;
+  private resumeToken: unknown = null;
+  private restartTimer: NodeJS.Timeout | null = null;
+  private restartDelayMs = RESTART_DELAY_MS;
+  // `${type}:${loadId}` -> expiry, for writes already emitted by this process
+  private published: Map<string, number> = new Map();
+  // userId -> serialized summary and expiry, for party changes already emitted
+  private partyChanges: Map<string, { summary: string; expiresAt: number }> = new Map();
+
+  /**
+   * Register a listener. Returns an unsubscribe function.
+   */
+  subscribe(listener: LoadChangeListener): () => void {
+    this.listeners.add(listener);
+    return () => {
+      this.listeners.delete(listener);
+    };
+  }
+
+  publishCreated(load: LoadSnapshot): void {
+    this.markPublished('created', (load as { _id?: unknown })._id);
+    this.emit({ type: 'created', load });
+  }
+
+  publishUpdated(load: LoadSnapshot, previousStatus?: LoadStatus): void {
+    this.markPublished('updated', (load as { _id?: unknown })._id);
+    this.emit({ type: 'updated', load, previousStatus });
+  }
+
+  publishDeleted(loadId: string): void {
+    this.markPublished('deleted', loadId);
+    this.emit({ type: 'deleted', loadId });
+  }
+
+  /**
+   * Signal that a user's party summary was rewritten on their loads
+   */
+  publishParty(userId: string, summary: IPartySummary): void {
+    if (this.firstPartyChange(userId, summary)) {
+      this.emit({ type: 'party', userId, summary });
+    }
+  }
+
+  /**
+   * Signal a bulk change (seed, import, migration) after which read models should rebuild
+   */
+  publishReset(): void {
+    this.emit({ type: 'reset' });
+  }
+
+  /**
+   * Mirror writes made by other processes through a MongoDB change stream.
+   * Requires a replica set. Echoes of writes this process already published
+   * are skipped, and a postedBySummary fan-out arrives as a single 'party'
+   * event instead of one update per load. On error the stream is
+   * reopened from the last resume token; if that token has aged out of the
+   * oplog, a reset is published so read models rebuild.
+   */
+  startChangeStream(): void {
+    if (this.changeStream) return;
+    this.changeStreamEnabled = true;
+
+    try {
+      const stream = Load.watch(CHANGE_STREAM_PIPELINE, {
+        fullDocument: 'updateLookup',
+        ...(this.resumeToken ? { resumeAfter: this.resumeToken } : {})
+      });
+      this.changeStream = stream;
+
+      stream.on('change', (event: any) => {
+        // Events still buffered on a stream that was replaced
+        if (this.changeStream !== stream) return;
+        this.resumeToken = event._id;
+        this.restartDelayMs = RESTART_DELAY_MS;
+        this.applyStreamEvent(event);
+      });
+
+      stream.on('error', (error: any) => {
+        if (this.changeStream !== stream) return;
+        logger.error('Load change stream failed', { error: error.message, code: error.code });
+        if (error.code === CHANGE_STREAM_HISTORY_LOST) {
+          // Events were missed; start from now and let read models rebuild
+          this.resumeToken = null;
+          this.emit({ type: 'reset' });
+        }
+        this.closeChangeStream();
+        this.scheduleRestart();
+      });
+
+      logger.info('Load change stream started', { resumed: Boolean(this.resumeToken) });
+    } catch (error: any) {
+      logger.error('Failed to start load change stream', { error: error.message });
+      this.changeStream = null;
+      this.scheduleRestart();
+    }
+  }
+
+  stopChangeStream(): void {
+    this.changeStreamEnabled = false;
+    if (this.restartTimer) {
+      clearTimeout(this.restartTimer);
+      this.restartTimer = null;
+    }
+    if (!this.changeStream) return;
+    this.closeChangeStream();
+    this.published.clear();
+    this.partyChanges.clear();
+    logger.info('Load change stream stopped');
+  }
+
+  private applyStreamEvent(event: any): void {
+    switch (event.operationType) {
+      case 'insert':
+        if (!this.consumePublished('created', event.documentKey._id)) {
+          this.emit({ type: 'created', load: event.fullDocument });
+        }
+        break;
+      case 'update':
+        if (isSummaryOnlyUpdate(event)) {
+          const load = event.fullDocument;
+          if (load?.postedBy && load.postedBySummary && this.firstPartyChange(String(load.postedBy), load.postedBySummary)) {
+            this.emit({ type: 'party', userId: String(load.postedBy), summary: load.postedBySummary });
+          }
+          break;
+        }
+        if (event.fullDocument && !this.consumePublished('updated', event.documentKey._id)) {
+          this.emit({ type: 'updated', load: event.fullDocument });
+        }
+        break;
+      case 'replace':
+        if (event.fullDocument && !this.consumePublished('updated', event.documentKey._id)) {
+          this.emit({ type: 'updated', load: event.fullDocument });
+        }
+        break;
+      case 'delete':
+        if (!this.consumePublished('deleted', event.documentKey._id)) {
+          this.emit({ type: 'deleted', loadId: event.documentKey._id.toString() });
+        }
+        break;
+      default:
+        break;
+    }
+  }
+
+  private closeChangeStream(): void {
+    this.changeStream?.close().catch(() => undefined);
+    this.changeStream = null;
+  }
+
+  private scheduleRestart(): void {
+    if (!this.changeStreamEnabled || this.restartTimer) return;
+
+    const delay = this.restartDelayMs;
+    this.restartDelayMs = Math.min(this.restartDelayMs * 2, MAX_RESTART_DELAY_MS);
+    logger.warn('Restarting load change stream', { delayMs: delay });
+    this.restartTimer = setTimeout(() => {
+      this.restartTimer = null;
+      if (this.changeStreamEnabled) {
+        this.startChangeStream();
+      }
+    }, delay);
+  }
+
+  /**
+   * Remember a write emitted locally so its change-stream echo is skipped
+   */
+  private markPublished(type: LoadChange['type'], loadId: unknown): void {
+    if (!this.changeStreamEnabled || !loadId) return;
+
+    const now = Date.now();
+    // Entries share one TTL, so insertion order is expiry order
+    for (const [key, expiresAt] of this.published) {
+      if (expiresAt > now) break;
+      this.published.delete(key);
+    }
+    const key = `${type}:${String(loadId)}`;
+    this.published.delete(key);
+    this.published.set(key, now + ECHO_TTL_MS);
+  }
+
+  private consumePublished(type: LoadChange['type'], loadId: unknown): boolean {
+    const key = `${type}:${String(loadId)}`;
+    const expiresAt = this.published.get(key);
+    if (expiresAt === undefined) return false;
+    this.published.delete(key);
+    return expiresAt > Date.now();
+  }
+
+  /**
+   * False when the same summary was already emitted for the user recently;
+   * a fan-out produces one stream event per load, all carrying that summary
+   */
+  private firstPartyChange(userId: string, summary: IPartySummary): boolean {
+    const now = Date.now();
+    for (const [key, seen] of this.partyChanges) {
+      if (seen.expiresAt > now) break;
+      this.partyChanges.delete(key);
+    }
+
+    const serialized = JSON.stringify({ company: summary.company, email: summary.email, accountType: summary.accountType });
+    const previous = this.partyChanges.get(userId);
+    this.partyChanges.delete(userId);
+    this.partyChanges.set(userId, { summary: serialized, expiresAt: now + ECHO_TTL_MS });
+    return previous?.summary !== serialized || previous.expiresAt <= now;
+  }
+
+  private emit(change: LoadChange): void {
+    for (const listener of this.listeners) {
+      try {
+        const result = listener(change);
+        if (result && typeof (result as Promise<void>).catch === 'function') {
+          (result as Promise<void>).catch((error: any) => {
+            logger.error('Load change listener failed', { type: change.type, error: error.message });
+          });
+        }
+      } catch (error: any) {
+        logger.error('Load change listener failed', { type: change.type, error: error.message });
+      }
+    }
+  }
+}
+
+export const loadEvents = new LoadEventsService();
@@ -0,0 +1,292 @@
+import { Types } from 'mongoose';
+import { Load } from '../models/Load.model.js';
+import { User } from '../models/User.model.js';
+import { Shipment } from '../models/Shipment.model.js';
+import { Country } from '../types/index.js';
+import { GEOCODE_REQUEST_TIMEOUT_MS } from '../utils/constants.js';
+import { mapWithConcurrency } from '../utils/concurrency.js';
+import { calculateDistanceMiles, isValidLatLng, toGeoPoint } from '../utils/geo.js';
+import { LoadImportInput, LoadImportLocation, ParsedImportRow } from '../utils/loadImport.js';
+import { validatePostalCode, validateState } from '../utils/validators.js';
+import { logger } from '../utils/logger.js';
+import { geocodingService, normalizeAddressKey } from './geocoding.service.js';
+import { loadEvents } from './loadEvents.service.js';
+import { dailyStatsService } from './dailyStats.service.js';
+import { PARTY_SUMMARY_FIELDS, toPartySummary } from './partySummary.service.js';
+import { websocketService } from './websocket.service.js';
+
+export const MAX_IMPORT_ROWS = 5000;
+const INSERT_CHUNK_SIZE = 500;
+const GEOCODE_CONCURRENCY = 8;
+
+export interface LoadImportRowResult {
+  row: number;
+  status: 'created' | 'failed';
+  loadId?: string;
+  errors?: string[];
+}
+
+export interface LoadImportSummary {
+  received: number;
+  created: number;
+  failed: number;
+  durationMs: number;
+  results: LoadImportRowResult[];
+}
+
+interface NormalizedLocation {
+  city: string;
+  state: string;
+  zip: string;
+  country: Country;
+  coordinates?: { lat: number; lng: number };
+}
+
+interface PreparedRow {
+  row: number;
+  input: LoadImportInput;
+  origin: NormalizedLocation;
+  destination: NormalizedLocation;
+  pickupDate: Date;
+  deliveryDate: Date;
+  weight: number;
+  rate: number;
+  errors: string[];
+}
+
+const asString = (value: unknown): string => (typeof value === 'string' ? value.trim() : value == null ? '' : String(value).trim());
+
+function normalizeLocation(location: LoadImportLocation | undefined, label: string, errors: string[]): NormalizedLocation {
+  const country: Country = asString(location?.country).toUpperCase() === 'CA' ? 'CA' : 'US';
+  const normalized: NormalizedLocation = {
+    city: asString(location?.city),
+    state: asString(location?.state).toUpperCase(),
+    zip: asString(location?.zip),
+    country
+  };
+
+  if (!normalized.city) errors.push(`${label} city is required`);
+  if (!validateState(normalized.state, country)) errors.push(`Invalid ${label} state/province`);
+  if (!validatePostalCode(normalized.zip, country)) errors.push(`Invalid ${label} postal code`);
+
+  const lat = Number(location?.coordinates?.lat);
+  const lng = Number(location?.coordinates?.lng);
+  if (location?.coordinates && isValidLatLng(lat, lng)) {
+    normalized.coordinates = { lat, lng };
+  }
+
+  return normalized;
+}
+
+/**
+ * Bulk load import: validates every row up front, resolves the broker and
+ * shipments once, geocodes each distinct address once and inserts in chunks.
+ */
+class LoadImportService {
+  async importLoads(rows: ParsedImportRow[], brokerId: string): Promise<LoadImportSummary> {
+    const startedAt = Date.now();
+    const results: LoadImportRowResult[] = [];
+    const prepared: PreparedRow[] = [];
+
+    for (const parsed of rows) {
+      if (!parsed.input) {
+        results.push({ row: parsed.row, status: 'failed', errors: [parsed.error || 'Unreadable row'] });
+        continue;
+      }
+      prepared.push(this.prepareRow(parsed.row, parsed.input));
+    }
+
+    // Authority and shipment checks need one query each for the whole batch
+    const [broker, shipments] = await Promise.all([
+      User.findById(brokerId).select(`hasMC ${PARTY_SUMMARY_FIELDS}`).lean(),
+      this.findOpenShipments(prepared)
+    ]);
+
+    for (const row of prepared) {
+      if (row.origin.state !== row.destination.state && broker && !broker.hasMC) {
+        row.errors.push('MC number required for interstate loads. Brokers with only USDOT can post intrastate loads only.');
+      }
+      if (row.input.shipmentId && !shipments.has(asString(row.input.shipmentId))) {
+        row.errors.push('Invalid or closed shipmentId');
+      }
+    }
+
+    const valid = prepared.filter(row => row.errors.length === 0);
+    await this.geocodeUnique(valid);
+
+    const documents: Array<{ row: PreparedRow; doc: Record<string, any> }> = [];
+    for (const row of valid) {
+      const shipmentRef = row.input.shipmentId ? shipments.get(asString(row.input.shipmentId)) : undefined;
+      const equipmentType = asString(row.input.equipmentType);
+      const title = asString(row.input.title) ||
+        `${equipmentType} Load: ${row.origin.city}, ${row.origin.state} → ${row.destination.city}, ${row.destination.state}`;
+
+      const load = new Load({
+        title,
+        description: asString(row.input.description) || title,
+        origin: row.origin,
+        destination: row.destination,
+        originPoint: toGeoPoint(row.origin.coordinates),
+        destinationPoint: toGeoPoint(row.destination.coordinates),
+        pickupDate: row.pickupDate,
+        deliveryDate: row.deliveryDate,
+        equipmentType,
+        weight: row.weight,
+        rate: row.rate,
+        rateType: asString(row.input.rateType) || undefined,
+        distance: calculateDistanceMiles(row.origin.coordinates, row.destination.coordinates) ?? undefined,
+        shipmentId: shipmentRef ? asString(row.input.shipmentId) : '',
+        shipment: shipmentRef,
+        unlinked: !shipmentRef,
+        isInterstate: row.origin.state !== row.destination.state,
+        postedBy: brokerId,
+        postedBySummary: toPartySummary(broker),
+        billingStatus: 'not_ready'
+      });
+
+      const validationError = load.validateSync();
+      if (validationError) {
+        row.errors.push(...Object.values(validationError.errors).map(error => error.message));
+        continue;
+      }
+      documents.push({ row, doc: load.toObject() });
+    }
+
+    const inserted = await this.insertInChunks(documents);
+
+    for (const row of prepared) {
+      const loadId = inserted.get(row.row);
+      results.push(loadId
+        ? { row: row.row, status: 'created', loadId }
+        : { row: row.row, status: 'failed', errors: row.errors.length > 0 ? row.errors : ['Insert failed'] });
+    }
+    results.sort((a, b) => a.row - b.row);
+
+    const created = results.filter(result => result.status === 'created').length;
+    if (created > 0) {
+      websocketService.notifyLoadsImported({
+        postedBy: brokerId,
+        count: created,
+        loadIds: results.filter(result => result.loadId).map(result => result.loadId as string)
+      });
+    }
+
+    const summary = {
+      received: rows.length,
+      created,
+      failed: results.length - created,
+      durationMs: Date.now() - startedAt,
+      results
+    };
+
+    logger.info('Bulk load import finished', {
+      brokerId,
+      received: summary.received,
+      created: summary.created,
+      failed: summary.failed,
+      durationMs: summary.durationMs
+    });
+
+    return summary;
+  }
+
+  private prepareRow(row: number, input: LoadImportInput): PreparedRow {
+    const errors: string[] = [];
+    const origin = normalizeLocation(input.origin, 'origin', errors);
+    const destination = normalizeLocation(input.destination, 'destination', errors);
+
+    const pickupDate = new Date(asString(input.pickupDate));
+    const deliveryDate = new Date(asString(input.deliveryDate));
+    if (Number.isNaN(pickupDate.getTime())) errors.push('Invalid pickup date');
+    if (Number.isNaN(deliveryDate.getTime())) errors.push('Invalid delivery date');
+    if (deliveryDate.getTime() < pickupDate.getTime()) errors.push('Delivery date must not be before pickup date');
+
+    const weight = Number(input.weight);
+    const rate = Number(input.rate);
+    if (!Number.isFinite(weight) || weight <= 0) errors.push('Weight must be a positive number');
+    if (!Number.isFinite(rate) || rate <= 0) errors.push('Rate must be a positive number');
+    if (!asString(input.equipmentType)) errors.push('Equipment type is required');
+
+    return { row, input, origin, destination, pickupDate, deliveryDate, weight, rate, errors };
+  }
+
+  private async findOpenShipments(rows: PreparedRow[]): Promise<Map<string, Types.ObjectId>> {
+    const shipmentIds = Array.from(new Set(rows.map(row => asString(row.input.shipmentId)).filter(Boolean)));
+    if (shipmentIds.length === 0) return new Map();
+
+    const shipments = await Shipment.find({ shipmentId: { $in: shipmentIds }, status: 'open' })
+      .select('_id shipmentId')
+      .lean();
+    return new Map(shipments.map(shipment => [shipment.shipmentId, shipment._id as Types.ObjectId]));
+  }
+
+  /**
+   * Fill missing coordinates, geocoding each distinct address once
+   */
+  private async geocodeUnique(rows: PreparedRow[]): Promise<void> {
+    const pending = new Map<string, NormalizedLocation[]>();
+    for (const row of rows) {
+      for (const location of [row.origin, row.destination]) {
+        if (location.coordinates) continue;
+        const key = normalizeAddressKey(location);
+        const group = pending.get(key);
+        if (group) group.push(location);
+        else pending.set(key, [location]);
+      }
+    }
+
+    const groups = Array.from(pending.values());
+    await mapWithConcurrency(groups, GEOCODE_CONCURRENCY, async (group) => {
+      const point = await geocodingService.geocodeWithin(group[0], GEOCODE_REQUEST_TIMEOUT_MS);
+      if (!point) return;
+      for (const location of group) {
+        location.coordinates = { lat: point.latitude, lng: point.longitude };
+      }
+    });
+  }
+
+  /**
+   * Insert prepared documents in unordered chunks; returns row number → load id for inserted rows
+   */
+  private async insertInChunks(documents: Array<{ row: PreparedRow; doc: Record<string, any> }>): Promise<Map<number, string>> {
+    const inserted = new Map<number, string>();
+
+    for (let start = 0; start < documents.length; start += INSERT_CHUNK_SIZE) {
+      const chunk = documents.slice(start, start + INSERT_CHUNK_SIZE);
+      const failedIndexes = new Set<number>();
+
+      try {
+        // Documents were validated above, so skip re-hydration and validation
+        await Load.insertMany(chunk.map(item => item.doc), { ordered: false, lean: true });
+      } catch (error: any) {
+        const writeErrors = Array.isArray(error.writeErrors)
+          ? error.writeErrors
+          : error.writeErrors ? [error.writeErrors] : [];
+
+        if (writeErrors.length === 0) {
+          logger.error('Bulk load import chunk failed', { error: error.message });
+          chunk.forEach((_, index) => failedIndexes.add(index));
+        }
+        for (const writeError of writeErrors) {
+          const index = writeError.index ?? writeError.err?.index;
+          if (typeof index !== 'number') continue;
+          failedIndexes.add(index);
+          chunk[index].row.errors.push(writeError.errmsg ?? writeError.err?.errmsg ?? 'Insert failed');
+        }
+      }
+
+      const insertedDocs: Array<Record<string, any>> = [];
+      chunk.forEach((item, index) => {
+        if (failedIndexes.has(index)) return;
+        inserted.set(item.row.row, String(item.doc._id));
+        insertedDocs.push(item.doc);
+        loadEvents.publishCreated(item.doc as any);
+      });
+      await dailyStatsService.recordLoadsCreated(insertedDocs as any[]);
+    }
+
+    return inserted;
+  }
+}
+
+export const loadImportService = new LoadImportService();
@@ -0,0 +1,447 @@
+import { Load } from '../models/Load.model.js';
+import { config } from '../config/environment.js';
+import { IPartySummary } from '../types/index.js';
+import { loadEvents, LoadChange, LoadSnapshot } from './loadEvents.service.js';
+import { PARTY_SUMMARY_FIELDS, partySummaryService, PartyPopulate } from './partySummary.service.js';
+import { encodeCursor, LoadCursor } from '../utils/pagination.js';
+import { logger } from '../utils/logger.js';
+
+export interface LoadIndexQuery {
+  originState?: string;
+  destinationState?: string;
+  equipment?: string[];
+  minRate?: number;
+  maxRate?: number;
+  minWeight?: number;
+  maxWeight?: number;
+  pickupDateFrom?: Date;
+  pickupDateTo?: Date;
+  isInterstate?: boolean;
+}
+
+export interface LoadIndexPage {
+  limit: number;
+  skip?: number;
+  /** Keyset mode: null for the first page, a decoded cursor for later pages */
+  cursor?: LoadCursor | null;
+}
+
+export interface LoadIndexResult {
+  loads: LoadSnapshot[];
+  total: number;
+  nextCursor?: string | null;
+}
+
+export interface LoadIndexStats {
+  enabled: boolean;
+  ready: boolean;
+  loads: number;
+  buckets: number;
+  approxBytes: number;
+  hits: number;
+  misses: number;
+  hitRate: number;
+  lastRebuildAt: string | null;
+  lastRebuildMs: number | null;
+}
+
+interface IndexEntry {
+  id: string;
+  createdAt: number;
+  rate: number;
+  weight: number;
+  pickupDate: number;
+  isInterstate: boolean;
+  originState: string;
+  destinationState: string;
+  equipmentType: string;
+  bytes: number;
+  load: LoadSnapshot;
+}
+
+interface Bucket {
+  originState: string;
+  destinationState: string;
+  equipmentType: string;
+  byRate: IndexEntry[];
+  byPickup: IndexEntry[];
+}
+
+interface IndexState {
+  entries: Map<string, IndexEntry>;
+  buckets: Map<string, Bucket>;
+  byCreated: IndexEntry[];
+  approxBytes: number;
+}
+
+// Entries carry postedBy as { _id, ...postedBySummary }, the shape board reads return
+const POSTED_BY: PartyPopulate = { postedBy: PARTY_SUMMARY_FIELDS };
+const REBUILD_BATCH_SIZE = 500;
+
+// Newest first, ties broken by _id descending (same order as KEYSET_SORT)
+const compareRecency = (a: { createdAt: number; id: string }, b: { createdAt: number; id: string }): number =>
+  b.createdAt - a.createdAt || (a.id > b.id ? -1 : a.id < b.id ? 1 : 0);
+
+const compareRate = (a: IndexEntry, b: IndexEntry): number => a.rate - b.rate || compareRecency(a, b);
+
+const comparePickup = (a: IndexEntry, b: IndexEntry): number => a.pickupDate - b.pickupDate || compareRecency(a, b);
+
+function insertSorted(array: IndexEntry[], entry: IndexEntry, compare: (a: IndexEntry, b: IndexEntry) => number): void {
+  let lo = 0;
+  let hi = array.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (compare(array[mid], entry) < 0) lo = mid + 1;
+    else hi = mid;
+  }
+  array.splice(lo, 0, entry);
+}
+
+function removeSorted(array: IndexEntry[], entry: IndexEntry, compare: (a: IndexEntry, b: IndexEntry) => number): void {
+  let lo = 0;
+  let hi = array.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    if (compare(array[mid], entry) < 0) lo = mid + 1;
+    else hi = mid;
+  }
+  if (array[lo] === entry) array.splice(lo, 1);
+}
+
+/**
+ * First index whose key is >= value (or > value when `exclusive`)
+ */
+function boundBy(array: IndexEntry[], value: number, key: (entry: IndexEntry) => number, exclusive: boolean = false): number {
+  let lo = 0;
+  let hi = array.length;
+  while (lo < hi) {
+    const mid = (lo + hi) >>> 1;
+    const current = key(array[mid]);
+    if (current < value || (exclusive && current === value)) lo = mid + 1;
+    else hi = mid;
+  }
+  return lo;
+}
+
+function emptyState(): IndexState {
+  return { entries: new Map(), buckets: new Map(), byCreated: [], approxBytes: 0 };
+}
+
+/**
+ * Opt-in in-process index of available loads (LOAD_INDEX_ENABLED=true).
+ * Loads are bucketed by origin state / destination state / equipment with
+ * rate- and pickup-sorted arrays per bucket, plus a global recency array.
+ * Kept current from load change events (including party-summary changes);
+ * rebuilt from MongoDB on startup.
+ */
+class LoadIndexService {
+  private state: IndexState = emptyState();
+  private ready = false;
+  private started = false;
+  private queue: Promise<void> = Promise.resolve();
+  private hits = 0;
+  private misses = 0;
+  private lastRebuildAt: Date | null = null;
+  private lastRebuildMs: number | null = null;
+
+  /**
+   * Subscribe to load events and build the index. No-op unless enabled.
+   */
+  async start(): Promise<void> {
+    if (!config.LOAD_INDEX_ENABLED || this.started) return;
+    this.started = true;
+
+    loadEvents.subscribe((change) => this.enqueue(() => this.applyChange(change)));
+
+    try {
+      await this.rebuild();
+    } catch {
+      logger.warn('Load index unavailable, board reads will use MongoDB');
+    }
+  }
+
+  isReady(): boolean {
+    return this.ready;
+  }
+
+  /**
+   * Reload all available loads from MongoDB and swap the index atomically
+   */
+  rebuild(): Promise<void> {
+    return this.enqueue(async () => {
+      const startedAt = Date.now();
+      const next = emptyState();
+
+      const cursor = Load.find({ status: 'available' }).lean().cursor();
+
+      let batch: LoadSnapshot[] = [];
+      for await (const doc of cursor) {
+        batch.push(doc as unknown as LoadSnapshot);
+        if (batch.length === REBUILD_BATCH_SIZE) {
+          await this.addLoads(next, batch);
+          batch = [];
+        }
+      }
+      await this.addLoads(next, batch);
+
+      this.state = next;
+      this.ready = true;
+      this.lastRebuildAt = new Date();
+      this.lastRebuildMs = Date.now() - startedAt;
+
+      logger.info('Load index rebuilt', {
+        loads: next.entries.size,
+        buckets: next.buckets.size,
+        durationMs: this.lastRebuildMs
+      });
+    });
+  }
+
+  /**
+   * Answer an available-load query from memory.
+   * Returns null when the index is not ready; callers fall back to MongoDB.
+   */
+  query(filters: LoadIndexQuery, page: LoadIndexPage): LoadIndexResult | null {
+    if (!this.ready) {
+      if (config.LOAD_INDEX_ENABLED) this.misses++;
+      return null;
+    }
+
+    const matches = this.collect(filters);
+    this.hits++;
+
+    if (page.cursor !== undefined) {
+      let start = 0;
+      if (page.cursor) {
+        const position = { createdAt: page.cursor.createdAt.getTime(), id: page.cursor.id.toString() };
+        let lo = 0;
+        let hi = matches.length;
+        while (lo < hi) {
+          const mid = (lo + hi) >>> 1;
+          if (compareRecency(matches[mid], position) <= 0) lo = mid + 1;
+          else hi = mid;
+        }
+        start = lo;
+      }
+
+      const slice = matches.slice(start, start + page.limit);
+      const hasMore = start + page.limit < matches.length;
+      const last = slice[slice.length - 1];
+
+      return {
+        loads: slice.map(entry => entry.load),
+        total: matches.length,
+        nextCursor: hasMore && last ? encodeCursor({ createdAt: new Date(last.createdAt), _id: last.id }) : null
+      };
+    }
+
+    const skip = page.skip ?? 0;
+    return {
+      loads: matches.slice(skip, skip + page.limit).map(entry => entry.load),
+      total: matches.length
+    };
+  }
+
+  /**
+   * Record a read that could not be served from the index
+   */
+  recordMiss(): void {
+    if (this.ready) this.misses++;
+  }
+
+  getStats(): LoadIndexStats {
+    const lookups = this.hits + this.misses;
+    return {
+      enabled: config.LOAD_INDEX_ENABLED,
+      ready: this.ready,
+      loads: this.state.entries.size,
+      buckets: this.state.buckets.size,
+      approxBytes: this.state.approxBytes,
+      hits: this.hits,
+      misses: this.misses,
+      hitRate: lookups > 0 ? Number((this.hits / lookups).toFixed(4)) : 0,
+      lastRebuildAt: this.lastRebuildAt ? this.lastRebuildAt.toISOString() : null,
+      lastRebuildMs: this.lastRebuildMs
+    };
+  }
+
+  /**
+   * Gather matching entries in recency order
+   */
+  private collect(filters: LoadIndexQuery): IndexEntry[] {
+    const equipment = filters.equipment && filters.equipment.length > 0 ? new Set(filters.equipment) : null;
+    const hasRate = filters.minRate !== undefined || filters.maxRate !== undefined;
+    const hasPickup = filters.pickupDateFrom !== undefined || filters.pickupDateTo !== undefined;
+    const narrowsBuckets = !!(filters.originState || filters.destinationState || equipment);
+
+    // No bucket or range filter: walk the global recency array
+    if (!narrowsBuckets && !hasRate && !hasPickup) {
+      return this.state.byCreated.filter(entry => this.matches(entry, filters, equipment));
+    }
+
+    const results: IndexEntry[] = [];
+    for (const bucket of this.state.buckets.values()) {
+      if (filters.originState && bucket.originState !== filters.originState) continue;
+      if (filters.destinationState && bucket.destinationState !== filters.destinationState) continue;
+      if (equipment && !equipment.has(bucket.equipmentType)) continue;
+
+      let candidates: IndexEntry[];
+      if (hasRate) {
+        const from = filters.minRate !== undefined ? boundBy(bucket.byRate, filters.minRate, e => e.rate) : 0;
+        const to = filters.maxRate !== undefined ? boundBy(bucket.byRate, filters.maxRate, e => e.rate, true) : bucket.byRate.length;
+        candidates = bucket.byRate.slice(from, to);
+      } else if (hasPickup) {
+        const from = filters.pickupDateFrom ? boundBy(bucket.byPickup, filters.pickupDateFrom.getTime(), e => e.pickupDate) : 0;
+        const to = filters.pickupDateTo
+          ? boundBy(bucket.byPickup, filters.pickupDateTo.getTime(), e => e.pickupDate, true)
+          : bucket.byPickup.length;
+        candidates = bucket.byPickup.slice(from, to);
+      } else {
+        candidates = bucket.byRate;
+      }
+
+      for (const entry of candidates) {
+        if (this.matches(entry, filters, equipment)) results.push(entry);
+      }
+    }
+
+    return results.sort(compareRecency);
+  }
+
+  private matches(entry: IndexEntry, filters: LoadIndexQuery, equipment: Set<string> | null): boolean {
+    if (filters.originState && entry.originState !== filters.originState) return false;
+    if (filters.destinationState && entry.destinationState !== filters.destinationState) return false;
+    if (equipment && !equipment.has(entry.equipmentType)) return false;
+    if (filters.isInterstate !== undefined && entry.isInterstate !== filters.isInterstate) return false;
+    if (filters.minRate !== undefined && entry.rate < filters.minRate) return false;
+    if (filters.maxRate !== undefined && entry.rate > filters.maxRate) return false;
+    if (filters.minWeight !== undefined && entry.weight < filters.minWeight) return false;
+    if (filters.maxWeight !== undefined && entry.weight > filters.maxWeight) return false;
+    if (filters.pickupDateFrom && entry.pickupDate < filters.pickupDateFrom.getTime()) return false;
+    if (filters.pickupDateTo && entry.pickupDate > filters.pickupDateTo.getTime()) return false;
+    return true;
+  }
+
+  private async applyChange(change: LoadChange): Promise<void> {
+    switch (change.type) {
+      case 'reset':
+        // Scheduled behind the current task; awaiting it here would deadlock the queue
+        this.rebuild().catch(() => undefined);
+        return;
+      case 'deleted':
+        this.removeEntry(this.state, change.loadId);
+        return;
+      case 'created':
+      case 'updated': {
+        const id = change.load._id.toString();
+        if (change.load.status !== 'available') {
+          this.removeEntry(this.state, id);
+          return;
+        }
+
+        const [load] = await partySummaryService.expand([{ ...change.load }], POSTED_BY);
+
+        this.removeEntry(this.state, id);
+        this.addEntry(this.state, load);
+        return;
+      }
+      case 'party':
+        this.applyParty(change.userId, change.summary);
+        return;
+      default:
+        return;
+    }
+  }
+
+  /**
+   * Expand postedBy from the stored summaries (populating loads without one) and index the batch
+   */
+  private async addLoads(state: IndexState, loads: LoadSnapshot[]): Promise<void> {
+    if (loads.length === 0) return;
+    await partySummaryService.expand(loads, POSTED_BY);
+    for (const load of loads) {
+      this.addEntry(state, load);
+    }
+  }
+
+  /**
+   * Swap in a user's new summary on every entry they posted
+   */
+  private applyParty(userId: string, summary: IPartySummary): void {
+    for (const entry of this.state.entries.values()) {
+      const postedBy = entry.load.postedBy as { _id?: unknown } | undefined;
+      if (!postedBy?._id || String(postedBy._id) !== userId) continue;
+
+      entry.load = { ...entry.load, postedBy: { _id: postedBy._id, ...summary } };
+      const bytes = Buffer.byteLength(JSON.stringify(entry.load));
+      this.state.approxBytes += bytes - entry.bytes;
+      entry.bytes = bytes;
+    }
+  }
+
+  private addEntry(state: IndexState, load: LoadSnapshot): void {
+    const bytes = Buffer.byteLength(JSON.stringify(load));
+    const entry: IndexEntry = {
+      id: load._id.toString(),
+      createdAt: new Date(load.createdAt).getTime(),
+      rate: load.rate ?? 0,
+      weight: load.weight ?? 0,
+      pickupDate: new Date(load.pickupDate).getTime(),
+      isInterstate: load.isInterstate !== false,
+      originState: load.origin?.state ?? '',
+      destinationState: load.destination?.state ?? '',
+      equipmentType: load.equipmentType ?? '',
+      bytes,
+      load
+    };
+
+    const bucketKey = `${entry.originState}|${entry.destinationState}|${entry.equipmentType}`;
+    let bucket = state.buckets.get(bucketKey);
+    if (!bucket) {
+      bucket = {
+        originState: entry.originState,
+        destinationState: entry.destinationState,
+        equipmentType: entry.equipmentType,
+        byRate: [],
+        byPickup: []
+      };
+      state.buckets.set(bucketKey, bucket);
+    }
+
+    insertSorted(bucket.byRate, entry, compareRate);
+    insertSorted(bucket.byPickup, entry, comparePickup);
+    insertSorted(state.byCreated, entry, compareRecency);
+    state.entries.set(entry.id, entry);
+    state.approxBytes += bytes;
+  }
+
+  private removeEntry(state: IndexState, id: string): void {
+    const entry = state.entries.get(id);
+    if (!entry) return;
+
+    const bucketKey = `${entry.originState}|${entry.destinationState}|${entry.equipmentType}`;
+    const bucket = state.buckets.get(bucketKey);
+    if (bucket) {
+      removeSorted(bucket.byRate, entry, compareRate);
+      removeSorted(bucket.byPickup, entry, comparePickup);
+      if (bucket.byRate.length === 0) state.buckets.delete(bucketKey);
+    }
+
+    removeSorted(state.byCreated, entry, compareRecency);
+    state.entries.delete(id);
+    state.approxBytes -= entry.bytes;
+  }
+
+  /**
+   * Run index mutations one at a time so async populate cannot reorder events
+   */
+  private enqueue(task: () => Promise<void>): Promise<void> {
+    const run = this.queue.then(task);
+    this.queue = run.catch((error: any) => {
+      logger.error('Load index update failed', { error: error.message });
+    });
+    return run;
+  }
+}
+
+export const loadIndexService = new LoadIndexService();
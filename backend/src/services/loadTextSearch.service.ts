@@ -0,0 +1,108 @@
+import { Load } from '../models/Load.model.js';
+import { config } from '../config/environment.js';
+import { loadEvents, LoadChange, LoadSnapshot } from './loadEvents.service.js';
+import { TextIndex, TextRankResult, TextSearchHit } from '../utils/textIndex.js';
+import { logger } from '../utils/logger.js';
+
+export type LoadTextField = 'title' | 'description' | 'originCity' | 'originState' | 'destinationCity' | 'destinationState' | 'equipmentType';
+
+// Same relative weights as the load_text_search MongoDB index
+export const LOAD_TEXT_WEIGHTS: Record<LoadTextField, number> = {
+  title: 10,
+  originCity: 6,
+  destinationCity: 6,
+  equipmentType: 4,
+  originState: 3,
+  destinationState: 3,
+  description: 2
+};
+
+export type LoadTextSource = Pick<LoadSnapshot, 'title' | 'description' | 'origin' | 'destination' | 'equipmentType'>;
+
+export const loadTextFields = (load: LoadTextSource): Record<LoadTextField, string | undefined> => ({
+  title: load.title,
+  description: load.description,
+  originCity: load.origin?.city,
+  originState: load.origin?.state,
+  destinationCity: load.destination?.city,
+  destinationState: load.destination?.state,
+  equipmentType: load.equipmentType
+});
+
+/**
+ * Opt-in in-process BM25 index over non-cancelled loads (TEXT_SEARCH_INDEX_ENABLED=true).
+ * searchLoads uses it to rank the free-text part of a query and then applies
+ * structured filters in MongoDB to the candidate ids.
+ */
+class LoadTextSearchService {
+  private index = new TextIndex<LoadTextField>(LOAD_TEXT_WEIGHTS);
+  private ready = false;
+  private started = false;
+
+  async start(): Promise<void> {
+    if (!config.TEXT_SEARCH_INDEX_ENABLED || this.started) return;
+    this.started = true;
+
+    loadEvents.subscribe((change) => this.applyChange(change));
+    await this.rebuild();
+  }
+
+  isReady(): boolean {
+    return this.ready;
+  }
+
+  search(query: string, limit: number): TextSearchHit[] {
+    return this.index.search(query, limit);
+  }
+
+  /**
+   * Top `limit` hits plus the number of loads matched, so callers can tell a truncated list
+   */
+  rank(query: string, limit: number): TextRankResult {
+    return this.index.rank(query, limit);
+  }
+
+  async rebuild(): Promise<void> {
+    try {
+      const startedAt = Date.now();
+      const next = new TextIndex<LoadTextField>(LOAD_TEXT_WEIGHTS);
+      const cursor = Load.find({ status: { $ne: 'cancelled' } })
+        .select('title description origin.city origin.state destination.city destination.state equipmentType')
+        .lean()
+        .cursor();
+
+      for await (const load of cursor) {
+        next.add(String(load._id), loadTextFields(load as LoadTextSource));
+      }
+
+      this.index = next;
+      this.ready = true;
+      logger.info('Load text index rebuilt', { loads: next.size, durationMs: Date.now() - startedAt });
+    } catch (error: any) {
+      logger.error('Load text index rebuild failed', { error: error.message });
+    }
+  }
+
+  private applyChange(change: LoadChange): void {
+    if (!this.ready) return;
+
+    switch (change.type) {
+      case 'created':
+      case 'updated':
+        if (change.load.status === 'cancelled') {
+          this.index.remove(String(change.load._id));
+        } else {
+          this.index.add(String(change.load._id), loadTextFields(change.load));
+        }
+        break;
+      case 'deleted':
+        this.index.remove(change.loadId);
+        break;
+      case 'reset':
+        void this.rebuild();
+        break;
+    }
+  }
+}
+
+export const loadTextSearchService = new LoadTextSearchService();
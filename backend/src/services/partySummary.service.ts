@@ -0,0 +1,152 @@
+import { Query } from 'mongoose';
+import { Load } from '../models/Load.model.js';
+import { User } from '../models/User.model.js';
+import { config } from '../config/environment.js';
+import { IPartySummary } from '../types/index.js';
+import { loadEvents } from './loadEvents.service.js';
+import { logger } from '../utils/logger.js';
+
+export const PARTY_SUMMARY_FIELDS = 'company email accountType';
+
+type PartyPath = 'postedBy' | 'bookedBy';
+
+/** populate() select per party path, used when summary reads are disabled or a summary is missing */
+export type PartyPopulate = Partial<Record<PartyPath, string>>;
+
+const SUMMARY_FIELD: Record<PartyPath, 'postedBySummary' | 'bookedBySummary'> = {
+  postedBy: 'postedBySummary',
+  bookedBy: 'bookedBySummary'
+};
+
+export function toPartySummary(user?: { company?: string; email?: string; accountType?: string } | null): IPartySummary | undefined {
+  if (!user) return undefined;
+  return { company: user.company, email: user.email, accountType: user.accountType };
+}
+
+/**
+ * Compact company/email/accountType snapshots stored on loads so hot lists
+ * can skip populate(). Profile changes fan out to loads in the background.
+ */
+class PartySummaryService {
+  private pending: Set<string> = new Set();
+  private draining = false;
+
+  /**
+   * Queue a background refresh of every load summary that references the user
+   */
+  scheduleSync(userId: string): void {
+    this.pending.add(String(userId));
+    if (!this.draining) {
+      this.draining = true;
+      setImmediate(() => {
+        void this.drain();
+      });
+    }
+  }
+
+  /**
+   * Rewrite postedBySummary/bookedBySummary on all loads that reference the user
+   * and tell in-memory read models holding the old summary
+   */
+  async syncUser(userId: string): Promise<{ posted: number; booked: number }> {
+    const user = await User.findById(userId).select(PARTY_SUMMARY_FIELDS).lean();
+    if (!user) return { posted: 0, booked: 0 };
+
+    const summary = toPartySummary(user);
+    const [posted, booked] = await Promise.all([
+      Load.updateMany({ postedBy: userId }, { $set: { postedBySummary: summary } }),
+      Load.updateMany({ bookedBy: userId }, { $set: { bookedBySummary: summary } })
+    ]);
+    if (summary) {
+      loadEvents.publishParty(String(userId), summary);
+    }
+
+    return { posted: posted.modifiedCount, booked: booked.modifiedCount };
+  }
+
+  /**
+   * Run a load list query, filling party fields from the stored summaries when
+   * PARTY_SUMMARY_READS_ENABLED is set and from populate() otherwise.
+   * Summary mode returns lean objects shaped like the populated documents.
+   */
+  async readLoads(query: Query<any, any>, parties: PartyPopulate): Promise<any[]> {
+    if (!config.PARTY_SUMMARY_READS_ENABLED) {
+      for (const [path, select] of Object.entries(parties)) {
+        query.populate(path, select);
+      }
+      return query.exec();
+    }
+
+    const loads = await query.lean().exec();
+    return this.expand(loads, parties);
+  }
+
+  /**
+   * Same as readLoads for plain load objects that are already loaded, e.g. the
+   * output of an aggregation.
+   */
+  async hydrateLoads<T extends Record<string, any>>(loads: T[], parties: PartyPopulate): Promise<T[]> {
+    if (config.PARTY_SUMMARY_READS_ENABLED) {
+      return this.expand(loads, parties);
+    }
+
+    await Load.populate(loads, Object.entries(parties).map(([path, select]) => ({ path, select })));
+    for (const load of loads) {
+      delete (load as Record<string, any>).postedBySummary;
+      delete (load as Record<string, any>).bookedBySummary;
+    }
+    return loads;
+  }
+
+  /**
+   * Replace party ids with { _id, ...summary } on lean loads; loads written
+   * before summaries existed are populated as a fallback.
+   */
+  async expand<T extends Record<string, any>>(loads: T[], parties: PartyPopulate): Promise<T[]> {
+    for (const [path, select] of Object.entries(parties) as Array<[PartyPath, string]>) {
+      const summaryField = SUMMARY_FIELD[path];
+      const missing: T[] = [];
+
+      for (const load of loads) {
+        const id = load[path];
+        if (!id) continue;
+        const summary = load[summaryField];
+        const populated = typeof id === 'object' && 'email' in id;
+        if (summary) {
+          (load as Record<string, any>)[path] = { _id: populated ? id._id : id, ...summary };
+        } else if (!populated) {
+          missing.push(load);
+        }
+      }
+
+      if (missing.length > 0) {
+        await Load.populate(missing, { path, select });
+      }
+    }
+
+    for (const load of loads) {
+      delete (load as Record<string, any>).postedBySummary;
+      delete (load as Record<string, any>).bookedBySummary;
+    }
+    return loads;
+  }
+
+  private async drain(): Promise<void> {
+    try {
+      while (this.pending.size > 0) {
+        const [userId] = this.pending;
+        this.pending.delete(userId);
+        try {
+          const result = await this.syncUser(userId);
+          logger.info('Party summaries synced', { userId, ...result });
+        } catch (error: any) {
+          logger.error('Party summary sync failed', { userId, error: error.message });
+        }
+      }
+    } finally {
+      this.draining = false;
+    }
+  }
+}
+
+export const partySummaryService = new PartySummaryService();
@@ -1,5 +1,21 @@
 import { Load } from '../models/Load.model.js';
 import { logger } from '../utils/logger.js';
+import { loadCountService } from './loadCount.service.js';
+import { loadIndexService } from './loadIndex.service.js';
+import { facetCounterService } from './facetCounter.service.js';
+import { autocompleteService } from './autocomplete.service.js';
+import { loadTextSearchService } from './loadTextSearch.service.js';
+import { partySummaryService, PARTY_SUMMARY_FIELDS } from './partySummary.service.js';
+import { searchResultCacheService } from './searchResultCache.service.js';
+import { TextRankResult } from '../utils/textIndex.js';
+import { buildKeysetFilter, CountMode, decodeCursor, encodeCursor, KEYSET_SORT } from '../utils/pagination.js';
+import { EARTH_RADIUS_MILES, METERS_PER_MILE } from '../utils/geo.js';
+
+// Party fields returned with search results
+const SEARCH_PARTIES = { postedBy: PARTY_SUMMARY_FIELDS, bookedBy: 'company email' };
+
+// Upper bound on text-ranked candidates passed to MongoDB for structured filtering
+const TEXT_CANDIDATE_LIMIT = 5000;
 
 export interface SearchFilters {
   query?: string;
@@ -17,30 +33,60 @@ export interface SearchFilters {
   bookedBy?: string;
 }
 
+export interface SearchPageOptions {
+  /** Opaque keyset cursor; an empty string requests the first page in cursor mode */
+  cursor?: string;
+  /** How the total should be computed (defaults: exact for offset mode, none for cursor mode) */
+  count?: CountMode;
+}
+
+export interface NearbySearchOptions {
+  /** Origin search point and deadhead radius in miles */
+  lat: number;
+  lng: number;
+  radiusMiles: number;
+  /** Optional destination point and radius in miles */
+  destination?: { lat: number; lng: number; radiusMiles: number };
+}
+
 export interface SearchSuggestion {
   type: 'origin' | 'destination' | 'equipment' | 'city';
   value: string;
   count: number;
 }
 
+export class InvalidCursorError extends Error {
+  constructor() {
+    super('Invalid cursor');
+    this.name = 'InvalidCursorError';
+  }
+}
+
 class SearchService {
   /**
    * Advanced search with multiple filters and relevance scoring
    */
-  async searchLoads(filters: SearchFilters, page: number = 1, limit: number = 20): Promise<{
+  async searchLoads(filters: SearchFilters, page: number = 1, limit: number = 20, options: SearchPageOptions = {}): Promise<{
     loads: any[];
-    total: number;
+    total?: number;
+    nextCursor?: string | null;
     suggestions?: SearchSuggestion[];
   }> {
     try {
       const skip = (page - 1) * limit;
-      const query: any = { status: { $ne: 'cancelled' } }; // Exclude cancelled loads by default
-
-      // Text search
-      if (filters.query) {
-        query.$text = { $search: filters.query };
+      const cursorMode = typeof options.cursor === 'string';
+
+      const indexed = this.searchIndex(filters, skip, limit, options);
+      if (indexed) {
+        return {
+          loads: indexed.loads,
+          total: options.count === 'none' ? undefined : indexed.total,
+          nextCursor: indexed.nextCursor
+        };
       }
 
+      const query: any = { status: { $ne: 'cancelled' } }; // Exclude cancelled loads by default
+
       // Origin/Destination filters
       if (filters.originState) {
         query['origin.state'] = filters.originState;
@@ -90,33 +136,251 @@ class SearchService {
         query.bookedBy = filters.bookedBy;
       }
 
-      // Execute search with relevance scoring if text search is used
-      const sort: any = { createdAt: -1 };
-      if (filters.query) {
-        sort.score = { $meta: 'textScore' }; // Sort by relevance score
+      // Text search: rank candidates in-process when the index is built, otherwise use the MongoDB text index
+      const ranked = filters.query ? this.rankText(filters, query, skip + limit, cursorMode) : null;
+      if (ranked) {
+        query._id = { $in: ranked.hits.map(hit => hit.id) };
+      } else if (filters.query) {
+        query.$text = { $search: filters.query };
       }
 
+      // Execute search with relevance scoring if text search is used (relevance first, then recency)
+      const sort: any = filters.query && !ranked
+        ? { score: { $meta: 'textScore' }, createdAt: -1 }
+        : { createdAt: -1 };
+
+      // Structured (non-text) searches can be served from the result cache
+      const countMode = options.count ?? (cursorMode ? 'none' : 'exact');
+      const cacheTicket = filters.query
+        ? null
+        : searchResultCacheService.ticket(filters, { limit, skip: cursorMode ? undefined : skip, cursor: options.cursor, count: countMode });
+
+      if (cursorMode) {
+        const pageFilter: any = { ...query };
+        if (options.cursor) {
+          const position = decodeCursor(options.cursor);
+          if (!position) {
+            throw new InvalidCursorError();
+          }
+          Object.assign(pageFilter, buildKeysetFilter(position));
+        }
+
+        const cached = cacheTicket ? await searchResultCacheService.read(cacheTicket, SEARCH_PARTIES) : null;
+        if (cached) return cached;
+
+        const [rows, total] = await Promise.all([
+          partySummaryService.readLoads(
+            Load.find(pageFilter)
+              .sort(KEYSET_SORT)
+              .limit(limit + 1)
+              .lean(),
+            SEARCH_PARTIES
+          ),
+          loadCountService.count(query, countMode)
+        ]);
+
+        const hasMore = rows.length > limit;
+        const loads = hasMore ? rows.slice(0, limit) : rows;
+        const last = loads[loads.length - 1];
+        const nextCursor = hasMore && last ? encodeCursor(last) : null;
+        const suggestions = filters.query ? await this.generateSuggestions(filters.query) : undefined;
+
+        if (cacheTicket) {
+          searchResultCacheService.store(cacheTicket, { ids: loads.map(load => String(load._id)), total, nextCursor });
+        }
+
+        return { loads, total, nextCursor, suggestions };
+      }
+
+      if (ranked) {
+        return this.searchRanked(query, ranked, skip, limit, filters.query as string);
+      }
+
+      const cached = cacheTicket ? await searchResultCacheService.read(cacheTicket, SEARCH_PARTIES) : null;
+      if (cached) return cached;
+
       const [loads, total] = await Promise.all([
-        Load.find(query)
-          .populate('postedBy', 'company email accountType')
-          .populate('bookedBy', 'company email')
-          .sort(sort)
-          .skip(skip)
-          .limit(limit)
-          .lean(),
-        Load.countDocuments(query)
+        partySummaryService.readLoads(
+          Load.find(query)
+            .sort(sort)
+            .skip(skip)
+            .limit(limit)
+            .lean(),
+          SEARCH_PARTIES
+        ),
+        loadCountService.count(query, countMode)
       ]);
 
+      if (cacheTicket) {
+        searchResultCacheService.store(cacheTicket, { ids: loads.map(load => String(load._id)), total });
+      }
+
       // Generate search suggestions based on popular results
       const suggestions = filters.query ? await this.generateSuggestions(filters.query) : undefined;
 
       return { loads, total, suggestions };
     } catch (error: any) {
+      if (error instanceof InvalidCursorError) throw error;
       logger.error('Search loads failed', { error: error.message });
       return { loads: [], total: 0 };
     }
   }
 
+  /**
+   * Text-ranked candidates from the in-process index, or null when the MongoDB
+   * text index must answer instead. The index holds non-cancelled loads only,
+   * and it returns the top TEXT_CANDIDATE_LIMIT ids. A truncated list is used
+   * only when nothing but the text query narrows the results and the requested
+   * page lies within it; otherwise filtered matches ranked below the cut would
+   * be lost.
+   */
+  private rankText(filters: SearchFilters, query: any, pageEnd: number, cursorMode: boolean): TextRankResult | null {
+    const status = ([] as string[]).concat(filters.status ?? []);
+    if (!filters.query || !loadTextSearchService.isReady() || status.includes('cancelled')) return null;
+
+    const ranked = loadTextSearchService.rank(filters.query, TEXT_CANDIDATE_LIMIT);
+    if (ranked.total <= ranked.hits.length) return ranked;
+
+    const structured = status.length > 0 || Object.keys(query).some(key => key !== 'status');
+    return !structured && !cursorMode && pageEnd <= ranked.hits.length ? ranked : null;
+  }
+
+  /**
+   * Offset page of text-ranked candidates: structured filters run in MongoDB on
+   * the candidate ids, and the surviving ids keep their relevance order.
+   */
+  private async searchRanked(query: any, ranked: TextRankResult, skip: number, limit: number, text: string) {
+    const matching = await Load.find(query).select('_id').lean();
+    const matched = new Set(matching.map(load => String(load._id)));
+    const orderedIds = ranked.hits.map(hit => hit.id).filter(id => matched.has(id));
+    const pageIds = orderedIds.slice(skip, skip + limit);
+
+    const rows = await partySummaryService.readLoads(Load.find({ _id: { $in: pageIds } }).lean(), SEARCH_PARTIES);
+    const byId = new Map(rows.map(load => [String(load._id), load]));
+    const loads = pageIds.map(id => byId.get(id)).filter(Boolean);
+
+    // A truncated list is only used unfiltered (see rankText), so every match counts
+    const total = ranked.total > ranked.hits.length ? ranked.total : orderedIds.length;
+    const suggestions = await this.generateSuggestions(text);
+    return { loads, total, suggestions };
+  }
+
+  /**
+   * Available loads whose origin lies within a radius of a point, nearest first.
+   * Each load carries `deadheadMiles` (distance from the search point to its origin).
+   */
+  async searchLoadsNearby(
+    nearby: NearbySearchOptions,
+    filters: Pick<SearchFilters, 'equipment' | 'minRate' | 'maxRate' | 'minWeight' | 'maxWeight' | 'pickupDateFrom' | 'pickupDateTo'> = {},
+    page: number = 1,
+    limit: number = 20
+  ): Promise<{ loads: any[]; total: number }> {
+    try {
+      const query: any = { status: 'available' };
+
+      if (nearby.destination) {
+        query.destinationPoint = {
+          $geoWithin: {
+            $centerSphere: [
+              [nearby.destination.lng, nearby.destination.lat],
+              nearby.destination.radiusMiles / EARTH_RADIUS_MILES
+            ]
+          }
+        };
+      }
+
+      const equipment = ([] as string[]).concat(filters.equipment ?? []);
+      if (equipment.length > 0) {
+        query.equipmentType = { $in: equipment };
+      }
+      if (filters.minRate || filters.maxRate) {
+        query.rate = {};
+        if (filters.minRate) query.rate.$gte = filters.minRate;
+        if (filters.maxRate) query.rate.$lte = filters.maxRate;
+      }
+      if (filters.minWeight || filters.maxWeight) {
+        query.weight = {};
+        if (filters.minWeight) query.weight.$gte = filters.minWeight;
+        if (filters.maxWeight) query.weight.$lte = filters.maxWeight;
+      }
+      if (filters.pickupDateFrom || filters.pickupDateTo) {
+        query.pickupDate = {};
+        if (filters.pickupDateFrom) query.pickupDate.$gte = filters.pickupDateFrom;
+        if (filters.pickupDateTo) query.pickupDate.$lte = filters.pickupDateTo;
+      }
+
+      const skip = (page - 1) * limit;
+
+      // $geoNear uses the originPoint 2dsphere index and returns results sorted by distance
+      const [result] = await Load.aggregate([
+        {
+          $geoNear: {
+            near: { type: 'Point', coordinates: [nearby.lng, nearby.lat] },
+            key: 'originPoint',
+            spherical: true,
+            maxDistance: nearby.radiusMiles * METERS_PER_MILE,
+            distanceField: 'deadheadMiles',
+            distanceMultiplier: 1 / METERS_PER_MILE,
+            query
+          }
+        },
+        {
+          $facet: {
+            loads: [{ $skip: skip }, { $limit: limit }],
+            total: [{ $count: 'count' }]
+          }
+        }
+      ]);
+
+      // Aggregation results are plain objects, so expand summaries (or populate) directly
+      const loads = await partySummaryService.expand(result?.loads ?? [], { postedBy: PARTY_SUMMARY_FIELDS });
+
+      return {
+        loads: loads.map((load: any) => ({ ...load, deadheadMiles: Math.round(load.deadheadMiles * 10) / 10 })),
+        total: result?.total?.[0]?.count ?? 0
+      };
+    } catch (error: any) {
+      logger.error('Nearby load search failed', { error: error.message });
+      return { loads: [], total: 0 };
+    }
+  }
+
+  /**
+   * Serve available-only structured searches from the in-memory load index.
+   * Returns null when the filters need MongoDB (text query, other statuses, party filters).
+   */
+  private searchIndex(filters: SearchFilters, skip: number, limit: number, options: SearchPageOptions) {
+    // Query-string input may arrive as a single value rather than an array
+    const status = ([] as string[]).concat(filters.status ?? []);
+    const equipment = ([] as string[]).concat(filters.equipment ?? []);
+    const availableOnly = status.length === 1 && status[0] === 'available';
+
+    if (!availableOnly || filters.query || filters.postedBy || filters.bookedBy) {
+      if (availableOnly) loadIndexService.recordMiss();
+      return null;
+    }
+
+    const cursor = options.cursor ? decodeCursor(options.cursor) : null;
+    if (options.cursor && !cursor) {
+      throw new InvalidCursorError();
+    }
+
+    return loadIndexService.query(
+      {
+        originState: filters.originState,
+        destinationState: filters.destinationState,
+        equipment,
+        minRate: filters.minRate || undefined,
+        maxRate: filters.maxRate || undefined,
+        minWeight: filters.minWeight || undefined,
+        maxWeight: filters.maxWeight || undefined,
+        pickupDateFrom: filters.pickupDateFrom,
+        pickupDateTo: filters.pickupDateTo
+      },
+      typeof options.cursor === 'string' ? { limit, cursor } : { limit, skip }
+    );
+  }
+
   /**
    * Generate search suggestions based on query
    */
@@ -124,6 +388,16 @@ class SearchService {
     try {
       const suggestions: SearchSuggestion[] = [];
 
+      // Serve from incrementally maintained counters when available
+      if (facetCounterService.isReady()) {
+        suggestions.push(
+          ...facetCounterService.top('origin', 5).map(s => ({ type: 'origin' as const, value: s.value, count: s.count })),
+          ...facetCounterService.top('destination', 5).map(s => ({ type: 'destination' as const, value: s.value, count: s.count })),
+          ...facetCounterService.top('equipment', 10).map(s => ({ type: 'equipment' as const, value: s.value, count: s.count }))
+        );
+        return suggestions.slice(0, _limit);
+      }
+
       // Get popular origin states
       const originStates = await Load.aggregate([
         { $match: { status: { $ne: 'cancelled' } } },
@@ -179,7 +453,12 @@ class SearchService {
   async autocompleteCityState(query: string, type: 'origin' | 'destination' = 'origin', limit: number = 10): Promise<string[]> {
     try {
       const field = type === 'origin' ? 'origin' : 'destination';
-      const regex = new RegExp(query, 'i');
+
+      if (autocompleteService.isReady()) {
+        return autocompleteService.complete(query, field, limit);
+      }
+
+      const regex = new RegExp(query.replace(/[.*+?^${}()|[\]\\]/g, '\\$&'), 'i');
 
       const results = await Load.aggregate([
         {
@@ -237,6 +516,10 @@ class SearchService {
    */
   async getPopularSearches(limit: number = 20): Promise<Array<{ term: string; count: number }>> {
     try {
+      if (facetCounterService.isReady()) {
+        return facetCounterService.top('equipment', limit).map(item => ({ term: item.value, count: item.count }));
+      }
+
       // Get popular equipment types
       const popularEquipment = await Load.aggregate([
         { $match: { status: { $ne: 'cancelled' } } },
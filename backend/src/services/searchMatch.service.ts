@@ -0,0 +1,151 @@
+import { CronJob } from 'cron';
+import { Types } from 'mongoose';
+import { config } from '../config/environment.js';
+import { ISavedSearch, SavedSearch } from '../models/SavedSearch.model.js';
+import { ALERTS } from '../utils/constants.js';
+import { logger } from '../utils/logger.js';
+import { SearchMatcher } from '../utils/searchMatcher.js';
+import { loadEvents, LoadChange, LoadSnapshot } from './loadEvents.service.js';
+
+type IndexedSearch = Pick<ISavedSearch, 'filters' | 'alertEnabled'> & { _id: Types.ObjectId | string };
+
+/**
+ * Matches loads against alert-enabled saved searches as they are posted
+ * (opt-in via ALERT_MATCH_INDEX_ENABLED). Searches live in an in-memory
+ * reverse index; each match is pushed onto the search's pendingLoads bucket,
+ * which AlertCronService drains on the search's instant/daily/weekly schedule.
+ * Saved-search writes on this instance update the index directly; a periodic
+ * rebuild picks up the rest.
+ */
+class SearchMatchService {
+  private matcher = new SearchMatcher();
+  private ready = false;
+  private cronJob: CronJob | null = null;
+  private unsubscribe: (() => void) | null = null;
+
+  isEnabled(): boolean {
+    return config.ALERT_MATCH_INDEX_ENABLED;
+  }
+
+  isReady(): boolean {
+    return this.ready;
+  }
+
+  async start(): Promise<void> {
+    if (!this.isEnabled() || this.cronJob) return;
+
+    this.unsubscribe = loadEvents.subscribe((change) => this.applyChange(change));
+
+    this.cronJob = new CronJob(ALERTS.MATCH_RELOAD_CRON, async () => {
+      await this.rebuild();
+    });
+    this.cronJob.start();
+
+    await this.rebuild();
+  }
+
+  stop(): void {
+    this.cronJob?.stop();
+    this.cronJob = null;
+    this.unsubscribe?.();
+    this.unsubscribe = null;
+  }
+
+  /**
+   * Reload every alert-enabled search into a fresh index
+   */
+  async rebuild(): Promise<void> {
+    try {
+      const startedAt = Date.now();
+      const matcher = new SearchMatcher();
+      const cursor = SavedSearch.find({ alertEnabled: true }).select('filters').lean().cursor({ batchSize: 1000 });
+      for await (const search of cursor) {
+        matcher.add(String(search._id), search.filters ?? {});
+      }
+
+      this.matcher = matcher;
+      this.ready = true;
+      logger.info('Saved-search match index built', { searches: matcher.size, durationMs: Date.now() - startedAt });
+    } catch (error: any) {
+      logger.error('Saved-search match index build failed', { error: error.message });
+    }
+  }
+
+  /**
+   * Keep the index in step with a saved search created or updated on this instance
+   */
+  upsert(search: IndexedSearch): void {
+    if (!this.ready) return;
+    if (search.alertEnabled) {
+      this.matcher.add(String(search._id), search.filters ?? {});
+    } else {
+      this.matcher.remove(String(search._id));
+    }
+  }
+
+  remove(searchId: string): void {
+    if (!this.ready) return;
+    this.matcher.remove(searchId);
+  }
+
+  /**
+   * Match a load and add it to each matching search's pending bucket
+   */
+  async record(load: LoadSnapshot): Promise<number> {
+    if (!this.ready || load.status !== 'available' || !load._id) return 0;
+
+    const startedAt = process.hrtime.bigint();
+    const searchIds = this.matcher.match(load);
+    const matchMicros = Number(process.hrtime.bigint() - startedAt) / 1000;
+    if (searchIds.length === 0) return 0;
+
+    try {
+      // $ne skips searches that already hold the load (a change stream can deliver it twice)
+      const result = await SavedSearch.updateMany(
+        { _id: { $in: searchIds }, alertEnabled: true, pendingLoads: { $ne: load._id } },
+        {
+          $push: { pendingLoads: { $each: [load._id], $slice: -ALERTS.MAX_LOADS_PER_ALERT } },
+          $min: { pendingSince: new Date() }
+        }
+      );
+      logger.debug('Load matched saved searches', { loadId: String(load._id), searches: searchIds.length, matchMicros });
+      return result.modifiedCount;
+    } catch (error: any) {
+      logger.error('Recording saved-search matches failed', { loadId: String(load._id), error: error.message });
+      return 0;
+    }
+  }
+
+  /**
+   * Update pipeline removing drained loads from a search's bucket (for
+   * updateOne/bulkWrite). Loads matched since the drain started stay;
+   * pendingSince is cleared once the bucket is empty.
+   */
+  drainUpdate(loadIds: Types.ObjectId[], alertSentAt?: Date): Record<string, unknown>[] {
+    return [
+      { $set: { pendingLoads: { $filter: { input: { $ifNull: ['$pendingLoads', []] }, cond: { $not: [{ $in: ['$$this', loadIds] }] } } } } },
+      {
+        $set: {
+          pendingSince: { $cond: [{ $gt: [{ $size: '$pendingLoads' }, 0] }, '$pendingSince', '$$REMOVE'] },
+          ...(alertSentAt ? { lastAlertSent: alertSentAt } : {})
+        }
+      }
+    ];
+  }
+
+  private applyChange(change: LoadChange): void {
+    switch (change.type) {
+      case 'created':
+        void this.record(change.load);
+        break;
+      case 'updated':
+        // A load put back on the board is matched again (without previousStatus this cannot be told apart)
+        if (change.previousStatus && change.previousStatus !== 'available' && change.load.status === 'available') {
+          void this.record(change.load);
+        }
+        break;
+    }
+  }
+}
+
+export const searchMatchService = new SearchMatchService();
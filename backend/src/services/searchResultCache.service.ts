@@ -0,0 +1,382 @@
+import { Load } from '../models/Load.model.js';
+import { config } from '../config/environment.js';
+import { CountMode } from '../utils/pagination.js';
+import { SEARCH_RESULT_CACHE } from '../utils/constants.js';
+import { logger } from '../utils/logger.js';
+import { loadEvents, LoadChange, LoadSnapshot } from './loadEvents.service.js';
+import { partySummaryService, PartyPopulate } from './partySummary.service.js';
+
+/**
+ * Structured load filter shared by the board and search. Omitted status means
+ * "every status except cancelled" (the search default).
+ */
+export interface LoadResultFilter {
+  status?: string[];
+  originState?: string;
+  destinationState?: string;
+  equipment?: string[];
+  minRate?: number;
+  maxRate?: number;
+  minWeight?: number;
+  maxWeight?: number;
+  pickupDateFrom?: Date;
+  pickupDateTo?: Date;
+  postedBy?: string;
+  bookedBy?: string;
+  isInterstate?: boolean;
+}
+
+export interface LoadResultPage {
+  limit: number;
+  skip?: number;
+  /** Keyset mode cursor; an empty string is the first page */
+  cursor?: string;
+  count: CountMode;
+}
+
+export interface CachedLoadPage {
+  ids: string[];
+  total?: number;
+  nextCursor?: string | null;
+}
+
+/** Handle returned by `ticket`; pass it back to `read`/`store` */
+export interface LoadResultTicket {
+  key: string;
+  filterKey: string;
+  filter: CanonicalLoadFilter;
+  version: number;
+}
+
+export interface SearchResultCacheKeyStats {
+  key: string;
+  hits: number;
+  misses: number;
+  invalidations: number;
+  hitRate: number;
+  cached: boolean;
+}
+
+export interface SearchResultCacheStats {
+  enabled: boolean;
+  entries: number;
+  filters: number;
+  approxBytes: number;
+  maxBytes: number;
+  hits: number;
+  misses: number;
+  hitRate: number;
+  invalidations: number;
+  evictions: number;
+  keys: SearchResultCacheKeyStats[];
+}
+
+export type CanonicalLoadFilter = Omit<LoadResultFilter, 'pickupDateFrom' | 'pickupDateTo'> & {
+  pickupDateFrom?: number;
+  pickupDateTo?: number;
+};
+
+interface CacheEntry {
+  filterKey: string;
+  page: CachedLoadPage;
+  bytes: number;
+  expiresAt: number;
+}
+
+interface FilterGroup {
+  filter: CanonicalLoadFilter;
+  keys: Set<string>;
+}
+
+interface KeyCounters {
+  hits: number;
+  misses: number;
+  invalidations: number;
+}
+
+const idOf = (value: unknown): string | undefined => {
+  if (!value) return undefined;
+  if (typeof value === 'object' && '_id' in (value as Record<string, unknown>)) {
+    return String((value as { _id: unknown })._id);
+  }
+  return String(value);
+};
+
+const positive = (value: number | undefined): number | undefined =>
+  typeof value === 'number' && Number.isFinite(value) && value > 0 ? value : undefined;
+
+const sortedUnique = (values: string[] | string | undefined): string[] | undefined => {
+  const list = Array.from(new Set(([] as string[]).concat(values ?? []).map(value => String(value).trim()).filter(Boolean))).sort();
+  return list.length > 0 ? list : undefined;
+};
+
+/**
+ * Canonical form: empty values dropped, lists de-duplicated and sorted, dates as
+ * epoch ms and keys in a fixed order, so equivalent filters share a cache key.
+ */
+export function canonicalizeLoadFilter(filter: LoadResultFilter): CanonicalLoadFilter {
+  const time = (date?: Date) => (date && !Number.isNaN(date.getTime()) ? date.getTime() : undefined);
+  const canonical: CanonicalLoadFilter = {
+    bookedBy: filter.bookedBy ? String(filter.bookedBy) : undefined,
+    destinationState: filter.destinationState || undefined,
+    equipment: sortedUnique(filter.equipment),
+    isInterstate: filter.isInterstate,
+    maxRate: positive(filter.maxRate),
+    maxWeight: positive(filter.maxWeight),
+    minRate: positive(filter.minRate),
+    minWeight: positive(filter.minWeight),
+    originState: filter.originState || undefined,
+    pickupDateFrom: time(filter.pickupDateFrom),
+    pickupDateTo: time(filter.pickupDateTo),
+    postedBy: filter.postedBy ? String(filter.postedBy) : undefined,
+    status: sortedUnique(filter.status)
+  };
+
+  for (const key of Object.keys(canonical) as Array<keyof CanonicalLoadFilter>) {
+    if (canonical[key] === undefined) delete canonical[key];
+  }
+  return canonical;
+}
+
+/**
+ * Whether a load belongs to a filter's result set. With `anyStatus` the status
+ * clause is skipped, for updates whose previous status is unknown.
+ */
+function matchesFilter(filter: CanonicalLoadFilter, load: LoadSnapshot, anyStatus: boolean = false): boolean {
+  if (!anyStatus) {
+    if (filter.status ? !filter.status.includes(load.status) : load.status === 'cancelled') return false;
+  }
+  if (filter.originState && load.origin?.state !== filter.originState) return false;
+  if (filter.destinationState && load.destination?.state !== filter.destinationState) return false;
+  if (filter.equipment && !filter.equipment.includes(load.equipmentType)) return false;
+  if (filter.isInterstate !== undefined && !!load.isInterstate !== filter.isInterstate) return false;
+  if (filter.minRate !== undefined && !(load.rate >= filter.minRate)) return false;
+  if (filter.maxRate !== undefined && !(load.rate <= filter.maxRate)) return false;
+  if (filter.minWeight !== undefined && !(load.weight >= filter.minWeight)) return false;
+  if (filter.maxWeight !== undefined && !(load.weight <= filter.maxWeight)) return false;
+
+  const pickup = load.pickupDate ? new Date(load.pickupDate).getTime() : NaN;
+  if (filter.pickupDateFrom !== undefined && !(pickup >= filter.pickupDateFrom)) return false;
+  if (filter.pickupDateTo !== undefined && !(pickup <= filter.pickupDateTo)) return false;
+
+  if (filter.postedBy && idOf(load.postedBy) !== filter.postedBy) return false;
+  if (filter.bookedBy && idOf(load.bookedBy) !== filter.bookedBy) return false;
+  return true;
+}
+
+/**
+ * Opt-in cache of load list/search result pages (SEARCH_RESULT_CACHE_ENABLED=true).
+ * Entries hold page ids and counts under a canonical filter + page key, bounded
+ * by approximate size. A load write drops only the entries whose filter the load
+ * matches (before or after the write) or whose page contains it.
+ */
+class SearchResultCacheService {
+  private entries: Map<string, CacheEntry> = new Map();
+  private groups: Map<string, FilterGroup> = new Map();
+  private counters: Map<string, KeyCounters> = new Map();
+  private approxBytes = 0;
+  private hits = 0;
+  private misses = 0;
+  private invalidations = 0;
+  private evictions = 0;
+  // Bumped on every load write so results computed across a write are not stored
+  private version = 0;
+  private started = false;
+
+  start(): void {
+    if (!config.SEARCH_RESULT_CACHE_ENABLED || this.started) return;
+    this.started = true;
+    loadEvents.subscribe((change) => this.applyChange(change));
+    logger.info('Search result cache enabled', { maxBytes: SEARCH_RESULT_CACHE.MAX_BYTES });
+  }
+
+  /**
+   * Build the cache handle for a filter and page, or null when caching is off
+   */
+  ticket(filter: LoadResultFilter, page: LoadResultPage): LoadResultTicket | null {
+    if (!this.started) return null;
+
+    const canonical = canonicalizeLoadFilter(filter);
+    const filterKey = JSON.stringify(canonical);
+    const pageKey = page.cursor !== undefined
+      ? `cursor:${page.cursor}:${page.limit}:${page.count}`
+      : `skip:${page.skip ?? 0}:${page.limit}:${page.count}`;
+
+    return { key: `${filterKey}|${pageKey}`, filterKey, filter: canonical, version: this.version };
+  }
+
+  /**
+   * Serve a page from cache, re-reading the documents by id so load fields are
+   * current. Returns null on a miss.
+   */
+  async read(ticket: LoadResultTicket, parties: PartyPopulate): Promise<{ loads: any[]; total?: number; nextCursor?: string | null } | null> {
+    const entry = this.entries.get(ticket.key);
+    const counters = this.countersFor(ticket.key);
+
+    if (!entry || entry.expiresAt <= Date.now()) {
+      if (entry) this.removeEntry(ticket.key);
+      this.misses++;
+      counters.misses++;
+      return null;
+    }
+
+    this.hits++;
+    counters.hits++;
+    // Re-insert to mark as most recently used
+    this.entries.delete(ticket.key);
+    this.entries.set(ticket.key, entry);
+
+    const rows = await partySummaryService.readLoads(Load.find({ _id: { $in: entry.page.ids } }).lean(), parties);
+    const byId = new Map(rows.map(load => [String(load._id), load]));
+    const loads = entry.page.ids.map(id => byId.get(id)).filter(Boolean);
+
+    return { loads, total: entry.page.total, nextCursor: entry.page.nextCursor };
+  }
+
+  /**
+   * Cache a freshly computed page unless a load write happened while it ran
+   */
+  store(ticket: LoadResultTicket, page: CachedLoadPage): void {
+    if (ticket.version !== this.version) return;
+
+    this.removeEntry(ticket.key);
+    const bytes = (ticket.key.length + (page.nextCursor?.length ?? 0)) * 2 + page.ids.length * 64 + 160;
+    if (bytes > SEARCH_RESULT_CACHE.MAX_BYTES) return;
+
+    this.entries.set(ticket.key, {
+      filterKey: ticket.filterKey,
+      page,
+      bytes,
+      expiresAt: Date.now() + SEARCH_RESULT_CACHE.TTL_MS
+    });
+    this.approxBytes += bytes;
+
+    const group = this.groups.get(ticket.filterKey);
+    if (group) group.keys.add(ticket.key);
+    else this.groups.set(ticket.filterKey, { filter: ticket.filter, keys: new Set([ticket.key]) });
+
+    while (this.approxBytes > SEARCH_RESULT_CACHE.MAX_BYTES && this.entries.size > 0) {
+      const oldest = this.entries.keys().next().value as string;
+      this.removeEntry(oldest);
+      this.evictions++;
+    }
+  }
+
+  clear(): void {
+    this.entries.clear();
+    this.groups.clear();
+    this.approxBytes = 0;
+  }
+
+  /**
+   * Totals plus per-key hit ratios, busiest keys first
+   */
+  getStats(limit: number = 50): SearchResultCacheStats {
+    const lookups = this.hits + this.misses;
+    const keys = Array.from(this.counters.entries())
+      .map(([key, counters]) => {
+        const keyLookups = counters.hits + counters.misses;
+        return {
+          key,
+          ...counters,
+          hitRate: keyLookups > 0 ? Number((counters.hits / keyLookups).toFixed(4)) : 0,
+          cached: this.entries.has(key)
+        };
+      })
+      .sort((a, b) => (b.hits + b.misses) - (a.hits + a.misses))
+      .slice(0, limit);
+
+    return {
+      enabled: this.started,
+      entries: this.entries.size,
+      filters: this.groups.size,
+      approxBytes: this.approxBytes,
+      maxBytes: SEARCH_RESULT_CACHE.MAX_BYTES,
+      hits: this.hits,
+      misses: this.misses,
+      hitRate: lookups > 0 ? Number((this.hits / lookups).toFixed(4)) : 0,
+      invalidations: this.invalidations,
+      evictions: this.evictions,
+      keys
+    };
+  }
+
+  private applyChange(change: LoadChange): void {
+    this.version++;
+
+    switch (change.type) {
+      case 'reset':
+        this.clear();
+        return;
+      case 'deleted':
+        // The deleted load's fields are gone, so any filter may have counted it
+        this.invalidateWhere(() => true);
+        return;
+      case 'created':
+        this.invalidateWhere(filter => matchesFilter(filter, change.load));
+        return;
+      case 'updated': {
+        const id = String(change.load._id);
+        const { previousStatus } = change;
+        this.invalidateWhere(
+          filter => matchesFilter(filter, change.load, previousStatus === undefined) ||
+            (previousStatus !== undefined && matchesFilter(filter, { ...change.load, status: previousStatus })),
+          entry => entry.page.ids.includes(id)
+        );
+        return;
+      }
+    }
+  }
+
+  /**
+   * Drop every page of the filters selected by `matchGroup`, plus single pages selected by `matchEntry`
+   */
+  private invalidateWhere(matchGroup: (filter: CanonicalLoadFilter) => boolean, matchEntry?: (entry: CacheEntry) => boolean): void {
+    for (const group of Array.from(this.groups.values())) {
+      if (!matchGroup(group.filter)) continue;
+      for (const key of Array.from(group.keys)) {
+        this.invalidate(key);
+      }
+    }
+
+    if (!matchEntry) return;
+    for (const [key, entry] of Array.from(this.entries.entries())) {
+      if (matchEntry(entry)) this.invalidate(key);
+    }
+  }
+
+  private invalidate(key: string): void {
+    this.removeEntry(key);
+    this.invalidations++;
+    this.countersFor(key).invalidations++;
+  }
+
+  private removeEntry(key: string): void {
+    const entry = this.entries.get(key);
+    if (!entry) return;
+
+    this.entries.delete(key);
+    this.approxBytes -= entry.bytes;
+
+    const group = this.groups.get(entry.filterKey);
+    if (group) {
+      group.keys.delete(key);
+      if (group.keys.size === 0) this.groups.delete(entry.filterKey);
+    }
+  }
+
+  private countersFor(key: string): KeyCounters {
+    let counters = this.counters.get(key);
+    if (!counters) {
+      counters = { hits: 0, misses: 0, invalidations: 0 };
+      this.counters.set(key, counters);
+      // Keep per-key stats bounded; the oldest tracked keys go first
+      if (this.counters.size > SEARCH_RESULT_CACHE.MAX_TRACKED_KEYS) {
+        this.counters.delete(this.counters.keys().next().value as string);
+      }
+    }
+    return counters;
+  }
+}
+
+export const searchResultCacheService = new SearchResultCacheService();
@@ -0,0 +1,254 @@
+import { CronJob } from 'cron';
+import { Document } from '../models/Document.model.js';
+import { Load } from '../models/Load.model.js';
+import { Message } from '../models/Message.model.js';
+import { Shipment } from '../models/Shipment.model.js';
+import { SystemStats, SystemStatsSnapshot } from '../models/SystemStatsSnapshot.model.js';
+import { User } from '../models/User.model.js';
+import type { LoadStatus } from '../types/index.js';
+import { SYSTEM_STATS } from '../utils/constants.js';
+import { logger } from '../utils/logger.js';
+
+export interface SystemStatsView extends SystemStats {
+  generatedAt: string;
+}
+
+export interface SystemStatsHistoryPoint extends SystemStats {
+  takenAt: Date;
+}
+
+const ACTIVE_LANE_STATUSES: LoadStatus[] = ['available', 'booked', 'in_transit'];
+const BILLABLE_STATUSES = ['ready', 'invoiced'];
+const HOUR_MS = 60 * 60 * 1000;
+
+const percent = (part: number, total: number): number => (total > 0 ? Number(((part / total) * 100).toFixed(1)) : 0);
+
+/**
+ * Background snapshots of the admin console statistics. Load status counts are
+ * grouped on the status index for every snapshot; lane, billing and
+ * time-to-book figures need full-collection aggregations, so they are
+ * recomputed hourly. The rest are cheap counts (metadata-based
+ * estimatedDocumentCount for collection totals). None of it depends on which
+ * instance served a write, and each interval's snapshot is inserted once under
+ * the interval start by whichever instance gets there first.
+ */
+class SystemStatsService {
+  private activeLaneCount = 0;
+  private readyForBilling = 0;
+  private bookedHours = 0;
+  private bookedCount = 0;
+  private ready = false;
+  private snapshotJob: CronJob | null = null;
+  private reconcileJob: CronJob | null = null;
+  private running: Promise<SystemStatsView> | null = null;
+
+  async start(): Promise<void> {
+    if (this.snapshotJob) return;
+
+    this.reconcileJob = new CronJob(SYSTEM_STATS.RECONCILE_CRON, async () => {
+      await this.reconcile();
+    });
+    this.snapshotJob = new CronJob(SYSTEM_STATS.SNAPSHOT_CRON, async () => {
+      try {
+        await this.snapshot();
+      } catch (error: any) {
+        logger.error('System stats snapshot failed', { error: error.message });
+      }
+    });
+    this.reconcileJob.start();
+    this.snapshotJob.start();
+
+    await this.reconcile();
+  }
+
+  stop(): void {
+    this.snapshotJob?.stop();
+    this.reconcileJob?.stop();
+    this.snapshotJob = null;
+    this.reconcileJob = null;
+  }
+
+  /**
+   * Most recent snapshot, taking one if none exists yet (first boot)
+   */
+  async latest(): Promise<SystemStatsView> {
+    const snapshot = await SystemStatsSnapshot.findOne().sort({ takenAt: -1 }).lean();
+    if (!snapshot) {
+      return this.snapshot();
+    }
+    return toView(snapshot);
+  }
+
+  /**
+   * Snapshots taken in [from, to], oldest first, thinned to at most `maxPoints`
+   */
+  async history(from: Date, to: Date, maxPoints: number = SYSTEM_STATS.HISTORY_MAX_POINTS): Promise<SystemStatsHistoryPoint[]> {
+    const snapshots = await SystemStatsSnapshot.find({ takenAt: { $gte: from, $lte: to } })
+      .sort({ takenAt: 1 })
+      .select('-_id -durationMs')
+      .lean<SystemStatsHistoryPoint[]>();
+
+    if (snapshots.length <= maxPoints) {
+      return snapshots;
+    }
+    const step = snapshots.length / maxPoints;
+    return Array.from({ length: maxPoints }, (_, i) => snapshots[Math.floor(i * step)]);
+  }
+
+  /**
+   * Compute and store the snapshot for the current interval. Concurrent calls share one run.
+   */
+  snapshot(): Promise<SystemStatsView> {
+    if (!this.running) {
+      this.running = this.takeSnapshot().finally(() => {
+        this.running = null;
+      });
+    }
+    return this.running;
+  }
+
+  /**
+   * Recompute the lane, billing and time-to-book figures in one aggregation
+   */
+  async reconcile(): Promise<void> {
+    try {
+      const [result] = await Load.aggregate([
+        {
+          $facet: {
+            lanes: [
+              { $match: { status: { $in: ACTIVE_LANE_STATUSES } } },
+              { $group: { _id: { origin: '$origin.state', destination: '$destination.state' } } },
+              { $count: 'count' }
+            ],
+            billing: [{ $match: { billingStatus: { $in: BILLABLE_STATUSES } } }, { $count: 'count' }],
+            booking: [
+              { $match: { bookedAt: { $ne: null }, createdAt: { $ne: null } } },
+              {
+                $group: {
+                  _id: null,
+                  hours: { $sum: { $divide: [{ $subtract: ['$bookedAt', '$createdAt'] }, HOUR_MS] } },
+                  count: { $sum: 1 }
+                }
+              }
+            ]
+          }
+        }
+      ]);
+
+      this.activeLaneCount = result?.lanes?.[0]?.count ?? 0;
+      this.readyForBilling = result?.billing?.[0]?.count ?? 0;
+      this.bookedHours = result?.booking?.[0]?.hours ?? 0;
+      this.bookedCount = result?.booking?.[0]?.count ?? 0;
+      this.ready = true;
+      logger.debug('System stats load figures recomputed');
+    } catch (error: any) {
+      logger.error('System stats reconcile failed', { error: error.message });
+    }
+  }
+
+  private async takeSnapshot(): Promise<SystemStatsView> {
+    const startedAt = Date.now();
+    if (!this.ready) {
+      await this.reconcile();
+    }
+
+    const [
+      totalUsers,
+      [userCounts],
+      statusRows,
+      totalLoads,
+      totalShipments,
+      openShipments,
+      totalMessages,
+      totalDocuments,
+      verifiedDocuments
+    ] = await Promise.all([
+      User.estimatedDocumentCount(),
+      User.aggregate([
+        {
+          $group: {
+            _id: null,
+            active: { $sum: { $cond: ['$isActive', 1, 0] } },
+            admin: { $sum: { $cond: [{ $eq: ['$role', 'admin'] }, 1, 0] } },
+            carriers: { $sum: { $cond: [{ $eq: ['$accountType', 'carrier'] }, 1, 0] } },
+            brokers: { $sum: { $cond: [{ $eq: ['$accountType', 'broker'] }, 1, 0] } },
+            shippers: { $sum: { $cond: [{ $eq: ['$accountType', 'shipper'] }, 1, 0] } }
+          }
+        }
+      ]),
+      // Sorting first lets the group read the status index instead of documents
+      Load.aggregate<{ _id: LoadStatus | null; count: number }>([
+        { $sort: { status: 1 } },
+        { $group: { _id: '$status', count: { $sum: 1 } } }
+      ]),
+      Load.estimatedDocumentCount(),
+      Shipment.estimatedDocumentCount(),
+      Shipment.countDocuments({ status: 'open' }),
+      Message.estimatedDocumentCount(),
+      Document.estimatedDocumentCount(),
+      Document.countDocuments({ isVerified: true })
+    ]);
+
+    const status = (name: LoadStatus) => statusRows.find(row => row._id === name)?.count ?? 0;
+    const stats: SystemStats = {
+      users: {
+        total: totalUsers,
+        active: userCounts?.active ?? 0,
+        admin: userCounts?.admin ?? 0,
+        carriers: userCounts?.carriers ?? 0,
+        brokers: userCounts?.brokers ?? 0,
+        shippers: userCounts?.shippers ?? 0
+      },
+      loads: {
+        total: totalLoads,
+        open: status('available'),
+        booked: status('booked'),
+        inTransit: status('in_transit'),
+        delivered: status('delivered'),
+        readyForBilling: this.readyForBilling
+      },
+      shipments: {
+        total: totalShipments,
+        open: openShipments
+      },
+      messages: {
+        total: totalMessages
+      },
+      documents: {
+        total: totalDocuments,
+        verified: verifiedDocuments,
+        pending: Math.max(totalDocuments - verifiedDocuments, 0),
+        verificationRate: percent(verifiedDocuments, totalDocuments)
+      },
+      analytics: {
+        conversionRate: percent(status('booked'), totalLoads),
+        activeLaneCount: this.activeLaneCount,
+        averageHoursToBook: this.bookedCount > 0 ? this.bookedHours / this.bookedCount : 0,
+        readyForBilling: this.readyForBilling
+      }
+    };
+
+    const takenAt = new Date(Math.floor(startedAt / SYSTEM_STATS.SNAPSHOT_INTERVAL_MS) * SYSTEM_STATS.SNAPSHOT_INTERVAL_MS);
+    const durationMs = Date.now() - startedAt;
+    // Insert-only: the first instance to finish owns the interval's snapshot
+    const { upsertedCount } = await SystemStatsSnapshot.updateOne(
+      { takenAt },
+      { $setOnInsert: { ...stats, durationMs } },
+      { upsert: true }
+    );
+    if (upsertedCount === 0) {
+      const stored = await SystemStatsSnapshot.findOne({ takenAt }).lean();
+      if (stored) return toView(stored);
+    }
+    logger.debug('System stats snapshot stored', { takenAt, durationMs });
+
+    return { ...stats, generatedAt: takenAt.toISOString() };
+  }
+}
+
+function toView(snapshot: SystemStats & { takenAt: Date }): SystemStatsView {
+  const { users, loads, shipments, messages, documents, analytics } = snapshot;
+  return { users, loads, shipments, messages, documents, analytics, generatedAt: snapshot.takenAt.toISOString() };
+}
+
+export const systemStatsService = new SystemStatsService();
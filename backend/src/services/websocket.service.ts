@@ -234,6 +234,18 @@ class WebSocketService {
     logger.info('Notified new load', { loadId: load._id });
   }
 
+  /**
+   * Broadcast one aggregated event for a bulk import instead of one per load
+   */
+  notifyLoadsImported(summary: { postedBy: string; count: number; loadIds: string[] }): void {
+    if (!this.io) return;
+
+    this.io.to('account_carrier').emit('loads_imported', summary);
+    this.io.to('account_broker').emit('loads_imported', summary);
+
+    logger.info('Notified bulk load import', { postedBy: summary.postedBy, count: summary.count });
+  }
+
   /**
    * Broadcast load update
    */
@@ -116,12 +116,25 @@ export interface ILocation {
   };
 }
 
+export interface IGeoPoint {
+  type: 'Point';
+  coordinates: [number, number]; // [lng, lat]
+}
+
+export interface IPartySummary {
+  company?: string;
+  email?: string;
+  accountType?: string;
+}
+
 export interface ILoad {
   _id: Types.ObjectId;
   title: string;
   description: string;
   origin: ILocation;
   destination: ILocation;
+  originPoint?: IGeoPoint;
+  destinationPoint?: IGeoPoint;
   pickupDate: Date;
   deliveryDate: Date;
   equipmentType: string;
@@ -134,6 +147,8 @@ export interface ILoad {
   unlinked: boolean;
   postedBy: Types.ObjectId;
   bookedBy?: Types.ObjectId;
+  postedBySummary?: IPartySummary;
+  bookedBySummary?: IPartySummary;
   shipment?: Types.ObjectId;
   isInterstate: boolean;
   agreedRate?: number;
@@ -354,6 +369,17 @@ export interface EnvironmentConfig {
   VAPID_PUBLIC_KEY?: string;
   VAPID_PRIVATE_KEY?: string;
   VAPID_SUBJECT?: string;
+  LOAD_INDEX_ENABLED: boolean;
+  LOAD_CHANGE_STREAM_ENABLED: boolean;
+  PARTY_SUMMARY_READS_ENABLED: boolean;
+  TEXT_SEARCH_INDEX_ENABLED: boolean;
+  SEARCH_RESULT_CACHE_ENABLED: boolean;
+  DAILY_STATS_READS_ENABLED: boolean;
+  DASHBOARD_CACHE_ENABLED: boolean;
+  ALERT_MATCH_INDEX_ENABLED: boolean;
+  ALERT_DISPATCH_CONCURRENCY: number;
+  GAZETTEER_PATH: string;
+  EXPORT_DIR: string;
 }
 
 
@@ -0,0 +1,100 @@
+import { detectImportFormat, parseCsvRecords, parseLoadImport } from '../loadImport.js';
+
+describe('parseCsvRecords', () => {
+  it('splits records on LF and CRLF', () => {
+    expect(parseCsvRecords('a,b\n1,2\r\n3,4')).toEqual([['a', 'b'], ['1', '2'], ['3', '4']]);
+  });
+
+  it('handles quoted fields with commas, newlines and escaped quotes', () => {
+    expect(parseCsvRecords('title,description\n"Load, urgent","Line one\nsays ""hi"""\n')).toEqual([
+      ['title', 'description'],
+      ['Load, urgent', 'Line one\nsays "hi"']
+    ]);
+  });
+
+  it('keeps empty fields, including a trailing one', () => {
+    expect(parseCsvRecords('a,,c,\n')).toEqual([['a', '', 'c', '']]);
+  });
+
+  it('does not add a record for a trailing newline', () => {
+    expect(parseCsvRecords('a\nb\n')).toEqual([['a'], ['b']]);
+    expect(parseCsvRecords('')).toEqual([]);
+  });
+});
+
+describe('parseLoadImport (csv)', () => {
+  it('maps flat columns to a load, matching headers loosely', () => {
+    const csv = [
+      'Origin City,origin_state,originZip,Origin.Lat,originLng,destinationCity,destinationState,destinationZip,pickupDate,Equipment Type,weight,rate,rateType',
+      'Dallas,TX,75201,32.78,-96.8,Chicago,IL,60601,2025-06-01, Dry Van ,40000,2500,flat_rate'
+    ].join('\n');
+
+    const [row] = parseLoadImport(csv, 'csv');
+
+    expect(row.row).toBe(1);
+    expect(row.input).toEqual({
+      title: undefined,
+      description: undefined,
+      origin: { city: 'Dallas', state: 'TX', zip: '75201', country: undefined, coordinates: { lat: 32.78, lng: -96.8 } },
+      destination: { city: 'Chicago', state: 'IL', zip: '60601', country: undefined, coordinates: undefined },
+      pickupDate: '2025-06-01',
+      deliveryDate: undefined,
+      equipmentType: 'Dry Van',
+      weight: '40000',
+      rate: '2500',
+      rateType: 'flat_rate',
+      shipmentId: undefined
+    });
+  });
+
+  it('drops coordinates unless both are numeric', () => {
+    const [row] = parseLoadImport('originCity,originLat,originLng\nDallas,32.7,abc', 'csv');
+    expect(row.input?.origin?.coordinates).toBeUndefined();
+  });
+
+  it('skips blank lines but keeps row numbers aligned with the file', () => {
+    const rows = parseLoadImport('originCity\nDallas\n , \nAustin', 'csv');
+    expect(rows.map(row => [row.row, row.input?.origin?.city])).toEqual([[1, 'Dallas'], [3, 'Austin']]);
+  });
+
+  it('returns nothing for a header-only or empty file', () => {
+    expect(parseLoadImport('originCity,originState\n', 'csv')).toEqual([]);
+    expect(parseLoadImport('', 'csv')).toEqual([]);
+  });
+});
+
+describe('parseLoadImport (ndjson)', () => {
+  it('parses one object per line and reports bad lines by line number', () => {
+    const content = [
+      '{"title":"A","rate":1000}',
+      '',
+      '{not json',
+      '[1,2]',
+      'null',
+      '{"title":"B"}'
+    ].join('\r\n');
+
+    expect(parseLoadImport(content, 'ndjson')).toEqual([
+      { row: 1, input: { title: 'A', rate: 1000 } },
+      { row: 3, error: 'Invalid JSON' },
+      { row: 4, error: 'Line is not a JSON object' },
+      { row: 5, error: 'Line is not a JSON object' },
+      { row: 6, input: { title: 'B' } }
+    ]);
+  });
+});
+
+describe('detectImportFormat', () => {
+  it('prefers the file name and mime type', () => {
+    expect(detectImportFormat('{"a":1}', 'loads.csv')).toBe('csv');
+    expect(detectImportFormat('a,b', 'loads.JSONL')).toBe('ndjson');
+    expect(detectImportFormat('a,b', 'loads.ndjson')).toBe('ndjson');
+    expect(detectImportFormat('{"a":1}', undefined, 'text/csv')).toBe('csv');
+    expect(detectImportFormat('a,b', undefined, 'application/x-ndjson')).toBe('ndjson');
+  });
+
+  it('falls back to the content', () => {
+    expect(detectImportFormat('  {"title":"A"}')).toBe('ndjson');
+    expect(detectImportFormat('title,rate')).toBe('csv');
+  });
+});
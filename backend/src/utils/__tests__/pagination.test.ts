@@ -0,0 +1,86 @@
+import { Types } from 'mongoose';
+import { buildKeysetFilter, decodeCursor, encodeCursor, parseCountMode, parseLimit } from '../pagination.js';
+import { PAGINATION } from '../constants.js';
+
+const id = '64b7f0c2a1b2c3d4e5f60718';
+const createdAt = new Date('2025-03-01T10:20:30.456Z');
+
+describe('keyset cursors', () => {
+  it('round-trips a document position', () => {
+    const cursor = encodeCursor({ createdAt, _id: new Types.ObjectId(id) });
+    const decoded = decodeCursor(cursor);
+
+    expect(decoded?.createdAt.getTime()).toBe(createdAt.getTime());
+    expect(decoded?.id.toString()).toBe(id);
+  });
+
+  it('accepts string dates and ids', () => {
+    const decoded = decodeCursor(encodeCursor({ createdAt: createdAt.toISOString(), _id: id }));
+
+    expect(decoded?.createdAt.getTime()).toBe(createdAt.getTime());
+    expect(decoded?.id.toString()).toBe(id);
+  });
+
+  it('produces URL-safe cursors', () => {
+    expect(encodeCursor({ createdAt, _id: id })).toMatch(/^[A-Za-z0-9_-]+$/);
+  });
+
+  it.each([
+    ['an empty string', ''],
+    ['random text', 'not-a-cursor'],
+    ['a missing id', Buffer.from(`${createdAt.getTime()}:`).toString('base64url')],
+    ['an invalid id', Buffer.from(`${createdAt.getTime()}:xyz`).toString('base64url')],
+    ['a non-numeric timestamp', Buffer.from(`soon:${id}`).toString('base64url')]
+  ])('rejects %s', (_label, cursor) => {
+    expect(decodeCursor(cursor)).toBeNull();
+  });
+
+  it('selects documents strictly after the cursor in newest-first order', () => {
+    const cursor = { createdAt, id: new Types.ObjectId(id) };
+
+    expect(buildKeysetFilter(cursor)).toEqual({
+      $or: [
+        { createdAt: { $lt: createdAt } },
+        { createdAt, _id: { $lt: cursor.id } }
+      ]
+    });
+  });
+});
+
+describe('parseLimit', () => {
+  it('parses numeric strings and numbers', () => {
+    expect(parseLimit('25')).toBe(25);
+    expect(parseLimit(10)).toBe(10);
+  });
+
+  it('falls back to the default for missing or invalid values', () => {
+    expect(parseLimit(undefined)).toBe(PAGINATION.DEFAULT_LIMIT);
+    expect(parseLimit('abc')).toBe(PAGINATION.DEFAULT_LIMIT);
+    expect(parseLimit('0')).toBe(PAGINATION.DEFAULT_LIMIT);
+    expect(parseLimit(-5)).toBe(PAGINATION.DEFAULT_LIMIT);
+  });
+
+  it('clamps to the maximum page size', () => {
+    expect(parseLimit(PAGINATION.MAX_LIMIT + 1)).toBe(PAGINATION.MAX_LIMIT);
+  });
+});
+
+describe('parseCountMode', () => {
+  it('accepts each mode case-insensitively', () => {
+    expect(parseCountMode('exact', 'none')).toBe('exact');
+    expect(parseCountMode('CACHED', 'none')).toBe('cached');
+    expect(parseCountMode('Estimated', 'none')).toBe('estimated');
+    expect(parseCountMode('none', 'exact')).toBe('none');
+  });
+
+  it('maps boolean strings to exact and none', () => {
+    expect(parseCountMode('true', 'none')).toBe('exact');
+    expect(parseCountMode('false', 'exact')).toBe('none');
+  });
+
+  it('falls back for anything else', () => {
+    expect(parseCountMode(undefined, 'cached')).toBe('cached');
+    expect(parseCountMode('sometimes', 'exact')).toBe('exact');
+    expect(parseCountMode(1, 'none')).toBe('none');
+  });
+});
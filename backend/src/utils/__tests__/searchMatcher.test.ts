@@ -0,0 +1,135 @@
+import { SearchMatcher } from '../searchMatcher.js';
+import type { MatchableLoad } from '../searchMatcher.js';
+
+const load = {
+  equipmentType: 'Dry Van',
+  rate: 2000,
+  origin: { state: 'TX' },
+  destination: { state: 'CA' },
+  pickupDate: new Date('2025-06-15T12:00:00Z')
+};
+
+const matchIds = (matcher: SearchMatcher, candidate: MatchableLoad = load): string[] => matcher.match(candidate).sort();
+
+describe('SearchMatcher', () => {
+  describe('price bounds', () => {
+    it('treats unset and zero bounds as unbounded', () => {
+      const matcher = new SearchMatcher();
+      matcher.add('unset', {});
+      matcher.add('zero-min', { priceMin: 0 });
+      matcher.add('zero-max', { priceMax: 0 });
+      matcher.add('zero-both', { priceMin: 0, priceMax: 0 });
+
+      expect(matchIds(matcher)).toEqual(['unset', 'zero-both', 'zero-max', 'zero-min']);
+      expect(matchIds(matcher, { ...load, rate: 1 })).toHaveLength(4);
+    });
+
+    it('includes both ends of the range', () => {
+      const matcher = new SearchMatcher();
+      matcher.add('min-equal', { priceMin: 2000 });
+      matcher.add('max-equal', { priceMax: 2000 });
+      matcher.add('exact', { priceMin: 2000, priceMax: 2000 });
+      matcher.add('above', { priceMin: 2001 });
+      matcher.add('below', { priceMax: 1999 });
+
+      expect(matchIds(matcher)).toEqual(['exact', 'max-equal', 'min-equal']);
+    });
+
+    it('finds every search with a minimum at or below the rate, whatever the insertion order', () => {
+      const matcher = new SearchMatcher();
+      [2500, 500, 2000, 1500, 3000].forEach(priceMin => matcher.add(`min-${priceMin}`, { priceMin }));
+
+      expect(matchIds(matcher)).toEqual(['min-1500', 'min-2000', 'min-500']);
+    });
+
+    it('does not match a load without a rate against a price bound', () => {
+      const matcher = new SearchMatcher();
+      matcher.add('bounded', { priceMin: 100 });
+      matcher.add('unbounded', {});
+
+      expect(matchIds(matcher, { ...load, rate: undefined })).toEqual(['unbounded']);
+    });
+  });
+
+  describe('equipment', () => {
+    it('matches any of several equipment types and returns the search once', () => {
+      const matcher = new SearchMatcher();
+      matcher.add('vans-and-flatbeds', { equipment: ['Dry Van', 'Flatbed', 'Dry Van'] });
+
+      expect(matcher.match(load)).toEqual(['vans-and-flatbeds']);
+      expect(matcher.match({ ...load, equipmentType: 'Flatbed' })).toEqual(['vans-and-flatbeds']);
+      expect(matcher.match({ ...load, equipmentType: 'Refrigerated' })).toEqual([]);
+    });
+
+    it('treats an empty equipment list as any equipment', () => {
+      const matcher = new SearchMatcher();
+      matcher.add('any', { equipment: [] });
+
+      expect(matcher.match({ ...load, equipmentType: 'Lowboy' })).toEqual(['any']);
+    });
+  });
+
+  describe('lanes', () => {
+    it('matches unset origin or destination states as wildcards', () => {
+      const matcher = new SearchMatcher();
+      matcher.add('exact-lane', { originState: 'TX', destinationState: 'CA' });
+      matcher.add('from-tx', { originState: 'TX' });
+      matcher.add('to-ca', { destinationState: 'CA' });
+      matcher.add('anywhere', {});
+      matcher.add('other-lane', { originState: 'TX', destinationState: 'NY' });
+
+      expect(matchIds(matcher)).toEqual(['anywhere', 'exact-lane', 'from-tx', 'to-ca']);
+    });
+
+    it('only matches wildcard lanes for a load without states', () => {
+      const matcher = new SearchMatcher();
+      matcher.add('from-tx', { originState: 'TX' });
+      matcher.add('anywhere', {});
+
+      expect(matcher.match({ ...load, origin: {}, destination: {} })).toEqual(['anywhere']);
+    });
+  });
+
+  describe('pickup dates', () => {
+    it('includes both ends of the date range', () => {
+      const matcher = new SearchMatcher();
+      matcher.add('starts-at-pickup', { dateRange: { from: load.pickupDate } });
+      matcher.add('ends-at-pickup', { dateRange: { to: load.pickupDate.toISOString() } });
+      matcher.add('later', { dateRange: { from: '2025-06-16T00:00:00Z' } });
+      matcher.add('earlier', { dateRange: { from: '2025-06-01T00:00:00Z', to: '2025-06-15T11:59:59Z' } });
+
+      expect(matchIds(matcher)).toEqual(['ends-at-pickup', 'starts-at-pickup']);
+    });
+  });
+
+  describe('updates', () => {
+    it('stops matching a removed search', () => {
+      const matcher = new SearchMatcher();
+      matcher.add('search', { originState: 'TX' });
+      matcher.remove('search');
+
+      expect(matcher.match(load)).toEqual([]);
+      expect(matcher.size).toBe(0);
+      expect(matcher.has('search')).toBe(false);
+    });
+
+    it('replaces the predicate when a search is added again', () => {
+      const matcher = new SearchMatcher();
+      matcher.add('search', { originState: 'TX', equipment: ['Dry Van'] });
+      matcher.add('search', { originState: 'NY', equipment: ['Flatbed'] });
+
+      expect(matcher.size).toBe(1);
+      expect(matcher.match(load)).toEqual([]);
+      expect(matcher.match({ ...load, origin: { state: 'NY' }, equipmentType: 'Flatbed' })).toEqual(['search']);
+    });
+
+    it('keeps other searches in a shared bucket when one is removed', () => {
+      const matcher = new SearchMatcher();
+      matcher.add('first', { originState: 'TX', priceMin: 1000 });
+      matcher.add('second', { originState: 'TX', priceMin: 1500 });
+      matcher.remove('first');
+
+      expect(matcher.match(load)).toEqual(['second']);
+    });
+  });
+});
@@ -0,0 +1,99 @@
+import { TDigest } from '../tdigest.js';
+
+// Deterministic shuffled values 1..n
+function shuffled(n: number, seed: number = 42): number[] {
+  const values = Array.from({ length: n }, (_, i) => i + 1);
+  let state = seed;
+  for (let i = values.length - 1; i > 0; i--) {
+    state = (state * 1103515245 + 12345) % 2147483648;
+    const j = state % (i + 1);
+    [values[i], values[j]] = [values[j], values[i]];
+  }
+  return values;
+}
+
+const digestOf = (values: number[], compression?: number): TDigest => {
+  const digest = new TDigest(compression);
+  values.forEach(value => digest.add(value));
+  return digest;
+};
+
+describe('TDigest', () => {
+  it('returns NaN when empty', () => {
+    expect(new TDigest().quantile(0.5)).toBeNaN();
+  });
+
+  it('returns the only value of a single-value digest', () => {
+    expect(digestOf([1234]).quantile(0.9)).toBe(1234);
+  });
+
+  it('ignores non-finite values and non-positive weights', () => {
+    const digest = new TDigest();
+    digest.add(Number.NaN);
+    digest.add(Infinity);
+    digest.add(5, 0);
+    expect(digest.count).toBe(0);
+  });
+
+  it('estimates quantiles of a large stream closely, tails most closely', () => {
+    const n = 100000;
+    const digest = digestOf(shuffled(n));
+
+    expect(digest.count).toBe(n);
+    expect(Math.abs(digest.quantile(0.5) - n * 0.5)).toBeLessThan(n * 0.01);
+    expect(Math.abs(digest.quantile(0.25) - n * 0.25)).toBeLessThan(n * 0.01);
+    expect(Math.abs(digest.quantile(0.99) - n * 0.99)).toBeLessThan(n * 0.002);
+    expect(Math.abs(digest.quantile(0.01) - n * 0.01)).toBeLessThan(n * 0.002);
+  });
+
+  it('returns the exact minimum and maximum at the ends', () => {
+    const digest = digestOf(shuffled(10000));
+    expect(digest.quantile(0)).toBe(1);
+    expect(digest.quantile(1)).toBe(10000);
+  });
+
+  it('keeps the number of centroids bounded by the compression', () => {
+    const serialized = digestOf(shuffled(50000), 100).toJSON();
+    expect(serialized.means.length).toBeLessThanOrEqual(100);
+    expect(serialized.weights.reduce((sum, weight) => sum + weight, 0)).toBe(50000);
+  });
+
+  it('merges into the same estimates as one digest over all values', () => {
+    const values = shuffled(60000);
+    const whole = digestOf(values);
+    const merged = digestOf(values.slice(0, 20000));
+    merged.merge(digestOf(values.slice(20000, 45000)));
+    merged.merge(digestOf(values.slice(45000)));
+
+    expect(merged.count).toBe(60000);
+    expect(merged.quantile(0)).toBe(1);
+    expect(merged.quantile(1)).toBe(60000);
+    for (const q of [0.05, 0.5, 0.95]) {
+      expect(Math.abs(merged.quantile(q) - whole.quantile(q))).toBeLessThan(60000 * 0.01);
+    }
+  });
+
+  it('ignores merging an empty digest', () => {
+    const digest = digestOf([1, 2, 3]);
+    digest.merge(new TDigest());
+    expect(digest.count).toBe(3);
+    expect(digest.quantile(0)).toBe(1);
+  });
+
+  it('survives a JSON round trip', () => {
+    const digest = digestOf(shuffled(20000));
+    const restored = TDigest.fromJSON(JSON.parse(JSON.stringify(digest.toJSON())));
+
+    expect(restored.count).toBe(digest.count);
+    for (const q of [0, 0.1, 0.5, 0.9, 1]) {
+      expect(restored.quantile(q)).toBeCloseTo(digest.quantile(q), 6);
+    }
+  });
+
+  it('restores an empty digest from null', () => {
+    const digest = TDigest.fromJSON(null);
+    expect(digest.count).toBe(0);
+    digest.add(7);
+    expect(digest.quantile(0.5)).toBe(7);
+  });
+});
@@ -0,0 +1,131 @@
+import { TextIndex, tokenize } from '../textIndex.js';
+
+type Field = 'title' | 'description';
+const WEIGHTS: Record<Field, number> = { title: 10, description: 2 };
+
+const ids = (index: TextIndex<Field>, query: string, limit?: number): string[] => index.search(query, limit).map(hit => hit.id);
+
+describe('tokenize', () => {
+  it('lowercases, strips accents and punctuation, and drops stopwords', () => {
+    expect(tokenize('Dry-Van load to SÃO Paulo, 53ft!')).toEqual(['dry', 'van', 'sao', 'paulo', '53ft']);
+  });
+
+  it('returns nothing for stopwords only', () => {
+    expect(tokenize('the load of a')).toEqual([]);
+  });
+});
+
+describe('TextIndex', () => {
+  it('ranks a title match above a description match', () => {
+    const index = new TextIndex<Field>(WEIGHTS);
+    index.add('description-only', { title: 'Flatbed to Denver', description: 'reefer unit on board' });
+    index.add('title', { title: 'Reefer to Denver', description: 'produce' });
+
+    expect(ids(index, 'reefer')).toEqual(['title', 'description-only']);
+  });
+
+  it('ranks documents matching more query terms higher', () => {
+    const index = new TextIndex<Field>(WEIGHTS);
+    index.add('one-term', { title: 'Dry van Dallas' });
+    index.add('two-terms', { title: 'Dry van Chicago' });
+    index.add('none', { title: 'Flatbed Miami' });
+
+    expect(ids(index, 'van chicago')).toEqual(['two-terms', 'one-term']);
+  });
+
+  it('ranks rarer terms higher', () => {
+    const index = new TextIndex<Field>(WEIGHTS);
+    index.add('common', { title: 'van' });
+    index.add('rare', { title: 'hazmat' });
+    index.add('filler-1', { title: 'van' });
+    index.add('filler-2', { title: 'van' });
+
+    expect(ids(index, 'van hazmat')[0]).toBe('rare');
+  });
+
+  it('limits hits but reports every match', () => {
+    const index = new TextIndex<Field>(WEIGHTS);
+    for (let i = 0; i < 10; i++) {
+      index.add(`load-${i}`, { title: `dry van ${'extra '.repeat(i)}` });
+    }
+    const ranked = index.rank('van', 3);
+
+    expect(ranked.hits).toHaveLength(3);
+    expect(ranked.total).toBe(10);
+    // Shorter titles score higher under length normalization
+    expect(ranked.hits.map(hit => hit.id)).toEqual(['load-0', 'load-1', 'load-2']);
+  });
+
+  it('returns nothing for unknown terms, stopword queries or a zero limit', () => {
+    const index = new TextIndex<Field>(WEIGHTS);
+    index.add('load', { title: 'Dry van' });
+
+    expect(index.rank('tanker', 10)).toEqual({ hits: [], total: 0 });
+    expect(index.rank('the', 10)).toEqual({ hits: [], total: 0 });
+    expect(index.search('van', 0)).toEqual([]);
+  });
+
+  it('replaces a document that is added again', () => {
+    const index = new TextIndex<Field>(WEIGHTS);
+    index.add('load', { title: 'Dry van' });
+    index.add('load', { title: 'Flatbed' });
+
+    expect(index.size).toBe(1);
+    expect(ids(index, 'van')).toEqual([]);
+    expect(ids(index, 'flatbed')).toEqual(['load']);
+  });
+
+  it('keeps other documents searchable when one is removed', () => {
+    const index = new TextIndex<Field>(WEIGHTS);
+    ['a', 'b', 'c', 'd'].forEach(id => index.add(id, { title: `dry van ${id}` }));
+    index.remove('a');
+    index.remove('c');
+    index.remove('missing');
+
+    expect(index.size).toBe(2);
+    expect(ids(index, 'van').sort()).toEqual(['b', 'd']);
+    expect(ids(index, 'c')).toEqual([]);
+  });
+
+  it('scores the same after churn as a freshly built index', () => {
+    const words = ['dry', 'van', 'reefer', 'tx', 'ca', 'chicago', 'dallas', 'flatbed', 'urgent', 'fragile'];
+    let state = 7;
+    const next = () => (state = (state * 1103515245 + 12345) % 2147483648) / 2147483648;
+    const pick = () => words[Math.floor(next() * words.length)];
+
+    const churned = new TextIndex<Field>(WEIGHTS);
+    const live = new Map<string, Record<Field, string>>();
+    for (let step = 0; step < 5000; step++) {
+      const id = `load-${Math.floor(next() * 200)}`;
+      if (next() < 0.3) {
+        churned.remove(id);
+        live.delete(id);
+      } else {
+        const document = { title: `${pick()} ${pick()} ${pick()}`, description: pick() };
+        churned.add(id, document);
+        live.set(id, document);
+      }
+    }
+
+    const fresh = new TextIndex<Field>(WEIGHTS);
+    live.forEach((document, id) => fresh.add(id, document));
+
+    for (const query of ['dry van', 'tx', 'urgent chicago']) {
+      const expected = fresh.rank(query, 1000);
+      const actual = churned.rank(query, 1000);
+      const scores = new Map(actual.hits.map(hit => [hit.id, hit.score]));
+
+      expect(actual.total).toBe(expected.total);
+      expected.hits.forEach(hit => expect(scores.get(hit.id)).toBeCloseTo(hit.score, 9));
+    }
+  });
+
+  it('empties on clear', () => {
+    const index = new TextIndex<Field>(WEIGHTS);
+    index.add('load', { title: 'Dry van' });
+    index.clear();
+
+    expect(index.size).toBe(0);
+    expect(ids(index, 'van')).toEqual([]);
+  });
+});
@@ -0,0 +1,166 @@
+import { Transform, TransformCallback } from 'stream';
+import {
+  Bool,
+  Data,
+  DataType,
+  Dictionary,
+  Field,
+  Float64,
+  Int32,
+  Int8,
+  makeData,
+  RecordBatch,
+  Schema,
+  Struct,
+  TimestampMillisecond,
+  Utf8,
+  Vector,
+  vectorFromArray
+} from 'apache-arrow';
+
+export type ArrowColumnType = 'utf8' | 'float64' | 'int32' | 'bool' | 'timestamp' | 'dictionary';
+
+export interface ArrowColumn {
+  name: string;
+  type: ArrowColumnType;
+  // Values of a 'dictionary' column (at most 127); anything else is written as null
+  dictionary?: readonly string[];
+  value: (doc: any) => unknown;
+}
+
+interface DictionaryColumn {
+  type: Dictionary<Utf8, Int8>;
+  values: Vector<Utf8>;
+  index: Map<string, number>;
+}
+
+const toNumber = (value: unknown): number | null => {
+  if (value === undefined || value === null || value === '') return null;
+  const number = Number(value);
+  return Number.isFinite(number) ? number : null;
+};
+
+const toTimestamp = (value: unknown): number | null => {
+  if (!value) return null;
+  const time = new Date(value as string | Date).getTime();
+  return Number.isNaN(time) ? null : time;
+};
+
+/**
+ * Object-mode documents in, Arrow record batches out (for a RecordBatchWriter).
+ * Rows are buffered up to `batchRows`, so memory is bounded by one batch.
+ * Dictionary columns use one fixed dictionary per column, shared by every
+ * batch, so the IPC file carries each dictionary once.
+ */
+export class ArrowBatchEncoder extends Transform {
+  readonly schema: Schema;
+  private readonly dictionaries: Map<string, DictionaryColumn> = new Map();
+  private rows: unknown[][] = [];
+  private count = 0;
+  private emitted = false;
+
+  constructor(private readonly columns: readonly ArrowColumn[], private readonly batchRows: number) {
+    super({ objectMode: true });
+
+    let dictionaryId = 0;
+    const fields = columns.map(column => {
+      if (column.type === 'dictionary') {
+        const values = [...(column.dictionary ?? [])];
+        const dictionary: DictionaryColumn = {
+          type: new Dictionary(new Utf8(), new Int8(), dictionaryId++),
+          values: vectorFromArray(values, new Utf8()),
+          index: new Map(values.map((value, i) => [value, i]))
+        };
+        this.dictionaries.set(column.name, dictionary);
+        return new Field(column.name, dictionary.type, true);
+      }
+      return new Field(column.name, scalarType(column.type), true);
+    });
+    this.schema = new Schema(fields);
+  }
+
+  get records(): number {
+    return this.count;
+  }
+
+  _transform(doc: unknown, _encoding: BufferEncoding, callback: TransformCallback): void {
+    this.rows.push(this.columns.map(column => column.value(doc)));
+    this.count++;
+    if (this.rows.length >= this.batchRows) {
+      callback(null, this.build());
+      return;
+    }
+    callback();
+  }
+
+  _flush(callback: TransformCallback): void {
+    // An empty export still gets one (empty) batch, so the file has a schema
+    if (this.rows.length > 0 || !this.emitted) {
+      this.push(this.build());
+    }
+    callback();
+  }
+
+  private build(): RecordBatch {
+    const rows = this.rows;
+    this.rows = [];
+    this.emitted = true;
+
+    const children = this.columns.map((column, i) => this.columnData(column, this.schema.fields[i].type, rows.map(row => row[i])));
+    return new RecordBatch(this.schema, makeData({ type: new Struct(this.schema.fields), length: rows.length, nullCount: 0, children }));
+  }
+
+  private columnData(column: ArrowColumn, type: DataType, values: unknown[]): Data {
+    switch (column.type) {
+      case 'dictionary': {
+        const dictionary = this.dictionaries.get(column.name)!;
+        const indices = new Int8Array(values.length);
+        const nullBitmap = new Uint8Array((values.length + 7) >> 3);
+        let nullCount = 0;
+        values.forEach((value, i) => {
+          const index = typeof value === 'string' ? dictionary.index.get(value) : undefined;
+          if (index === undefined) {
+            nullCount++;
+            return;
+          }
+          indices[i] = index;
+          nullBitmap[i >> 3] |= 1 << (i & 7);
+        });
+        return makeData({
+          type: dictionary.type,
+          length: values.length,
+          nullCount,
+          nullBitmap: nullCount > 0 ? nullBitmap : undefined,
+          data: indices,
+          dictionary: dictionary.values
+        });
+      }
+      case 'float64':
+      case 'int32':
+        return vectorFromArray(values.map(toNumber), type).data[0];
+      case 'timestamp':
+        return vectorFromArray(values.map(toTimestamp), type).data[0];
+      case 'bool':
+        return vectorFromArray(values.map(value => (value === undefined || value === null ? null : Boolean(value))), type).data[0];
+      case 'utf8':
+      default:
+        return vectorFromArray(values.map(value => (value === undefined || value === null ? null : String(value))), type).data[0];
+    }
+  }
+}
+
+function scalarType(type: Exclude<ArrowColumnType, 'dictionary'>): DataType {
+  switch (type) {
+    case 'float64':
+      return new Float64();
+    case 'int32':
+      return new Int32();
+    case 'bool':
+      return new Bool();
+    case 'timestamp':
+      return new TimestampMillisecond('UTC');
+    case 'utf8':
+    default:
+      return new Utf8();
+  }
+}
@@ -0,0 +1,127 @@
+/**
+ * Sorted-array prefix index for "City, ST" autocomplete.
+ * Each entry is indexed under every word start of its normalized key so
+ * "york" still finds "New York, NY". Lookups binary-search the prefix range
+ * and select the top-k entries by occurrence count.
+ */
+
+interface CompletionEntry {
+  display: string;
+  count: number;
+  terms: string[];
+}
+
+export function normalizeCompletionKey(value: string): string {
+  return value
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .replace(/\s+/g, ' ')
+    .trim();
+}
+
+function wordStartTerms(normalized: string): string[] {
+  const terms = [normalized];
+  for (let i = 1; i < normalized.length; i++) {
+    const previous = normalized[i - 1];
+    if ((previous === ' ' || previous === '-' || previous === '.') && normalized[i] !== ' ') {
+      terms.push(normalized.slice(i));
+    }
+  }
+  return terms;
+}
+
+export class CompletionIndex {
+  private terms: string[] = [];
+  private refs: CompletionEntry[] = [];
+  private entries: Map<string, CompletionEntry> = new Map();
+
+  get size(): number {
+    return this.entries.size;
+  }
+
+  clear(): void {
+    this.terms = [];
+    this.refs = [];
+    this.entries.clear();
+  }
+
+  /**
+   * Adjust the occurrence count of a display value, adding or removing it as needed
+   */
+  add(display: string, delta: number = 1): void {
+    const key = normalizeCompletionKey(display);
+    if (!key) return;
+
+    const existing = this.entries.get(key);
+    if (existing) {
+      existing.count += delta;
+      if (existing.count <= 0) this.remove(key, existing);
+      return;
+    }
+
+    if (delta <= 0) return;
+
+    const entry: CompletionEntry = { display, count: delta, terms: wordStartTerms(key) };
+    this.entries.set(key, entry);
+    for (const term of entry.terms) {
+      const position = this.lowerBound(term);
+      this.terms.splice(position, 0, term);
+      this.refs.splice(position, 0, entry);
+    }
+  }
+
+  /**
+   * Top `limit` display values whose key (or a word within it) starts with `prefix`
+   */
+  complete(prefix: string, limit: number = 10): string[] {
+    const needle = normalizeCompletionKey(prefix);
+    if (!needle || limit <= 0) return [];
+
+    const start = this.lowerBound(needle);
+    const top: CompletionEntry[] = [];
+    const seen = new Set<CompletionEntry>();
+
+    for (let i = start; i < this.terms.length && this.terms[i].startsWith(needle); i++) {
+      const entry = this.refs[i];
+      if (seen.has(entry)) continue;
+      seen.add(entry);
+
+      if (top.length === limit && entry.count <= top[top.length - 1].count) continue;
+
+      // Insert into the small sorted top-k buffer
+      let position = top.length;
+      while (position > 0 && top[position - 1].count < entry.count) position--;
+      top.splice(position, 0, entry);
+      if (top.length > limit) top.pop();
+    }
+
+    return top.map(entry => entry.display);
+  }
+
+  private remove(key: string, entry: CompletionEntry): void {
+    this.entries.delete(key);
+    for (const term of entry.terms) {
+      let position = this.lowerBound(term);
+      while (position < this.terms.length && this.terms[position] === term) {
+        if (this.refs[position] === entry) {
+          this.terms.splice(position, 1);
+          this.refs.splice(position, 1);
+          break;
+        }
+        position++;
+      }
+    }
+  }
+
+  private lowerBound(value: string): number {
+    let lo = 0;
+    let hi = this.terms.length;
+    while (lo < hi) {
+      const mid = (lo + hi) >>> 1;
+      if (this.terms[mid] < value) lo = mid + 1;
+      else hi = mid;
+    }
+    return lo;
+  }
+}
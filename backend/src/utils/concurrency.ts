@@ -0,0 +1,23 @@
+/**
+ * Map items through an async function with at most `limit` calls in flight.
+ * Results keep input order.
+ */
+export async function mapWithConcurrency<T, R>(
+  items: readonly T[],
+  limit: number,
+  fn: (item: T, index: number) => Promise<R>
+): Promise<R[]> {
+  const results = new Array<R>(items.length);
+  let next = 0;
+
+  const worker = async (): Promise<void> => {
+    while (next < items.length) {
+      const index = next++;
+      results[index] = await fn(items[index], index);
+    }
+  };
+
+  const workers = Array.from({ length: Math.min(Math.max(limit, 1), items.length) }, () => worker());
+  await Promise.all(workers);
+  return results;
+}
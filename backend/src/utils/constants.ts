@@ -27,6 +27,8 @@ export const CA_PROVINCES = [
 export const RATE_LIMIT = {
   WINDOW_MS: 15 * 60 * 1000, // 15 minutes
   MAX_REQUESTS: 100,
+  DISTANCE_MATRIX_WINDOW_MS: 60 * 1000, // 1 minute
+  DISTANCE_MATRIX_MAX_REQUESTS: 20, // per user
 };
 
 // Pagination
@@ -36,6 +38,81 @@ export const PAGINATION = {
   MAX_LIMIT: 100,
 };
 
+// Geocoding cache
+export const GEOCODE_CACHE = {
+  MAX_MEMORY_ENTRIES: 10000,
+  TTL_MS: 30 * 24 * 60 * 60 * 1000, // 30 days
+  NEGATIVE_TTL_MS: 24 * 60 * 60 * 1000, // 1 day for addresses the provider could not resolve
+  WARM_UP_LOCATIONS: 500,
+};
+
+// Load list/search result cache
+export const SEARCH_RESULT_CACHE = {
+  MAX_BYTES: 32 * 1024 * 1024,
+  TTL_MS: 5 * 60 * 1000, // bounds staleness of totals for writes the invalidation cannot see
+  MAX_TRACKED_KEYS: 1000,
+};
+
+// DailyUserStats rollups
+export const DAILY_STATS = {
+  REBUILD_DAYS: 62, // nightly repair window (dashboards compare two 30-day periods)
+  EQUIPMENT_WINDOW_DAYS: 60, // top equipment is read from this many days of rollups
+  REBUILD_RETRIES: 3, // passes over rollup days that took a delta while the rebuild read them
+  RUN_RETENTION_DAYS: 30,
+};
+
+// Dashboard and admin system stats cache (stale-while-revalidate)
+export const DASHBOARD_CACHE = {
+  MAX_BYTES: 16 * 1024 * 1024,
+  FRESH_MS: 30 * 1000, // served as-is
+  MAX_AGE_MS: 60 * 1000, // served stale while refreshing until this age
+};
 
+// Admin console system stats snapshots
+export const SYSTEM_STATS = {
+  SNAPSHOT_CRON: '*/5 * * * *',
+  SNAPSHOT_INTERVAL_MS: 5 * 60 * 1000, // matches SNAPSHOT_CRON; snapshots are keyed by the start of their interval
+  RECONCILE_CRON: '7 * * * *', // recompute lane, billing and time-to-book figures hourly
+  RETENTION_DAYS: 90,
+  HISTORY_MAX_POINTS: 500,
+};
+
+// Lane market rates (rate-per-mile quantiles per lane and week)
+export const LANE_RATES = {
+  WINDOW_WEEKS: 12, // quotes cover this many weekly buckets
+  TREND_WEEKS: 4, // trend compares the last TREND_WEEKS with the TREND_WEEKS before
+  COMPRESSION: 100, // t-digest compression (≈ centroids kept per bucket)
+  MAX_RATE_PER_MILE: 50, // samples above this are treated as data-entry errors
+  REFRESH_CRON: '10 0 * * *', // rebuild quotes daily so the window slides
+  POLL_CRON: '* * * * *', // refresh lanes whose buckets changed, e.g. bookings recorded by other instances
+  POLL_OVERLAP_MS: 60 * 1000, // re-read changes this far behind the newest seen, for clock skew between writers
+  FLUSH_RETRIES: 5,
+};
+
+// Upper bound on time a request (e.g. posting a load) waits for geocoding
+export const GEOCODE_REQUEST_TIMEOUT_MS = 3000;
 
+// Requests carrying this header get per-stage timings (Server-Timing header and `timings` in the body)
+export const DEBUG_TIMING_HEADER = 'x-debug-timing';
 
+// Background admin export jobs
+export const EXPORT_JOBS = {
+  CHUNK_SIZE: 10000, // documents per gzip part
+  POLL_CRON: '*/15 * * * * *', // pick up queued jobs (submissions also start the worker directly)
+  STALE_MS: 5 * 60 * 1000, // a running job without progress for this long is reclaimed
+  MAX_ATTEMPTS: 3, // automatic retries before a job is marked failed
+  RETRY_DELAY_MS: 30 * 1000, // multiplied by the attempt number
+  RETENTION_DAYS: 7,
+  CLEANUP_CRON: '30 3 * * *',
+};
+
+// Saved-search alerts
+export const ALERTS = {
+  MAX_LOADS_PER_ALERT: 50,
+  MATCH_RELOAD_CRON: '*/10 * * * *', // rebuild the saved-search match index (picks up other instances' edits)
+  DISPATCH_PAGE_SIZE: 500, // searches per checkpoint (one bulkWrite each)
+  EMAIL_BATCH_SIZE: 100, // emails per provider call (Resend batch limit)
+  RUN_STALE_MS: 15 * 60 * 1000, // a run without a checkpoint for this long is resumed by the next one
+  RUN_RETENTION_DAYS: 30,
+  SCHEDULE_SLACK_MS: 5 * 60 * 1000, // an hourly run a little under an hour after the last alert still counts it as due
+};
@@ -0,0 +1,94 @@
+import { EARTH_RADIUS_MILES, isValidLatLng, toRadians } from './geo.js';
+
+/**
+ * Haversine distance matrix over packed typed arrays. Points are converted to
+ * radians once and cos(lat) is precomputed, so the inner loop is a handful of
+ * float operations per cell with no object allocation.
+ */
+
+export interface PackedPoints {
+  count: number;
+  lat: Float64Array;
+  lng: Float64Array;
+  cosLat: Float64Array;
+}
+
+export interface NearestEntry {
+  index: number;
+  distance: number;
+}
+
+/**
+ * Pack { lat, lng } points into typed arrays.
+ * Returns the index of the first invalid point instead when validation fails.
+ */
+export function packPoints(points: Array<{ lat: unknown; lng: unknown }>): PackedPoints | { invalidIndex: number } {
+  const count = points.length;
+  const lat = new Float64Array(count);
+  const lng = new Float64Array(count);
+  const cosLat = new Float64Array(count);
+
+  for (let i = 0; i < count; i++) {
+    const point = points[i];
+    if (!point || !isValidLatLng(point.lat, point.lng)) {
+      return { invalidIndex: i };
+    }
+    lat[i] = toRadians(point.lat as number);
+    lng[i] = toRadians(point.lng as number);
+    cosLat[i] = Math.cos(lat[i]);
+  }
+
+  return { count, lat, lng, cosLat };
+}
+
+/**
+ * Distances in miles from origin `row` to every destination, written into `out`
+ */
+export function distanceRow(origins: PackedPoints, row: number, destinations: PackedPoints, out: Float64Array): Float64Array {
+  const lat1 = origins.lat[row];
+  const lng1 = origins.lng[row];
+  const cos1 = origins.cosLat[row];
+  const { lat, lng, cosLat, count } = destinations;
+
+  for (let j = 0; j < count; j++) {
+    const sinLat = Math.sin((lat[j] - lat1) / 2);
+    const sinLng = Math.sin((lng[j] - lng1) / 2);
+    const a = sinLat * sinLat + cos1 * cosLat[j] * sinLng * sinLng;
+    out[j] = 2 * EARTH_RADIUS_MILES * Math.asin(Math.min(1, Math.sqrt(a)));
+  }
+
+  return out;
+}
+
+/**
+ * The k smallest distances in a row, nearest first
+ */
+export function nearestInRow(distances: Float64Array, k: number): NearestEntry[] {
+  const size = Math.min(k, distances.length);
+  if (size <= 0) return [];
+
+  // Sorted insertion buffer; cheap for the small k dispatch tooling asks for
+  const indexes = new Int32Array(size);
+  const values = new Float64Array(size).fill(Infinity);
+  let filled = 0;
+
+  for (let j = 0; j < distances.length; j++) {
+    const distance = distances[j];
+    if (filled === size && distance >= values[size - 1]) continue;
+
+    let position = filled < size ? filled++ : size - 1;
+    while (position > 0 && values[position - 1] > distance) {
+      values[position] = values[position - 1];
+      indexes[position] = indexes[position - 1];
+      position--;
+    }
+    values[position] = distance;
+    indexes[position] = j;
+  }
+
+  const result: NearestEntry[] = [];
+  for (let i = 0; i < filled; i++) {
+    result.push({ index: indexes[i], distance: values[i] });
+  }
+  return result;
+}
@@ -0,0 +1,269 @@
+import fs from 'fs';
+import { Country } from '../types/index.js';
+import { CA_PROVINCES, US_STATES } from './constants.js';
+import { haversineMiles } from './geo.js';
+
+/**
+ * Offline postal-code centroid gazetteer (US ZIP codes and Canadian FSAs).
+ *
+ * Binary layout (little-endian), produced by scripts/buildGazetteer.ts:
+ *   header   16 bytes: magic "CLGZ", version u16, reserved u16, count u32, cityBytes u32
+ *   keys     u32[count]  postal keys, sorted ascending (see encodePostalKey)
+ *   lat      f32[count]
+ *   lng      f32[count]
+ *   city     u32[count]  index into the city name table
+ *   region   u8[count]   index into US_STATES followed by CA_PROVINCES
+ *   cities   UTF-8 city names separated by "\n"
+ *
+ * Lookups binary-search the key array; reverse lookups use a 1° grid.
+ */
+
+const MAGIC = 'CLGZ';
+const VERSION = 1;
+const HEADER_BYTES = 16;
+const CA_KEY_BASE = 100000;
+const GRID_COLUMNS = 360;
+const GRID_CELLS = 180 * GRID_COLUMNS;
+const MILES_PER_DEGREE = 69.17;
+
+export const GAZETTEER_REGIONS = [...US_STATES, ...CA_PROVINCES];
+
+export interface GazetteerRecord {
+  code: string;
+  country: Country;
+  city: string;
+  region: string;
+  lat: number;
+  lng: number;
+}
+
+export interface GazetteerPlace {
+  code: string;
+  country: Country;
+  city: string;
+  region: string;
+  lat: number;
+  lng: number;
+}
+
+/**
+ * Numeric key for a postal code: US ZIP5 as-is, Canadian FSA (A9A) above 100000.
+ * Returns null for codes that are not a US ZIP or Canadian postal code/FSA.
+ */
+export function encodePostalKey(code: string, country: Country = 'US'): number | null {
+  const cleaned = (code || '').trim().toUpperCase().replace(/[\s-]/g, '');
+  if (country === 'CA') {
+    const match = /^([A-Z])(\d)([A-Z])/.exec(cleaned);
+    if (!match) return null;
+    const first = match[1].charCodeAt(0) - 65;
+    const last = match[3].charCodeAt(0) - 65;
+    return CA_KEY_BASE + (first * 10 + Number(match[2])) * 26 + last;
+  }
+  const match = /^(\d{5})/.exec(cleaned);
+  return match ? Number(match[1]) : null;
+}
+
+function decodePostalKey(key: number): { code: string; country: Country } {
+  if (key < CA_KEY_BASE) {
+    return { code: String(key).padStart(5, '0'), country: 'US' };
+  }
+  const value = key - CA_KEY_BASE;
+  const last = value % 26;
+  const rest = Math.floor(value / 26);
+  return {
+    code: `${String.fromCharCode(65 + Math.floor(rest / 10))}${rest % 10}${String.fromCharCode(65 + last)}`,
+    country: 'CA'
+  };
+}
+
+const gridCell = (lat: number, lng: number): number => {
+  const row = Math.min(Math.max(Math.floor(lat) + 90, 0), 179);
+  const column = ((Math.floor(lng) + 180) % GRID_COLUMNS + GRID_COLUMNS) % GRID_COLUMNS;
+  return row * GRID_COLUMNS + column;
+};
+
+/**
+ * Serialize records into the gazetteer binary format (duplicate codes keep the first record)
+ */
+export function encodeGazetteer(records: GazetteerRecord[]): Buffer {
+  const byKey = new Map<number, GazetteerRecord>();
+  for (const record of records) {
+    const key = encodePostalKey(record.code, record.country);
+    if (key === null || byKey.has(key)) continue;
+    if (!Number.isFinite(record.lat) || !Number.isFinite(record.lng)) continue;
+    byKey.set(key, record);
+  }
+
+  const keys = Array.from(byKey.keys()).sort((a, b) => a - b);
+  const count = keys.length;
+  const cityNames: string[] = [];
+  const cityIds = new Map<string, number>();
+
+  const cityIndex = new Uint32Array(count);
+  const lat = new Float32Array(count);
+  const lng = new Float32Array(count);
+  const region = new Uint8Array(count);
+
+  keys.forEach((key, i) => {
+    const record = byKey.get(key) as GazetteerRecord;
+    let cityId = cityIds.get(record.city);
+    if (cityId === undefined) {
+      cityId = cityNames.length;
+      cityNames.push(record.city);
+      cityIds.set(record.city, cityId);
+    }
+    cityIndex[i] = cityId;
+    lat[i] = record.lat;
+    lng[i] = record.lng;
+    const regionId = GAZETTEER_REGIONS.indexOf(record.region.toUpperCase());
+    region[i] = regionId >= 0 ? regionId : 255;
+  });
+
+  const cityBytes = Buffer.from(cityNames.join('\n'), 'utf8');
+  const header = Buffer.alloc(HEADER_BYTES);
+  header.write(MAGIC, 0, 'ascii');
+  header.writeUInt16LE(VERSION, 4);
+  header.writeUInt32LE(count, 8);
+  header.writeUInt32LE(cityBytes.length, 12);
+
+  return Buffer.concat([
+    header,
+    Buffer.from(Uint32Array.from(keys).buffer),
+    Buffer.from(lat.buffer),
+    Buffer.from(lng.buffer),
+    Buffer.from(cityIndex.buffer),
+    Buffer.from(region.buffer),
+    cityBytes
+  ]);
+}
+
+export class Gazetteer {
+  private readonly keys: Uint32Array;
+  private readonly lat: Float32Array;
+  private readonly lng: Float32Array;
+  private readonly cityIndex: Uint32Array;
+  private readonly region: Uint8Array;
+  private readonly cities: string[];
+  // Counting-sorted grid: entries of cell c are gridItems[gridStart[c] .. gridStart[c + 1])
+  private readonly gridStart: Uint32Array;
+  private readonly gridItems: Uint32Array;
+
+  constructor(data: Buffer) {
+    if (data.length < HEADER_BYTES || data.toString('ascii', 0, 4) !== MAGIC) {
+      throw new Error('Not a gazetteer file');
+    }
+    if (data.readUInt16LE(4) !== VERSION) {
+      throw new Error(`Unsupported gazetteer version ${data.readUInt16LE(4)}`);
+    }
+
+    const count = data.readUInt32LE(8);
+    const cityBytes = data.readUInt32LE(12);
+    if (data.length < HEADER_BYTES + count * 17 + cityBytes) {
+      throw new Error('Truncated gazetteer file');
+    }
+
+    // Typed array views need 4-byte alignment; copy once if the buffer is not aligned
+    const aligned = data.byteOffset % 4 === 0 ? data : Buffer.from(data);
+    const base = aligned.byteOffset + HEADER_BYTES;
+    this.keys = new Uint32Array(aligned.buffer, base, count);
+    this.lat = new Float32Array(aligned.buffer, base + count * 4, count);
+    this.lng = new Float32Array(aligned.buffer, base + count * 8, count);
+    this.cityIndex = new Uint32Array(aligned.buffer, base + count * 12, count);
+    this.region = new Uint8Array(aligned.buffer, base + count * 16, count);
+    this.cities = aligned.toString('utf8', HEADER_BYTES + count * 17, HEADER_BYTES + count * 17 + cityBytes).split('\n');
+
+    this.gridStart = new Uint32Array(GRID_CELLS + 1);
+    for (let i = 0; i < count; i++) {
+      this.gridStart[gridCell(this.lat[i], this.lng[i]) + 1]++;
+    }
+    for (let c = 0; c < GRID_CELLS; c++) {
+      this.gridStart[c + 1] += this.gridStart[c];
+    }
+    const fill = this.gridStart.slice(0, GRID_CELLS);
+    this.gridItems = new Uint32Array(count);
+    for (let i = 0; i < count; i++) {
+      this.gridItems[fill[gridCell(this.lat[i], this.lng[i])]++] = i;
+    }
+  }
+
+  /**
+   * Load a gazetteer file, or return null when it does not exist
+   */
+  static load(path: string): Gazetteer | null {
+    if (!path || !fs.existsSync(path)) return null;
+    return new Gazetteer(fs.readFileSync(path));
+  }
+
+  get size(): number {
+    return this.keys.length;
+  }
+
+  /**
+   * Centroid for a US ZIP or Canadian postal code (matched on its FSA)
+   */
+  lookup(code: string, country: Country = 'US'): GazetteerPlace | null {
+    const key = encodePostalKey(code, country);
+    if (key === null) return null;
+
+    let lo = 0;
+    let hi = this.keys.length - 1;
+    while (lo <= hi) {
+      const mid = (lo + hi) >>> 1;
+      const value = this.keys[mid];
+      if (value === key) return this.place(mid);
+      if (value < key) lo = mid + 1;
+      else hi = mid - 1;
+    }
+    return null;
+  }
+
+  /**
+   * Nearest centroid to a point, searching grid rings outward.
+   * Returns null when nothing lies within maxMiles.
+   */
+  nearest(lat: number, lng: number, maxMiles: number = 50): GazetteerPlace | null {
+    const row = Math.floor(lat) + 90;
+    const column = Math.floor(lng) + 180;
+    // Longitude degrees shrink towards the poles; use the narrowest width the search can reach
+    const maxRings = Math.ceil(maxMiles / (MILES_PER_DEGREE * Math.cos(Math.min(Math.abs(lat) + 1, 89) * Math.PI / 180))) + 1;
+
+    let best = -1;
+    let bestMiles = Infinity;
+
+    for (let ring = 0; ring <= maxRings; ring++) {
+      for (let r = row - ring; r <= row + ring; r++) {
+        if (r < 0 || r >= 180) continue;
+        const onEdgeRow = r === row - ring || r === row + ring;
+        for (let c = column - ring; c <= column + ring; c += onEdgeRow || ring === 0 ? 1 : ring * 2) {
+          const cell = r * GRID_COLUMNS + ((c % GRID_COLUMNS) + GRID_COLUMNS) % GRID_COLUMNS;
+          for (let k = this.gridStart[cell]; k < this.gridStart[cell + 1]; k++) {
+            const i = this.gridItems[k];
+            const miles = haversineMiles(lat, lng, this.lat[i], this.lng[i]);
+            if (miles < bestMiles) {
+              bestMiles = miles;
+              best = i;
+            }
+          }
+        }
+      }
+
+      // Every cell in the next ring is at least `ring` cell widths away
+      const ringMiles = ring * MILES_PER_DEGREE * Math.cos(Math.min(Math.abs(lat) + ring + 1, 89) * Math.PI / 180);
+      if (best >= 0 && bestMiles <= ringMiles) break;
+    }
+
+    return best >= 0 && bestMiles <= maxMiles ? this.place(best) : null;
+  }
+
+  private place(i: number): GazetteerPlace {
+    const { code, country } = decodePostalKey(this.keys[i]);
+    return {
+      code,
+      country,
+      city: this.cities[this.cityIndex[i]] ?? '',
+      region: GAZETTEER_REGIONS[this.region[i]] ?? '',
+      lat: this.lat[i],
+      lng: this.lng[i]
+    };
+  }
+}
@@ -0,0 +1,71 @@
+import { IGeoPoint } from '../types/index.js';
+
+export const EARTH_RADIUS_MILES = 3958.8;
+export const METERS_PER_MILE = 1609.344;
+
+export const toRadians = (degrees: number): number => (degrees * Math.PI) / 180;
+
+/**
+ * Validate a latitude/longitude pair
+ */
+export function isValidLatLng(lat: unknown, lng: unknown): boolean {
+  return (
+    typeof lat === 'number' &&
+    typeof lng === 'number' &&
+    Number.isFinite(lat) &&
+    Number.isFinite(lng) &&
+    lat >= -90 &&
+    lat <= 90 &&
+    lng >= -180 &&
+    lng <= 180
+  );
+}
+
+/**
+ * Convert { lat, lng } coordinates to a GeoJSON point ([lng, lat] order)
+ */
+export function toGeoPoint(coordinates?: { lat?: number; lng?: number } | null): IGeoPoint | undefined {
+  if (!coordinates || !isValidLatLng(coordinates.lat, coordinates.lng)) {
+    return undefined;
+  }
+  return { type: 'Point', coordinates: [coordinates.lng as number, coordinates.lat as number] };
+}
+
+/**
+ * Great-circle distance between two points in miles (unrounded)
+ */
+export function haversineMiles(lat1: number, lng1: number, lat2: number, lng2: number): number {
+  const dLat = toRadians(lat2 - lat1);
+  const dLng = toRadians(lng2 - lng1);
+  const a =
+    Math.sin(dLat / 2) * Math.sin(dLat / 2) +
+    Math.cos(toRadians(lat1)) * Math.cos(toRadians(lat2)) * Math.sin(dLng / 2) * Math.sin(dLng / 2);
+  return EARTH_RADIUS_MILES * 2 * Math.atan2(Math.sqrt(a), Math.sqrt(1 - a));
+}
+
+/**
+ * Great-circle distance in whole miles, or null if either coordinate is missing
+ */
+export function calculateDistanceMiles(
+  origin?: { lat?: number; lng?: number },
+  destination?: { lat?: number; lng?: number }
+): number | null {
+  if (
+    !origin ||
+    !destination ||
+    typeof origin.lat !== 'number' ||
+    typeof origin.lng !== 'number' ||
+    typeof destination.lat !== 'number' ||
+    typeof destination.lng !== 'number'
+  ) {
+    return null;
+  }
+
+  const miles = haversineMiles(origin.lat, origin.lng, destination.lat, destination.lng);
+
+  if (!Number.isFinite(miles) || miles <= 0) {
+    return null;
+  }
+
+  return Math.round(miles);
+}
@@ -0,0 +1,177 @@
+/**
+ * Parsing for bulk load imports. Accepts NDJSON (one postLoad-shaped object
+ * per line) or CSV with a header row using flat column names such as
+ * originCity, originState, originZip, destinationCity, pickupDate, rate.
+ */
+
+export type LoadImportFormat = 'csv' | 'ndjson';
+
+export interface LoadImportLocation {
+  city?: string;
+  state?: string;
+  zip?: string;
+  country?: string;
+  coordinates?: { lat?: number; lng?: number };
+}
+
+export interface LoadImportInput {
+  title?: string;
+  description?: string;
+  origin?: LoadImportLocation;
+  destination?: LoadImportLocation;
+  pickupDate?: string;
+  deliveryDate?: string;
+  equipmentType?: string;
+  weight?: number | string;
+  rate?: number | string;
+  rateType?: string;
+  shipmentId?: string;
+}
+
+export interface ParsedImportRow {
+  /** 1-based record number in the upload (CSV rows are counted after the header) */
+  row: number;
+  input?: LoadImportInput;
+  error?: string;
+}
+
+/**
+ * Guess the format from the file name/mime type, falling back to the content
+ */
+export function detectImportFormat(content: string, filename?: string, mimetype?: string): LoadImportFormat {
+  const name = (filename || '').toLowerCase();
+  if (name.endsWith('.csv') || mimetype === 'text/csv') return 'csv';
+  if (name.endsWith('.ndjson') || name.endsWith('.jsonl') || mimetype === 'application/x-ndjson') return 'ndjson';
+  return content.trimStart().startsWith('{') ? 'ndjson' : 'csv';
+}
+
+export function parseLoadImport(content: string, format: LoadImportFormat): ParsedImportRow[] {
+  return format === 'csv' ? parseCsvImport(content) : parseNdjsonImport(content);
+}
+
+function parseNdjsonImport(content: string): ParsedImportRow[] {
+  const rows: ParsedImportRow[] = [];
+  const lines = content.split(/\r?\n/);
+
+  lines.forEach((line, i) => {
+    if (!line.trim()) return;
+    try {
+      const value = JSON.parse(line);
+      if (!value || typeof value !== 'object' || Array.isArray(value)) {
+        rows.push({ row: i + 1, error: 'Line is not a JSON object' });
+        return;
+      }
+      rows.push({ row: i + 1, input: value as LoadImportInput });
+    } catch {
+      rows.push({ row: i + 1, error: 'Invalid JSON' });
+    }
+  });
+
+  return rows;
+}
+
+/**
+ * Split CSV text into records (RFC 4180 quoting, CRLF or LF line endings)
+ */
+export function parseCsvRecords(content: string): string[][] {
+  const records: string[][] = [];
+  let record: string[] = [];
+  let field = '';
+  let quoted = false;
+
+  for (let i = 0; i < content.length; i++) {
+    const char = content[i];
+
+    if (quoted) {
+      if (char === '"') {
+        if (content[i + 1] === '"') {
+          field += '"';
+          i++;
+        } else {
+          quoted = false;
+        }
+      } else {
+        field += char;
+      }
+      continue;
+    }
+
+    if (char === '"') {
+      quoted = true;
+    } else if (char === ',') {
+      record.push(field);
+      field = '';
+    } else if (char === '\n' || char === '\r') {
+      if (char === '\r' && content[i + 1] === '\n') i++;
+      record.push(field);
+      records.push(record);
+      record = [];
+      field = '';
+    } else {
+      field += char;
+    }
+  }
+
+  if (field !== '' || record.length > 0) {
+    record.push(field);
+    records.push(record);
+  }
+
+  return records;
+}
+
+const optionalNumber = (value?: string): number | undefined => {
+  if (value === undefined || value.trim() === '') return undefined;
+  const parsed = Number(value);
+  return Number.isFinite(parsed) ? parsed : undefined;
+};
+
+function csvLocation(record: Record<string, string>, prefix: 'origin' | 'destination'): LoadImportLocation {
+  const lat = optionalNumber(record[`${prefix}lat`]);
+  const lng = optionalNumber(record[`${prefix}lng`]);
+  return {
+    city: record[`${prefix}city`],
+    state: record[`${prefix}state`],
+    zip: record[`${prefix}zip`],
+    country: record[`${prefix}country`] || undefined,
+    coordinates: lat !== undefined && lng !== undefined ? { lat, lng } : undefined
+  };
+}
+
+function parseCsvImport(content: string): ParsedImportRow[] {
+  const records = parseCsvRecords(content);
+  if (records.length === 0) return [];
+
+  // Header names are matched case-insensitively, ignoring spaces, dots and underscores
+  const headers = records[0].map(header => header.trim().toLowerCase().replace(/[\s._]/g, ''));
+  const rows: ParsedImportRow[] = [];
+
+  for (let i = 1; i < records.length; i++) {
+    const values = records[i];
+    if (values.every(value => value.trim() === '')) continue;
+
+    const record: Record<string, string> = {};
+    headers.forEach((header, column) => {
+      record[header] = (values[column] ?? '').trim();
+    });
+
+    rows.push({
+      row: i,
+      input: {
+        title: record.title || undefined,
+        description: record.description || undefined,
+        origin: csvLocation(record, 'origin'),
+        destination: csvLocation(record, 'destination'),
+        pickupDate: record.pickupdate,
+        deliveryDate: record.deliverydate,
+        equipmentType: record.equipmenttype,
+        weight: record.weight,
+        rate: record.rate,
+        rateType: record.ratetype || undefined,
+        shipmentId: record.shipmentid || undefined
+      }
+    });
+  }
+
+  return rows;
+}
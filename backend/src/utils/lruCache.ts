@@ -0,0 +1,51 @@
+interface LruEntry<V> {
+  value: V;
+  expiresAt: number;
+}
+
+/**
+ * Size-bounded LRU cache with per-entry TTL, backed by Map insertion order.
+ * `get` returns undefined for missing or expired keys, so null is a valid value.
+ */
+export class LruCache<K, V> {
+  private entries: Map<K, LruEntry<V>> = new Map();
+
+  constructor(private readonly maxEntries: number, private readonly defaultTtlMs: number) {}
+
+  get size(): number {
+    return this.entries.size;
+  }
+
+  get(key: K): V | undefined {
+    const entry = this.entries.get(key);
+    if (!entry) return undefined;
+
+    if (entry.expiresAt <= Date.now()) {
+      this.entries.delete(key);
+      return undefined;
+    }
+
+    // Re-insert to mark as most recently used
+    this.entries.delete(key);
+    this.entries.set(key, entry);
+    return entry.value;
+  }
+
+  set(key: K, value: V, ttlMs: number = this.defaultTtlMs): void {
+    this.entries.delete(key);
+    this.entries.set(key, { value, expiresAt: Date.now() + ttlMs });
+
+    while (this.entries.size > this.maxEntries) {
+      const oldest = this.entries.keys().next().value as K;
+      this.entries.delete(oldest);
+    }
+  }
+
+  delete(key: K): void {
+    this.entries.delete(key);
+  }
+
+  clear(): void {
+    this.entries.clear();
+  }
+}
@@ -0,0 +1,81 @@
+import { Types } from 'mongoose';
+import { PAGINATION } from './constants.js';
+
+/**
+ * Keyset (cursor) pagination helpers
+ * Cursors encode the (createdAt, _id) of the last item on a page so the next
+ * page can be fetched with an index range scan instead of skip().
+ */
+
+export type CountMode = 'exact' | 'cached' | 'estimated' | 'none';
+
+export interface LoadCursor {
+  createdAt: Date;
+  id: Types.ObjectId;
+}
+
+export const KEYSET_SORT = { createdAt: -1, _id: -1 } as const;
+
+/**
+ * Encode the position of a document into an opaque cursor string
+ */
+export function encodeCursor(doc: { createdAt: Date | string; _id: Types.ObjectId | string }): string {
+  const createdAt = new Date(doc.createdAt).getTime();
+  return Buffer.from(`${createdAt}:${doc._id.toString()}`, 'utf8').toString('base64url');
+}
+
+/**
+ * Decode an opaque cursor string. Returns null for malformed cursors.
+ */
+export function decodeCursor(cursor: string): LoadCursor | null {
+  if (!cursor || typeof cursor !== 'string') return null;
+
+  try {
+    const decoded = Buffer.from(cursor, 'base64url').toString('utf8');
+    const [timestamp, id] = decoded.split(':');
+    const createdAt = new Date(Number(timestamp));
+
+    if (!timestamp || Number.isNaN(createdAt.getTime()) || !id || !Types.ObjectId.isValid(id)) {
+      return null;
+    }
+
+    return { createdAt, id: new Types.ObjectId(id) };
+  } catch {
+    return null;
+  }
+}
+
+/**
+ * Build the range predicate that selects documents strictly after the cursor
+ * in { createdAt: -1, _id: -1 } order
+ */
+export function buildKeysetFilter(cursor: LoadCursor): Record<string, unknown> {
+  return {
+    $or: [
+      { createdAt: { $lt: cursor.createdAt } },
+      { createdAt: cursor.createdAt, _id: { $lt: cursor.id } }
+    ]
+  };
+}
+
+/**
+ * Clamp a requested page size to the configured bounds
+ */
+export function parseLimit(limit: unknown): number {
+  const parsed = parseInt(String(limit ?? ''), 10);
+  if (Number.isNaN(parsed) || parsed <= 0) return PAGINATION.DEFAULT_LIMIT;
+  return Math.min(parsed, PAGINATION.MAX_LIMIT);
+}
+
+/**
+ * Parse the count mode requested by the client, falling back to the given default
+ */
+export function parseCountMode(value: unknown, fallback: CountMode): CountMode {
+  const mode = typeof value === 'string' ? value.toLowerCase() : '';
+  if (mode === 'exact' || mode === 'cached' || mode === 'estimated' || mode === 'none') {
+    return mode;
+  }
+  if (mode === 'true') return 'exact';
+  if (mode === 'false') return 'none';
+  return fallback;
+}
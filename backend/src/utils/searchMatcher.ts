@@ -0,0 +1,163 @@
+/**
+ * Reverse index of saved-search predicates: searches are the indexed
+ * documents and a load is the query. Each search is filed under its lane
+ * (origin state → destination state, `*` when unset) and each of its
+ * equipment types (`*` when none), so a load probes at most 2 × 2 × 2
+ * buckets. Within a bucket searches are kept sorted by minimum price, so the
+ * scan stops at the first search whose minimum is above the load's rate; the
+ * remaining range predicates (maximum price, pickup date) are checked inline.
+ *
+ * Matching follows AlertCronService.findMatchingLoads: empty or zero-valued
+ * criteria are unset, ranges are inclusive.
+ */
+
+const ANY = '*';
+
+export interface SearchPredicate {
+  equipment?: string[];
+  priceMin?: number;
+  priceMax?: number;
+  originState?: string;
+  destinationState?: string;
+  dateRange?: {
+    from?: Date | string;
+    to?: Date | string;
+  };
+}
+
+export interface MatchableLoad {
+  equipmentType?: string;
+  rate?: number;
+  origin?: { state?: string };
+  destination?: { state?: string };
+  pickupDate?: Date | string;
+}
+
+interface Entry {
+  id: string;
+  // -Infinity / Infinity when unbounded
+  priceMin: number;
+  priceMax: number;
+  dateFrom: number;
+  dateTo: number;
+  keys: string[];
+}
+
+interface Bucket {
+  entries: Entry[];
+  sorted: boolean;
+}
+
+const bucketKey = (origin: string, destination: string, equipment: string): string => `${origin}>${destination}|${equipment}`;
+
+const time = (value: Date | string | undefined, fallback: number): number => {
+  if (!value) return fallback;
+  const ms = new Date(value).getTime();
+  return Number.isNaN(ms) ? fallback : ms;
+};
+
+const within = (value: number, min: number, max: number): boolean =>
+  (min === -Infinity || value >= min) && (max === Infinity || value <= max);
+
+export class SearchMatcher {
+  private buckets: Map<string, Bucket> = new Map();
+  private entries: Map<string, Entry> = new Map();
+
+  get size(): number {
+    return this.entries.size;
+  }
+
+  has(id: string): boolean {
+    return this.entries.has(id);
+  }
+
+  /**
+   * Add or replace a search
+   */
+  add(id: string, predicate: SearchPredicate): void {
+    this.remove(id);
+
+    const equipment = predicate.equipment?.length ? Array.from(new Set(predicate.equipment)) : [ANY];
+    const origin = predicate.originState || ANY;
+    const destination = predicate.destinationState || ANY;
+    const entry: Entry = {
+      id,
+      priceMin: predicate.priceMin || -Infinity,
+      priceMax: predicate.priceMax || Infinity,
+      dateFrom: time(predicate.dateRange?.from, -Infinity),
+      dateTo: time(predicate.dateRange?.to, Infinity),
+      keys: equipment.map(type => bucketKey(origin, destination, type))
+    };
+
+    for (const key of entry.keys) {
+      let bucket = this.buckets.get(key);
+      if (!bucket) {
+        bucket = { entries: [], sorted: true };
+        this.buckets.set(key, bucket);
+      }
+      bucket.entries.push(entry);
+      bucket.sorted = false;
+    }
+    this.entries.set(id, entry);
+  }
+
+  remove(id: string): void {
+    const entry = this.entries.get(id);
+    if (!entry) return;
+
+    for (const key of entry.keys) {
+      const bucket = this.buckets.get(key);
+      if (!bucket) continue;
+      bucket.entries = bucket.entries.filter(candidate => candidate !== entry);
+      if (bucket.entries.length === 0) {
+        this.buckets.delete(key);
+      }
+    }
+    this.entries.delete(id);
+  }
+
+  /**
+   * Ids of the searches a load matches. A search is filed once per lane and
+   * equipment type, so no id is returned twice.
+   */
+  match(load: MatchableLoad): string[] {
+    const origins = load.origin?.state ? [load.origin.state, ANY] : [ANY];
+    const destinations = load.destination?.state ? [load.destination.state, ANY] : [ANY];
+    const equipment = load.equipmentType ? [load.equipmentType, ANY] : [ANY];
+    const rate = typeof load.rate === 'number' ? load.rate : NaN;
+    const pickup = time(load.pickupDate, NaN);
+
+    const ids: string[] = [];
+    for (const origin of origins) {
+      for (const destination of destinations) {
+        for (const type of equipment) {
+          const bucket = this.buckets.get(bucketKey(origin, destination, type));
+          if (bucket) {
+            this.scan(bucket, rate, pickup, ids);
+          }
+        }
+      }
+    }
+    return ids;
+  }
+
+  clear(): void {
+    this.buckets.clear();
+    this.entries.clear();
+  }
+
+  private scan(bucket: Bucket, rate: number, pickup: number, ids: string[]): void {
+    if (!bucket.sorted) {
+      bucket.entries.sort((a, b) => (a.priceMin === b.priceMin ? 0 : a.priceMin < b.priceMin ? -1 : 1));
+      bucket.sorted = true;
+    }
+
+    for (const entry of bucket.entries) {
+      // Sorted by priceMin: unbounded first, then ascending; nothing further can match
+      if (entry.priceMin !== -Infinity && !(rate >= entry.priceMin)) break;
+      if (entry.priceMax !== Infinity && !(rate <= entry.priceMax)) continue;
+      if (!within(pickup, entry.dateFrom, entry.dateTo)) continue;
+      ids.push(entry.id);
+    }
+  }
+}
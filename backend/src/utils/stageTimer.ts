@@ -0,0 +1,41 @@
+import { Request, Response } from 'express';
+import { DEBUG_TIMING_HEADER } from './constants.js';
+
+/**
+ * Wall-clock timings of the named stages of one request. Stages may run
+ * concurrently; `total` is the time since the timer was created.
+ */
+export class StageTimer {
+  private readonly startedAt = performance.now();
+  private readonly stages: Record<string, number> = {};
+
+  async time<T>(stage: string, fn: () => Promise<T>): Promise<T> {
+    const start = performance.now();
+    try {
+      return await fn();
+    } finally {
+      this.stages[stage] = round(performance.now() - start);
+    }
+  }
+
+  timings(): Record<string, number> {
+    return { ...this.stages, total: round(performance.now() - this.startedAt) };
+  }
+
+  /**
+   * Add the timings to `body` and a Server-Timing header when the request
+   * asked for them with the debug header; otherwise return `body` unchanged.
+   */
+  attach<T extends object>(req: Request, res: Response, body: T): T | (T & { timings: Record<string, number> }) {
+    const header = req.get(DEBUG_TIMING_HEADER);
+    if (!header || header === '0' || header.toLowerCase() === 'false') {
+      return body;
+    }
+
+    const timings = this.timings();
+    res.setHeader('Server-Timing', Object.entries(timings).map(([stage, ms]) => `${stage};dur=${ms}`).join(', '));
+    return { ...body, timings };
+  }
+}
+
+const round = (ms: number): number => Math.round(ms * 10) / 10;
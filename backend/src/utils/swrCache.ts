@@ -0,0 +1,223 @@
+import { logger } from './logger.js';
+
+export type SwrState = 'fresh' | 'stale' | 'miss';
+
+export interface SwrCacheOptions {
+  /** Approximate memory budget; least recently used entries are evicted past it */
+  maxBytes: number;
+  /** Entries younger than this are served without a refresh */
+  freshMs: number;
+  /** Entries older than this are dropped; in between they are served stale and refreshed in the background */
+  maxAgeMs: number;
+}
+
+export interface SwrCacheStats {
+  entries: number;
+  approxBytes: number;
+  maxBytes: number;
+  hits: number;
+  staleHits: number;
+  misses: number;
+  hitRate: number;
+  refreshes: number;
+  refreshFailures: number;
+  invalidations: number;
+  evictions: number;
+}
+
+interface SwrEntry<V> {
+  value: V;
+  bytes: number;
+  tags: string[];
+  staleAt: number;
+  expiresAt: number;
+}
+
+interface Refresh<V> {
+  promise: Promise<V>;
+  cancelled: boolean;
+}
+
+/**
+ * Stale-while-revalidate cache. A stale entry is returned immediately while a
+ * single background refresh per key replaces it; concurrent misses share one
+ * load. Entries carry tags so writes can drop (or just age) every entry they affect.
+ * Map insertion order doubles as the LRU list.
+ */
+export class SwrCache<V> {
+  private entries: Map<string, SwrEntry<V>> = new Map();
+  private refreshing: Map<string, Refresh<V>> = new Map();
+  private tagged: Map<string, Set<string>> = new Map();
+  private approxBytes = 0;
+  private hits = 0;
+  private staleHits = 0;
+  private misses = 0;
+  private refreshes = 0;
+  private refreshFailures = 0;
+  private invalidations = 0;
+  private evictions = 0;
+
+  constructor(private readonly name: string, private readonly options: SwrCacheOptions) {}
+
+  /**
+   * Cached value for `key`, loading it on a miss. `tags` are recorded when the
+   * loaded value is stored.
+   */
+  async get(key: string, load: () => Promise<V>, tags: string[] = []): Promise<{ value: V; state: SwrState }> {
+    const entry = this.entries.get(key);
+    const now = Date.now();
+
+    if (entry && entry.expiresAt > now) {
+      this.entries.delete(key);
+      this.entries.set(key, entry);
+
+      if (entry.staleAt > now) {
+        this.hits++;
+        return { value: entry.value, state: 'fresh' };
+      }
+
+      this.staleHits++;
+      this.refresh(key, load, tags).catch((error: any) => {
+        logger.error('Background cache refresh failed', { cache: this.name, key, error: error.message });
+      });
+      return { value: entry.value, state: 'stale' };
+    }
+
+    if (entry) {
+      this.remove(key);
+    }
+    this.misses++;
+    return { value: await this.refresh(key, load, tags), state: 'miss' };
+  }
+
+  /**
+   * Drop an entry and discard any refresh already running for it
+   */
+  invalidate(key: string): void {
+    this.cancelRefresh(key);
+    if (this.remove(key)) {
+      this.invalidations++;
+    }
+  }
+
+  /**
+   * Drop every entry carrying `tag`, or with `{ soft: true }` only mark them
+   * stale so they are still served while the next read refreshes them
+   */
+  invalidateTag(tag: string, options: { soft?: boolean } = {}): void {
+    const keys = this.tagged.get(tag);
+    if (!keys) return;
+
+    for (const key of Array.from(keys)) {
+      if (options.soft) {
+        const entry = this.entries.get(key);
+        this.cancelRefresh(key);
+        if (entry && entry.staleAt > Date.now()) {
+          entry.staleAt = Date.now();
+          this.invalidations++;
+        }
+      } else {
+        this.invalidate(key);
+      }
+    }
+  }
+
+  clear(): void {
+    for (const key of Array.from(this.refreshing.keys())) {
+      this.cancelRefresh(key);
+    }
+    this.invalidations += this.entries.size;
+    this.entries.clear();
+    this.tagged.clear();
+    this.approxBytes = 0;
+  }
+
+  getStats(): SwrCacheStats {
+    const lookups = this.hits + this.staleHits + this.misses;
+    return {
+      entries: this.entries.size,
+      approxBytes: this.approxBytes,
+      maxBytes: this.options.maxBytes,
+      hits: this.hits,
+      staleHits: this.staleHits,
+      misses: this.misses,
+      hitRate: lookups > 0 ? Number(((this.hits + this.staleHits) / lookups).toFixed(3)) : 0,
+      refreshes: this.refreshes,
+      refreshFailures: this.refreshFailures,
+      invalidations: this.invalidations,
+      evictions: this.evictions
+    };
+  }
+
+  private refresh(key: string, load: () => Promise<V>, tags: string[]): Promise<V> {
+    const running = this.refreshing.get(key);
+    if (running) return running.promise;
+
+    this.refreshes++;
+    const refresh = { cancelled: false } as Refresh<V>;
+    this.refreshing.set(key, refresh);
+    refresh.promise = (async () => {
+      try {
+        const value = await load();
+        // An invalidation while loading means the value may predate the write
+        if (!refresh.cancelled) {
+          this.store(key, value, tags);
+        }
+        return value;
+      } catch (error) {
+        this.refreshFailures++;
+        throw error;
+      } finally {
+        if (this.refreshing.get(key) === refresh) {
+          this.refreshing.delete(key);
+        }
+      }
+    })();
+    return refresh.promise;
+  }
+
+  private cancelRefresh(key: string): void {
+    const running = this.refreshing.get(key);
+    if (running) {
+      running.cancelled = true;
+      this.refreshing.delete(key);
+    }
+  }
+
+  private store(key: string, value: V, tags: string[]): void {
+    const bytes = Buffer.byteLength(JSON.stringify(value) ?? '');
+    if (bytes > this.options.maxBytes) return;
+
+    this.remove(key);
+    const now = Date.now();
+    this.entries.set(key, { value, bytes, tags, staleAt: now + this.options.freshMs, expiresAt: now + this.options.maxAgeMs });
+    this.approxBytes += bytes;
+    for (const tag of tags) {
+      const keys = this.tagged.get(tag) ?? new Set<string>();
+      keys.add(key);
+      this.tagged.set(tag, keys);
+    }
+
+    while (this.approxBytes > this.options.maxBytes && this.entries.size > 0) {
+      const oldest = this.entries.keys().next().value as string;
+      this.remove(oldest);
+      this.evictions++;
+    }
+  }
+
+  private remove(key: string): boolean {
+    const entry = this.entries.get(key);
+    if (!entry) return false;
+
+    this.entries.delete(key);
+    this.approxBytes -= entry.bytes;
+    for (const tag of entry.tags) {
+      const keys = this.tagged.get(tag);
+      keys?.delete(key);
+      if (keys?.size === 0) {
+        this.tagged.delete(tag);
+      }
+    }
+    return true;
+  }
+}
@@ -0,0 +1,146 @@
+export interface SerializedDigest {
+  means: number[];
+  weights: number[];
+  min: number;
+  max: number;
+}
+
+/**
+ * Merging t-digest (Dunning) for streaming quantile estimates. Centroids are
+ * sized with the k1 scale function, so the tails stay accurate while the
+ * digest holds O(compression) centroids however many values it has seen.
+ * Digests merge losslessly up to that bound, which lets per-bucket digests be
+ * combined into any window.
+ */
+export class TDigest {
+  private means: number[] = [];
+  private weights: number[] = [];
+  private buffer: Array<[number, number]> = [];
+  private total = 0;
+  private min = Infinity;
+  private max = -Infinity;
+
+  constructor(private readonly compression: number = 100) {}
+
+  static fromJSON(data: SerializedDigest | null | undefined, compression?: number): TDigest {
+    const digest = new TDigest(compression);
+    if (!data) return digest;
+    digest.means = [...data.means];
+    digest.weights = [...data.weights];
+    digest.total = data.weights.reduce((sum, weight) => sum + weight, 0);
+    if (digest.total > 0) {
+      digest.min = data.min;
+      digest.max = data.max;
+    }
+    return digest;
+  }
+
+  get count(): number {
+    return this.total;
+  }
+
+  add(value: number, weight: number = 1): void {
+    if (!Number.isFinite(value) || weight <= 0) return;
+    this.buffer.push([value, weight]);
+    this.total += weight;
+    this.min = Math.min(this.min, value);
+    this.max = Math.max(this.max, value);
+    if (this.buffer.length >= this.compression * 5) {
+      this.compress();
+    }
+  }
+
+  merge(other: TDigest): void {
+    other.compress();
+    if (other.total === 0) return;
+    for (let i = 0; i < other.means.length; i++) {
+      this.buffer.push([other.means[i], other.weights[i]]);
+    }
+    this.total += other.total;
+    this.min = Math.min(this.min, other.min);
+    this.max = Math.max(this.max, other.max);
+    this.compress();
+  }
+
+  /**
+   * Estimated value at quantile `q` (0..1); NaN when empty
+   */
+  quantile(q: number): number {
+    this.compress();
+    if (this.total === 0) return NaN;
+    if (this.means.length === 1) return this.means[0];
+
+    const n = this.means.length;
+    const index = Math.min(Math.max(q, 0), 1) * this.total;
+
+    // Between min and the first centroid's center
+    if (index < this.weights[0] / 2) {
+      return this.min + (index / (this.weights[0] / 2)) * (this.means[0] - this.min);
+    }
+
+    let cumulative = this.weights[0] / 2;
+    for (let i = 0; i < n - 1; i++) {
+      const step = (this.weights[i] + this.weights[i + 1]) / 2;
+      if (cumulative + step >= index) {
+        const t = (index - cumulative) / step;
+        return this.means[i] + t * (this.means[i + 1] - this.means[i]);
+      }
+      cumulative += step;
+    }
+
+    // Between the last centroid's center and max
+    const lastHalf = this.weights[n - 1] / 2;
+    const t = lastHalf > 0 ? Math.min((index - cumulative) / lastHalf, 1) : 1;
+    return this.means[n - 1] + t * (this.max - this.means[n - 1]);
+  }
+
+  toJSON(): SerializedDigest {
+    this.compress();
+    return {
+      means: [...this.means],
+      weights: [...this.weights],
+      min: this.total > 0 ? this.min : 0,
+      max: this.total > 0 ? this.max : 0
+    };
+  }
+
+  private compress(): void {
+    if (this.buffer.length === 0) return;
+
+    const points: Array<[number, number]> = this.means.map((mean, i) => [mean, this.weights[i]]);
+    points.push(...this.buffer);
+    points.sort((a, b) => a[0] - b[0]);
+    this.buffer = [];
+
+    const means: number[] = [];
+    const weights: number[] = [];
+    let before = 0;
+    let [mean, weight] = points[0];
+
+    for (let i = 1; i < points.length; i++) {
+      const [nextMean, nextWeight] = points[i];
+      const qLeft = before / this.total;
+      const qRight = (before + weight + nextWeight) / this.total;
+
+      if (this.scale(qRight) - this.scale(qLeft) <= 1) {
+        weight += nextWeight;
+        mean += ((nextMean - mean) * nextWeight) / weight;
+      } else {
+        means.push(mean);
+        weights.push(weight);
+        before += weight;
+        [mean, weight] = [nextMean, nextWeight];
+      }
+    }
+    means.push(mean);
+    weights.push(weight);
+
+    this.means = means;
+    this.weights = weights;
+  }
+
+  // k1 scale function: centroids shrink towards q = 0 and q = 1
+  private scale(q: number): number {
+    return (this.compression / (2 * Math.PI)) * Math.asin(2 * Math.min(Math.max(q, 0), 1) - 1);
+  }
+}
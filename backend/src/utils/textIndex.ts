@@ -0,0 +1,217 @@
+/**
+ * In-process inverted index with per-field weights and BM25F-style scoring.
+ * Documents are addressed by string id; each field's term frequency is
+ * length-normalized against that field's average length, weighted, summed
+ * and then saturated with the usual BM25 k1 curve.
+ */
+
+const K1 = 1.2;
+const B = 0.75;
+
+const STOPWORDS = new Set(['a', 'an', 'and', 'for', 'in', 'of', 'on', 'or', 'the', 'to', 'load', 'loads']);
+
+export function tokenize(text: string): string[] {
+  return text
+    .normalize('NFD')
+    .replace(/[\u0300-\u036f]/g, '')
+    .toLowerCase()
+    .split(/[^a-z0-9]+/)
+    .filter(token => token.length > 0 && !STOPWORDS.has(token));
+}
+
+export interface TextSearchHit {
+  id: string;
+  score: number;
+}
+
+export interface TextRankResult {
+  /** Best `limit` documents, best first */
+  hits: TextSearchHit[];
+  /** Documents matching any query term (hits is truncated when larger) */
+  total: number;
+}
+
+interface Posting {
+  doc: number;
+  /** Index of this posting's term in the document's term list */
+  term: number;
+  /** Term frequency per field, indexed like `fields` */
+  tf: number[];
+}
+
+export class TextIndex<F extends string> {
+  private readonly fields: F[];
+  private readonly weights: number[];
+  private postings: Map<string, Posting[]> = new Map();
+  private ids: string[] = [];
+  private slots: Map<string, number> = new Map();
+  private lengths: number[][] = [];
+  private terms: string[][] = [];
+  // Position of each of a document's postings in its term's list, indexed like `terms`
+  private positions: number[][] = [];
+  private totalLengths: number[];
+  private freeSlots: number[] = [];
+  private live = 0;
+
+  constructor(weights: Record<F, number>) {
+    this.fields = Object.keys(weights) as F[];
+    this.weights = this.fields.map(field => weights[field]);
+    this.totalLengths = this.fields.map(() => 0);
+  }
+
+  get size(): number {
+    return this.live;
+  }
+
+  /**
+   * Add or replace a document
+   */
+  add(id: string, document: Partial<Record<F, string | undefined>>): void {
+    this.remove(id);
+
+    const slot = this.freeSlots.length > 0 ? (this.freeSlots.pop() as number) : this.ids.length;
+    const frequencies = new Map<string, number[]>();
+    const lengths = this.fields.map((field, f) => {
+      const tokens = tokenize(document[field] ?? '');
+      for (const token of tokens) {
+        let tf = frequencies.get(token);
+        if (!tf) {
+          tf = this.fields.map(() => 0);
+          frequencies.set(token, tf);
+        }
+        tf[f]++;
+      }
+      this.totalLengths[f] += tokens.length;
+      return tokens.length;
+    });
+
+    const terms: string[] = [];
+    const positions: number[] = [];
+    for (const [term, tf] of frequencies) {
+      let list = this.postings.get(term);
+      if (!list) {
+        list = [];
+        this.postings.set(term, list);
+      }
+      positions.push(list.length);
+      list.push({ doc: slot, term: terms.length, tf });
+      terms.push(term);
+    }
+
+    this.ids[slot] = id;
+    this.lengths[slot] = lengths;
+    this.terms[slot] = terms;
+    this.positions[slot] = positions;
+    this.slots.set(id, slot);
+    this.live++;
+  }
+
+  remove(id: string): void {
+    const slot = this.slots.get(id);
+    if (slot === undefined) return;
+
+    // Swap-remove each posting, repointing the posting moved into its place
+    this.terms[slot].forEach((term, t) => {
+      const list = this.postings.get(term);
+      if (!list) return;
+      const position = this.positions[slot][t];
+      const last = list.pop() as Posting;
+      if (position < list.length) {
+        list[position] = last;
+        this.positions[last.doc][last.term] = position;
+      }
+      if (list.length === 0) this.postings.delete(term);
+    });
+
+    this.lengths[slot].forEach((length, f) => {
+      this.totalLengths[f] -= length;
+    });
+    this.terms[slot] = [];
+    this.positions[slot] = [];
+    this.lengths[slot] = [];
+    this.slots.delete(id);
+    this.freeSlots.push(slot);
+    this.live--;
+  }
+
+  clear(): void {
+    this.postings.clear();
+    this.ids = [];
+    this.slots.clear();
+    this.lengths = [];
+    this.terms = [];
+    this.positions = [];
+    this.totalLengths = this.fields.map(() => 0);
+    this.freeSlots = [];
+    this.live = 0;
+  }
+
+  /**
+   * Documents matching any query term, best first
+   */
+  search(query: string, limit: number = 100): TextSearchHit[] {
+    return this.rank(query, limit).hits;
+  }
+
+  /**
+   * Best `limit` documents matching any query term, with the number matched
+   */
+  rank(query: string, limit: number = 100): TextRankResult {
+    const queryTerms = Array.from(new Set(tokenize(query)));
+    if (queryTerms.length === 0 || this.live === 0 || limit <= 0) return { hits: [], total: 0 };
+
+    const averageLengths = this.totalLengths.map(total => Math.max(total / this.live, 1));
+    // Dense score accumulator indexed by slot; `touched` lists slots with a score
+    const scores = new Float64Array(this.ids.length);
+    const touched: number[] = [];
+
+    for (const term of queryTerms) {
+      const list = this.postings.get(term);
+      if (!list) continue;
+
+      const idf = Math.log(1 + (this.live - list.length + 0.5) / (list.length + 0.5));
+      for (const posting of list) {
+        const lengths = this.lengths[posting.doc];
+        let weighted = 0;
+        for (let f = 0; f < posting.tf.length; f++) {
+          if (posting.tf[f] === 0) continue;
+          weighted += (this.weights[f] * posting.tf[f]) / (1 - B + (B * lengths[f]) / averageLengths[f]);
+        }
+        if (scores[posting.doc] === 0) touched.push(posting.doc);
+        scores[posting.doc] += (idf * weighted * (K1 + 1)) / (weighted + K1);
+      }
+    }
+
+    // Keep the best `limit` slots in a min-heap so large result sets are not fully sorted
+    const heap: number[] = [];
+    const less = (a: number, b: number) => scores[a] < scores[b];
+    for (const slot of touched) {
+      if (heap.length < limit) {
+        heap.push(slot);
+        for (let i = heap.length - 1; i > 0;) {
+          const parent = (i - 1) >> 1;
+          if (!less(heap[i], heap[parent])) break;
+          [heap[i], heap[parent]] = [heap[parent], heap[i]];
+          i = parent;
+        }
+      } else if (less(heap[0], slot)) {
+        heap[0] = slot;
+        for (let i = 0; ;) {
+          const left = 2 * i + 1;
+          const right = left + 1;
+          let smallest = i;
+          if (left < heap.length && less(heap[left], heap[smallest])) smallest = left;
+          if (right < heap.length && less(heap[right], heap[smallest])) smallest = right;
+          if (smallest === i) break;
+          [heap[i], heap[smallest]] = [heap[smallest], heap[i]];
+          i = smallest;
+        }
+      }
+    }
+
+    const hits = heap
+      .sort((a, b) => scores[b] - scores[a])
+      .map(slot => ({ id: this.ids[slot], score: scores[slot] }));
+    return { hits, total: touched.length };
+  }
+}
@@ -76,3 +76,16 @@ export function normalizeEIN(ein: string): { canon: string; display: string } {
 
 
 
+
+/**
+ * IANA time zone name accepted by both Intl and MongoDB date operators (e.g. "America/Chicago")
+ */
+export function validateTimeZone(timeZone: string): boolean {
+  if (!timeZone || typeof timeZone !== 'string') return false;
+  try {
+    new Intl.DateTimeFormat('en-US', { timeZone });
+    return true;
+  } catch {
+    return false;
+  }
+}